@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+CLI Startup Benchmark
+
+Times cold starts of main_quality_analysis.py commands in fresh interpreters,
+so import-time regressions (a heavy module pulled back to the top level) show
+up as numbers instead of a sluggish `--help`.
+
+Each command is run N times as a subprocess; min and median wall time are
+reported. The full workflow import (pandas, yfinance, scorer) is timed as a
+reference for what the lightweight commands avoid.
+
+Usage:
+    python benchmark_startup.py              # 5 runs per command
+    python benchmark_startup.py --runs 10
+    python benchmark_startup.py --top 15     # also list the slowest imports per command
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import List, Tuple
+
+SCANNER_DIR = Path(__file__).parent
+CLI = str(SCANNER_DIR / "main_quality_analysis.py")
+
+COMMANDS = [
+    ("--help", [CLI, "--help"]),
+    ("--info AAPL", [CLI, "--info", "AAPL"]),
+    ("--cache-info", [CLI, "--cache-info"]),
+    ("import workflow (reference)", ["-c", "import workflows.opportunity_discovery"]),
+]
+
+
+def time_command(args: List[str], runs: int) -> Tuple[float, float]:
+    """(min, median) wall seconds of ``python <args>`` over ``runs`` cold starts"""
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, *args], cwd=SCANNER_DIR,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=False)
+        samples.append(time.perf_counter() - start)
+    return min(samples), statistics.median(samples)
+
+
+def slowest_imports(args: List[str], top: int) -> List[Tuple[int, str]]:
+    """Top ``top`` modules by cumulative import time (microseconds), via -X importtime"""
+    result = subprocess.run([sys.executable, "-X", "importtime", *args], cwd=SCANNER_DIR,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|", 2)
+        rows.append((int(cumulative), name.strip()))
+    return sorted(rows, reverse=True)[:top]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark main_quality_analysis.py startup")
+    parser.add_argument("--runs", type=int, default=5, help="Cold starts per command (default: 5)")
+    parser.add_argument("--top", type=int, default=0,
+                        help="Also show the N slowest imports per command (default: off)")
+    args = parser.parse_args()
+
+    print(f"{'Command':<30} {'min':>8} {'median':>8}")
+    print("-" * 48)
+    for label, command in COMMANDS:
+        best, median = time_command(command, max(1, args.runs))
+        print(f"{label:<30} {best:>7.3f}s {median:>7.3f}s")
+
+    if args.top:
+        for label, command in COMMANDS:
+            print(f"\nSlowest imports — {label}:")
+            for cumulative, name in slowest_imports(command, args.top):
+                print(f"  {cumulative / 1e6:>7.3f}s  {name}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,366 @@
+"""
+Constituent Snapshot Store
+
+Versioned, on-disk index constituent lists for WatchlistConfig.
+
+Every run used to re-download and re-parse the Wikipedia constituent pages
+(three of them for the Russell approximations and the S&P 1500) before any
+fundamentals work could start. Here each parsed list is saved as a snapshot
+with an as-of date and a content hash; a page is only scraped again once the
+latest snapshot is older than ``max_age``, and a changed list becomes a new
+version while an unchanged one just has its ``checked_at`` bumped.
+
+Features:
+- SQLite snapshots table: index, as_of, checked_at, content hash, tickers
+- Fresh snapshots are served without touching the network
+- Stale snapshots are served immediately and refreshed in a background
+  thread (only a first-ever fetch blocks)
+- ``diff(index, since)`` returns added/removed tickers between versions, so
+  incremental runs can fetch fundamentals for changed names only
+- Composite universes (Russell approximations, S&P 1500) are unions of the
+  scraped base indices and diff the same way
+- Sources are injectable (``fetch_page`` or ``sources``) for local fixture pages
+
+Usage:
+    from .constituent_store import ConstituentStore
+
+    store = ConstituentStore(CONSTITUENTS_FILE, max_age=timedelta(days=7))
+    tickers = store.get("sp500")
+    added, removed = store.diff("sp500")   # latest vs previous version
+"""
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from functools import partial
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_AGE = timedelta(days=7)
+
+# Project directory, next to the merged cache (not the caller's cwd)
+CONSTITUENTS_FILE = Path(__file__).parent.parent / "constituents.db"
+
+# Indices with a scraped source (financial_data_fetcher.WIKIPEDIA_CONSTITUENT_PAGES)
+BASE_INDICES = ('sp500', 'sp400', 'sp600', 'nasdaq100')
+
+# Universes built from the scraped base indices (see financial_data_fetcher)
+COMPOSITE_INDICES = {
+    'russell1000': ('sp500', 'sp400'),
+    'russell2000': ('sp600',),
+    'russell3000': ('sp500', 'sp400', 'sp600'),
+    'combined_sp': ('sp500', 'sp400', 'sp600'),
+}
+
+
+@dataclass
+class ConstituentSnapshot:
+    """One version of an index's constituent list"""
+    index: str
+    as_of: datetime          # when this list was first seen
+    checked_at: datetime     # when the source last confirmed it
+    content_hash: str
+    tickers: List[str] = field(default_factory=list)
+
+    def age(self) -> timedelta:
+        """Time since the source last confirmed this list"""
+        return datetime.now() - self.checked_at
+
+
+class ConstituentStore:
+    """
+    SQLite-backed, versioned constituent lists with age-based refresh.
+
+    Attributes:
+        db_path: Path to the SQLite database file
+        max_age: Snapshot age after which the source is scraped again
+    """
+
+    def __init__(
+        self,
+        db_path: Union[str, Path] = CONSTITUENTS_FILE,
+        max_age: timedelta = DEFAULT_MAX_AGE,
+        fetch_page: Optional[Callable[[str], str]] = None,
+        sources: Optional[Dict[str, Callable[[], List[str]]]] = None,
+        background_refresh: bool = True,
+    ):
+        """
+        Open (or create) the store.
+
+        Args:
+            db_path: Path to SQLite database file (default: project directory)
+            max_age: Refresh a snapshot once it is older than this
+            fetch_page: url -> HTML callable used by the default Wikipedia sources
+                (default: HTTP fetch)
+            sources: index -> ticker-list callable, replacing the default sources
+            background_refresh: Serve stale snapshots and refresh them in a thread
+                (False: refresh synchronously before returning)
+        """
+        self.db_path = Path(db_path)
+        self.max_age = max_age
+        self.background_refresh = background_refresh
+        self.sources = sources if sources is not None else {
+            index: partial(_scrape, index, fetch_page) for index in BASE_INDICES
+        }
+        self._lock = threading.Lock()
+        self._refreshing: Dict[str, threading.Thread] = {}
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS snapshots (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                index_name TEXT NOT NULL,
+                as_of REAL NOT NULL,
+                checked_at REAL NOT NULL,
+                content_hash TEXT NOT NULL,
+                tickers TEXT NOT NULL
+            )
+        ''')
+        self._conn.execute(
+            'CREATE INDEX IF NOT EXISTS idx_snapshots_index ON snapshots(index_name, as_of)'
+        )
+        self._conn.commit()
+
+    # ---- lists -------------------------------------------------------------
+
+    def get(self, index: str) -> List[str]:
+        """
+        Current constituents of ``index`` (base or composite).
+
+        Fresh snapshots are returned as stored. A stale one is returned as
+        well, with a refresh started in the background; only an index that
+        has never been fetched blocks on the source.
+        """
+        if index in COMPOSITE_INDICES:
+            return _union(self.get(base) for base in COMPOSITE_INDICES[index])
+        self._check_source(index)
+
+        snapshot = self.latest(index)
+        if snapshot is None:
+            snapshot = self.refresh(index)
+            return snapshot.tickers if snapshot else []
+        if snapshot.age() > self.max_age:
+            if self.background_refresh:
+                self._refresh_in_background(index)
+            else:
+                snapshot = self.refresh(index) or snapshot
+        return snapshot.tickers
+
+    def refresh(self, index: str) -> Optional[ConstituentSnapshot]:
+        """
+        Scrape ``index`` now and record the result.
+
+        Returns:
+            The latest snapshot, or None if the source returned nothing and
+            there is no earlier snapshot to fall back on
+        """
+        self._check_source(index)
+        tickers = list(dict.fromkeys(t.strip() for t in self.sources[index]() if t and t.strip()))
+        if not tickers:
+            logger.warning(f"{index}: source returned no tickers; keeping previous snapshot")
+            return self.latest(index)
+        return self.record(index, tickers)
+
+    def record(self, index: str, tickers: Iterable[str],
+               as_of: Optional[datetime] = None) -> ConstituentSnapshot:
+        """
+        Save a parsed list; a new version only if its contents changed.
+
+        Args:
+            index: Base index name
+            tickers: Constituent tickers
+            as_of: Observation time (default: now)
+
+        Returns:
+            The latest snapshot after recording
+        """
+        tickers = list(tickers)
+        digest = _content_hash(tickers)
+        ts = as_of.timestamp() if as_of else time.time()
+        previous = self.latest(index)
+        with self._lock:
+            if previous is not None and previous.content_hash == digest:
+                self._conn.execute(
+                    "UPDATE snapshots SET checked_at = ? WHERE index_name = ? AND content_hash = ? "
+                    "AND as_of = ?",
+                    (ts, index, digest, previous.as_of.timestamp()),
+                )
+            else:
+                self._conn.execute(
+                    "INSERT INTO snapshots (index_name, as_of, checked_at, content_hash, tickers) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (index, ts, ts, digest, json.dumps(tickers)),
+                )
+            self._conn.commit()
+        latest = self.latest(index)
+        if previous is not None and previous.content_hash != digest:
+            added, removed = _set_diff(previous.tickers, latest.tickers)
+            logger.info(f"{index}: new constituent snapshot (+{len(added)} / -{len(removed)})")
+        return latest
+
+    # ---- versions ----------------------------------------------------------
+
+    def latest(self, index: str) -> Optional[ConstituentSnapshot]:
+        """Newest snapshot of a base index, or None"""
+        return self._one(
+            "WHERE index_name = ? ORDER BY as_of DESC, id DESC LIMIT 1", (index,)
+        )
+
+    def snapshot_as_of(self, index: str, when: datetime) -> Optional[ConstituentSnapshot]:
+        """Snapshot of a base index that was current at ``when``, or None"""
+        return self._one(
+            "WHERE index_name = ? AND as_of <= ? ORDER BY as_of DESC, id DESC LIMIT 1",
+            (index, when.timestamp()),
+        )
+
+    def history(self, index: str) -> List[ConstituentSnapshot]:
+        """All snapshots of a base index, newest first"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT index_name, as_of, checked_at, content_hash, tickers FROM snapshots "
+                "WHERE index_name = ? ORDER BY as_of DESC, id DESC",
+                (index,),
+            ).fetchall()
+        return [_from_row(row) for row in rows]
+
+    def diff(self, index: str, since: Optional[datetime] = None) -> Tuple[List[str], List[str]]:
+        """
+        Constituents added and removed, latest snapshot versus an earlier one.
+
+        Args:
+            index: Base or composite index
+            since: Compare against the snapshot current at this time
+                (default: each base index's previous version)
+
+        Returns:
+            Tuple of (added, removed) ticker lists
+        """
+        return self.diff_union(COMPOSITE_INDICES.get(index, (index,)), since)
+
+    def diff_union(self, bases: Iterable[str],
+                   since: Optional[datetime] = None) -> Tuple[List[str], List[str]]:
+        """
+        ``diff`` of the union of several base indices (a name moving between
+        them is neither added nor removed).
+
+        Args:
+            bases: Base index names
+            since: As for ``diff``
+
+        Returns:
+            Tuple of (added, removed) ticker lists
+        """
+        old: List[List[str]] = []
+        new: List[List[str]] = []
+        for base in bases:
+            versions = self.history(base)
+            if not versions:
+                continue
+            new.append(versions[0].tickers)
+            if since is None:
+                previous = versions[1] if len(versions) > 1 else versions[0]
+            else:
+                previous = self.snapshot_as_of(base, since)
+            old.append(previous.tickers if previous else [])
+        return _set_diff(_union(old), _union(new))
+
+    # ---- lifecycle ---------------------------------------------------------
+
+    def wait(self, timeout: Optional[float] = None) -> None:
+        """Block until background refreshes finish"""
+        for thread in list(self._refreshing.values()):
+            thread.join(timeout)
+
+    def close(self) -> None:
+        self.wait()
+        with self._lock:
+            self._conn.close()
+
+    # ---- internals ---------------------------------------------------------
+
+    def _check_source(self, index: str) -> None:
+        if index not in self.sources:
+            raise ValueError(f"No constituent source for index {index!r}")
+
+    def _refresh_in_background(self, index: str) -> None:
+        with self._lock:
+            running = self._refreshing.get(index)
+            if running is not None and running.is_alive():
+                return
+            thread = threading.Thread(
+                target=self._safe_refresh, args=(index,),
+                name=f"constituents-{index}", daemon=True,
+            )
+            self._refreshing[index] = thread
+        logger.info(f"{index}: snapshot is stale; refreshing in background")
+        thread.start()
+
+    def _safe_refresh(self, index: str) -> None:
+        try:
+            self.refresh(index)
+        except Exception as e:
+            logger.error(f"{index}: background constituent refresh failed: {e}")
+
+    def _one(self, where: str, params: tuple) -> Optional[ConstituentSnapshot]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT index_name, as_of, checked_at, content_hash, tickers FROM snapshots "
+                + where,
+                params,
+            ).fetchone()
+        return _from_row(row) if row else None
+
+
+_default_store: Optional[ConstituentStore] = None
+
+
+def get_default_store() -> ConstituentStore:
+    """Process-wide store at ``CONSTITUENTS_FILE`` (created on first use)"""
+    global _default_store
+    if _default_store is None:
+        _default_store = ConstituentStore()
+    return _default_store
+
+
+def _scrape(index: str, fetch_page: Optional[Callable[[str], str]]) -> List[str]:
+    """Default source: the index's Wikipedia page. The fetcher module (pandas,
+    yfinance) is only imported when a page is actually scraped."""
+    from .financial_data_fetcher import fetch_constituent_page, scrape_index_tickers
+    return scrape_index_tickers(index, fetch_page=fetch_page or fetch_constituent_page)
+
+
+def _content_hash(tickers: Iterable[str]) -> str:
+    """Order-insensitive hash of a constituent list"""
+    return hashlib.sha256("\n".join(sorted(set(tickers))).encode()).hexdigest()
+
+
+def _union(lists: Iterable[List[str]]) -> List[str]:
+    """Order-preserving union"""
+    out: Dict[str, None] = {}
+    for tickers in lists:
+        out.update(dict.fromkeys(tickers))
+    return list(out)
+
+
+def _set_diff(old: List[str], new: List[str]) -> Tuple[List[str], List[str]]:
+    old_set, new_set = set(old), set(new)
+    return [t for t in new if t not in old_set], [t for t in old if t not in new_set]
+
+
+def _from_row(row: tuple) -> ConstituentSnapshot:
+    return ConstituentSnapshot(
+        index=row[0],
+        as_of=datetime.fromtimestamp(row[1]),
+        checked_at=datetime.fromtimestamp(row[2]),
+        content_hash=row[3],
+        tickers=json.loads(row[4]),
+    )
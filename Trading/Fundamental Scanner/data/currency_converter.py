@@ -2,15 +2,23 @@
 Currency Converter - Fetches live exchange rates and converts currencies
 
 Uses exchangerate-api.com (free tier: 1000 requests/day)
+
+Rates are kept per (currency, date): the JSON cache is a snapshot plus an
+append-only journal (json_journal.py) loaded once, and each currency's
+history is a date-sorted array searched with bisect, so historical lookups
+and conversions never touch the file.
 """
 
 import requests
 import time
-from typing import Dict, Optional
+from bisect import bisect_right
+from typing import Dict, List, Optional, Tuple, Union
 from dataclasses import dataclass
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 import logging
 
+from .json_journal import JsonJournal
+
 logger = logging.getLogger(__name__)
 
 
@@ -64,53 +72,112 @@ class CurrencyConverter:
         Args:
             cache_file: Path to cache file for exchange rates
         """
-        self._rate_cache: Dict[str, CurrencyRate] = {}
+        self._rate_cache: Dict[str, CurrencyRate] = {}  # latest rate per currency
+        # currency -> (sorted day ordinals, rates on those days)
+        self._history: Dict[str, Tuple[List[int], List[CurrencyRate]]] = {}
+        self._entries: Dict[str, dict] = {}
         self._cache_file = cache_file
+        self._journal = JsonJournal(cache_file)
         self._load_cache()
     
+    @staticmethod
+    def _entry_key(currency: str, day: date) -> str:
+        return f"{currency}:{day.isoformat()}"
+    
     def _load_cache(self) -> None:
-        """Load cached exchange rates from file"""
+        """Load cached exchange rates (snapshot + journal) into the in-memory index"""
         try:
-            import json
-            import os
-            if os.path.exists(self._cache_file):
-                with open(self._cache_file, 'r') as f:
-                    data = json.load(f)
-                    for currency, rate_data in data.items():
-                        self._rate_cache[currency] = CurrencyRate(
-                            from_currency=rate_data['from'],
-                            to_currency='USD',
-                            rate=rate_data['rate'],
-                            timestamp=datetime.fromisoformat(rate_data['timestamp'])
-                        )
-                logger.info(f"Loaded {len(self._rate_cache)} cached currency rates")
+            data = self._journal.load()
+            for key, rate_data in data.items():
+                rate = CurrencyRate(
+                    from_currency=rate_data['from'],
+                    to_currency='USD',
+                    rate=rate_data['rate'],
+                    timestamp=datetime.fromisoformat(rate_data['timestamp'])
+                )
+                # Older caches were keyed by currency alone
+                self._index_rate(self._entry_key(rate.from_currency, rate.timestamp.date()),
+                                 rate, rate_data)
+            if self._rate_cache:
+                logger.info(f"Loaded {len(self._entries)} cached currency rates "
+                            f"for {len(self._rate_cache)} currencies")
         except Exception as e:
             logger.warning(f"Failed to load currency cache: {e}")
     
+    def _index_rate(self, key: str, rate: CurrencyRate, rate_data: dict) -> None:
+        """Add a rate to the per-currency sorted history and the latest-rate map"""
+        currency = rate.from_currency
+        day = rate.timestamp.date().toordinal()
+        days, rates = self._history.setdefault(currency, ([], []))
+        i = bisect_right(days, day)
+        if i and days[i - 1] == day:
+            if rates[i - 1].timestamp <= rate.timestamp:
+                rates[i - 1] = rate  # same day: keep the newer quote
+        else:
+            days.insert(i, day)
+            rates.insert(i, rate)
+        latest = self._rate_cache.get(currency)
+        if latest is None or latest.timestamp <= rate.timestamp:
+            self._rate_cache[currency] = rate
+        self._entries[key] = rate_data
+    
+    def _save_rate(self, rate: CurrencyRate) -> None:
+        """Journal one fetched rate"""
+        key = self._entry_key(rate.from_currency, rate.timestamp.date())
+        rate_data = {
+            'from': rate.from_currency,
+            'to': rate.to_currency,
+            'rate': rate.rate,
+            'timestamp': rate.timestamp.isoformat()
+        }
+        self._index_rate(key, rate, rate_data)
+        try:
+            self._journal.put(key, rate_data)
+            self._journal.maybe_compact(self._entries)
+        except Exception as e:
+            logger.warning(f"Failed to save currency cache: {e}")
+    
     def _save_cache(self) -> None:
-        """Save exchange rates to cache file"""
+        """Save all exchange rates as a fresh snapshot"""
         try:
-            import json
-            data = {}
-            for currency, rate in self._rate_cache.items():
-                data[currency] = {
-                    'from': rate.from_currency,
-                    'to': rate.to_currency,
-                    'rate': rate.rate,
-                    'timestamp': rate.timestamp.isoformat()
-                }
-            with open(self._cache_file, 'w') as f:
-                json.dump(data, f, indent=2)
+            self._journal.compact(self._entries)
         except Exception as e:
             logger.warning(f"Failed to save currency cache: {e}")
     
-    def get_rate(self, from_currency: str, to_currency: str = 'USD') -> float:
+    def rate_on(self, currency: str, as_of: Union[date, datetime]) -> Optional[float]:
+        """
+        Cached rate (currency -> USD) in effect on a date: the latest quote
+        on or before ``as_of``.
+        
+        Args:
+            currency: Currency code
+            as_of: Date (or datetime) of interest
+            
+        Returns:
+            Exchange rate, or None if nothing is cached on or before that date
+        """
+        currency = currency.upper()
+        if currency == 'USD':
+            return 1.0
+        history = self._history.get(currency)
+        if not history:
+            return None
+        day = as_of.date() if isinstance(as_of, datetime) else as_of
+        days, rates = history
+        i = bisect_right(days, day.toordinal())
+        return rates[i - 1].rate if i else None
+    
+    def get_rate(self, from_currency: str, to_currency: str = 'USD',
+                 as_of: Optional[Union[date, datetime]] = None) -> float:
         """
         Get exchange rate from one currency to another.
         
         Args:
             from_currency: Source currency code (e.g., 'TWD', 'JPY')
             to_currency: Target currency code (default: 'USD')
+            as_of: Use the cached rate in effect on this date; falls back to
+                the current rate (with a warning) when none is cached
+                (default: current rate)
         
         Returns:
             Exchange rate as float
@@ -126,6 +193,13 @@ class CurrencyConverter:
         
         cache_key = from_currency
         
+        if as_of is not None:
+            historical = self.rate_on(from_currency, as_of)
+            if historical is not None:
+                return historical
+            logger.warning(f"No cached {from_currency} rate on or before {as_of}; "
+                           f"using the current rate instead")
+        
         if cache_key in self._rate_cache:
             cached = self._rate_cache[cache_key]
             age = datetime.now() - cached.timestamp
@@ -134,13 +208,12 @@ class CurrencyConverter:
         
         try:
             rate = self._fetch_rate_from_api(from_currency)
-            self._rate_cache[cache_key] = CurrencyRate(
+            self._save_rate(CurrencyRate(
                 from_currency=from_currency,
                 to_currency=to_currency,
                 rate=rate,
                 timestamp=datetime.now()
-            )
-            self._save_cache()
+            ))
             return rate
         except Exception as e:
             logger.error(f"Failed to fetch rate for {from_currency}: {e}")
@@ -197,7 +270,8 @@ class CurrencyConverter:
         
         raise CurrencyConversionError(f"No exchange rate available for {currency}")
     
-    def convert(self, value: float, from_currency: str, to_currency: str = 'USD') -> float:
+    def convert(self, value: float, from_currency: str, to_currency: str = 'USD',
+                as_of: Optional[Union[date, datetime]] = None) -> float:
         """
         Convert a value from one currency to another.
         
@@ -205,6 +279,7 @@ class CurrencyConverter:
             value: Numeric value to convert
             from_currency: Source currency code
             to_currency: Target currency code
+            as_of: Convert at the rate in effect on this date (see get_rate)
             
         Returns:
             Converted value
@@ -217,27 +292,29 @@ class CurrencyConverter:
         
         try:
             if to_currency.upper() == 'USD':
-                rate = self.get_rate(from_currency)
+                rate = self.get_rate(from_currency, as_of=as_of)
                 return value * rate
             elif from_currency.upper() == 'USD':
-                rate = self.get_rate(to_currency)
+                rate = self.get_rate(to_currency, as_of=as_of)
                 return value / rate
             else:
-                to_usd = self.get_rate(from_currency)
-                from_usd = self.get_rate(to_currency)
+                to_usd = self.get_rate(from_currency, as_of=as_of)
+                from_usd = self.get_rate(to_currency, as_of=as_of)
                 usd_value = value * to_usd
                 return usd_value / from_usd
         except Exception as e:
             logger.error(f"Currency conversion failed: {e}")
             raise CurrencyConversionError(f"Failed to convert {value} {from_currency} to {to_currency}")
     
-    def convert_financial_data(self, data: Dict, from_currency: str) -> Dict:
+    def convert_financial_data(self, data: Dict, from_currency: str,
+                               as_of: Optional[Union[date, datetime]] = None) -> Dict:
         """
         Convert all numeric values in financial data dict.
         
         Args:
             data: Dictionary with financial values
             from_currency: Source currency code
+            as_of: Convert at the rate in effect on this date (see get_rate)
             
         Returns:
             Dictionary with converted values
@@ -246,10 +323,11 @@ class CurrencyConverter:
             return data
         
         try:
+            rate = self.get_rate(from_currency, as_of=as_of)
             converted = {}
             for key, value in data.items():
                 if isinstance(value, (int, float)) and value != 0:
-                    converted[key] = self.convert(value, from_currency)
+                    converted[key] = value * rate
                 else:
                     converted[key] = value
             return converted
@@ -260,9 +338,9 @@ class CurrencyConverter:
     def clear_cache(self) -> None:
         """Clear the rate cache"""
         self._rate_cache.clear()
-        import os
-        if os.path.exists(self._cache_file):
-            os.remove(self._cache_file)
+        self._history.clear()
+        self._entries.clear()
+        self._journal.remove()
         logger.info("Currency rate cache cleared")
     
     def get_supported_currencies(self) -> list:
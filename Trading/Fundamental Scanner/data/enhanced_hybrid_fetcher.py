@@ -50,7 +50,7 @@ class EnhancedHybridDataFetcher:
     def __init__(
         self,
         simfin_api_key: Optional[str] = None,
-        simfin_cache_file: str = "simfin_cache.pkl"
+        simfin_cache_file: str = "simfin_cache.db"
     ):
         """
         Initialize enhanced hybrid data fetcher with foreign detection.
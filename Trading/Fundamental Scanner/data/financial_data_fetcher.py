@@ -7,14 +7,14 @@ import yfinance as yf
 import logging
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional, Any
-import pickle
-import os
+from pathlib import Path
 from dataclasses import dataclass, asdict
 import json
 import pandas as pd
 import numpy as np
 import time  # For rate limit delays
 
+from .kv_store import KeyValueStore
 from .stock_logger import get_stock_logger
 
 # Setup logging
@@ -76,57 +76,42 @@ class FinancialData:
 
 
 class FinancialDataCache:
-    """Simple file-based cache for financial data"""
+    """Per-ticker SQLite cache for financial data (see :class:`KeyValueStore`)"""
 
-    def __init__(self, cache_file: str = "financial_cache.pkl", cache_hours: int = 48):
-        self.cache_file = cache_file
+    def __init__(self, cache_file: str = "financial_cache.db", cache_hours: int = 48,
+                 batch_size: int = 1):
+        # A legacy ``financial_cache.pkl`` next to the database is imported on first use.
+        self.cache_file = str(Path(cache_file).with_suffix(".db"))
         self.cache_hours = cache_hours  # Extended to 48 hours (fundamental data changes quarterly)
-        self.cache = self._load_cache()
+        self.store = KeyValueStore(self.cache_file, batch_size=batch_size,
+                                   legacy_pickle=Path(cache_file).with_suffix(".pkl"))
 
-    def _load_cache(self) -> Dict:
-        """Load cache from file"""
-        if os.path.exists(self.cache_file):
-            try:
-                with open(self.cache_file, 'rb') as f:
-                    cache = pickle.load(f)
-                    logger.debug(f"Loaded financial cache with {len(cache)} entries")
-                    return cache
-            except Exception as e:
-                logger.warning(f"Failed to load financial cache: {e}")
-        return {}
-
-    def _save_cache(self):
-        """Save cache to file"""
-        try:
-            with open(self.cache_file, 'wb') as f:
-                pickle.dump(self.cache, f)
-            logger.debug(f"Saved financial cache with {len(self.cache)} entries")
-        except Exception as e:
-            logger.error(f"Failed to save financial cache: {e}")
+    @property
+    def ttl(self) -> timedelta:
+        return timedelta(hours=self.cache_hours)
 
     def get(self, ticker: str) -> Optional[FinancialData]:
         """Get cached financial data if available and fresh"""
-        if ticker in self.cache:
-            data, timestamp = self.cache[ticker]
-            # Financial data changes slowly - 24 hour cache
-            if datetime.now() - timestamp < timedelta(hours=self.cache_hours):
-                logger.debug(f"Financial cache HIT for {ticker}")
-                return data
-            else:
-                logger.debug(f"Financial cache EXPIRED for {ticker}")
-                del self.cache[ticker]
-        return None
+        data = self.store.get(ticker, self.ttl)
+        logger.debug(f"Financial cache {'HIT' if data is not None else 'MISS'} for {ticker}")
+        return data
+
+    def get_many(self, tickers: List[str]) -> Dict[str, FinancialData]:
+        """Fresh cached entries for many tickers in one query"""
+        return self.store.get_many(tickers, self.ttl)
 
     def set(self, ticker: str, data: FinancialData):
         """Cache financial data"""
-        self.cache[ticker] = (data, datetime.now())
-        self._save_cache()
+        self.store.set(ticker, data)
         logger.debug(f"Cached financial data for {ticker}")
 
+    def flush(self):
+        """Commit any batched writes"""
+        self.store.flush()
+
     def clear(self):
         """Clear entire cache"""
-        self.cache = {}
-        self._save_cache()
+        self.store.clear()
         logger.info("Financial cache cleared")
 
 
@@ -176,27 +161,40 @@ class FinancialDataFetcher:
         self.cache = FinancialDataCache() if enable_cache else None
         logger.info("FinancialDataFetcher initialized with yfinance")
 
-    def _fetch_with_retry(self, ticker: str, max_retries: int = 3) -> Optional[FinancialData]:
+    def _fetch_with_retry(self, ticker: str, max_retries: int = 3,
+                          limiter=None) -> Optional[FinancialData]:
         """
-        Fetch with exponential backoff retry for rate limits
+        Fetch with backoff retry for rate limits
 
         Args:
             ticker: Stock ticker symbol
             max_retries: Maximum retry attempts (default: 3)
+            limiter: Optional AdaptiveTokenBucket that paces attempts; a 429
+                cuts its rate instead of sleeping a fixed backoff
 
         Returns:
             FinancialData or None if all retries failed
         """
         for attempt in range(max_retries):
             try:
-                return self._fetch_financial_data_internal(ticker)
+                if limiter is not None:
+                    limiter.acquire()
+                data = self._fetch_financial_data_internal(ticker)
+                if limiter is not None:
+                    limiter.on_success()
+                return data
 
             except Exception as e:
                 # Check if it's a rate limit error (429 or "Too Many Requests")
                 error_str = str(e).lower()
                 is_rate_limit = '429' in error_str or 'too many requests' in error_str
 
+                if is_rate_limit and limiter is not None:
+                    limiter.on_throttle()
                 if is_rate_limit and attempt < max_retries - 1:
+                    if limiter is not None:
+                        logger.warning(f"⚠️  Rate limit hit for {ticker}, slowing to {limiter.rate:.2f} req/s (attempt {attempt+1}/{max_retries})")
+                        continue
                     delay = 2 ** attempt  # Exponential backoff: 1s, 2s, 4s...
                     logger.warning(f"⚠️  Rate limit hit for {ticker}, retrying in {delay}s (attempt {attempt+1}/{max_retries})")
                     time.sleep(delay)
@@ -600,24 +598,30 @@ class FinancialDataFetcher:
         """
         Fetch financial data for multiple tickers with rate limit protection
 
+        Requests are paced by an adaptive token bucket: ``delay`` only seeds
+        the starting interval, after which the rate speeds up while requests
+        succeed and backs off when the provider answers 429. Cached tickers
+        are served in one read and never wait on the limiter.
+
         Args:
             tickers: List of ticker symbols
-            delay: Seconds to wait between requests (default 2.0 to avoid rate limits)
+            delay: Starting seconds between requests (default 2.0)
 
         Returns:
             Dict mapping ticker -> FinancialData (or None if failed)
         """
+        from .parallel_fetcher import RateLimiter
+
+        limiter = RateLimiter(1.0 / delay if delay > 0 else 0)
+        cached = self.cache.get_many(tickers) if self.cache else {}
         results = {}
 
         for i, ticker in enumerate(tickers):
             logger.debug(f"Fetching financials {i+1}/{len(tickers)}: {ticker}")
-            data = self.fetch_financial_data(ticker)
-            results[ticker] = data
-
-            # Add delay between requests (except for last ticker)
-            if i < len(tickers) - 1 and delay > 0:
-                time.sleep(delay)
-                logger.debug(f"Rate limit protection: waiting {delay}s before next request")
+            if ticker in cached:
+                results[ticker] = cached[ticker]
+                continue
+            results[ticker] = self._fetch_with_retry(ticker, limiter=limiter)
 
         success_count = sum(1 for v in results.values() if v and v.data_quality != "insufficient")
         logger.debug(f"Batch fetch complete: {success_count}/{len(tickers)} tickers with usable data")
@@ -635,14 +639,14 @@ class FinancialDataFetcher:
         Fetch financial data for multiple tickers in parallel with progress bar
 
         This method provides significant speedup for large index screening:
-        - Uses ThreadPoolExecutor for concurrent fetching
-        - Implements rate limiting to avoid API throttling
+        - Uses ParallelFetcher's asyncio pipeline for concurrent fetching
+        - Adaptive per-endpoint rate limiting (backs off on 429, probes up otherwise)
         - Shows real-time progress bar using tqdm
 
         Args:
             tickers: List of ticker symbols
             max_workers: Number of parallel threads (default: 10)
-            requests_per_second: Rate limit (default: 1.0 = 1 request/second)
+            requests_per_second: Starting rate per endpoint (default: 1.0); adapts from there
             show_progress: Show progress bar (default: True)
 
         Returns:
@@ -762,36 +766,93 @@ class FinancialDataFetcher:
             return None
 
 
-def get_sp500_tickers() -> List[str]:
+# Wikipedia constituent tables: index -> (url, table position, ticker column)
+WIKIPEDIA_CONSTITUENT_PAGES = {
+    'sp500': ('https://en.wikipedia.org/wiki/List_of_S%26P_500_companies', 0, 'Symbol'),
+    'sp400': ('https://en.wikipedia.org/wiki/List_of_S%26P_400_companies', 0, 'Symbol'),
+    'sp600': ('https://en.wikipedia.org/wiki/List_of_S%26P_600_companies', 0, 'Symbol'),
+    # The ticker list is typically in the 4th table (index 3)
+    'nasdaq100': ('https://en.wikipedia.org/wiki/Nasdaq-100', 3, 'Ticker'),
+}
+
+
+def fetch_constituent_page(url: str) -> str:
     """
-    Get S&P 500 ticker list from Wikipedia
+    Download a constituent page's HTML
+
+    Args:
+        url: Page URL
+
+    Returns:
+        Page HTML text
+    """
+    import requests
+
+    # Add User-Agent header to avoid 403 Forbidden error from Wikipedia
+    headers = {
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+    }
+    response = requests.get(url, headers=headers)
+    response.raise_for_status()
+    return response.text
+
+
+def parse_constituent_table(html: str, table_index: int, column: str) -> List[str]:
+    """
+    Extract the ticker column from a constituent page
+
+    Uses the table at ``table_index`` when it has ``column``; otherwise the
+    first table that does (page layouts shift occasionally).
+
+    Args:
+        html: Page HTML
+        table_index: Expected position of the constituent table
+        column: Ticker column name
 
     Returns:
         List of ticker symbols
     """
-    try:
-        import requests
-        from io import StringIO
+    from io import StringIO
 
-        url = 'https://en.wikipedia.org/wiki/List_of_S%26P_500_companies'
-        # Add User-Agent header to avoid 403 Forbidden error from Wikipedia
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        response = requests.get(url, headers=headers)
-        response.raise_for_status()
-
-        tables = pd.read_html(StringIO(response.text))
-        # The ticker table is the first table (index 0) containing the company list
-        sp500_table = tables[0]
-        tickers = sp500_table['Symbol'].tolist()
-        logger.info(f"Fetched {len(tickers)} S&P 500 tickers")
-        return tickers
+    tables = pd.read_html(StringIO(html))
+    candidates = tables[table_index:table_index + 1] + tables
+    for table in candidates:
+        if column in table.columns:
+            return table[column].dropna().astype(str).tolist()
+    raise ValueError(f"No table with a {column!r} column")
+
+
+def scrape_index_tickers(index: str, fetch_page=fetch_constituent_page) -> List[str]:
+    """
+    Scrape one index's constituents from Wikipedia
+
+    Args:
+        index: Key of WIKIPEDIA_CONSTITUENT_PAGES ('sp500', 'sp400', 'sp600', 'nasdaq100')
+        fetch_page: url -> HTML callable (swap in to read local fixture pages)
+
+    Returns:
+        List of ticker symbols (empty on failure)
+    """
+    url, table_index, column = WIKIPEDIA_CONSTITUENT_PAGES[index]
+    try:
+        return parse_constituent_table(fetch_page(url), table_index, column)
     except Exception as e:
-        logger.error(f"Failed to fetch S&P 500 tickers: {e}")
+        logger.error(f"Failed to fetch {index} tickers: {e}")
         return []
 
 
+def get_sp500_tickers() -> List[str]:
+    """
+    Get S&P 500 ticker list from Wikipedia
+
+    Returns:
+        List of ticker symbols
+    """
+    tickers = scrape_index_tickers('sp500')
+    logger.info(f"Fetched {len(tickers)} S&P 500 tickers")
+    return tickers
+
+
 def get_sp400_tickers() -> List[str]:
     """
     Get S&P MidCap 400 ticker list from Wikipedia
@@ -802,27 +863,9 @@ def get_sp400_tickers() -> List[str]:
     Returns:
         List of ticker symbols
     """
-    try:
-        import requests
-        from io import StringIO
-
-        url = 'https://en.wikipedia.org/wiki/List_of_S%26P_400_companies'
-        # Add User-Agent header to avoid 403 Forbidden error from Wikipedia
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        response = requests.get(url, headers=headers)
-        response.raise_for_status()
-
-        tables = pd.read_html(StringIO(response.text))
-        # Use first table (index 0) which contains the company list
-        sp400_table = tables[0]
-        tickers = sp400_table['Symbol'].tolist()
-        logger.info(f"Fetched {len(tickers)} S&P MidCap 400 tickers")
-        return tickers
-    except Exception as e:
-        logger.error(f"Failed to fetch S&P 400 tickers: {e}")
-        return []
+    tickers = scrape_index_tickers('sp400')
+    logger.info(f"Fetched {len(tickers)} S&P MidCap 400 tickers")
+    return tickers
 
 
 def get_sp600_tickers() -> List[str]:
@@ -835,27 +878,9 @@ def get_sp600_tickers() -> List[str]:
     Returns:
         List of ticker symbols
     """
-    try:
-        import requests
-        from io import StringIO
-
-        url = 'https://en.wikipedia.org/wiki/List_of_S%26P_600_companies'
-        # Add User-Agent header to avoid 403 Forbidden error from Wikipedia
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        response = requests.get(url, headers=headers)
-        response.raise_for_status()
-
-        tables = pd.read_html(StringIO(response.text))
-        # Use first table (index 0) which contains the company list
-        sp600_table = tables[0]
-        tickers = sp600_table['Symbol'].tolist()
-        logger.info(f"Fetched {len(tickers)} S&P SmallCap 600 tickers")
-        return tickers
-    except Exception as e:
-        logger.error(f"Failed to fetch S&P 600 tickers: {e}")
-        return []
+    tickers = scrape_index_tickers('sp600')
+    logger.info(f"Fetched {len(tickers)} S&P SmallCap 600 tickers")
+    return tickers
 
 
 def get_nasdaq100_tickers() -> List[str]:
@@ -869,28 +894,9 @@ def get_nasdaq100_tickers() -> List[str]:
     Returns:
         List of ticker symbols
     """
-    try:
-        import requests
-        from io import StringIO
-
-        url = 'https://en.wikipedia.org/wiki/Nasdaq-100'
-        # Add User-Agent header to avoid 403 Forbidden error from Wikipedia
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        response = requests.get(url, headers=headers)
-        response.raise_for_status()
-
-        tables = pd.read_html(StringIO(response.text))
-        # The ticker list is typically in the 4th table (index 3)
-        # It has columns including 'Ticker'
-        nasdaq_table = tables[3]
-        tickers = nasdaq_table['Ticker'].tolist()
-        logger.info(f"Fetched {len(tickers)} NASDAQ-100 tickers")
-        return tickers
-    except Exception as e:
-        logger.error(f"Failed to fetch NASDAQ-100 tickers: {e}")
-        return []
+    tickers = scrape_index_tickers('nasdaq100')
+    logger.info(f"Fetched {len(tickers)} NASDAQ-100 tickers")
+    return tickers
 
 
 def get_russell3000_tickers() -> List[str]:
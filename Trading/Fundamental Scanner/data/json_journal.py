@@ -0,0 +1,140 @@
+"""
+JSON Journal
+
+Append-only persistence for the small JSON caches (TickerMappingCache,
+CurrencyConverter).
+
+Those caches used to re-serialize their whole dict on every write — O(N) per
+``set`` and O(N^2) across a universe. Here the existing JSON file becomes a
+snapshot and each write appends one JSON line to ``<file>.journal``. Loading
+reads the snapshot and replays the journal into a dict once; when the journal
+grows past the live entry count it is folded back into the snapshot
+(compaction: write temp file, atomic replace, truncate journal).
+
+Features:
+- Snapshot stays the same plain JSON dict the caches always wrote
+- One line per put/delete, flushed immediately
+- A torn last line (crash mid-append) is dropped from the file on load
+- Compaction threshold scales with the cache size (amortized O(1) writes)
+
+Usage:
+    from .json_journal import JsonJournal
+
+    journal = JsonJournal("ticker_mapping_cache.json")
+    state = journal.load()
+    state[key] = entry
+    journal.put(key, entry)
+    journal.maybe_compact(state)
+"""
+
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any, Dict, Optional, TextIO, Union
+
+logger = logging.getLogger(__name__)
+
+
+class JsonJournal:
+    """
+    JSON snapshot plus append-only JSON-lines journal.
+
+    Not thread-safe on its own; owners serialize calls with their own lock.
+
+    Attributes:
+        path: Snapshot file (plain JSON dict)
+        journal_path: Journal file (one JSON object per line)
+    """
+
+    def __init__(self, path: Union[str, Path], min_compact: int = 256):
+        """
+        Args:
+            path: Snapshot JSON file
+            min_compact: Never compact before this many journal lines
+        """
+        self.path = Path(path)
+        self.journal_path = self.path.with_name(self.path.name + ".journal")
+        self.min_compact = min_compact
+        self._lines = 0
+        self._handle: Optional[TextIO] = None
+
+    def load(self) -> Dict[str, Any]:
+        """Snapshot with the journal replayed on top."""
+        state: Dict[str, Any] = {}
+        if self.path.exists():
+            with self.path.open('r', encoding='utf-8') as f:
+                data = json.load(f)
+            if isinstance(data, dict):
+                state.update(data)
+            else:
+                logger.warning(f"Invalid cache format in {self.path}: expected dict")
+
+        self._lines = 0
+        if self.journal_path.exists():
+            raw = self.journal_path.read_bytes()
+            complete = raw[:raw.rfind(b'\n') + 1]
+            if complete != raw:
+                # Torn last line from an interrupted append: cut it off so the next
+                # append starts on a fresh line instead of extending the fragment
+                logger.warning(f"Dropping torn last line of {self.journal_path}")
+                with self.journal_path.open('r+b') as f:
+                    f.truncate(len(complete))
+            for line in complete.decode('utf-8', errors='replace').splitlines():
+                self._lines += 1
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    logger.warning(f"Skipping unreadable journal line in {self.journal_path}")
+                    continue
+                if record.get('d'):
+                    state.pop(record['k'], None)
+                else:
+                    state[record['k']] = record['v']
+        return state
+
+    def put(self, key: str, value: Any) -> None:
+        self._append({'k': key, 'v': value})
+
+    def delete(self, key: str) -> None:
+        self._append({'k': key, 'd': 1})
+
+    def maybe_compact(self, state: Dict[str, Any]) -> bool:
+        """Compact once the journal outgrows the live state; True if it did."""
+        if self._lines > max(self.min_compact, len(state)):
+            self.compact(state)
+            return True
+        return False
+
+    def compact(self, state: Dict[str, Any]) -> None:
+        """Write ``state`` as the new snapshot and empty the journal."""
+        self.close()
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        with tmp.open('w', encoding='utf-8') as f:
+            json.dump(state, f, indent=2, default=str)
+        os.replace(tmp, self.path)
+        if self.journal_path.exists():
+            self.journal_path.unlink()
+        self._lines = 0
+        logger.debug(f"Compacted {self.path}: {len(state)} entries")
+
+    def remove(self) -> None:
+        """Delete snapshot and journal."""
+        self.close()
+        for path in (self.path, self.journal_path):
+            if path.exists():
+                path.unlink()
+        self._lines = 0
+
+    def close(self) -> None:
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+
+    def _append(self, record: Dict[str, Any]) -> None:
+        if self._handle is None:
+            self.journal_path.parent.mkdir(parents=True, exist_ok=True)
+            self._handle = self.journal_path.open('a', encoding='utf-8')
+        self._handle.write(json.dumps(record, default=str) + '\n')
+        self._handle.flush()
+        self._lines += 1
@@ -0,0 +1,212 @@
+"""
+Key-Value Store
+
+Embedded, transactional per-key cache shared by the fetcher caches
+(FinancialDataCache, SimFinDataCache, MergedCache).
+
+The old caches kept one dict in memory and re-pickled the whole file on every
+``set`` — O(N) per write, O(N^2) for a full-universe run, and a half-written
+file if the process was interrupted. Here each key is one SQLite row, so a
+write is a single upsert and a crash can lose at most the uncommitted batch.
+
+Features:
+- SQLite in WAL mode (readers never block the writer)
+- One row per key: pickled value + ``fetched_at`` timestamp for TTL checks
+- Batched commits (``batch_size``) with explicit ``flush()``
+- ``get_many`` reads any number of keys in a handful of ``IN (...)`` queries
+- Thread-safe: one connection guarded by a lock, safe for fetcher thread pools
+- One-time migration of a legacy ``{key: (value, datetime)}`` pickle
+
+Usage:
+    from .kv_store import KeyValueStore
+
+    store = KeyValueStore("financial_cache.db", legacy_pickle="financial_cache.pkl")
+    store.set("AAPL", data)
+    fresh = store.get_many(["AAPL", "MSFT"], ttl=timedelta(hours=48))
+"""
+
+import logging
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+# Stay under SQLITE_MAX_VARIABLE_NUMBER on older SQLite builds (999).
+_MAX_PARAMS = 900
+
+
+class KeyValueStore:
+    """
+    SQLite-backed store of pickled values, one row per key.
+
+    Attributes:
+        db_path: Path to the SQLite database file
+        batch_size: Writes buffered per transaction before an automatic commit
+    """
+
+    def __init__(
+        self,
+        db_path: Union[str, Path],
+        batch_size: int = 1,
+        legacy_pickle: Optional[Union[str, Path]] = None,
+    ):
+        """
+        Open (or create) the store.
+
+        Args:
+            db_path: Path to SQLite database file
+            batch_size: Commit after this many writes (default: 1 = every write)
+            legacy_pickle: Old whole-file pickle cache to import on first use;
+                renamed to ``*.migrated`` once its entries are in the store
+        """
+        self.db_path = Path(db_path)
+        self.batch_size = max(1, batch_size)
+        self._lock = threading.Lock()
+        self._pending = 0
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                value BLOB NOT NULL,
+                fetched_at REAL NOT NULL
+            )
+        ''')
+        self._conn.commit()
+
+        if legacy_pickle is not None:
+            self._migrate(Path(legacy_pickle))
+
+    # ---- writes ------------------------------------------------------------
+
+    def set(self, key: str, value: Any, fetched_at: Optional[datetime] = None) -> None:
+        """Upsert one key; committed once ``batch_size`` writes are pending."""
+        self.set_many({key: value}, fetched_at)
+
+    def set_many(self, items: Dict[str, Any], fetched_at: Optional[datetime] = None) -> None:
+        """Upsert several keys in one statement."""
+        ts = fetched_at.timestamp() if fetched_at else time.time()
+        rows = [(k, pickle.dumps(v, pickle.HIGHEST_PROTOCOL), ts) for k, v in items.items()]
+        with self._lock:
+            self._upsert(rows)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            self._commit_if_due(1)
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        with self._lock:
+            self._conn.execute("DELETE FROM entries")
+            self._conn.commit()
+            self._pending = 0
+
+    def flush(self) -> None:
+        """Commit any buffered writes."""
+        with self._lock:
+            if self._pending:
+                self._conn.commit()
+                self._pending = 0
+
+    def close(self) -> None:
+        self.flush()
+        with self._lock:
+            self._conn.close()
+
+    # ---- reads -------------------------------------------------------------
+
+    def get(self, key: str, ttl: Optional[timedelta] = None) -> Optional[Any]:
+        """Value for ``key``, or None if missing or older than ``ttl``."""
+        return self.get_many([key], ttl).get(key)
+
+    def get_many(self, keys: Iterable[str], ttl: Optional[timedelta] = None) -> Dict[str, Any]:
+        """Fresh values for ``keys`` (missing/expired keys are omitted)."""
+        keys = list(dict.fromkeys(keys))
+        cutoff = time.time() - ttl.total_seconds() if ttl is not None else float("-inf")
+        out: Dict[str, Any] = {}
+        with self._lock:
+            for i in range(0, len(keys), _MAX_PARAMS):
+                chunk = keys[i:i + _MAX_PARAMS]
+                marks = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT key, value FROM entries WHERE key IN ({marks}) AND fetched_at > ?",
+                    (*chunk, cutoff),
+                ).fetchall()
+                for key, blob in rows:
+                    try:
+                        out[key] = pickle.loads(blob)
+                    except Exception as e:
+                        logger.warning(f"Dropping unreadable cache entry {key}: {e}")
+        return out
+
+    def fresh_keys(self, keys: Iterable[str], ttl: Optional[timedelta] = None) -> List[str]:
+        """Subset of ``keys`` with a fresh entry, without unpickling any values."""
+        keys = list(dict.fromkeys(keys))
+        cutoff = time.time() - ttl.total_seconds() if ttl is not None else float("-inf")
+        found = set()
+        with self._lock:
+            for i in range(0, len(keys), _MAX_PARAMS):
+                chunk = keys[i:i + _MAX_PARAMS]
+                marks = ",".join("?" * len(chunk))
+                found.update(k for (k,) in self._conn.execute(
+                    f"SELECT key FROM entries WHERE key IN ({marks}) AND fetched_at > ?",
+                    (*chunk, cutoff),
+                ))
+        return [k for k in keys if k in found]
+
+    def keys(self) -> List[str]:
+        with self._lock:
+            return [k for (k,) in self._conn.execute("SELECT key FROM entries ORDER BY key")]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    # ---- internals ---------------------------------------------------------
+
+    def _upsert(self, rows: List[tuple]) -> None:
+        self._conn.executemany(
+            "INSERT INTO entries (key, value, fetched_at) VALUES (?, ?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = excluded.value, fetched_at = excluded.fetched_at",
+            rows,
+        )
+        self._commit_if_due(len(rows))
+
+    def _commit_if_due(self, n: int) -> None:
+        self._pending += n
+        if self._pending >= self.batch_size:
+            self._conn.commit()
+            self._pending = 0
+
+    def _migrate(self, legacy: Path) -> None:
+        """Import a ``{key: (value, datetime)}`` pickle once, then retire the file."""
+        if not legacy.exists():
+            return
+        try:
+            with legacy.open("rb") as f:
+                data = pickle.load(f)
+            rows = [
+                (key, pickle.dumps(value, pickle.HIGHEST_PROTOCOL), fetched_at.timestamp())
+                for key, (value, fetched_at) in data.items()
+            ]
+        except Exception as e:
+            logger.warning(f"Could not migrate legacy cache {legacy}: {e}")
+            return
+        with self._lock:
+            # Keep rows already in the store: they are newer than the pickle.
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO entries (key, value, fetched_at) VALUES (?, ?, ?)", rows
+            )
+            self._conn.commit()
+        os.replace(legacy, legacy.with_name(legacy.name + ".migrated"))
+        logger.info(f"Migrated {len(rows)} entries from {legacy} to {self.db_path}")
@@ -0,0 +1,236 @@
+"""
+Metadata Index
+
+Small per-ticker lookup table (sector, market cap, data quality, fetch time,
+latest score / tier / rank) kept next to the merged opportunity cache.
+
+Answering "what do we know about AAPL?" used to mean importing the whole
+workflow (pandas, yfinance, the scorer) and unpickling the cached universe.
+The index is written as a by-product of the work that produces the data —
+gather upserts the fetch fields batch by batch, scoring upserts the score
+fields — so lookups and cache inspections only need ``sqlite3``.
+
+Features:
+- One row per ticker; fetch fields and score fields are updated independently
+- ``get(ticker)`` / ``summary()`` read without unpickling anything
+- Standard-library only (safe to import from the CLI before argument parsing)
+- ``record_fetched`` accepts merged dicts, so the index can be rebuilt from
+  the merged cache at any time
+
+Usage:
+    from data.metadata_index import MetadataIndex
+
+    index = MetadataIndex("metadata_index.db")
+    index.record_fetched(merged_by_ticker)
+    index.record_scores(reports)
+    print(index.get("AAPL"))
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+FETCH_FIELDS = ("sector", "industry", "market_cap", "current_price", "data_quality")
+SCORE_FIELDS = ("opportunity_score", "qarp_score", "tier", "gates_passed", "gate_failures",
+                "rank", "universe_size")
+_COLUMNS = ("ticker",) + FETCH_FIELDS + ("fetched_at",) + SCORE_FIELDS + ("scored_at",)
+
+
+class MetadataIndex:
+    """
+    SQLite-backed per-ticker metadata for fast CLI lookups.
+
+    Attributes:
+        db_path: Path to the SQLite database file
+    """
+
+    def __init__(self, db_path: Union[str, Path] = "metadata_index.db"):
+        """
+        Open (or create) the index.
+
+        Args:
+            db_path: Path to SQLite database file
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS tickers (
+                ticker TEXT PRIMARY KEY,
+                sector TEXT,
+                industry TEXT,
+                market_cap REAL,
+                current_price REAL,
+                data_quality TEXT,
+                fetched_at REAL,
+                opportunity_score REAL,
+                qarp_score REAL,
+                tier TEXT,
+                gates_passed INTEGER,
+                gate_failures TEXT,
+                rank INTEGER,
+                universe_size INTEGER,
+                scored_at REAL
+            )
+        ''')
+        self._conn.commit()
+
+    # ---- writes ------------------------------------------------------------
+
+    def record_fetched(self, merged_by_ticker: Dict[str, Dict[str, Any]],
+                       fetched_at: Optional[datetime] = None) -> int:
+        """
+        Upsert the fetch fields from merged data dicts; score fields are kept.
+
+        Args:
+            merged_by_ticker: ticker -> merged data dict
+            fetched_at: Fetch time for every row (default: each dict's
+                ``fetch_timestamp``, else now)
+
+        Returns:
+            Number of tickers written
+        """
+        now = time.time()
+        rows = [
+            (
+                ticker,
+                *(_field(data, name) for name in FETCH_FIELDS),
+                fetched_at.timestamp() if fetched_at else _fetch_time(data, now),
+            )
+            for ticker, data in merged_by_ticker.items() if data
+        ]
+        self._upsert(("ticker",) + FETCH_FIELDS + ("fetched_at",), rows)
+        return len(rows)
+
+    def record_scores(self, reports: Iterable[Any],
+                      scored_at: Optional[datetime] = None) -> int:
+        """
+        Upsert the score fields from ranked ``OpportunityReport``s (best first).
+
+        Returns:
+            Number of tickers written
+        """
+        reports = list(reports)
+        ts = scored_at.timestamp() if scored_at else time.time()
+        rows = [
+            (
+                r.ticker,
+                r.opportunity_score,
+                r.qarp_score,
+                r.tier,
+                int(bool(r.gates_passed)),
+                json.dumps(list(r.gate_failures or [])),
+                rank,
+                len(reports),
+                ts,
+            )
+            for rank, r in enumerate(reports, 1)
+        ]
+        self._upsert(("ticker",) + SCORE_FIELDS + ("scored_at",), rows)
+        return len(rows)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    # ---- reads -------------------------------------------------------------
+
+    def get(self, ticker: str) -> Optional[Dict[str, Any]]:
+        """Everything indexed for ``ticker``, or None."""
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {', '.join(_COLUMNS)} FROM tickers WHERE ticker = ?", (ticker,)
+            ).fetchone()
+        if row is None:
+            return None
+        record = dict(zip(_COLUMNS, row))
+        if record["gate_failures"] is not None:
+            record["gate_failures"] = json.loads(record["gate_failures"])
+        if record["gates_passed"] is not None:
+            record["gates_passed"] = bool(record["gates_passed"])
+        for key in ("fetched_at", "scored_at"):
+            record[key] = _from_ts(record[key])
+        return record
+
+    def search(self, prefix: str, limit: int = 20) -> List[str]:
+        """Indexed tickers starting with ``prefix``."""
+        with self._lock:
+            return [t for (t,) in self._conn.execute(
+                "SELECT ticker FROM tickers WHERE ticker LIKE ? ORDER BY ticker LIMIT ?",
+                (prefix.replace("%", "") + "%", limit),
+            )]
+
+    def summary(self) -> Dict[str, Any]:
+        """Row counts and fetch / score time ranges."""
+        with self._lock:
+            total, scored, first, last, scored_at = self._conn.execute(
+                "SELECT COUNT(*), COUNT(scored_at), MIN(fetched_at), MAX(fetched_at), "
+                "MAX(scored_at) FROM tickers"
+            ).fetchone()
+            sectors = self._conn.execute(
+                "SELECT COALESCE(sector, 'Unknown'), COUNT(*) FROM tickers "
+                "GROUP BY 1 ORDER BY 2 DESC"
+            ).fetchall()
+        return {
+            "tickers": total,
+            "scored": scored,
+            "oldest_fetch": _from_ts(first),
+            "newest_fetch": _from_ts(last),
+            "last_scored": _from_ts(scored_at),
+            "sectors": dict(sectors),
+        }
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM tickers").fetchone()[0]
+
+    # ---- internals ---------------------------------------------------------
+
+    def _upsert(self, columns: tuple, rows: List[tuple]) -> None:
+        if not rows:
+            return
+        updates = ", ".join(f"{c} = excluded.{c}" for c in columns[1:])
+        with self._lock:
+            self._conn.executemany(
+                f"INSERT INTO tickers ({', '.join(columns)}) "
+                f"VALUES ({','.join('?' * len(columns))}) "
+                f"ON CONFLICT(ticker) DO UPDATE SET {updates}",
+                rows,
+            )
+            self._conn.commit()
+
+
+def _field(data: Dict[str, Any], name: str) -> Any:
+    """Merged-dict value for an index column (numbers as float, NaN as None)."""
+    value = data.get(name)
+    if name in ("market_cap", "current_price"):
+        try:
+            value = float(value)
+        except (TypeError, ValueError):
+            return None
+        return None if value != value else value
+    return value if value is None or isinstance(value, str) else str(value)
+
+
+def _from_ts(ts: Optional[float]) -> Optional[datetime]:
+    return datetime.fromtimestamp(ts) if ts is not None else None
+
+
+def _fetch_time(data: Dict[str, Any], default: float) -> float:
+    stamp = data.get("fetch_timestamp")
+    if stamp:
+        try:
+            return datetime.fromisoformat(str(stamp)).timestamp()
+        except ValueError:
+            pass
+    return default
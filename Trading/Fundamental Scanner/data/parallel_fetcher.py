@@ -1,27 +1,30 @@
 """
 Parallel Fetcher Module
-Concurrent financial data fetching with rate limiting and progress tracking
+Concurrent financial data fetching with adaptive rate limiting and progress tracking
 
 Features:
-- ThreadPoolExecutor for concurrent fetching
-- Semaphore-based rate limiting
+- asyncio pipeline: every ticker's endpoints are requested concurrently
+- Adaptive token-bucket rate limiting (AIMD: probe up on success, halve on 429)
+- Separate bucket per provider endpoint (quote vs. fundamentals timeseries)
+- Request coalescing: duplicate tickers share one in-flight fetch
+- Pluggable transport (default: yfinance in worker threads) for offline testing
 - Progress bar with tqdm
 - Graceful error handling
-- Retry logic with exponential backoff
 - Signal handling for graceful shutdown
 
 Author: Quality Analysis System
 Date: January 2026
 """
 
+import asyncio
 import logging
+import math
 import sys
+import threading
 import time
 import signal
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from concurrent.futures._base import Future
-from threading import Semaphore
-from typing import TYPE_CHECKING, Dict, List, Optional, Callable
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, List, Optional
 from dataclasses import dataclass
 
 import yfinance as yf
@@ -66,31 +69,397 @@ class ParallelFetchResult:
     results: Dict[str, 'FinancialData']
 
 
-class RateLimiter:
-    """Thread-safe rate limiter using semaphore"""
-    
-    def __init__(self, requests_per_second: float = 1.0):
-        self.min_interval = 1.0 / requests_per_second if requests_per_second > 0 else 0
-        self.semaphore = Semaphore(1)
-        self.last_call_time = 0.0
-    
-    def acquire(self):
-        """Wait if necessary to maintain rate limit"""
-        with self.semaphore:
-            now = time.time()
-            elapsed = now - self.last_call_time
-            if elapsed < self.min_interval:
-                sleep_time = self.min_interval - elapsed
-                time.sleep(sleep_time)
-            self.last_call_time = time.time()
+# ---------------------------------------------------------------------------
+# Rate limiting
+# ---------------------------------------------------------------------------
+
+class RateLimitError(Exception):
+    """Raised by a transport when the provider throttles a request (HTTP 429)"""
+
+    def __init__(self, message: str = "rate limited", retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def is_rate_limit_error(exc: BaseException) -> bool:
+    """True for RateLimitError or any error whose text carries a 429"""
+    if isinstance(exc, RateLimitError):
+        return True
+    error_str = str(exc).lower()
+    return '429' in error_str or 'too many requests' in error_str
+
+
+class AdaptiveTokenBucket:
+    """
+    Thread-safe token bucket whose refill rate adapts to throttling (AIMD).
+
+    Until the first throttle the rate doubles every second of clean traffic
+    (slow start); after that each clean response adds ``increase / rate``, i.e.
+    the rate climbs by ``increase`` req/s per second. A throttle multiplies it
+    by ``decrease`` (at most once per ``cooldown`` seconds, so a burst of 429s
+    from requests already in flight counts as one signal) and drains the
+    bucket. The rate therefore settles just under whatever the provider allows
+    that day, without hand-tuned sleeps.
+
+    Waiting works from threads (``acquire``) and coroutines (``acquire_async``):
+    a waiter sleeps until the next token is due and re-checks, so a rate cut
+    takes effect for requests already queued.
+    """
+
+    def __init__(
+        self,
+        rate: float = 1.0,
+        burst: float = 1.0,
+        min_rate: float = 0.05,
+        max_rate: Optional[float] = None,
+        increase: float = 0.5,
+        decrease: float = 0.5,
+        cooldown: float = 1.0,
+    ):
+        self.rate = float(rate)
+        self.burst = float(burst)
+        self.min_rate = min_rate
+        self.max_rate = max_rate if max_rate is not None else math.inf
+        self.increase = increase
+        self.decrease = decrease
+        self.cooldown = cooldown
+        self.throttle_count = 0
+        self.slow_start = True
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._last_cut = -math.inf
+        self._last_short = -math.inf
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _try_take(self) -> float:
+        """Take a token if one is available (returns 0), else the seconds until one will be"""
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._tokens >= 1.0:
+                self._tokens -= 1.0
+                return 0.0
+            self._last_short = self._updated
+            return (1.0 - self._tokens) / self.rate
+
+    def acquire(self) -> None:
+        """Block the calling thread until a request may be sent"""
+        while (wait := self._try_take()) > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self) -> None:
+        """Suspend the calling coroutine until a request may be sent"""
+        while (wait := self._try_take()) > 0:
+            await asyncio.sleep(wait)
+
+    def on_success(self) -> None:
+        """Increase after a clean response (only while callers are waiting on tokens)"""
+        with self._lock:
+            now = time.monotonic()
+            if now - self._last_short > max(1.0, 1.0 / self.rate):
+                return  # nobody has waited lately: demand is below the rate, nothing to probe
+            self._refill(now)
+            step = 1.0 if self.slow_start else self.increase / self.rate
+            self.rate = min(self.max_rate, self.rate + step)
+
+    def on_throttle(self, retry_after: Optional[float] = None) -> None:
+        """Multiplicative decrease after a 429; honours a server ``retry_after`` hint"""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.throttle_count += 1
+            self.slow_start = False
+            if now - self._last_cut >= self.cooldown:
+                self.rate = max(self.min_rate, self.rate * self.decrease)
+                self._last_cut = now
+            self._tokens = min(self._tokens, 0.0)
+            if retry_after:
+                self._tokens = min(self._tokens, -retry_after * self.rate)
+
+
+class RateLimiter(AdaptiveTokenBucket):
+    """Adaptive limiter seeded at ``requests_per_second`` (kept for existing callers)"""
+
+    def __init__(self, requests_per_second: float = 1.0, **kwargs):
+        super().__init__(rate=requests_per_second if requests_per_second > 0 else 1e6, **kwargs)
+
+
+class EndpointLimiters:
+    """One adaptive bucket per provider endpoint, created on first use.
+
+    Throttling on one endpoint (e.g. the fundamentals timeseries) does not slow
+    requests to another (e.g. the quote summary behind ``Ticker.info``).
+    """
+
+    def __init__(self, requests_per_second: float = 1.0, **bucket_kwargs):
+        self.requests_per_second = requests_per_second
+        self.bucket_kwargs = bucket_kwargs
+        self._buckets: Dict[str, RateLimiter] = {}
+        self._lock = threading.Lock()
+
+    def __getitem__(self, endpoint: str) -> RateLimiter:
+        with self._lock:
+            bucket = self._buckets.get(endpoint)
+            if bucket is None:
+                bucket = RateLimiter(self.requests_per_second, **self.bucket_kwargs)
+                self._buckets[endpoint] = bucket
+            return bucket
+
+    def rates(self) -> Dict[str, float]:
+        """Current adapted rate (req/s) of every bucket"""
+        with self._lock:
+            return {name: b.rate for name, b in self._buckets.items()}
+
+
+# ---------------------------------------------------------------------------
+# Transport + async pipeline
+# ---------------------------------------------------------------------------
+
+class YFinanceTransport:
+    """
+    Default transport: blocking yfinance attribute reads run in worker threads.
+
+    A transport is any object with ``async fetch(endpoint, ticker)`` that
+    returns the payload for one of ``ENDPOINTS`` and raises RateLimitError
+    when throttled; ``BUCKETS`` (optional) maps endpoints onto shared rate
+    buckets. Tests can substitute a fake that talks to a local server.
+    """
+
+    ENDPOINTS = ("info", "financials", "balance_sheet", "cashflow")
+    # Ticker.info hits quoteSummary; the three statements share the timeseries API.
+    BUCKETS = {"info": "quote", "financials": "timeseries",
+               "balance_sheet": "timeseries", "cashflow": "timeseries"}
+
+    async def fetch(self, endpoint: str, ticker: str) -> Any:
+        return await asyncio.to_thread(self._fetch, endpoint, ticker)
+
+    @staticmethod
+    def _fetch(endpoint: str, ticker: str) -> Any:
+        try:
+            return getattr(yf.Ticker(ticker), endpoint)
+        except Exception as e:
+            if is_rate_limit_error(e):
+                raise RateLimitError(str(e)) from e
+            raise
+
+
+def _safe_get(df: pd.DataFrame, key: str, col: int = 0) -> Optional[float]:
+    """Safely get value from DataFrame"""
+    try:
+        if df is not None and key in df.index:
+            value = df.loc[key].iloc[col]
+            if pd.notna(value) and not np.isinf(value):
+                return float(value)
+    except Exception:
+        pass
+    return None
+
+
+def build_financial_data(
+    ticker: str,
+    info: Optional[dict],
+    financials: Optional[pd.DataFrame],
+    balance_sheet: Optional[pd.DataFrame],
+    cashflow: Optional[pd.DataFrame],
+) -> 'FinancialData':
+    """Assemble a FinancialData record from raw yfinance payloads"""
+    from datetime import datetime
+    from .financial_data_fetcher import FinancialData
+
+    info = info or {}
+    data = FinancialData(ticker=ticker)
+
+    data.market_cap = info.get('marketCap')
+    data.sector = info.get('sector')
+    data.industry = info.get('industry')
+    data.current_price = info.get('currentPrice')
+    data.pe_ratio = info.get('trailingPE')
+
+    if financials is not None and not financials.empty:
+        data.revenue = _safe_get(financials, 'Total Revenue', 0)
+        data.cogs = _safe_get(financials, 'Cost Of Revenue', 0)
+        data.operating_income = _safe_get(financials, 'Operating Income', 0)
+        data.net_income = _safe_get(financials, 'Net Income', 0)
+
+        operating_expense = _safe_get(financials, 'Operating Expense', 0)
+        if operating_expense and data.cogs:
+            data.sga = operating_expense - data.cogs
+
+    if balance_sheet is not None and not balance_sheet.empty:
+        data.total_assets = _safe_get(balance_sheet, 'Total Assets', 0)
+        data.shareholder_equity = _safe_get(balance_sheet, 'Stockholders Equity', 0)
+
+        total_debt = _safe_get(balance_sheet, 'Total Debt', 0)
+        if total_debt is None:
+            long_term_debt = _safe_get(balance_sheet, 'Long Term Debt', 0) or 0
+            current_debt = _safe_get(balance_sheet, 'Current Debt', 0) or 0
+            total_debt = long_term_debt + current_debt
+        data.total_debt = total_debt
+
+    if cashflow is not None and not cashflow.empty:
+        data.free_cash_flow = _safe_get(cashflow, 'Free Cash Flow', 0)
+
+    if data.operating_income:
+        data.nopat = data.operating_income * 0.79
+
+    data.fetch_time = datetime.now().isoformat()
+
+    if data.validate():
+        data.data_quality = "complete"
+    elif any([data.revenue, data.total_assets, data.net_income]):
+        data.data_quality = "partial"
+    else:
+        data.data_quality = "insufficient"
+    return data
+
+
+class AsyncFundamentalsFetcher:
+    """
+    asyncio fetch pipeline for current fundamentals.
+
+    Each ticker's endpoints are requested concurrently, each through its
+    endpoint's adaptive bucket; throttled requests are retried once the
+    bucket allows (no fixed sleeps). ``max_concurrency`` caps tickers in
+    flight, and concurrent requests for the same ticker are coalesced.
+    """
+
+    def __init__(
+        self,
+        transport: Any = None,
+        limiters: Optional[EndpointLimiters] = None,
+        max_concurrency: int = 10,
+        max_retries: int = 3,
+        cache: Optional['FinancialDataCache'] = None,
+    ):
+        self.transport = transport or YFinanceTransport()
+        self.limiters = limiters or EndpointLimiters()
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.cache = cache
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    async def fetch(self, ticker: str) -> Optional['FinancialData']:
+        """Fetch one ticker, joining an identical request that is already in flight"""
+        task = self._inflight.get(ticker)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch_ticker(ticker))
+            self._inflight[ticker] = task
+            task.add_done_callback(lambda _: self._inflight.pop(ticker, None))
+        return await task
+
+    async def fetch_many(
+        self,
+        tickers: List[str],
+        on_result: Optional[Callable[[str, Optional['FinancialData']], None]] = None,
+    ) -> Dict[str, Optional['FinancialData']]:
+        """Fetch every distinct ticker; ``on_result`` fires as each one completes"""
+        unique = list(dict.fromkeys(tickers))
+        results: Dict[str, Optional['FinancialData']] = {}
+
+        if self.cache is not None:
+            for ticker, data in self.cache.get_many(unique).items():
+                results[ticker] = data
+                if on_result:
+                    on_result(ticker, data)
+
+        async def run(ticker: str) -> None:
+            data = await self.fetch(ticker)
+            if _SHUTDOWN_REQUESTED and data is None:
+                return
+            results[ticker] = data
+            if on_result:
+                on_result(ticker, data)
+
+        await asyncio.gather(*(run(t) for t in unique if t not in results))
+        return results
+
+    async def fetch_payloads_many(
+        self,
+        tickers: List[str],
+        on_result: Optional[Callable[[str, Optional[Dict[str, Any]]], None]] = None,
+    ) -> None:
+        """
+        Fetch raw endpoint payloads (``{endpoint: payload}``) for every distinct
+        ticker, bypassing the FinancialData cache; ``on_result`` fires as each
+        completes (None on failure). For callers that build more than
+        FinancialData from the same statements.
+        """
+        async def run(ticker: str) -> None:
+            payloads = await self._fetch_payloads(ticker)
+            if _SHUTDOWN_REQUESTED and payloads is None:
+                return
+            if on_result:
+                on_result(ticker, payloads)
+
+        await asyncio.gather(*(run(t) for t in dict.fromkeys(tickers)))
+
+    async def _fetch_payloads(self, ticker: str) -> Optional[Dict[str, Any]]:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        async with self._semaphore:
+            if _SHUTDOWN_REQUESTED:
+                return None
+            endpoints = getattr(self.transport, "ENDPOINTS", YFinanceTransport.ENDPOINTS)
+            try:
+                payloads = await asyncio.gather(
+                    *(self._fetch_endpoint(ep, ticker) for ep in endpoints)
+                )
+            except Exception as e:
+                get_stock_logger().error(ticker, f"Failed to fetch: {e}")
+                return None
+        return dict(zip(endpoints, payloads))
+
+    async def _fetch_ticker(self, ticker: str) -> Optional['FinancialData']:
+        payloads = await self._fetch_payloads(ticker)
+        if payloads is None:
+            return None
+        data = build_financial_data(ticker, **payloads)
+        if self.cache is not None:
+            self.cache.set(ticker, data)
+        logger.debug(f"Fetched {ticker}: quality={data.data_quality}")
+        return data
+
+    async def _fetch_endpoint(self, endpoint: str, ticker: str) -> Any:
+        bucket = self.limiters[getattr(self.transport, "BUCKETS", {}).get(endpoint, endpoint)]
+        for attempt in range(self.max_retries + 1):
+            await bucket.acquire_async()
+            try:
+                payload = await self.transport.fetch(endpoint, ticker)
+            except Exception as e:
+                if not is_rate_limit_error(e):
+                    raise
+                bucket.on_throttle(getattr(e, "retry_after", None))
+                if attempt == self.max_retries:
+                    raise
+                get_stock_logger().warning(
+                    ticker, f"Rate limit on {endpoint}, backing off to {bucket.rate:.2f} req/s "
+                            f"(attempt {attempt + 1}/{self.max_retries})")
+                continue
+            bucket.on_success()
+            return payload
+
+
+def _run_coroutine(coro: Awaitable) -> Any:
+    """Run ``coro`` to completion from sync code, even if an event loop is already running"""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coro).result()
 
 
 class ParallelFetcher:
     """
-    Parallel financial data fetcher with rate limiting and progress tracking
+    Parallel financial data fetcher with adaptive rate limiting and progress tracking
     
-    Uses ThreadPoolExecutor to fetch multiple tickers concurrently,
-    with semaphore-based rate limiting to avoid overwhelming the API.
+    Runs the AsyncFundamentalsFetcher pipeline: up to ``max_workers`` tickers in
+    flight, paced by per-endpoint AIMD token buckets seeded at
+    ``requests_per_second`` that speed up until the provider pushes back.
     
     Usage:
         fetcher = ParallelFetcher(max_workers=10, requests_per_second=1.0)
@@ -108,16 +477,18 @@ class ParallelFetcher:
         max_workers: int = 10,
         requests_per_second: float = 1.0,
         enable_cache: bool = True,
-        max_retries: int = 3
+        max_retries: int = 3,
+        transport: Any = None,
     ):
         """
         Initialize parallel fetcher
         
         Args:
-            max_workers: Maximum concurrent threads (default: 10)
-            requests_per_second: Rate limit (default: 1.0 = 1 request/second)
-            enable_cache: Enable 24-hour caching (default: True)
+            max_workers: Maximum tickers in flight (default: 10)
+            requests_per_second: Starting rate per endpoint; adapts from there (default: 1.0)
+            enable_cache: Enable 48-hour caching (default: True)
             max_retries: Maximum retry attempts for rate limit errors (default: 3)
+            transport: Request transport (default: YFinanceTransport)
         """
         from .financial_data_fetcher import FinancialDataCache
 
@@ -125,117 +496,55 @@ class ParallelFetcher:
         self.requests_per_second = requests_per_second
         self.max_retries = max_retries
         self.cache = FinancialDataCache() if enable_cache else None
-        self.rate_limiter = RateLimiter(requests_per_second)
+        self.transport = transport or YFinanceTransport()
+        self.limiters = EndpointLimiters(requests_per_second)
+        # Sync callers (historical statements) share the timeseries bucket and its learned rate.
+        self.rate_limiter = self.limiters["timeseries"]
         
         logger.info(f"ParallelFetcher initialized: workers={max_workers}, "
-                   f"rate={requests_per_second}/s, cache={enable_cache}")
+                   f"rate={requests_per_second}/s (adaptive), cache={enable_cache}")
     
-    def _fetch_single_ticker(
+    def _run_pipeline(
         self,
-        ticker: str,
-        retry_count: int = 0
-    ) -> tuple:
+        tickers: List[str],
+        on_result: Optional[Callable[[str, Optional['FinancialData']], None]] = None,
+    ) -> Dict[str, Optional['FinancialData']]:
+        pipeline = AsyncFundamentalsFetcher(
+            transport=self.transport,
+            limiters=self.limiters,
+            max_concurrency=self.max_workers,
+            max_retries=self.max_retries,
+            cache=self.cache,
+        )
+        try:
+            return _run_coroutine(pipeline.fetch_many(tickers, on_result))
+        finally:
+            logger.debug(f"Adapted endpoint rates: {self.limiters.rates()}")
+
+    def fetch_payloads(
+        self,
+        tickers: List[str],
+        on_result: Callable[[str, Optional[Dict[str, Any]]], None],
+    ) -> None:
         """
-        Fetch financial data for a single ticker
-        
-        Args:
-            ticker: Stock ticker symbol
-            retry_count: Current retry attempt number
-            
-        Returns:
-            Tuple of (ticker, FinancialData or None)
+        Fetch raw ``{endpoint: payload}`` dicts through the shared adaptive
+        buckets, handing each to ``on_result`` as it arrives (None = failed).
+        Blocks until every ticker has been reported.
         """
-        from .financial_data_fetcher import FinancialData
-
+        pipeline = AsyncFundamentalsFetcher(
+            transport=self.transport,
+            limiters=self.limiters,
+            max_concurrency=self.max_workers,
+            max_retries=self.max_retries,
+        )
         try:
-            self.rate_limiter.acquire()
-            
-            if self.cache:
-                cached = self.cache.get(ticker)
-                if cached is not None:
-                    logger.debug(f"Cache HIT for {ticker}")
-                    return (ticker, cached)
-            
-            stock = yf.Ticker(ticker)
-            info = stock.info
-            financials = stock.financials
-            balance_sheet = stock.balance_sheet
-            cashflow = stock.cashflow
-            
-            data = FinancialData(ticker=ticker)
-            
-            data.market_cap = info.get('marketCap')
-            data.sector = info.get('sector')
-            data.industry = info.get('industry')
-            data.current_price = info.get('currentPrice')
-            data.pe_ratio = info.get('trailingPE')
-            
-            if not financials.empty:
-                data.revenue = self._safe_get(financials, 'Total Revenue', 0)
-                data.cogs = self._safe_get(financials, 'Cost Of Revenue', 0)
-                data.operating_income = self._safe_get(financials, 'Operating Income', 0)
-                data.net_income = self._safe_get(financials, 'Net Income', 0)
-                
-                operating_expense = self._safe_get(financials, 'Operating Expense', 0)
-                if operating_expense and data.cogs:
-                    data.sga = operating_expense - data.cogs
-            
-            if not balance_sheet.empty:
-                data.total_assets = self._safe_get(balance_sheet, 'Total Assets', 0)
-                data.shareholder_equity = self._safe_get(balance_sheet, 'Stockholders Equity', 0)
-                
-                total_debt = self._safe_get(balance_sheet, 'Total Debt', 0)
-                if total_debt is None:
-                    long_term_debt = self._safe_get(balance_sheet, 'Long Term Debt', 0) or 0
-                    current_debt = self._safe_get(balance_sheet, 'Current Debt', 0) or 0
-                    total_debt = long_term_debt + current_debt
-                data.total_debt = total_debt
-            
-            if not cashflow.empty:
-                data.free_cash_flow = self._safe_get(cashflow, 'Free Cash Flow', 0)
-            
-            if data.operating_income:
-                data.nopat = data.operating_income * 0.79
-            
-            from datetime import datetime
-            data.fetch_time = datetime.now().isoformat()
-            
-            if data.validate():
-                data.data_quality = "complete"
-            elif any([data.revenue, data.total_assets, data.net_income]):
-                data.data_quality = "partial"
-            else:
-                data.data_quality = "insufficient"
-            
-            if self.cache:
-                self.cache.set(ticker, data)
-            
-            logger.debug(f"Fetched {ticker}: quality={data.data_quality}")
-            return (ticker, data)
-            
-        except Exception as e:
-            error_str = str(e).lower()
-            is_rate_limit = '429' in error_str or 'too many requests' in error_str
-            
-            if is_rate_limit and retry_count < self.max_retries:
-                wait_time = 2 ** retry_count
-                get_stock_logger().warning(ticker, f"Rate limit hit, retrying in {wait_time}s (attempt {retry_count + 1}/{self.max_retries})")
-                time.sleep(wait_time)
-                return self._fetch_single_ticker(ticker, retry_count + 1)
-            else:
-                get_stock_logger().error(ticker, f"Failed to fetch: {e}")
-                return (ticker, None)
-    
+            _run_coroutine(pipeline.fetch_payloads_many(tickers, on_result))
+        finally:
+            logger.debug(f"Adapted endpoint rates: {self.limiters.rates()}")
+
     def _safe_get(self, df: pd.DataFrame, key: str, col: int = 0) -> Optional[float]:
         """Safely get value from DataFrame"""
-        try:
-            if key in df.index:
-                value = df.loc[key].iloc[col]
-                if pd.notna(value) and not np.isinf(value):
-                    return float(value)
-        except Exception:
-            pass
-        return None
+        return _safe_get(df, key, col)
     
     def batch_fetch(self, tickers: List[str]) -> Dict[str, Optional['FinancialData']]:
         """
@@ -247,41 +556,16 @@ class ParallelFetcher:
         Returns:
             Dict mapping ticker -> FinancialData (or None if failed)
         """
-        results = {}
         start_time = time.time()
         
         logger.debug(f"Starting parallel fetch for {len(tickers)} tickers "
                    f"(workers={self.max_workers})")
         
         try:
-            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-                futures = {
-                    executor.submit(self._fetch_single_ticker, ticker): ticker
-                    for ticker in tickers
-                }
-                
-                for i, future in enumerate(as_completed(futures)):
-                    # Check for shutdown signal
-                    if _SHUTDOWN_REQUESTED:
-                        logger.debug(f"Shutdown requested, stopping after {i+1} tickers")
-                        break
-                    
-                    try:
-                        ticker, data = future.result()
-                        results[ticker] = data
-                    except Exception as e:
-                        logger.warning(f"Error getting result: {e}")
-                        continue
-                    
-                    if (i + 1) % 50 == 0:
-                        logger.debug(f"Progress: {i + 1}/{len(tickers)} completed")
-                        
-        except KeyboardInterrupt:
-            logger.info("Keyboard interrupt received, stopping fetch...")
-            return results
+            results = self._run_pipeline(tickers)
         except Exception as e:
             logger.error(f"Error during batch fetch: {e}")
-            return results
+            return {}
         
         duration = time.time() - start_time
         
@@ -318,13 +602,10 @@ class ParallelFetcher:
         """
         try:
             from tqdm import tqdm
-            has_tqdm = True
         except ImportError:
             logger.warning("tqdm not installed, using batch_fetch without progress")
-            has_tqdm = False
             return self.batch_fetch(tickers)
 
-        results = {}
         start_time = time.time()
 
         logger.debug(f"Starting parallel fetch with progress: {len(tickers)} tickers")
@@ -343,26 +624,9 @@ class ParallelFetcher:
             original_level = set_logger_level(logging.WARNING)
 
         try:
-            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-                futures = {
-                    executor.submit(self._fetch_single_ticker, ticker): ticker
-                    for ticker in tickers
-                }
-
-                with tqdm(total=len(tickers), desc=desc, unit=unit, mininterval=0.1, miniters=1, dynamic_ncols=True, disable=False, file=sys.stdout) as pbar:
-                    for future in as_completed(futures):
-                        # Check for shutdown signal
-                        if _SHUTDOWN_REQUESTED:
-                            logger.debug("Shutdown requested, stopping fetch...")
-                            break
-
-                        try:
-                            ticker, data = future.result()
-                            results[ticker] = data
-                        except Exception as e:
-                            logger.warning(f"Error getting result: {e}")
-                            continue
-                        pbar.update(1)
+            total = len(dict.fromkeys(tickers))
+            with tqdm(total=total, desc=desc, unit=unit, mininterval=0.1, miniters=1, dynamic_ncols=True, disable=False, file=sys.stdout) as pbar:
+                results = self._run_pipeline(tickers, lambda ticker, data: pbar.update(1))
 
             duration = time.time() - start_time
 
@@ -373,9 +637,6 @@ class ParallelFetcher:
             logger.debug(f"Parallel fetch with progress complete: {duration:.1f}s")
             logger.debug(f"  Success: {success_count}, Failed: {failed_count}")
 
-            return results
-        except KeyboardInterrupt:
-            logger.debug("Keyboard interrupt received, stopping fetch...")
             return results
         finally:
             if suppress_logging and original_level is not None:
@@ -396,52 +657,30 @@ class ParallelFetcher:
         Returns:
             Dict mapping ticker -> FinancialData (or None if failed)
         """
-        results = {}
         start_time = time.time()
-        total = len(tickers)
+        total = len(dict.fromkeys(tickers))
+        completed = 0
 
         logger.debug(f"Starting parallel fetch with callback: {total} tickers")
 
-        def _update_progress(completed, total):
+        def on_result(ticker, data):
+            nonlocal completed
+            completed += 1
             if progress_callback:
                 progress_callback(completed, total)
 
-        try:
-            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-                futures = {
-                    executor.submit(self._fetch_single_ticker, ticker): ticker
-                    for ticker in tickers
-                }
-
-                completed = 0
-                for future in as_completed(futures):
-                    # Check for shutdown signal
-                    if _SHUTDOWN_REQUESTED:
-                        logger.debug("Shutdown requested, stopping fetch...")
-                        break
-                    
-                    try:
-                        ticker, data = future.result()
-                        results[ticker] = data
-                    except Exception as e:
-                        logger.warning(f"Error getting result: {e}")
-                        continue
-                    completed += 1
-                    _update_progress(completed, total)
+        results = self._run_pipeline(tickers, on_result)
 
-            duration = time.time() - start_time
+        duration = time.time() - start_time
 
-            success_count = sum(1 for v in results.values() 
-                               if v and v.data_quality != "insufficient")
-            failed_count = sum(1 for v in results.values() if v is None)
+        success_count = sum(1 for v in results.values() 
+                           if v and v.data_quality != "insufficient")
+        failed_count = sum(1 for v in results.values() if v is None)
 
-            logger.debug(f"Parallel fetch with callback complete: {duration:.1f}s")
-            logger.debug(f"  Success: {success_count}, Failed: {failed_count}")
+        logger.debug(f"Parallel fetch with callback complete: {duration:.1f}s")
+        logger.debug(f"  Success: {success_count}, Failed: {failed_count}")
 
-            return results
-        except KeyboardInterrupt:
-            logger.debug("Keyboard interrupt received, stopping fetch...")
-            return results
+        return results
     
     def fetch_historical_financials(
         self,
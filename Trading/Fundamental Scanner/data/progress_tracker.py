@@ -10,21 +10,57 @@ Key Features:
 - Quarterly data freshness monitoring
 - Resume capability from interruption points
 - Progress analytics and ETA calculations
+- Writes are queued to one background writer connection (WAL mode) and
+  committed in batches, so thread-pooled fetchers never wait on fsync
 
 Author: Progress Tracking System
 Date: January 2026
 """
 
+import atexit
+import queue
 import sqlite3
 import json
 import logging
-from typing import Dict, List, Optional, Tuple
+import threading
+import time
+import uuid
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 from datetime import datetime, timedelta
 from dataclasses import dataclass, asdict
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
 
+# Writer-thread batching thresholds: commit once this many statements are
+# queued, or this many seconds after the first one, whichever comes first.
+WRITE_BATCH_SIZE = 500
+WRITE_BATCH_SECONDS = 1.0
+
+_STOP = object()
+
+
+class ProgressWriteError(RuntimeError):
+    """Queued progress writes that the database rejected.
+
+    Attributes:
+        failures: (sql, params, error message) of each rejected statement
+    """
+
+    def __init__(self, failures: List[Tuple[str, tuple, str]]):
+        self.failures = failures
+        first = failures[0]
+        super().__init__(
+            f"{len(failures)} progress update(s) failed; first: {first[2]} ({' '.join(first[0].split())[:80]})"
+        )
+
+_STOCK_UPSERT = '''
+    INSERT OR REPLACE INTO stock_progress
+    (ticker, status, last_updated, quarter, api_calls_used,
+     error_message, quality_score, processing_time_seconds)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
 
 @dataclass
 class StockProgress:
@@ -69,26 +105,66 @@ class ProgressTracker:
     
     Manages persistence of stock-level and session-level progress,
     enabling resume capability and detailed analytics.
+
+    All writes go through a queue to a single writer thread that owns the
+    only writing connection and groups statements into one transaction per
+    ``batch_size`` statements or ``batch_seconds``. Reads use a separate
+    connection and first wait for any queued writes, so callers always see
+    their own updates. A statement the database rejects is rolled back on
+    its own (the rest of its batch still commits) and is raised as a
+    ``ProgressWriteError`` from the next ``flush()`` or ``close()``. Call
+    ``close()`` (or use the tracker as a context manager) to flush on
+    shutdown; an ``atexit`` hook covers the rest.
     """
     
-    def __init__(self, db_path: str):
+    def __init__(self, db_path: str, batch_size: int = WRITE_BATCH_SIZE,
+                 batch_seconds: float = WRITE_BATCH_SECONDS):
         """
         Initialize progress tracker with SQLite database.
         
         Args:
             db_path: Path to SQLite database file
+            batch_size: Max statements per write transaction
+            batch_seconds: Max delay before queued writes are committed
         """
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.batch_size = max(1, batch_size)
+        self.batch_seconds = batch_seconds
         
         # Initialize database schema
         self._init_database()
+
+        self._read_conn = self._connect()
+        self._read_lock = threading.Lock()
+        self._queue: "queue.Queue" = queue.Queue()
+        self._closed = False
+        self._failures: List[Tuple[str, tuple, str]] = []
+        self._failures_lock = threading.Lock()
+        self._writer = threading.Thread(
+            target=self._writer_loop, name=f"ProgressTracker-{self.db_path.name}", daemon=True
+        )
+        self._writer.start()
+        atexit.register(self._close_at_exit)
         
         logger.info(f"ProgressTracker initialized with database: {self.db_path}")
+
+    def __enter__(self) -> "ProgressTracker":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        return conn
     
     def _init_database(self) -> None:
         """Initialize SQLite database schema"""
         with sqlite3.connect(self.db_path) as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
             cursor = conn.cursor()
             
             # Stock progress table
@@ -139,35 +215,148 @@ class ProgressTracker:
             
             conn.commit()
     
+    # ---- writer thread -----------------------------------------------------
+
+    def _write(self, sql: str, params: tuple = ()) -> None:
+        """Queue one statement for the writer thread."""
+        if self._closed:
+            raise RuntimeError(f"ProgressTracker for {self.db_path} is closed")
+        self._queue.put((sql, params))
+
+    def _writer_loop(self) -> None:
+        conn = self._connect()
+        stopping = False
+        while not stopping:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.batch_seconds
+            while len(batch) < self.batch_size and not _is_marker(batch[-1]):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            stopping = batch[-1] is _STOP
+            self._commit_batch(conn, [item for item in batch if not _is_marker(item)])
+            for item in batch:
+                if isinstance(item, threading.Event):
+                    item.set()
+                self._queue.task_done()
+        conn.close()
+
+    def _commit_batch(self, conn: sqlite3.Connection, statements: List[tuple]) -> None:
+        """Run queued statements in one transaction, grouping runs of the same SQL.
+
+        If the batch fails it is rolled back and replayed one statement per
+        SAVEPOINT, so only the statements the database rejects are lost;
+        those are recorded for the next ``flush()`` / ``close()`` to raise.
+        """
+        if not statements:
+            return
+        try:
+            i = 0
+            while i < len(statements):
+                sql = statements[i][0]
+                j = i
+                while j < len(statements) and statements[j][0] == sql:
+                    j += 1
+                conn.executemany(sql, [params for _, params in statements[i:j]])
+                i = j
+            conn.commit()
+            return
+        except sqlite3.Error:
+            conn.rollback()
+
+        failures = []
+        for sql, params in statements:
+            conn.execute('SAVEPOINT progress_write')
+            try:
+                conn.execute(sql, params)
+            except sqlite3.Error as e:
+                conn.execute('ROLLBACK TO progress_write')
+                failures.append((sql, params, str(e)))
+            conn.execute('RELEASE progress_write')
+        conn.commit()
+        if failures:
+            logger.error(f"Failed to write {len(failures)} of {len(statements)} progress updates: "
+                         f"{failures[0][2]}")
+            with self._failures_lock:
+                self._failures.extend(failures)
+
+    def _wait(self) -> None:
+        """Block until every queued write has been attempted."""
+        if self._closed or not self._writer.is_alive():
+            return
+        if self._queue.unfinished_tasks:
+            done = threading.Event()
+            self._queue.put(done)
+            done.wait()
+
+    def _raise_failures(self) -> None:
+        with self._failures_lock:
+            failures, self._failures = self._failures, []
+        if failures:
+            raise ProgressWriteError(failures)
+
+    def flush(self) -> None:
+        """
+        Block until every queued write is committed.
+
+        Raises:
+            ProgressWriteError: if any write queued since the last flush was rejected
+        """
+        self._wait()
+        self._raise_failures()
+
+    def close(self) -> None:
+        """
+        Commit queued writes and stop the writer thread.
+
+        Raises:
+            ProgressWriteError: if any write queued since the last flush was rejected
+        """
+        if self._closed:
+            return
+        self._closed = True
+        if self._writer.is_alive():
+            self._queue.put(_STOP)
+            self._writer.join()
+        with self._read_lock:
+            self._read_conn.close()
+        atexit.unregister(self._close_at_exit)
+        self._raise_failures()
+
+    def _close_at_exit(self) -> None:
+        try:
+            self.close()
+        except ProgressWriteError as e:
+            logger.error(f"ProgressTracker for {self.db_path}: {e}")
+
+    def _read(self, sql: str, params: tuple = ()) -> List[tuple]:
+        """Run a query after pending writes land (read-your-writes)."""
+        self._wait()
+        with self._read_lock:
+            return self._read_conn.execute(sql, params).fetchall()
+
+    # ---- stock progress ----------------------------------------------------
+    
     def save_stock_progress(self, progress: StockProgress) -> None:
         """
         Save progress for a single stock.
+
+        Queued for the writer thread; committed with the next batch.
         
         Args:
             progress: StockProgress object to save
         """
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                INSERT OR REPLACE INTO stock_progress 
-                (ticker, status, last_updated, quarter, api_calls_used, 
-                 error_message, quality_score, processing_time_seconds)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                progress.ticker,
-                progress.status,
-                progress.last_updated.isoformat(),
-                progress.quarter,
-                progress.api_calls_used,
-                progress.error_message,
-                progress.quality_score,
-                progress.processing_time_seconds
-            ))
-            
-            conn.commit()
-        
+        self._write(_STOCK_UPSERT, _stock_row(progress))
         logger.debug(f"Saved progress for {progress.ticker}: {progress.status}")
+
+    def save_many_stock_progress(self, progresses: Iterable[StockProgress]) -> None:
+        """Save progress for several stocks (same batching as single saves)."""
+        for progress in progresses:
+            self._write(_STOCK_UPSERT, _stock_row(progress))
     
     def get_stock_progress(self, ticker: str) -> Optional[StockProgress]:
         """
@@ -179,27 +368,24 @@ class ProgressTracker:
         Returns:
             StockProgress object or None if not found
         """
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                SELECT ticker, status, last_updated, quarter, api_calls_used,
-                       error_message, quality_score, processing_time_seconds
-                FROM stock_progress WHERE ticker = ?
-            ''', (ticker,))
-            
-            row = cursor.fetchone()
-            if row:
-                return StockProgress(
-                    ticker=row[0],
-                    status=row[1],
-                    last_updated=datetime.fromisoformat(row[2]),
-                    quarter=row[3],
-                    api_calls_used=row[4],
-                    error_message=row[5],
-                    quality_score=row[6],
-                    processing_time_seconds=row[7]
-                )
+        rows = self._read('''
+            SELECT ticker, status, last_updated, quarter, api_calls_used,
+                   error_message, quality_score, processing_time_seconds
+            FROM stock_progress WHERE ticker = ?
+        ''', (ticker,))
+        
+        if rows:
+            row = rows[0]
+            return StockProgress(
+                ticker=row[0],
+                status=row[1],
+                last_updated=datetime.fromisoformat(row[2]),
+                quarter=row[3],
+                api_calls_used=row[4],
+                error_message=row[5],
+                quality_score=row[6],
+                processing_time_seconds=row[7]
+            )
         
         return None
     
@@ -213,11 +399,23 @@ class ProgressTracker:
         Returns:
             List of ticker symbols
         """
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
+        rows = self._read('SELECT ticker FROM stock_progress WHERE status = ?', (status,))
+        return [row[0] for row in rows]
+
+    def get_done_tickers(self, statuses: Iterable[str] = ('completed',)) -> Set[str]:
+        """
+        Set of tickers in any of ``statuses``, in one query (for resume).
+        
+        Args:
+            statuses: Statuses that count as done (default: completed only)
             
-            cursor.execute('SELECT ticker FROM stock_progress WHERE status = ?', (status,))
-            return [row[0] for row in cursor.fetchall()]
+        Returns:
+            Set of ticker symbols
+        """
+        statuses = tuple(statuses)
+        marks = ','.join('?' * len(statuses))
+        rows = self._read(f'SELECT ticker FROM stock_progress WHERE status IN ({marks})', statuses)
+        return {row[0] for row in rows}
     
     def get_completed_tickers(self) -> List[str]:
         """Get list of successfully completed tickers"""
@@ -245,15 +443,22 @@ class ProgressTracker:
         """Get the last update time for a ticker"""
         progress = self.get_stock_progress(ticker)
         return progress.last_updated if progress else None
+
+    # ---- sessions ----------------------------------------------------------
     
-    def save_session_start(self, session_queue) -> None:
+    def save_session_start(self, session_queue) -> str:
         """
         Save the start of a new processing session.
         
         Args:
             session_queue: DailyQueue object with session information
+
+        Returns:
+            The new session's identifier
         """
-        session_id = f"session_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        # Microseconds + a short random suffix: two sessions started in the
+        # same second must not collide on the session_id primary key.
+        session_id = f"session_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}_{uuid.uuid4().hex[:6]}"
         
         session = SessionProgress(
             session_id=session_id,
@@ -264,26 +469,22 @@ class ProgressTracker:
             status='active'
         )
         
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                INSERT INTO session_progress 
-                (session_id, session_date, stocks_processed, stocks_failed, 
-                 api_calls_used, status)
-                VALUES (?, ?, ?, ?, ?, ?)
-            ''', (
-                session.session_id,
-                session.session_date.isoformat(),
-                session.stocks_processed,
-                session.stocks_failed,
-                session.api_calls_used,
-                session.status
-            ))
-            
-            conn.commit()
+        self._write('''
+            INSERT INTO session_progress 
+            (session_id, session_date, stocks_processed, stocks_failed, 
+             api_calls_used, status)
+            VALUES (?, ?, ?, ?, ?, ?)
+        ''', (
+            session.session_id,
+            session.session_date.isoformat(),
+            session.stocks_processed,
+            session.stocks_failed,
+            session.api_calls_used,
+            session.status
+        ))
         
         logger.info(f"Started new session: {session_id}")
+        return session_id
     
     def update_session_progress(self, session_id: str, ticker: str, 
                                success: bool, api_calls: int) -> None:
@@ -296,75 +497,32 @@ class ProgressTracker:
             success: Whether processing was successful
             api_calls: API calls used for this stock
         """
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            
-            if success:
-                cursor.execute('''
-                    UPDATE session_progress 
-                    SET stocks_processed = stocks_processed + 1
-                    WHERE session_id = ?
-                ''', (session_id,))
-            else:
-                cursor.execute('''
-                    UPDATE session_progress 
-                    SET stocks_failed = stocks_failed + 1
-                    WHERE session_id = ?
-                ''', (session_id,))
-            
-            conn.commit()
+        column = 'stocks_processed' if success else 'stocks_failed'
+        self._write(f'''
+            UPDATE session_progress 
+            SET {column} = {column} + 1
+            WHERE session_id = ?
+        ''', (session_id,))
     
     def get_session_progress(self, session_id: str) -> Optional[SessionProgress]:
         """Get progress for a specific session"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                SELECT session_id, session_date, stocks_processed, stocks_failed,
-                       api_calls_used, session_duration_seconds, status
-                FROM session_progress WHERE session_id = ?
-            ''', (session_id,))
-            
-            row = cursor.fetchone()
-            if row:
-                return SessionProgress(
-                    session_id=row[0],
-                    session_date=datetime.fromisoformat(row[1]),
-                    stocks_processed=row[2],
-                    stocks_failed=row[3],
-                    api_calls_used=row[4],
-                    session_duration_seconds=row[5],
-                    status=row[6]
-                )
-        
-        return None
+        rows = self._read(f'''
+            SELECT {_SESSION_COLUMNS}
+            FROM session_progress WHERE session_id = ?
+        ''', (session_id,))
+        return _session_from_row(rows[0]) if rows else None
     
     def get_latest_session(self) -> Optional[SessionProgress]:
         """Get the most recent session"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                SELECT session_id, session_date, stocks_processed, stocks_failed,
-                       api_calls_used, session_duration_seconds, status
-                FROM session_progress 
-                ORDER BY session_date DESC 
-                LIMIT 1
-            ''')
-            
-            row = cursor.fetchone()
-            if row:
-                return SessionProgress(
-                    session_id=row[0],
-                    session_date=datetime.fromisoformat(row[1]),
-                    stocks_processed=row[2],
-                    stocks_failed=row[3],
-                    api_calls_used=row[4],
-                    session_duration_seconds=row[5],
-                    status=row[6]
-                )
-        
-        return None
+        rows = self._read(f'''
+            SELECT {_SESSION_COLUMNS}
+            FROM session_progress 
+            ORDER BY session_date DESC 
+            LIMIT 1
+        ''')
+        return _session_from_row(rows[0]) if rows else None
+
+    # ---- daily usage -------------------------------------------------------
     
     def save_daily_usage(self, date: datetime, api_calls: int, stocks_processed: int) -> None:
         """
@@ -377,15 +535,10 @@ class ProgressTracker:
         """
         date_str = date.strftime('%Y-%m-%d')
         
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                INSERT OR REPLACE INTO daily_usage (date, api_calls_used, stocks_processed)
-                VALUES (?, ?, COALESCE((SELECT stocks_processed FROM daily_usage WHERE date = ?), 0) + ?)
-            ''', (date_str, api_calls, date_str, stocks_processed))
-            
-            conn.commit()
+        self._write('''
+            INSERT OR REPLACE INTO daily_usage (date, api_calls_used, stocks_processed)
+            VALUES (?, ?, COALESCE((SELECT stocks_processed FROM daily_usage WHERE date = ?), 0) + ?)
+        ''', (date_str, api_calls, date_str, stocks_processed))
     
     def get_daily_usage(self, date: datetime) -> Tuple[int, int]:
         """
@@ -399,17 +552,13 @@ class ProgressTracker:
         """
         date_str = date.strftime('%Y-%m-%d')
         
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                SELECT api_calls_used, stocks_processed 
-                FROM daily_usage WHERE date = ?
-            ''', (date_str,))
-            
-            row = cursor.fetchone()
-            if row:
-                return row[0], row[1]
+        rows = self._read('''
+            SELECT api_calls_used, stocks_processed 
+            FROM daily_usage WHERE date = ?
+        ''', (date_str,))
+        
+        if rows:
+            return rows[0][0], rows[0][1]
         
         return 0, 0
     
@@ -428,8 +577,10 @@ class ProgressTracker:
         Returns:
             List of tickers that are not completed
         """
-        completed = self.get_completed_tickers()
+        completed = self.get_done_tickers()
         return [ticker for ticker in all_tickers if ticker not in completed]
+
+    # ---- reporting ---------------------------------------------------------
     
     def load_progress(self) -> ProgressState:
         """
@@ -438,99 +589,112 @@ class ProgressTracker:
         Returns:
             ProgressState object with current status
         """
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            
-            # Get stock counts by status
-            cursor.execute('SELECT status, COUNT(*) FROM stock_progress GROUP BY status')
-            status_counts = dict(cursor.fetchall())
-            
-            # Get current session
-            cursor.execute('''
-                SELECT session_id, session_date, stocks_processed, stocks_failed,
-                       api_calls_used, session_duration_seconds, status
-                FROM session_progress 
-                WHERE status = 'active'
-                ORDER BY session_date DESC 
-                LIMIT 1
-            ''')
-            
-            session_row = cursor.fetchone()
-            last_session = None
-            if session_row:
-                last_session = SessionProgress(
-                    session_id=session_row[0],
-                    session_date=datetime.fromisoformat(session_row[1]),
-                    stocks_processed=session_row[2],
-                    stocks_failed=session_row[3],
-                    api_calls_used=session_row[4],
-                    session_duration_seconds=session_row[5],
-                    status=session_row[6]
-                )
-            
-            # Get today's API usage
-            today = datetime.now()
-            api_calls_today, _ = self.get_daily_usage(today)
-            
-            total_stocks = sum(status_counts.values())
-            
-            return ProgressState(
-                total_stocks=total_stocks,
-                completed_stocks=status_counts.get('completed', 0),
-                failed_stocks=status_counts.get('failed', 0),
-                pending_stocks=status_counts.get('pending', 0),
-                last_session=last_session,
-                api_calls_today=api_calls_today,
-                api_calls_remaining=max(0, 250 - api_calls_today)
-            )
+        # Get stock counts by status
+        status_counts = dict(self._read('SELECT status, COUNT(*) FROM stock_progress GROUP BY status'))
+        
+        # Get current session
+        session_rows = self._read(f'''
+            SELECT {_SESSION_COLUMNS}
+            FROM session_progress 
+            WHERE status = 'active'
+            ORDER BY session_date DESC 
+            LIMIT 1
+        ''')
+        last_session = _session_from_row(session_rows[0]) if session_rows else None
+        
+        # Get today's API usage
+        today = datetime.now()
+        api_calls_today, _ = self.get_daily_usage(today)
+        
+        total_stocks = sum(status_counts.values())
+        
+        return ProgressState(
+            total_stocks=total_stocks,
+            completed_stocks=status_counts.get('completed', 0),
+            failed_stocks=status_counts.get('failed', 0),
+            pending_stocks=status_counts.get('pending', 0),
+            last_session=last_session,
+            api_calls_today=api_calls_today,
+            api_calls_remaining=max(0, 250 - api_calls_today)
+        )
     
     def get_progress_summary(self) -> Dict:
         """Get detailed progress summary for reporting"""
         state = self.load_progress()
         
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            
-            # Get recent sessions (last 7 days)
-            seven_days_ago = (datetime.now() - timedelta(days=7)).isoformat()
-            cursor.execute('''
-                SELECT session_date, stocks_processed, stocks_failed, api_calls_used
-                FROM session_progress 
-                WHERE session_date >= ?
-                ORDER BY session_date DESC
-            ''', (seven_days_ago,))
-            
-            recent_sessions = [
-                {
-                    'date': row[0].split('T')[0],  # Extract date part
-                    'processed': row[1],
-                    'failed': row[2],
-                    'api_calls': row[3]
-                }
-                for row in cursor.fetchall()
-            ]
-            
-            # Get quality score statistics
-            cursor.execute('''
-                SELECT AVG(quality_score), MIN(quality_score), MAX(quality_score), 
-                       COUNT(quality_score)
-                FROM stock_progress 
-                WHERE quality_score IS NOT NULL AND status = 'completed'
-            ''')
-            
-            score_stats = cursor.fetchone()
-            quality_stats = {}
-            if score_stats and score_stats[3] > 0:
-                quality_stats = {
-                    'average_score': round(score_stats[0], 2),
-                    'min_score': round(score_stats[1], 2),
-                    'max_score': round(score_stats[2], 2),
-                    'total_scored': score_stats[3]
-                }
+        # Get recent sessions (last 7 days)
+        seven_days_ago = (datetime.now() - timedelta(days=7)).isoformat()
+        rows = self._read('''
+            SELECT session_date, stocks_processed, stocks_failed, api_calls_used
+            FROM session_progress 
+            WHERE session_date >= ?
+            ORDER BY session_date DESC
+        ''', (seven_days_ago,))
+        
+        recent_sessions = [
+            {
+                'date': row[0].split('T')[0],  # Extract date part
+                'processed': row[1],
+                'failed': row[2],
+                'api_calls': row[3]
+            }
+            for row in rows
+        ]
+        
+        # Get quality score statistics
+        score_stats = self._read('''
+            SELECT AVG(quality_score), MIN(quality_score), MAX(quality_score), 
+                   COUNT(quality_score)
+            FROM stock_progress 
+            WHERE quality_score IS NOT NULL AND status = 'completed'
+        ''')[0]
+        
+        quality_stats = {}
+        if score_stats and score_stats[3] > 0:
+            quality_stats = {
+                'average_score': round(score_stats[0], 2),
+                'min_score': round(score_stats[1], 2),
+                'max_score': round(score_stats[2], 2),
+                'total_scored': score_stats[3]
+            }
         
         return {
             'progress_state': asdict(state),
             'recent_sessions': recent_sessions,
             'quality_statistics': quality_stats,
             'completion_rate': round(state.completed_stocks / max(state.total_stocks, 1) * 100, 2)
-        }
\ No newline at end of file
+        }
+
+
+_SESSION_COLUMNS = '''session_id, session_date, stocks_processed, stocks_failed,
+                   api_calls_used, session_duration_seconds, status'''
+
+
+def _session_from_row(row: tuple) -> SessionProgress:
+    return SessionProgress(
+        session_id=row[0],
+        session_date=datetime.fromisoformat(row[1]),
+        stocks_processed=row[2],
+        stocks_failed=row[3],
+        api_calls_used=row[4],
+        session_duration_seconds=row[5],
+        status=row[6]
+    )
+
+
+def _stock_row(progress: StockProgress) -> tuple:
+    return (
+        progress.ticker,
+        progress.status,
+        progress.last_updated.isoformat(),
+        progress.quarter,
+        progress.api_calls_used,
+        progress.error_message,
+        progress.quality_score,
+        progress.processing_time_seconds
+    )
+
+
+def _is_marker(item) -> bool:
+    """Flush events and the stop sentinel end a batch; they carry no SQL."""
+    return item is _STOP or isinstance(item, threading.Event)
@@ -7,7 +7,8 @@ and incremental summary updates. Ensures data quality while maintaining storage
 Key Features:
 - 20-quarter (5-year) archive rotation
 - Quarterly data freshness detection
-- Incremental summary file updates (append-only)
+- Structured append-only history (one row per ticker and quarter, see
+  quarterly_store.py); the text summary is rendered from it on demand
 - Automatic archive cleanup
 - Historical data preservation
 
@@ -23,6 +24,10 @@ from datetime import datetime, timedelta
 from pathlib import Path
 import re
 
+import pandas as pd
+
+from .quarterly_store import QuarterlyStore
+
 logger = logging.getLogger(__name__)
 
 
@@ -35,6 +40,7 @@ class QuarterlyManager:
     - Rotation of summary archives
     - Incremental updates to analysis summaries
     - Archive maintenance (20-quarter retention)
+    - Structured per-quarter history and quarter-over-quarter deltas
     """
     
     MAX_QUARTERS_ARCHIVE = 20  # 5 years × 4 quarters = 20 quarters
@@ -59,6 +65,9 @@ class QuarterlyManager:
         
         # Main summary file path
         self.summary_file = self.outputs_dir / "quality_analysis_summary.txt"
+
+        # Structured history the summary is rendered from
+        self.store = QuarterlyStore(self.outputs_dir / "quarterly_analysis.db")
         
         logger.info(f"QuarterlyManager initialized with outputs_dir: {self.outputs_dir}")
         logger.info(f"Archive directory: {self.archive_dir}")
@@ -238,19 +247,21 @@ class QuarterlyManager:
         
         return removed_count
     
-    def create_new_summary_header(self, index_name: str, stocks_count: int) -> str:
+    def create_new_summary_header(self, index_name: str, stocks_count: int,
+                                  quarter: Optional[int] = None) -> str:
         """
         Create header content for new summary file.
         
         Args:
             index_name: Name of the index being analyzed
             stocks_count: Number of stocks analyzed
+            quarter: Quarter the summary covers (default: current quarter)
             
         Returns:
             Header content string
         """
         current_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        current_quarter = self.get_current_quarter()
+        current_quarter = quarter if quarter is not None else self.get_current_quarter()
         year = current_quarter // 10
         quarter = current_quarter % 10
         
@@ -399,11 +410,91 @@ Current Quarter: {year} Q{quarter}
         
         return merged_content
     
+    def record_analysis(self, analysis_data: List[Dict],
+                        quarter: Optional[int] = None) -> int:
+        """
+        Append analysis results to the structured quarterly history.
+        
+        Args:
+            analysis_data: Analysis dicts (ticker, quality_score, market_cap, tier, red_flags, ...)
+            quarter: Quarter number (auto-detected if None)
+            
+        Returns:
+            Number of records written
+        """
+        if quarter is None:
+            quarter = self.get_current_quarter()
+        return self.store.append(analysis_data, quarter)
+    
+    def get_ticker_history(self, ticker: str) -> pd.DataFrame:
+        """Stored analyses for one ticker, indexed by quarter"""
+        return self.store.history(ticker)
+    
+    def get_quarter_over_quarter(self, field: str = 'quality_score',
+                                 quarters: Optional[List[int]] = None) -> pd.DataFrame:
+        """
+        Quarter-over-quarter change of a numeric field for every ticker.
+        
+        Args:
+            field: 'quality_score', 'market_cap' or 'red_flags'
+            quarters: Restrict to these quarters (default: all stored)
+            
+        Returns:
+            DataFrame indexed by ticker with one column per later quarter
+        """
+        return self.store.quarter_over_quarter(field, quarters)
+    
+    def export_summary(self, index_name: str, total_stocks: int,
+                       quarter: Optional[int] = None, top_n: int = 20) -> str:
+        """
+        Render the text summary for a quarter from the structured history.
+        
+        Args:
+            index_name: Name of the index
+            total_stocks: Total number of stocks analyzed
+            quarter: Quarter to render (default: current quarter)
+            top_n: Number of ranked rows
+            
+        Returns:
+            Summary content string
+        """
+        if quarter is None:
+            quarter = self.get_current_quarter()
+        records = self.store.records(quarter)
+        records.sort(key=lambda x: x.get('quality_score') or 0, reverse=True)
+        
+        content = self.create_new_summary_header(index_name, total_stocks, quarter)
+        if records:
+            content += f"TOP {top_n} STOCKS BY QUALITY SCORE:\n"
+            content += "Rank Ticker   Market Cap   Score    Tier         Red Flags \n"
+            content += "--------------------------------------------------------------------------------\n"
+            for i, item in enumerate(records[:top_n], 1):
+                content += self._format_top_line(i, item) + '\n'
+        return content
+    
+    @staticmethod
+    def _format_top_line(rank: int, item: Dict) -> str:
+        ticker = item.get('ticker') or 'N/A'
+        score = item.get('quality_score') or 0
+        market_cap = item.get('market_cap')
+        if market_cap is None:
+            market_cap = 'N/A'
+        elif isinstance(market_cap, float) and market_cap.is_integer():
+            market_cap = int(market_cap)
+        tier = item.get('tier') or 'Unknown'
+        red_flags = item.get('red_flags')
+        red_flags = 0 if red_flags is None else int(red_flags)
+        return f"{rank:<4} {ticker:<8} ${market_cap:<12} {score:<8.1f}    {tier:<12} {red_flags:<10}"
+    
     def update_summary_incremental(self, new_analysis_data: List[Dict], 
                                   index_name: str, total_stocks: int) -> None:
         """
         Update summary file incrementally with new analysis data.
         
+        The results are appended to the structured store (replacing only
+        this quarter's rows for re-analysed tickers) and the summary file is
+        re-rendered from the store, so no existing text is parsed.
+        
         Args:
             new_analysis_data: New analysis results
             index_name: Name of the index
@@ -418,38 +509,15 @@ Current Quarter: {year} Q{quarter}
             if removed_count > 0:
                 logger.info(f"Removed {removed_count} old archives")
             
-            # Read existing content or create new
-            if self.summary_file.exists():
-                with open(self.summary_file, 'r') as f:
-                    existing_content = f.read()
-                
-                # Merge new data
-                merged_content = self.merge_new_analysis(
-                    existing_content, new_analysis_data, index_name, total_stocks
-                )
-            else:
-                # Create new summary
-                merged_content = self.create_new_summary_header(index_name, total_stocks)
-                
-                # Add new data
-                if new_analysis_data:
-                    new_analysis_data.sort(key=lambda x: x.get('quality_score', 0), reverse=True)
-                    merged_content += "Rank Ticker   Market Cap   Score    Tier         Red Flags \n"
-                    merged_content += "--------------------------------------------------------------------------------\n"
-                    
-                    for i, item in enumerate(new_analysis_data[:20], 1):
-                        ticker = item.get('ticker', 'N/A')
-                        score = item.get('quality_score', 0)
-                        market_cap = item.get('market_cap', 'N/A')
-                        tier = item.get('tier', 'Unknown')
-                        red_flags = item.get('red_flags', 0)
-                        
-                        line = f"{i:<4} {ticker:<8} ${market_cap:<12} {score:<8.1f}    {tier:<12} {red_flags:<10}"
-                        merged_content += line + '\n'
+            current_quarter = self.get_current_quarter()
+            self.record_analysis(new_analysis_data, current_quarter)
+            pruned = self.store.prune(_shift_quarter(current_quarter, -self.MAX_QUARTERS_ARCHIVE))
+            if pruned:
+                logger.info(f"Pruned {pruned} quarterly records beyond retention")
             
             # Write updated content
             with open(self.summary_file, 'w') as f:
-                f.write(merged_content)
+                f.write(self.export_summary(index_name, total_stocks, current_quarter))
             
             logger.info(f"Updated summary file with {len(new_analysis_data)} new analysis results")
             
@@ -548,4 +616,10 @@ Current Quarter: {year} Q{quarter}
         except Exception as e:
             result['errors'].append(f"Error reading summary file: {e}")
         
-        return result
\ No newline at end of file
+        return result
+
+
+def _shift_quarter(quarter: int, n: int) -> int:
+    """Move a YYYYQ quarter number by ``n`` quarters."""
+    index = (quarter // 10) * 4 + (quarter % 10 - 1) + n
+    return (index // 4) * 10 + index % 4 + 1
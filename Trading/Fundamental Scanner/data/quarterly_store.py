@@ -0,0 +1,229 @@
+"""
+Quarterly Analysis Store
+
+Structured, append-only history of quality analyses: one typed row per
+(ticker, quarter), backing QuarterlyManager.
+
+The text summary used to be the only record, so every merge re-parsed and
+rewrote the accumulated file and any quarter-over-quarter comparison meant
+string parsing. Here a quarter's results are appended as rows; earlier
+quarters are never rewritten (re-analysing a ticker within the same quarter
+replaces only that quarter's row). Text summaries are rendered from the rows
+on demand.
+
+Features:
+- SQLite in WAL mode, primary key (ticker, quarter) plus a quarter index
+- Typed columns for the summary fields (score, market cap, tier, red flags);
+  any other fields of an analysis record are kept as JSON in ``extra``
+- ``history(ticker)`` is an indexed lookup; ``panel``/``quarter_over_quarter``
+  return tickers x quarters frames for vectorized comparisons
+- ``prune(before_quarter)`` applies the archive retention policy
+
+Usage:
+    from .quarterly_store import QuarterlyStore
+
+    store = QuarterlyStore("outputs/quarterly_analysis.db")
+    store.append(results, quarter=20262)
+    deltas = store.quarter_over_quarter("quality_score")
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Typed columns; every other key of an analysis record goes to ``extra``.
+NUMERIC_FIELDS = ("quality_score", "market_cap", "red_flags")
+TEXT_FIELDS = ("tier",)
+_COLUMNS = ("ticker", "quarter", "recorded_at") + NUMERIC_FIELDS + TEXT_FIELDS + ("extra",)
+
+
+class QuarterlyStore:
+    """
+    SQLite-backed quarterly analysis history, one row per (ticker, quarter).
+
+    Attributes:
+        db_path: Path to the SQLite database file
+    """
+
+    def __init__(self, db_path: Union[str, Path]):
+        """
+        Open (or create) the store.
+
+        Args:
+            db_path: Path to SQLite database file
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS quarterly_analysis (
+                ticker TEXT NOT NULL,
+                quarter INTEGER NOT NULL,
+                recorded_at REAL NOT NULL,
+                quality_score REAL,
+                market_cap REAL,
+                red_flags REAL,
+                tier TEXT,
+                extra TEXT,
+                PRIMARY KEY (ticker, quarter)
+            )
+        ''')
+        self._conn.execute(
+            'CREATE INDEX IF NOT EXISTS idx_quarterly_quarter ON quarterly_analysis(quarter)'
+        )
+        self._conn.commit()
+
+    # ---- writes ------------------------------------------------------------
+
+    def append(self, records: Iterable[Dict[str, Any]], quarter: int,
+               recorded_at: Optional[datetime] = None) -> int:
+        """
+        Record one quarter's analysis results in a single transaction.
+
+        Args:
+            records: Analysis dicts with at least ``ticker``
+            quarter: Quarter number in YYYYQ format
+            recorded_at: Timestamp for the rows (default: now)
+
+        Returns:
+            Number of rows written
+        """
+        ts = recorded_at.timestamp() if recorded_at else time.time()
+        rows = [_to_row(record, quarter, ts) for record in records if record.get('ticker')]
+        marks = ",".join("?" * len(_COLUMNS))
+        with self._lock:
+            self._conn.executemany(
+                f"INSERT OR REPLACE INTO quarterly_analysis ({', '.join(_COLUMNS)}) VALUES ({marks})",
+                rows,
+            )
+            self._conn.commit()
+        logger.debug(f"Recorded {len(rows)} analyses for quarter {quarter}")
+        return len(rows)
+
+    def prune(self, before_quarter: int) -> int:
+        """Delete rows older than ``before_quarter``; returns rows removed."""
+        with self._lock:
+            cur = self._conn.execute(
+                "DELETE FROM quarterly_analysis WHERE quarter < ?", (before_quarter,)
+            )
+            self._conn.commit()
+        return cur.rowcount
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    # ---- reads -------------------------------------------------------------
+
+    def quarters(self) -> List[int]:
+        """Stored quarters, oldest first."""
+        with self._lock:
+            return [q for (q,) in self._conn.execute(
+                "SELECT DISTINCT quarter FROM quarterly_analysis ORDER BY quarter"
+            )]
+
+    def history(self, ticker: str) -> pd.DataFrame:
+        """One ticker's rows indexed by quarter, oldest first."""
+        frame = self._frame("WHERE ticker = ? ORDER BY quarter", (ticker,))
+        return frame.set_index("quarter")
+
+    def quarter_frame(self, quarter: int) -> pd.DataFrame:
+        """All rows for one quarter, indexed by ticker."""
+        frame = self._frame("WHERE quarter = ? ORDER BY ticker", (quarter,))
+        return frame.set_index("ticker")
+
+    def records(self, quarter: int) -> List[Dict[str, Any]]:
+        """One quarter's analyses as dicts (typed fields merged with ``extra``)."""
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {', '.join(_COLUMNS)} FROM quarterly_analysis WHERE quarter = ?",
+                (quarter,),
+            ).fetchall()
+        out = []
+        for row in rows:
+            record = dict(zip(_COLUMNS[:-1], row[:-1]))
+            record.update(json.loads(row[-1]) if row[-1] else {})
+            out.append(record)
+        return out
+
+    def panel(self, field: str = "quality_score",
+              quarters: Optional[Iterable[int]] = None) -> pd.DataFrame:
+        """
+        Tickers x quarters frame of one numeric field.
+
+        Args:
+            field: One of NUMERIC_FIELDS
+            quarters: Restrict to these quarters (default: all)
+
+        Returns:
+            DataFrame indexed by ticker, one column per quarter (NaN = no row)
+        """
+        if field not in NUMERIC_FIELDS:
+            raise ValueError(f"Unknown numeric field {field!r}; expected one of {NUMERIC_FIELDS}")
+        sql = f"SELECT ticker, quarter, {field} FROM quarterly_analysis"
+        params: tuple = ()
+        if quarters is not None:
+            quarters = sorted(set(quarters))
+            sql += f" WHERE quarter IN ({','.join('?' * len(quarters))})"
+            params = tuple(quarters)
+        with self._lock:
+            long = pd.DataFrame(self._conn.execute(sql, params).fetchall(),
+                                columns=["ticker", "quarter", field])
+        wide = long.pivot(index="ticker", columns="quarter", values=field)
+        return wide.sort_index(axis=1).astype(float)
+
+    def quarter_over_quarter(self, field: str = "quality_score",
+                             quarters: Optional[Iterable[int]] = None) -> pd.DataFrame:
+        """
+        Change of ``field`` versus the previous stored quarter, for every ticker.
+
+        Columns are the later quarter of each pair; a ticker missing either
+        quarter gets NaN.
+        """
+        return self.panel(field, quarters).diff(axis=1).iloc[:, 1:]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM quarterly_analysis").fetchone()[0]
+
+    # ---- internals ---------------------------------------------------------
+
+    def _frame(self, where: str, params: tuple) -> pd.DataFrame:
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {', '.join(_COLUMNS[:-1])} FROM quarterly_analysis {where}", params
+            ).fetchall()
+        return pd.DataFrame(rows, columns=list(_COLUMNS[:-1]))
+
+
+def _to_float(value: Any) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _to_row(record: Dict[str, Any], quarter: int, ts: float) -> tuple:
+    """Split an analysis dict into typed columns and a JSON ``extra`` blob."""
+    extra = {k: v for k, v in record.items()
+             if k not in _COLUMNS or (k in NUMERIC_FIELDS and _to_float(v) is None and v is not None)}
+    return (
+        record['ticker'],
+        quarter,
+        ts,
+        *(_to_float(record.get(f)) for f in NUMERIC_FIELDS),
+        *(record.get(f) for f in TEXT_FIELDS),
+        json.dumps(extra, default=str) if extra else None,
+    )
@@ -22,13 +22,13 @@ import logging
 import time
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional, Any, Tuple
-import pickle
-import os
+from pathlib import Path
 from dataclasses import dataclass, asdict
 import json
 
 warnings.filterwarnings('ignore', category=FutureWarning, module='simfin.load')
 
+from .kv_store import KeyValueStore
 from .ticker_mapping import get_api_ticker, is_mapped_ticker
 from .stock_logger import get_stock_logger
 
@@ -98,56 +98,38 @@ class SimFinFinancialData:
 
 
 class SimFinDataCache:
-    """File-based cache for SimFin data with longer expiry (fundamental data changes quarterly)"""
+    """Per-ticker SQLite cache for SimFin data with longer expiry (fundamental data changes quarterly)"""
     
-    def __init__(self, cache_file: str = "simfin_cache.pkl", cache_days: int = 30):
-        self.cache_file = cache_file
+    def __init__(self, cache_file: str = "simfin_cache.db", cache_days: int = 30,
+                 batch_size: int = 1):
+        # A legacy ``simfin_cache.pkl`` next to the database is imported on first use.
+        self.cache_file = str(Path(cache_file).with_suffix(".db"))
         self.cache_days = cache_days
-        self.cache = self._load_cache()
-    
-    def _load_cache(self) -> Dict:
-        """Load cache from file"""
-        if os.path.exists(self.cache_file):
-            try:
-                with open(self.cache_file, 'rb') as f:
-                    cache = pickle.load(f)
-                    logger.debug(f"Loaded SimFin cache with {len(cache)} entries")
-                    return cache
-            except Exception as e:
-                logger.warning(f"Failed to load SimFin cache: {e}")
-        return {}
-    
-    def _save_cache(self):
-        """Save cache to file"""
-        try:
-            with open(self.cache_file, 'wb') as f:
-                pickle.dump(self.cache, f)
-            logger.debug(f"Saved SimFin cache with {len(self.cache)} entries")
-        except Exception as e:
-            logger.error(f"Failed to save SimFin cache: {e}")
+        self.store = KeyValueStore(self.cache_file, batch_size=batch_size,
+                                   legacy_pickle=Path(cache_file).with_suffix(".pkl"))
     
     def get(self, ticker: str) -> Optional[SimFinFinancialData]:
         """Get cached SimFin data if available and fresh"""
-        if ticker in self.cache:
-            data, timestamp = self.cache[ticker]
-            if datetime.now() - timestamp < timedelta(days=self.cache_days):
-                logger.debug(f"SimFin cache HIT for {ticker}")
-                return data
-            else:
-                logger.debug(f"SimFin cache EXPIRED for {ticker}")
-                del self.cache[ticker]
-        return None
+        data = self.store.get(ticker, timedelta(days=self.cache_days))
+        logger.debug(f"SimFin cache {'HIT' if data is not None else 'MISS'} for {ticker}")
+        return data
+    
+    def get_many(self, tickers: List[str]) -> Dict[str, SimFinFinancialData]:
+        """Fresh cached entries for many tickers in one query"""
+        return self.store.get_many(tickers, timedelta(days=self.cache_days))
     
     def set(self, ticker: str, data: SimFinFinancialData):
         """Cache SimFin data"""
-        self.cache[ticker] = (data, datetime.now())
-        self._save_cache()
+        self.store.set(ticker, data)
         logger.debug(f"Cached SimFin data for {ticker}")
     
+    def flush(self):
+        """Commit any batched writes"""
+        self.store.flush()
+    
     def clear(self):
         """Clear entire cache"""
-        self.cache = {}
-        self._save_cache()
+        self.store.clear()
         logger.info("SimFin cache cleared")
 
 
@@ -165,7 +147,7 @@ class SimFinDataFetcher:
     """
     
     def __init__(self, api_key: str = None, enable_cache: bool = True, 
-                 cache_file: str = "simfin_cache.pkl"):
+                 cache_file: str = "simfin_cache.db"):
         """
         Initialize SimFin data fetcher
         
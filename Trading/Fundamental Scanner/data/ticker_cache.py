@@ -5,7 +5,8 @@ Provides caching for ticker symbol mappings to avoid repeated lookups
 and improve performance when processing large lists of tickers.
 
 Features:
-- File-based persistence (JSON format)
+- File-based persistence (JSON snapshot + append-only journal, see json_journal.py)
+- Loaded once into an in-memory dict; lookups never touch the file
 - TTL-based expiration (default 7 days)
 - Thread-safe operations
 - Automatic cleanup of expired entries
@@ -22,13 +23,13 @@ Usage:
         cache.set('FISV', 'simfin', 'FI')
 """
 
-import json
 import logging
-import os
 import threading
 from datetime import datetime, timedelta
 from typing import Dict, Optional
 
+from .json_journal import JsonJournal
+
 logger = logging.getLogger(__name__)
 
 
@@ -44,6 +45,7 @@ class TickerMappingCache:
         ttl_days: Time-to-live for cache entries in days
         _lock: Thread lock for thread-safe operations
         _cache: In-memory cache dictionary
+        _written: Parsed entry timestamps (for TTL checks without re-parsing)
     """
 
     def __init__(
@@ -62,59 +64,69 @@ class TickerMappingCache:
         self.ttl_days = ttl_days
         self._lock = threading.RLock()
         self._cache: Dict[str, dict] = {}
+        self._written: Dict[str, Optional[datetime]] = {}
+        self._journal = JsonJournal(cache_file)
         self._load_cache()
 
     def _load_cache(self) -> None:
-        """Load cache from JSON file if it exists."""
-        if not os.path.exists(self.cache_file):
-            logger.debug(f"Ticker cache file not found: {self.cache_file}")
+        """Load snapshot + journal once into memory, dropping expired entries."""
+        try:
+            data = self._journal.load()
+        except Exception as e:
+            logger.warning(f"Failed to load ticker cache: {e}")
             return
 
-        try:
-            with open(self.cache_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+        if not data:
+            logger.debug(f"Ticker cache file not found or empty: {self.cache_file}")
+            return
 
-            # Validate cache structure
-            if not isinstance(data, dict):
-                logger.warning(f"Invalid ticker cache format: expected dict")
-                return
+        # Load and validate entries
+        loaded_count = 0
+        expired_count = 0
 
-            # Load and validate entries
-            now = datetime.now()
-            loaded_count = 0
-            expired_count = 0
+        for key, value in data.items():
+            if not isinstance(value, dict):
+                continue
 
-            for key, value in data.items():
-                if not isinstance(value, dict):
+            # Check TTL
+            timestamp = value.get('timestamp')
+            entry_time = None
+            if timestamp:
+                try:
+                    entry_time = datetime.fromisoformat(timestamp)
+                except ValueError:
                     continue
+            if self._expired(entry_time):
+                expired_count += 1
+                continue
 
-                # Check TTL
-                timestamp = value.get('timestamp')
-                if timestamp:
-                    try:
-                        entry_time = datetime.fromisoformat(timestamp)
-                        if now - entry_time > timedelta(days=self.ttl_days):
-                            expired_count += 1
-                            continue
-                    except ValueError:
-                        continue
-
-                self._cache[key] = value
-                loaded_count += 1
-
-            logger.info(
-                f"Loaded ticker cache: {loaded_count} entries, "
-                f"{expired_count} expired entries discarded"
-            )
+            self._cache[key] = value
+            self._written[key] = entry_time
+            loaded_count += 1
+
+        logger.info(
+            f"Loaded ticker cache: {loaded_count} entries, "
+            f"{expired_count} expired entries discarded"
+        )
+
+    def _expired(self, entry_time: Optional[datetime]) -> bool:
+        return entry_time is not None and datetime.now() - entry_time > timedelta(days=self.ttl_days)
 
+    def _persist(self, key: str) -> None:
+        """Journal one change (write or delete); compact when the journal outgrows the cache."""
+        try:
+            if key in self._cache:
+                self._journal.put(key, self._cache[key])
+            else:
+                self._journal.delete(key)
+            self._journal.maybe_compact(self._cache)
         except Exception as e:
-            logger.warning(f"Failed to load ticker cache: {e}")
+            logger.error(f"Failed to save ticker cache: {e}")
 
     def _save_cache(self) -> None:
-        """Save cache to JSON file."""
+        """Write the full cache as a fresh snapshot (empties the journal)."""
         try:
-            with open(self.cache_file, 'w', encoding='utf-8') as f:
-                json.dump(self._cache, f, indent=2, default=str)
+            self._journal.compact(self._cache)
             logger.debug(f"Saved ticker cache: {len(self._cache)} entries")
         except Exception as e:
             logger.error(f"Failed to save ticker cache: {e}")
@@ -137,22 +149,16 @@ class TickerMappingCache:
         with self._lock:
             key = self._make_key(ticker, api_source)
 
-            if key not in self._cache:
+            entry = self._cache.get(key)
+            if entry is None:
                 return None
 
-            entry = self._cache[key]
-
             # Check TTL
-            timestamp = entry.get('timestamp')
-            if timestamp:
-                try:
-                    entry_time = datetime.fromisoformat(timestamp)
-                    if datetime.now() - entry_time > timedelta(days=self.ttl_days):
-                        del self._cache[key]
-                        logger.debug(f"Ticker cache entry expired: {key}")
-                        return None
-                except ValueError:
-                    return None
+            if self._expired(self._written.get(key)):
+                del self._cache[key]
+                del self._written[key]
+                logger.debug(f"Ticker cache entry expired: {key}")
+                return None
 
             return entry.get('mapped_ticker')
 
@@ -175,15 +181,17 @@ class TickerMappingCache:
         with self._lock:
             key = self._make_key(ticker, api_source)
 
+            now = datetime.now()
             self._cache[key] = {
                 'standard_ticker': ticker.upper(),
                 'api_source': api_source.lower(),
                 'mapped_ticker': mapped_ticker.upper(),
-                'timestamp': datetime.now().isoformat(),
+                'timestamp': now.isoformat(),
                 'discovered': discovered
             }
+            self._written[key] = now
 
-            self._save_cache()
+            self._persist(key)
 
             if discovered:
                 logger.info(
@@ -207,7 +215,8 @@ class TickerMappingCache:
 
             if key in self._cache:
                 del self._cache[key]
-                self._save_cache()
+                self._written.pop(key, None)
+                self._persist(key)
                 return True
 
             return False
@@ -216,6 +225,7 @@ class TickerMappingCache:
         """Clear all cached ticker mappings."""
         with self._lock:
             self._cache.clear()
+            self._written.clear()
             self._save_cache()
             logger.info("Ticker mapping cache cleared")
 
@@ -257,21 +267,11 @@ class TickerMappingCache:
             Number of entries removed
         """
         with self._lock:
-            now = datetime.now()
-            expired_keys = []
-
-            for key, entry in self._cache.items():
-                timestamp = entry.get('timestamp')
-                if timestamp:
-                    try:
-                        entry_time = datetime.fromisoformat(timestamp)
-                        if now - entry_time > timedelta(days=self.ttl_days):
-                            expired_keys.append(key)
-                    except ValueError:
-                        expired_keys.append(key)
+            expired_keys = [key for key in self._cache if self._expired(self._written.get(key))]
 
             for key in expired_keys:
                 del self._cache[key]
+                del self._written[key]
 
             if expired_keys:
                 self._save_cache()
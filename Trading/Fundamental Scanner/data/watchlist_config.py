@@ -13,6 +13,10 @@ Provides configurable watchlist system for screening different universes:
 This module replaces the hardcoded S&P 500 watchlist with a flexible
 configuration system that enables screening across different market cap tiers.
 
+Index lists come from the constituent snapshot store (constituent_store.py):
+pages are scraped only when the saved snapshot is older than its max age, and
+``get_constituent_changes()`` lists names added/removed since the last version.
+
 Usage:
     from data.watchlist_config import WatchlistIndex, WatchlistConfig
 
@@ -39,20 +43,12 @@ Academic Foundation:
 """
 
 import logging
+from datetime import datetime
 from enum import Enum
-from typing import List, Optional, Set
-from dataclasses import dataclass
-
-# Import fetcher functions (will be added in Task 2.2)
-from data.financial_data_fetcher import (
-    get_sp500_tickers,
-    get_sp400_tickers,
-    get_sp600_tickers,
-    get_nasdaq100_tickers,
-    get_russell3000_tickers,
-    get_russell1000_tickers,
-    get_russell2000_tickers
-)
+from typing import List, Optional, Set, Tuple
+from dataclasses import dataclass, field
+
+from data.constituent_store import COMPOSITE_INDICES, ConstituentStore, get_default_store
 
 logger = logging.getLogger(__name__)
 
@@ -109,6 +105,7 @@ class WatchlistConfig:
         custom_tickers: List of tickers (only used if index=CUSTOM)
         limit: Optional limit for number of tickers (for performance)
         multi_indices: List of indices to combine (only used if index=MULTI)
+        store: Constituent snapshot store (default: shared project-level constituents.db)
 
     Examples:
         # Screen top 50 from S&P 500 (daily quick check)
@@ -143,32 +140,38 @@ class WatchlistConfig:
     custom_tickers: Optional[List[str]] = None
     limit: Optional[int] = None
     multi_indices: Optional[List[WatchlistIndex]] = None
+    store: Optional[ConstituentStore] = field(default=None, repr=False, compare=False)
+
+    def _constituents(self) -> ConstituentStore:
+        return self.store or get_default_store()
 
     def _get_tickers_for_index(self, idx: WatchlistIndex) -> List[str]:
         """Get tickers for a single index"""
-        if idx == WatchlistIndex.SP500:
-            return get_sp500_tickers()
-        elif idx == WatchlistIndex.SP400:
-            return get_sp400_tickers()
-        elif idx == WatchlistIndex.SP600:
-            return get_sp600_tickers()
-        elif idx == WatchlistIndex.NASDAQ100:
-            return get_nasdaq100_tickers()
-        elif idx == WatchlistIndex.RUSSELL1000:
-            return get_russell1000_tickers()
-        elif idx == WatchlistIndex.RUSSELL2000:
-            return get_russell2000_tickers()
-        elif idx == WatchlistIndex.RUSSELL3000:
-            return get_russell3000_tickers()
-        elif idx == WatchlistIndex.COMBINED_SP:
-            sp500 = get_sp500_tickers()
-            sp400 = get_sp400_tickers()
-            sp600 = get_sp600_tickers()
-            return list(set(sp500) | set(sp400) | set(sp600))
-        elif idx == WatchlistIndex.CUSTOM:
+        if idx == WatchlistIndex.CUSTOM:
             return self.custom_tickers or []
-        else:
+        elif idx == WatchlistIndex.MULTI:
             return []
+        return self._constituents().get(idx.value)
+
+    def get_constituent_changes(self, since: Optional[datetime] = None) -> Tuple[List[str], List[str]]:
+        """Tickers added to / removed from the universe between snapshots
+
+        Args:
+            since: Compare against the snapshots current at this time
+                (default: each index's previous snapshot)
+
+        Returns:
+            Tuple of (added, removed); both empty for CUSTOM lists
+        """
+        if self.index == WatchlistIndex.CUSTOM:
+            return [], []
+        indices = self.multi_indices if self.index == WatchlistIndex.MULTI else [self.index]
+        # Diff the union, so a name moving between indices is neither added nor removed
+        bases = dict.fromkeys(
+            base for idx in indices or [] for base in COMPOSITE_INDICES.get(idx.value, (idx.value,))
+        )
+        added, removed = self._constituents().diff_union(bases, since)
+        return sorted(added), sorted(removed)
 
     def get_tickers(self) -> List[str]:
         """Get ticker list based on configuration
@@ -189,7 +192,8 @@ class WatchlistConfig:
 
         Performance:
             - Uses 24-hour cache for financial data (downstream)
-            - Index lists fetched fresh each time (lightweight operation)
+            - Index lists served from constituent snapshots; scraped only
+              once a snapshot exceeds the store's max age
             - ThreadPoolExecutor used for parallel data fetching (downstream)
         """
         logger.info(f"Fetching watchlist tickers for index: {self.index.value}")
@@ -221,12 +225,12 @@ class WatchlistConfig:
             logger.info(f"Combined total (deduplicated): {len(tickers)} tickers")
 
         elif self.index == WatchlistIndex.COMBINED_SP:
-            sp500 = get_sp500_tickers()
-            sp400 = get_sp400_tickers()
-            sp600 = get_sp600_tickers()
+            store = self._constituents()
+            sp500 = store.get(WatchlistIndex.SP500.value)
+            sp400 = store.get(WatchlistIndex.SP400.value)
+            sp600 = store.get(WatchlistIndex.SP600.value)
 
-            tickers_set: Set[str] = set(sp500) | set(sp400) | set(sp600)
-            tickers = list(tickers_set)
+            tickers = store.get(self.index.value)
 
             logger.info(
                 f"Combined S&P 1500: "
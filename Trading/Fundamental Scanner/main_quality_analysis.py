@@ -27,10 +27,18 @@ Single-Step Workflow:
 Other Options:
     --limit N: Process first N tickers only
     --workers N: Parallel workers (default: 10, max: 10 for yfinance)
-    --rate R: Requests per second (default: 1.0, lower if hitting 429s)
+    --rate R: Starting requests per second (default: 1.0; adapts to 429s)
     --top-n N: Number in shortlist (default: 25)
     --ticker AAPL: Single-stock analysis
 
+Quick lookups (no network, no pandas/yfinance import — start in well under a second):
+    python main_quality_analysis.py --info AAPL      # cached metadata + latest score
+    python main_quality_analysis.py --cache-info     # cache / index / constituent status
+    python main_quality_analysis.py --cache-info --rebuild-index
+
+Heavy subsystems (fetchers, scorer, pandas) are imported per command, only by
+the command that needs them; `benchmark_startup.py` measures startup time.
+
 Output:
     - outputs/opportunities_YYYYMMDD.json: Full ranked dataset with all signals
     - outputs/opportunities_YYYYMMDD_top.txt: Human-readable top-N shortlist
@@ -92,13 +100,19 @@ signal.signal(signal.SIGTERM, _signal_handler)
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent))
 
-from workflows.opportunity_discovery import OpportunityDiscoveryWorkflow
-from data.watchlist_config import WatchlistConfig, WatchlistIndex
+# Subsystems are imported inside the command handlers below: fetchers pull in
+# yfinance/pandas and the scorer pulls in pandas, which --info / --cache-info /
+# --help never need.
+
+INDEX_CHOICES = ['sp500', 'sp400', 'sp600', 'nasdaq100', 'russell1000', 'russell2000',
+                 'russell3000', 'combined_sp']
 
 
 def parse_indices(indices_str: str) -> list:
     """Parse comma-separated index string into list of WatchlistIndex"""
-    valid_indices = ['sp500', 'sp400', 'sp600', 'nasdaq100', 'russell1000', 'russell2000', 'russell3000', 'combined_sp']
+    from data.watchlist_config import WatchlistIndex
+
+    valid_indices = INDEX_CHOICES
     indices = []
     for idx in indices_str.split(','):
         idx = idx.strip().lower()
@@ -108,7 +122,8 @@ def parse_indices(indices_str: str) -> list:
     return indices
 
 
-def main():
+def build_parser() -> argparse.ArgumentParser:
+    """CLI definition (no subsystem imports)."""
     parser = argparse.ArgumentParser(
         description='Cross-Sectional Quality Scoring (Academic Research-Based)',
         epilog='Examples:\n'
@@ -127,7 +142,11 @@ def main():
                '  python main_quality_analysis.py --index sp500 --limit 100\n'
                '\n'
                '  # Single stock:\n'
-               '  python main_quality_analysis.py --ticker AAPL',
+               '  python main_quality_analysis.py --ticker AAPL\n'
+               '\n'
+               '  # Instant lookups from the metadata index (no network):\n'
+               '  python main_quality_analysis.py --info AAPL\n'
+               '  python main_quality_analysis.py --cache-info',
         formatter_class=argparse.RawDescriptionHelpFormatter,
         usage='%(prog)s [options]'
     )
@@ -137,7 +156,7 @@ def main():
     group.add_argument(
         '--index',
         type=str,
-        choices=['sp500', 'sp400', 'sp600', 'nasdaq100', 'russell1000', 'russell2000', 'russell3000', 'combined_sp'],
+        choices=INDEX_CHOICES,
         help='Single index to screen (default: combined_sp)'
     )
     group.add_argument(
@@ -150,6 +169,17 @@ def main():
         type=str,
         help='Individual stock ticker (e.g., AAPL, MSFT, NVDA)'
     )
+    group.add_argument(
+        '--info',
+        type=str,
+        metavar='TICKER',
+        help='Show cached metadata and latest score for a ticker (no fetch, no scoring)'
+    )
+    group.add_argument(
+        '--cache-info',
+        action='store_true',
+        help='Show merged cache, metadata index and constituent snapshot status'
+    )
 
     parser.add_argument(
         '--limit',
@@ -176,7 +206,7 @@ def main():
         '--rate',
         type=float,
         default=1.0,
-        help='Requests per second (default: 1.0, lower if hitting 429s)'
+        help='Starting requests per second per endpoint (default: 1.0; adapts up/down automatically)'
     )
 
     parser.add_argument(
@@ -191,9 +221,23 @@ def main():
         help='Skip fetch phase, only score cached data'
     )
 
-    args = parser.parse_args()
+    parser.add_argument(
+        '--rebuild-index',
+        action='store_true',
+        help='With --cache-info: rebuild the metadata index from the merged cache'
+    )
+
+    return parser
+
+
+def validate_args(parser: argparse.ArgumentParser, args: argparse.Namespace) -> None:
+    """Cross-option checks and defaults (exits via parser.error)"""
+    if args.rebuild_index and not args.cache_info:
+        parser.error("--rebuild-index is only used with --cache-info")
+
+    if args.info or args.cache_info:
+        return
 
-    # Validate arguments
     if not args.index and not args.indices and not args.ticker:
         # Default to composite SP1500 (all S&P indices combined)
         args.index = 'combined_sp'
@@ -207,134 +251,137 @@ def main():
     if args.fetch_only and args.score_only:
         parser.error("Cannot use --fetch-only and --score-only together. Choose one.")
 
-    if args.ticker:
-        # Individual stock analysis
-        ticker = args.ticker.upper()
-
-        # For single-ticker, we want to score against the full cached universe (if available)
-        # to get meaningful cross-sectional z-scores. Otherwise z-scores are all 0.0 (N=1).
-        from pathlib import Path
-        import pickle
-
-        cache_file = Path(__file__).parent / "merged_opportunity_cache.pkl"
-        cached_universe = []
-
-        if cache_file.exists() and args.score_only:
-            # Load all cached tickers to use as universe
-            try:
-                with cache_file.open("rb") as f:
-                    cache_data = pickle.load(f)
-                    cached_universe = list(cache_data.keys())
-                if len(cached_universe) > 1:
-                    print(f"[single-ticker] Scoring {ticker} against cached universe of {len(cached_universe)} tickers")
-                    print(f"[single-ticker] This provides meaningful cross-sectional z-scores")
-            except Exception as e:
-                print(f"[single-ticker] Could not load cache: {e}")
-
-        # Create workflow
-        if cached_universe and args.score_only:
-            # Score against full universe, then filter to target ticker
-            config = WatchlistConfig(
-                index=WatchlistIndex.CUSTOM,
-                custom_tickers=cached_universe
-            )
-            workflow = OpportunityDiscoveryWorkflow(
-                watchlist_config=config,
-                max_workers=1,
-                requests_per_second=args.rate,
-                top_n=len(cached_universe),  # Get all reports
-                write_outputs=False,  # We'll write custom filtered output
-            )
-            reports = workflow.score(cached_universe)
-
-            # Filter to target ticker and write custom output
-            target_report = next((r for r in reports if r.ticker == ticker), None)
-            if target_report:
-                # Write single-ticker output files
-                from datetime import datetime
-                import json
-                from pathlib import Path
-
-                outputs_dir = Path(__file__).parent / "outputs"
-                outputs_dir.mkdir(parents=True, exist_ok=True)
-                stamp = datetime.now().strftime("%Y%m%d")
-
-                # JSON output (single ticker)
-                json_path = outputs_dir / f"opportunities_{stamp}_single_{ticker}.json"
-                with json_path.open("w") as f:
-                    json.dump(target_report.to_dict(), f, indent=2, default=str)
-
-                # Human-readable output
-                txt_path = outputs_dir / f"opportunities_{stamp}_single_{ticker}.txt"
-                with txt_path.open("w") as f:
-                    f.write(f"Single Ticker Analysis: {ticker}\n")
-                    f.write(f"Universe: {len(cached_universe)} tickers from cache\n")
-                    f.write("=" * 80 + "\n\n")
-                    f.write(f"Rank:              {reports.index(target_report) + 1} of {len(reports)}\n")
-                    f.write(f"Opportunity Score: {target_report.opportunity_score:.1f} / 100\n")
-                    if target_report.qarp_score:
-                        f.write(f"QARP Score:        {target_report.qarp_score:.1f} / 100\n")
-                    f.write(f"Tier:              {target_report.tier}\n")
-                    f.write(f"Gates Passed:      {'✅ Yes' if target_report.gates_passed else '❌ No'}\n")
-                    if target_report.gate_failures:
-                        f.write(f"Gate Failures:     {', '.join(target_report.gate_failures)}\n")
-                    f.write(f"Sector:            {target_report.sector or 'N/A'}\n")
-                    f.write(f"Market Cap:        ${target_report.market_cap:,.0f}\n" if target_report.market_cap else "")
-                    f.write("\n" + "=" * 80 + "\n")
-                    f.write("SIGNALS (Raw Values)\n")
-                    f.write("=" * 80 + "\n")
-                    for k, v in target_report.signals.items():
-                        if v is not None:
-                            if isinstance(v, float):
-                                if abs(v) < 0.01:
-                                    f.write(f"{k:25s} {v:.4f}\n")
-                                elif abs(v) < 1:
-                                    f.write(f"{k:25s} {v:.3f}\n")
-                                else:
-                                    f.write(f"{k:25s} {v:.2f}\n")
+
+def cmd_ticker(args: argparse.Namespace) -> None:
+    """Single-stock analysis (fetch in isolation, or score against the cached universe)"""
+    from data.watchlist_config import WatchlistConfig, WatchlistIndex
+    from workflows.merged_cache import MergedCache
+    from workflows.opportunity_discovery import OpportunityDiscoveryWorkflow
+
+    ticker = args.ticker.upper()
+
+    # For single-ticker, we want to score against the full cached universe (if available)
+    # to get meaningful cross-sectional z-scores. Otherwise z-scores are all 0.0 (N=1).
+    cached_universe = []
+
+    if args.score_only:
+        # Load all cached tickers to use as universe
+        try:
+            cached_universe = MergedCache().keys()
+            if len(cached_universe) > 1:
+                print(f"[single-ticker] Scoring {ticker} against cached universe of {len(cached_universe)} tickers")
+                print(f"[single-ticker] This provides meaningful cross-sectional z-scores")
+        except Exception as e:
+            print(f"[single-ticker] Could not load cache: {e}")
+
+    # Create workflow
+    if cached_universe and args.score_only:
+        # Score against full universe, then filter to target ticker
+        config = WatchlistConfig(
+            index=WatchlistIndex.CUSTOM,
+            custom_tickers=cached_universe
+        )
+        workflow = OpportunityDiscoveryWorkflow(
+            watchlist_config=config,
+            max_workers=1,
+            requests_per_second=args.rate,
+            top_n=len(cached_universe),  # Get all reports
+            write_outputs=False,  # We'll write custom filtered output
+        )
+        reports = workflow.score(cached_universe)
+
+        # Filter to target ticker and write custom output
+        target_report = next((r for r in reports if r.ticker == ticker), None)
+        if target_report:
+            # Write single-ticker output files
+            from datetime import datetime
+            import json
+            from pathlib import Path
+
+            outputs_dir = Path(__file__).parent / "outputs"
+            outputs_dir.mkdir(parents=True, exist_ok=True)
+            stamp = datetime.now().strftime("%Y%m%d")
+
+            # JSON output (single ticker)
+            json_path = outputs_dir / f"opportunities_{stamp}_single_{ticker}.json"
+            with json_path.open("w") as f:
+                json.dump(target_report.to_dict(), f, indent=2, default=str)
+
+            # Human-readable output
+            txt_path = outputs_dir / f"opportunities_{stamp}_single_{ticker}.txt"
+            with txt_path.open("w") as f:
+                f.write(f"Single Ticker Analysis: {ticker}\n")
+                f.write(f"Universe: {len(cached_universe)} tickers from cache\n")
+                f.write("=" * 80 + "\n\n")
+                f.write(f"Rank:              {reports.index(target_report) + 1} of {len(reports)}\n")
+                f.write(f"Opportunity Score: {target_report.opportunity_score:.1f} / 100\n")
+                if target_report.qarp_score:
+                    f.write(f"QARP Score:        {target_report.qarp_score:.1f} / 100\n")
+                f.write(f"Tier:              {target_report.tier}\n")
+                f.write(f"Gates Passed:      {'✅ Yes' if target_report.gates_passed else '❌ No'}\n")
+                if target_report.gate_failures:
+                    f.write(f"Gate Failures:     {', '.join(target_report.gate_failures)}\n")
+                f.write(f"Sector:            {target_report.sector or 'N/A'}\n")
+                f.write(f"Market Cap:        ${target_report.market_cap:,.0f}\n" if target_report.market_cap else "")
+                f.write("\n" + "=" * 80 + "\n")
+                f.write("SIGNALS (Raw Values)\n")
+                f.write("=" * 80 + "\n")
+                for k, v in target_report.signals.items():
+                    if v is not None:
+                        if isinstance(v, float):
+                            if abs(v) < 0.01:
+                                f.write(f"{k:25s} {v:.4f}\n")
+                            elif abs(v) < 1:
+                                f.write(f"{k:25s} {v:.3f}\n")
                             else:
-                                f.write(f"{k:25s} {v}\n")
-                    f.write("\n" + "=" * 80 + "\n")
-                    f.write("Z-SCORES (Cross-Sectional Rankings)\n")
-                    f.write("=" * 80 + "\n")
-                    for k, v in target_report.z_scores.items():
-                        percentile = 50 + (v / 3) * 50  # Rough percentile estimate
-                        percentile = max(0, min(100, percentile))
-                        f.write(f"{k:25s} {v:6.2f}  (~{percentile:.0f}th percentile)\n")
-
-                print(f"\n✅ Single-ticker analysis complete:")
-                print(f"   Rank: {reports.index(target_report) + 1} / {len(reports)}")
-                print(f"   Opp Score: {target_report.opportunity_score:.1f}")
-                print(f"   QARP Score: {target_report.qarp_score:.1f}" if target_report.qarp_score else "")
-                print(f"   Tier: {target_report.tier}")
-                print(f"\n📄 Details: {txt_path}")
-                print(f"📊 JSON: {json_path}")
-            else:
-                print(f"❌ {ticker} not found in cached universe")
+                                f.write(f"{k:25s} {v:.2f}\n")
+                        else:
+                            f.write(f"{k:25s} {v}\n")
+                f.write("\n" + "=" * 80 + "\n")
+                f.write("Z-SCORES (Cross-Sectional Rankings)\n")
+                f.write("=" * 80 + "\n")
+                for k, v in target_report.z_scores.items():
+                    percentile = 50 + (v / 3) * 50  # Rough percentile estimate
+                    percentile = max(0, min(100, percentile))
+                    f.write(f"{k:25s} {v:6.2f}  (~{percentile:.0f}th percentile)\n")
+
+            print(f"\n✅ Single-ticker analysis complete:")
+            print(f"   Rank: {reports.index(target_report) + 1} / {len(reports)}")
+            print(f"   Opp Score: {target_report.opportunity_score:.1f}")
+            print(f"   QARP Score: {target_report.qarp_score:.1f}" if target_report.qarp_score else "")
+            print(f"   Tier: {target_report.tier}")
+            print(f"\n📄 Details: {txt_path}")
+            print(f"📊 JSON: {json_path}")
         else:
-            # Fallback: analyze in isolation (z-scores will be 0.0)
-            if not args.score_only:
-                print(f"[single-ticker] Fetching data for {ticker} (isolated analysis)")
-                print(f"[single-ticker] ⚠️  Z-scores will be 0.0 (N=1). Run --fetch-only on an index first, then --ticker {ticker} --score-only for cross-sectional rankings.")
-
-            config = WatchlistConfig(
-                index=WatchlistIndex.CUSTOM,
-                custom_tickers=[ticker]
-            )
-            workflow = OpportunityDiscoveryWorkflow(
-                watchlist_config=config,
-                max_workers=1,
-                requests_per_second=args.rate,
-                top_n=1,
-            )
-            if args.score_only:
-                workflow.score([ticker])
-            else:
-                workflow.run(limit=1)
-            print(f"\nSingle-ticker analysis complete. Check outputs/opportunities_*.txt for {ticker}")
-        return
+            print(f"❌ {ticker} not found in cached universe")
+    else:
+        # Fallback: analyze in isolation (z-scores will be 0.0)
+        if not args.score_only:
+            print(f"[single-ticker] Fetching data for {ticker} (isolated analysis)")
+            print(f"[single-ticker] ⚠️  Z-scores will be 0.0 (N=1). Run --fetch-only on an index first, then --ticker {ticker} --score-only for cross-sectional rankings.")
+
+        config = WatchlistConfig(
+            index=WatchlistIndex.CUSTOM,
+            custom_tickers=[ticker]
+        )
+        workflow = OpportunityDiscoveryWorkflow(
+            watchlist_config=config,
+            max_workers=1,
+            requests_per_second=args.rate,
+            top_n=1,
+        )
+        if args.score_only:
+            workflow.score([ticker])
+        else:
+            workflow.run(limit=1)
+        print(f"\nSingle-ticker analysis complete. Check outputs/opportunities_*.txt for {ticker}")
+
+
+def cmd_index(args: argparse.Namespace) -> None:
+    """Index analysis (single or multiple): fetch, score, or both"""
+    from data.watchlist_config import WatchlistConfig, WatchlistIndex
+    from workflows.opportunity_discovery import OpportunityDiscoveryWorkflow
 
-    # Index analysis (single or multiple)
     # Create watchlist config
     if args.index:
         index_map = {
@@ -363,6 +410,9 @@ def main():
     # Get tickers
     all_tickers = config.get_tickers()
     print(f"Universe: {len(all_tickers)} tickers from {args.index or args.indices}")
+    added, removed = config.get_constituent_changes()
+    if added or removed:
+        print(f"Constituent changes since previous snapshot: +{len(added)} / -{len(removed)}")
 
     # Always use opportunity discovery workflow (academic research-based)
     workflow = OpportunityDiscoveryWorkflow(
@@ -378,7 +428,7 @@ def main():
     if args.fetch_only:
         # Phase 1 only: fetch and cache (resumable with Ctrl-C)
         workflow.gather(tickers)
-        print(f"\n✅ Fetch complete. Data cached in merged_opportunity_cache.pkl")
+        print(f"\n✅ Fetch complete. Data cached in merged_opportunity_cache.db")
         print(f"📊 Run scoring with: python main_quality_analysis.py --score-only")
     elif args.score_only:
         # Phase 2 only: score from cache
@@ -388,5 +438,131 @@ def main():
         workflow.run(limit=args.limit if args.limit > 0 else None)
 
 
+def _age(when) -> str:
+    from datetime import datetime
+
+    days = (datetime.now() - when).total_seconds() / 86400
+    return f"{days * 24:.0f}h ago" if days < 1 else f"{days:.1f}d ago"
+
+
+def cmd_info(args: argparse.Namespace) -> None:
+    """Metadata-index lookup for one ticker (sqlite only; no fetch, no scoring)"""
+    from data.metadata_index import MetadataIndex
+    from workflows.merged_cache import METADATA_INDEX_FILE
+
+    ticker = args.info.upper()
+    if not METADATA_INDEX_FILE.exists():
+        print(f"No metadata index at {METADATA_INDEX_FILE.name}. Run --fetch-only / --score-only, "
+              f"or --cache-info --rebuild-index to build it from the merged cache.")
+        return
+
+    index = MetadataIndex(METADATA_INDEX_FILE)
+    record = index.get(ticker)
+    if record is None:
+        print(f"❌ {ticker} is not in the metadata index")
+        similar = index.search(ticker[:2], limit=10)
+        if similar:
+            print(f"   Indexed tickers starting with {ticker[:2]}: {', '.join(similar)}")
+        print(f"   Fetch it with --ticker {ticker} --fetch-only, or run --cache-info --rebuild-index")
+        return
+
+    print(f"{ticker} — {record['sector'] or 'N/A'}"
+          + (f" / {record['industry']}" if record['industry'] else ""))
+    if record['market_cap']:
+        print(f"  Market Cap:        ${record['market_cap']:,.0f}")
+    if record['current_price']:
+        print(f"  Price:             ${record['current_price']:,.2f}")
+    print(f"  Data Quality:      {record['data_quality'] or 'N/A'}")
+    if record['fetched_at']:
+        print(f"  Fetched:           {record['fetched_at']:%Y-%m-%d %H:%M} ({_age(record['fetched_at'])})")
+    if record['scored_at'] is None:
+        print("  Not scored yet — run --score-only")
+        return
+    print(f"  Opportunity Score: {record['opportunity_score']:.1f} / 100"
+          f"   (rank {record['rank']} of {record['universe_size']})")
+    if record['qarp_score'] is not None:
+        print(f"  QARP Score:        {record['qarp_score']:.1f} / 100")
+    print(f"  Tier:              {record['tier']}")
+    print(f"  Gates Passed:      {'✅ Yes' if record['gates_passed'] else '❌ No'}")
+    if record['gate_failures']:
+        print(f"  Gate Failures:     {', '.join(record['gate_failures'])}")
+    print(f"  Scored:            {record['scored_at']:%Y-%m-%d %H:%M} ({_age(record['scored_at'])})")
+
+
+def cmd_cache_info(args: argparse.Namespace) -> None:
+    """Status of the merged cache, metadata index and constituent snapshots"""
+    from data.metadata_index import MetadataIndex
+    from workflows.merged_cache import MERGED_CACHE_FILE, METADATA_INDEX_FILE, MergedCache
+
+    cache = MergedCache() if MERGED_CACHE_FILE.exists() else None
+    if cache is None:
+        print(f"Merged cache:    {MERGED_CACHE_FILE.name} — not created yet (run --fetch-only)")
+    else:
+        print(f"Merged cache:    {MERGED_CACHE_FILE.name} — {len(cache):,} tickers "
+              f"({len(cache.fresh_keys(cache.keys())):,} fresh within {cache.ttl.days}d)")
+
+    if args.rebuild_index:
+        if cache is None:
+            print("Nothing to index.")
+        else:
+            from workflows.merged_cache import rebuild_metadata_index
+
+            written = rebuild_metadata_index(cache, MetadataIndex(METADATA_INDEX_FILE))
+            print(f"Rebuilt metadata index: {written:,} tickers")
+
+    if METADATA_INDEX_FILE.exists():
+        summary = MetadataIndex(METADATA_INDEX_FILE).summary()
+        print(f"Metadata index:  {METADATA_INDEX_FILE.name} — {summary['tickers']:,} tickers, "
+              f"{summary['scored']:,} scored"
+              + (f" (last run {summary['last_scored']:%Y-%m-%d %H:%M})" if summary['last_scored'] else ""))
+        if summary['oldest_fetch']:
+            print(f"                 fetched {summary['oldest_fetch']:%Y-%m-%d} → "
+                  f"{summary['newest_fetch']:%Y-%m-%d}")
+        top = list(summary['sectors'].items())[:5]
+        if top:
+            print("                 " + ", ".join(f"{sector} {n}" for sector, n in top))
+    else:
+        print(f"Metadata index:  {METADATA_INDEX_FILE.name} — not built yet")
+
+    from data.constituent_store import BASE_INDICES, CONSTITUENTS_FILE, ConstituentStore
+
+    if CONSTITUENTS_FILE.exists():
+        store = ConstituentStore(CONSTITUENTS_FILE)
+        parts = []
+        for name in BASE_INDICES:
+            snapshot = store.latest(name)
+            if snapshot is not None:
+                parts.append(f"{name} {len(snapshot.tickers)} ({_age(snapshot.checked_at)})")
+        print(f"Constituents:    {', '.join(parts) or 'no snapshots'}")
+    else:
+        print("Constituents:    no snapshots yet")
+
+
+def select_command(args: argparse.Namespace) -> str:
+    if args.info:
+        return 'info'
+    if args.cache_info:
+        return 'cache-info'
+    if args.ticker:
+        return 'ticker'
+    return 'index'
+
+
+# Command name -> handler; each handler imports only what it uses.
+COMMANDS = {
+    'info': cmd_info,
+    'cache-info': cmd_cache_info,
+    'ticker': cmd_ticker,
+    'index': cmd_index,
+}
+
+
+def main():
+    parser = build_parser()
+    args = parser.parse_args()
+    validate_args(parser, args)
+    COMMANDS[select_command(args)](args)
+
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
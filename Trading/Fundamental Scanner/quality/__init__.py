@@ -6,6 +6,7 @@ Academic research-based cross-sectional quality scoring.
 Modules:
 - opportunity_scorer: Profitability-anchored cross-sectional ranking (Novy-Marx, Fama-French, AQR QMJ)
 - earnings_quality: Piotroski F-Score, Accrual Ratio, Cash Conversion (Sloan 1996, Piotroski 2000)
+- forensic_panel: Vectorized forensic signals over a tickers x fiscal periods panel
 
 Author: Quality Analysis System
 Date: April 2026
@@ -18,6 +19,14 @@ from .earnings_quality import (
     get_earnings_quality_analyzer
 )
 
+from .forensic_panel import (
+    StatementPanel,
+    FORENSIC_SIGNALS,
+    forensic_frame,
+    forensic_history,
+    forensic_scores,
+)
+
 from .opportunity_scorer import (
     OpportunityScorer,
     OpportunityReport,
@@ -32,6 +41,11 @@ __all__ = [
     'EarningsQualityResult',
     'PiotroskiScoreBreakdown',
     'get_earnings_quality_analyzer',
+    'StatementPanel',
+    'FORENSIC_SIGNALS',
+    'forensic_frame',
+    'forensic_history',
+    'forensic_scores',
     'OpportunityScorer',
     'OpportunityReport',
     'OpportunitySignals',
@@ -11,6 +11,11 @@ Metrics:
 2. Cash Conversion: Operating Cash Flow / Net Income
 3. Piotroski F-Score: 9-component binary score
 
+Every metric also has an array form (``piotroski_components``,
+``accrual_ratios``, ``cash_conversions``, ``earnings_quality_scores``) that
+scores any number of tickers/periods at once; ``quality.forensic_panel`` uses
+them over the whole universe.
+
 Red Flag Thresholds (from UPDATES.md):
 - Accrual Ratio > 10%: HIGH severity
 - Accrual Ratio < -10%: MODERATE severity (potential distress)
@@ -21,10 +26,12 @@ Author: Quality Analysis System
 Date: January 2026
 """
 
-from typing import Dict, Optional, Tuple, List
+from typing import Dict, Mapping, Optional, Tuple, List, Union
 from dataclasses import dataclass
 import logging
 
+import numpy as np
+
 logger = logging.getLogger(__name__)
 
 
@@ -237,105 +244,31 @@ class EarningsQualityAnalyzer:
         Returns:
             Tuple of (total_score, PiotroskiScoreBreakdown)
         """
-        # Extract current and prior year data
         ni = financial_data.get('net_income', 0)
         prior_ni = financial_data.get('prior_net_income', 0)
-        
-        ocf = financial_data.get('operating_cash_flow', ni)  # Fallback to NI if OCF missing
-        prior_ocf = financial_data.get('prior_operating_cash_flow', prior_ni)
-        
-        # Debug: Check what data we have for GOOGL
-        logger.debug(f"Piotroski data: NI={ni:.1f}, OCF={ocf:.1f}, Assets={financial_data.get('total_assets', 0):.1f}")
-        logger.debug(f"Piotroski prior: NI={prior_ni:.1f}, OCF={prior_ocf:.1f}, Assets={financial_data.get('prior_total_assets', 0):.1f}")
-        
-        ta = financial_data.get('total_assets', 1)
-        prior_ta = financial_data.get('prior_total_assets', 1)
-        
-        se = financial_data.get('shareholder_equity', 1)
-        prior_se = financial_data.get('prior_shareholder_equity', 1)
-        
-        ca = financial_data.get('current_assets', 0)
-        prior_ca = financial_data.get('prior_current_assets', 0)
-        
-        cl = financial_data.get('current_liabilities', 0)
-        prior_cl = financial_data.get('prior_current_liabilities', 0)
-        
-        td = financial_data.get('total_debt', 0)
-        prior_td = financial_data.get('prior_total_debt', 0)
-        
-        shares = financial_data.get('shares_outstanding', 0)
-        prior_shares = financial_data.get('prior_shares_outstanding', 0)
-        
-        rev = financial_data.get('revenue', 0)
-        prior_rev = financial_data.get('prior_revenue', 0)
-        
-        cogs = financial_data.get('cogs', 0)
-        prior_cogs = financial_data.get('prior_cogs', 0)
-        
-        # ===== PROFITABILITY SIGNALS (4 points) =====
-        
-        # F_ROA: ROA > 0 (1 point)
-        roa = ni / ta if ta > 0 else 0
-        f_roa = 1 if roa > 0 else 0
-        
-        # F_CFO: CFO > 0 (1 point)
-        f_cfo = 1 if ocf > 0 else 0
-        
-        # F_ΔROA: ROA increased YoY (1 point)
-        prior_roa = prior_ni / prior_ta if prior_ta > 0 else 0
-        f_droa = 1 if roa > prior_roa else 0
-        
-        # F_ACCRUAL: CFO > Net Income (low accruals) (1 point)
-        # Note: Piotroski uses the inverse of Sloan - CFO > NI is good
-        f_accrual = 1 if ocf > ni else 0
-        
-        # ===== LEVERAGE/LIQUIDITY SIGNALS (3 points) =====
-        
-        # F_ΔLEVER: Long-term debt/Assets decreased YoY (1 point)
-        lever = td / ta if ta > 0 else 0
-        prior_lever = prior_td / prior_ta if prior_ta > 0 else 0
-        f_dlever = 1 if lever < prior_lever else 0
-        
-        # F_ΔLIQUID: Current ratio increased YoY (1 point)
-        current_ratio = ca / cl if cl > 0 else 0
-        prior_current_ratio = prior_ca / prior_cl if prior_cl > 0 else 0
-        f_dliquid = 1 if current_ratio > prior_current_ratio else 0
-        
-        # F_EQ_OFFER: No new shares issued (1 point)
-        f_eq_offer = 1 if shares <= prior_shares else 0
-        
-        # ===== OPERATING EFFICIENCY SIGNALS (2 points) =====
-        
-        # F_ΔMARGIN: Gross margin increased YoY (1 point)
-        gm = (rev - cogs) / rev if rev > 0 else 0
-        prior_gm = (prior_rev - prior_cogs) / prior_rev if prior_rev > 0 else 0
-        f_dmargin = 1 if gm > prior_gm else 0
-        
-        # F_ΔTURN: Asset turnover increased YoY (1 point)
-        turnover = rev / ta if ta > 0 else 0
-        prior_turnover = prior_rev / prior_ta if prior_ta > 0 else 0
-        f_dturn = 1 if turnover > prior_turnover else 0
-        
-        # Create breakdown
+        logger.debug(
+            f"Piotroski data: NI={ni:.1f}, "
+            f"OCF={financial_data.get('operating_cash_flow', ni):.1f}, "
+            f"Assets={financial_data.get('total_assets', 0):.1f}"
+        )
+        logger.debug(
+            f"Piotroski prior: NI={prior_ni:.1f}, "
+            f"OCF={financial_data.get('prior_operating_cash_flow', prior_ni):.1f}, "
+            f"Assets={financial_data.get('prior_total_assets', 0):.1f}"
+        )
+
+        components = piotroski_components(financial_data)
         breakdown = PiotroskiScoreBreakdown(
-            f_roa=f_roa,
-            f_cfo=f_cfo,
-            f_droa=f_droa,
-            f_accrual=f_accrual,
-            f_dlever=f_dlever,
-            f_dliquid=f_dliquid,
-            f_eq_offer=f_eq_offer,
-            f_dmargin=f_dmargin,
-            f_dturn=f_dturn
+            **{name: int(points) for name, points in components.items()}
         )
         
         total_score = breakdown.total_score
         
         logger.debug(f"Piotroski F-Score: {total_score}/9")
         logger.debug(
-            f"Breakdown: P={f_roa+f_cfo+f_droa+f_accrual}, "
-            f"L={f_dlever+f_dliquid+f_eq_offer}, "
-            f"E={f_dmargin+f_dturn}"
+            f"Breakdown: P={breakdown.f_roa + breakdown.f_cfo + breakdown.f_droa + breakdown.f_accrual}, "
+            f"L={breakdown.f_dlever + breakdown.f_dliquid + breakdown.f_eq_offer}, "
+            f"E={breakdown.f_dmargin + breakdown.f_dturn}"
         )
         
         return total_score, breakdown
@@ -575,6 +508,106 @@ class EarningsQualityAnalyzer:
         )
 
 
+# =============================================================================
+# Array forms — one call scores any number of tickers / fiscal periods
+# =============================================================================
+
+ArrayLike = Union[float, np.ndarray]
+
+F_SCORE_COMPONENTS = (
+    'f_roa', 'f_cfo', 'f_droa', 'f_accrual',
+    'f_dlever', 'f_dliquid', 'f_eq_offer',
+    'f_dmargin', 'f_dturn',
+)
+
+
+def _ratio(num: np.ndarray, den: np.ndarray, ok: np.ndarray, fill: float = 0.0) -> np.ndarray:
+    """num / den where ``ok``, else ``fill`` (no division warnings)."""
+    out = np.full(np.broadcast(num, den, ok).shape, fill, dtype=float)
+    np.divide(num, den, out=out, where=ok)
+    return out
+
+
+def piotroski_components(financial_data: Mapping[str, ArrayLike]) -> Dict[str, np.ndarray]:
+    """
+    The nine Piotroski signals as 0/1 arrays.
+
+    Same inputs, defaults and comparisons as
+    ``EarningsQualityAnalyzer.calculate_piotroski_f_score``, but every value
+    may be an array (one element per ticker or ticker-period); NaN compares
+    false, so a missing input never earns a point.
+
+    Returns:
+        {component name: int8 array}, keys in F_SCORE_COMPONENTS order
+    """
+    def get(key: str, default: ArrayLike) -> np.ndarray:
+        return np.asarray(financial_data.get(key, default), dtype=float)
+
+    ni = get('net_income', 0)
+    prior_ni = get('prior_net_income', 0)
+    ocf = get('operating_cash_flow', ni)
+    ta, prior_ta = get('total_assets', 1), get('prior_total_assets', 1)
+    ca, prior_ca = get('current_assets', 0), get('prior_current_assets', 0)
+    cl, prior_cl = get('current_liabilities', 0), get('prior_current_liabilities', 0)
+    td, prior_td = get('total_debt', 0), get('prior_total_debt', 0)
+    shares, prior_shares = get('shares_outstanding', 0), get('prior_shares_outstanding', 0)
+    rev, prior_rev = get('revenue', 0), get('prior_revenue', 0)
+    cogs, prior_cogs = get('cogs', 0), get('prior_cogs', 0)
+
+    roa = _ratio(ni, ta, ta > 0)
+    prior_roa = _ratio(prior_ni, prior_ta, prior_ta > 0)
+    gm = _ratio(rev - cogs, rev, rev > 0)
+    prior_gm = _ratio(prior_rev - prior_cogs, prior_rev, prior_rev > 0)
+
+    signals = (
+        roa > 0,
+        ocf > 0,
+        roa > prior_roa,
+        ocf > ni,
+        _ratio(td, ta, ta > 0) < _ratio(prior_td, prior_ta, prior_ta > 0),
+        _ratio(ca, cl, cl > 0) > _ratio(prior_ca, prior_cl, prior_cl > 0),
+        shares <= prior_shares,
+        gm > prior_gm,
+        _ratio(rev, ta, ta > 0) > _ratio(prior_rev, prior_ta, prior_ta > 0),
+    )
+    return {name: np.asarray(s, dtype=np.int8) for name, s in zip(F_SCORE_COMPONENTS, signals)}
+
+
+def accrual_ratios(net_income: ArrayLike, operating_cash_flow: ArrayLike,
+                   total_assets: ArrayLike, prior_total_assets: ArrayLike) -> np.ndarray:
+    """(NI - OCF) / average total assets; NaN where average assets <= 0 or inputs missing."""
+    avg_assets = (np.asarray(total_assets, dtype=float) + np.asarray(prior_total_assets, dtype=float)) / 2
+    accruals = np.asarray(net_income, dtype=float) - np.asarray(operating_cash_flow, dtype=float)
+    return _ratio(accruals, avg_assets, avg_assets > 0, fill=np.nan)
+
+
+def cash_conversions(operating_cash_flow: ArrayLike, net_income: ArrayLike) -> np.ndarray:
+    """OCF / NI; NaN where net income <= 0 or inputs missing."""
+    ni = np.asarray(net_income, dtype=float)
+    return _ratio(np.asarray(operating_cash_flow, dtype=float), ni, ni > 0, fill=np.nan)
+
+
+def earnings_quality_scores(f_score: ArrayLike, accrual_ratio: ArrayLike,
+                            cash_conversion: ArrayLike) -> np.ndarray:
+    """
+    0-10 earnings quality scores, as ``calculate_earnings_quality_score``.
+
+    NaN accrual ratio / cash conversion get no adjustment, like None does
+    in the scalar method.
+    """
+    f_score = np.asarray(f_score, dtype=float)
+    ar = np.asarray(accrual_ratio, dtype=float)
+    cc = np.asarray(cash_conversion, dtype=float)
+    accrual_adj = np.select(
+        [np.isnan(ar), ar < 0, ar < 0.05, ar < 0.10], [0.0, 0.5, 0.3, 0.0], default=-0.5
+    )
+    cash_adj = np.select(
+        [np.isnan(cc), cc >= 1.2, cc >= 1.0, cc >= 0.8], [0.0, 0.5, 0.3, 0.0], default=-0.5
+    )
+    score = np.clip(f_score / 9 * 8 + accrual_adj + cash_adj, 0.0, 10.0)
+    return np.round(score, 1)
+
+
 def get_earnings_quality_analyzer() -> EarningsQualityAnalyzer:
     """Factory function to get an EarningsQualityAnalyzer instance."""
     return EarningsQualityAnalyzer()
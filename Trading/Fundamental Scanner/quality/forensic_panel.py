@@ -0,0 +1,588 @@
+"""
+Forensic Panel — Vectorized Earnings-Quality Scores Across the Universe
+
+Holds every ticker's statement history as aligned arrays (tickers x fiscal
+periods, one array per line item) and computes the forensic signals used by
+the opportunity scorer for every ticker *and* every period in one pass:
+
+    - Piotroski F-Score (2000)           f_score / f_score_components
+    - Beneish M-Score (1999, simplified) beneish_m
+    - Asset growth (Cooper-Gulen-Schill 2008)
+    - Shareholder yield
+    - Expected-growth proxy (Hou-Mo-Xue-Zhang 2021)
+    - Quality acceleration (Ma-Yang-Ye 2024)
+    - Sloan accrual ratio and cash conversion (earnings_quality)
+
+Periods are fiscal years, right-aligned: the last column is each ticker's
+latest fiscal year, column -2 the one before, and so on. Each ticker's
+columns are the union of the fiscal years its three statements report, and
+every statement row lands in its own year's column, so statements of
+different lengths (SimFin builds each one separately) still line up. A
+ticker with any row lacking a fiscal year cannot be placed by year; its
+statements are right-aligned by position instead (the per-ticker scorer's
+pairing whenever the statements have the same length).
+
+Each statement keeps its own row mask and fiscal-year array, and a value
+that is missing from a row is NaN. Signals follow the per-ticker scorer's
+rules: a statement's "latest" / "prior" rows are its last rows at or before
+the period (``_last_valid`` over that statement's mask), rows from
+different statements pair up by fiscal year, and year filters check the
+statement the scorer checked. Nothing loops over tickers after the panel is
+built.
+
+A score at period t only uses rows up to t, so the full (n, p) arrays are
+point-in-time histories of the scanner's own forensic signals (for
+backtests). Where every statement covers the same fiscal years the last
+column equals what the per-ticker scorer computed; where lengths differ, it
+is that computation with rows paired by fiscal year rather than by list
+position.
+
+Usage:
+    from quality.forensic_panel import StatementPanel, forensic_frame, forensic_scores
+
+    panel = StatementPanel.from_merged(merged_by_ticker)
+    latest = forensic_frame(panel, market_cap=mcaps)      # tickers x signals
+    history = forensic_scores(panel, market_cap=mcaps)    # {signal: (n, p) array}
+"""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .earnings_quality import accrual_ratios, cash_conversions, piotroski_components
+
+logger = logging.getLogger(__name__)
+
+STATEMENTS = ("income", "balance", "cash_flow")
+
+FORENSIC_SIGNALS = (
+    "f_score",
+    "beneish_m",
+    "asset_growth",
+    "shareholder_yield",
+    "expected_growth",
+    "quality_acceleration",
+    "accrual_ratio",
+    "cash_conversion",
+)
+
+
+# ---------------------------------------------------------------------------
+# Panel
+# ---------------------------------------------------------------------------
+
+@dataclass
+class StatementPanel:
+    """Statement histories as (tickers x periods) arrays, latest period last.
+
+    Attributes:
+        tickers: Row labels
+        fiscal_year: Fiscal year of each period (NaN where a positionally
+            aligned ticker has no year for it)
+        income / balance / cash_flow: {line item: (n, p) float array}
+        has_income / has_balance / has_cash_flow: (n, p) masks of existing rows
+        years: {statement: (n, p) fiscal year of that statement's row}
+    """
+    tickers: List[str]
+    fiscal_year: np.ndarray
+    income: Dict[str, np.ndarray] = field(default_factory=dict)
+    balance: Dict[str, np.ndarray] = field(default_factory=dict)
+    cash_flow: Dict[str, np.ndarray] = field(default_factory=dict)
+    has_income: Optional[np.ndarray] = None
+    has_balance: Optional[np.ndarray] = None
+    has_cash_flow: Optional[np.ndarray] = None
+    years: Dict[str, np.ndarray] = field(default_factory=dict)
+
+    @classmethod
+    def from_merged(
+        cls,
+        merged_by_ticker: Mapping[str, Dict[str, Any]],
+        periods: Optional[int] = None,
+    ) -> "StatementPanel":
+        """Build from scorer-shape dicts (``simfin_historical`` income/balance/cash_flow
+        lists, oldest -> newest).
+
+        Args:
+            merged_by_ticker: ticker -> merged data dict
+            periods: Keep at most this many latest periods (default: longest history)
+        """
+        tickers = list(merged_by_ticker)
+        histories = [
+            (merged_by_ticker[t] or {}).get("simfin_historical") or {} for t in tickers
+        ]
+        lists = [
+            [[row for row in (hist.get(name) or []) if isinstance(row, dict)] for name in STATEMENTS]
+            for hist in histories
+        ]
+        slots, ticker_years = zip(*(_layout(statements) for statements in lists)) if lists else ((), ())
+        longest = max((len(years) for years in ticker_years), default=0)
+        p = longest if periods is None else min(periods, longest)
+        n = len(tickers)
+
+        fiscal_year = np.full((n, p), np.nan)
+        for i, years in enumerate(ticker_years):
+            kept = years[len(years) - p:] if p else []
+            fiscal_year[i, p - len(kept):] = kept
+
+        arrays: Dict[str, Dict[str, np.ndarray]] = {}
+        masks: Dict[str, np.ndarray] = {}
+        years: Dict[str, np.ndarray] = {}
+        for k, name in enumerate(STATEMENTS):
+            items, mask = _scatter(
+                [(statements[k], slot[k], len(ty)) for statements, slot, ty in zip(lists, slots, ticker_years)],
+                n, p,
+            )
+            years[name] = items.pop("fiscal_year", np.full((n, p), np.nan))
+            arrays[name], masks[name] = items, mask
+
+        return cls(
+            tickers=tickers,
+            fiscal_year=fiscal_year,
+            income=arrays["income"],
+            balance=arrays["balance"],
+            cash_flow=arrays["cash_flow"],
+            has_income=masks["income"],
+            has_balance=masks["balance"],
+            has_cash_flow=masks["cash_flow"],
+            years=years,
+        )
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return self.fiscal_year.shape
+
+    def item(self, statement: str, name: str) -> np.ndarray:
+        """One line item as an (n, p) array; all-NaN if no ticker reports it."""
+        return getattr(self, statement).get(name, np.full(self.shape, np.nan))
+
+    def year(self, statement: str) -> np.ndarray:
+        """Fiscal year of each of ``statement``'s rows (NaN where absent or unreported)."""
+        return self.years.get(statement, np.full(self.shape, np.nan))
+
+
+def _fiscal_year(row: Dict[str, Any]) -> Optional[float]:
+    """A row's fiscal year as a float, None if missing or not numeric."""
+    value = row.get("fiscal_year")
+    try:
+        year = float(value)
+    except (TypeError, ValueError):
+        return None
+    return None if np.isnan(year) else year
+
+
+def _layout(statements: List[List[Dict[str, Any]]]) -> Tuple[List[List[int]], List[float]]:
+    """One ticker's column slot for every statement row, and each column's fiscal year.
+
+    Columns are the union of fiscal years across the statements (oldest
+    first); a later row of the same year replaces an earlier one. If any row
+    has no fiscal year, the statements are right-aligned by position instead
+    (column years: income's, else balance's, else cash flow's).
+    """
+    years = [[_fiscal_year(row) for row in rows] for rows in statements]
+    if all(y is not None for ys in years for y in ys):
+        union = sorted({y for ys in years for y in ys})
+        column = {y: c for c, y in enumerate(union)}
+        return [[column[y] for y in ys] for ys in years], union
+
+    width = max(len(rows) for rows in statements)
+    slots = [[width - len(rows) + j for j in range(len(rows))] for rows in statements]
+    column_years = [np.nan] * width
+    for ys, slot in zip(reversed(years), reversed(slots)):   # income last: it wins
+        for y, c in zip(ys, slot):
+            if y is not None:
+                column_years[c] = y
+    return slots, column_years
+
+
+def _scatter(placed: List[Tuple[List[Dict[str, Any]], List[int], int]], n: int, p: int
+             ) -> Tuple[Dict[str, np.ndarray], np.ndarray]:
+    """Scatter each ticker's rows into (n, p) arrays, one per key, at their column
+    slots (``placed``: per ticker, rows + slots + ticker width), latest column last."""
+    mask = np.zeros((n, p), dtype=bool)
+    if p == 0:
+        return {}, mask
+    ti: List[int] = []
+    ci: List[int] = []
+    rows: List[Dict[str, Any]] = []
+    for i, (ticker_rows, slots, width) in enumerate(placed):
+        offset = p - width
+        for row, slot in zip(ticker_rows, slots):
+            if slot + offset >= 0:
+                ti.append(i)
+                ci.append(slot + offset)
+                rows.append(row)
+
+    keys: Dict[str, None] = {}
+    for row in rows:
+        keys.update(dict.fromkeys(row))
+    ti_arr, ci_arr = np.array(ti, dtype=int), np.array(ci, dtype=int)
+    mask[ti_arr, ci_arr] = True
+
+    out: Dict[str, np.ndarray] = {}
+    for key in keys:
+        values = np.full((n, p), np.nan)
+        # Assignment in row order: a later row of the same year overwrites an earlier one
+        values[ti_arr, ci_arr] = _to_float_array([row.get(key) for row in rows])
+        out[key] = values
+    return out, mask
+
+
+def _to_float_array(values: List[Any]) -> np.ndarray:
+    """Floats with None / non-numeric -> NaN."""
+    try:
+        return np.array(values, dtype=float)
+    except (TypeError, ValueError):
+        return pd.to_numeric(pd.Series(values, dtype=object), errors="coerce").to_numpy(dtype=float)
+
+
+def ticker_array(values: Iterable[Any]) -> np.ndarray:
+    """Per-ticker inputs (market cap, share counts, ...) as an (n, 1) column."""
+    return _to_float_array(list(values)).reshape(-1, 1)
+
+
+# ---------------------------------------------------------------------------
+# Array helpers
+# ---------------------------------------------------------------------------
+
+def _prior(x: np.ndarray, fill: Any = np.nan) -> np.ndarray:
+    """Shift one period later (column t holds period t-1)."""
+    out = np.full_like(x, fill)
+    out[:, 1:] = x[:, :-1]
+    return out
+
+
+def _truthy(x: np.ndarray) -> np.ndarray:
+    """Mask of values a Python ``if value:`` would accept (present and non-zero)."""
+    return ~np.isnan(x) & (x != 0)
+
+
+def _or(x: np.ndarray, default: Any) -> np.ndarray:
+    """``value or default`` with NaN as missing."""
+    return np.where(_truthy(x), x, default)
+
+
+def _last_valid(valid: np.ndarray, k: int) -> List[np.ndarray]:
+    """Positions of the last ``k`` valid periods at or before each period.
+
+    Returns k (n, p) int arrays, newest first; -1 where fewer than k exist.
+    """
+    n, p = valid.shape
+    last = np.maximum.accumulate(np.where(valid, np.arange(p), -1), axis=1)
+    out = [last]
+    for _ in range(k - 1):
+        prev = out[-1]
+        step = np.take_along_axis(last, np.maximum(prev - 1, 0), axis=1)
+        out.append(np.where(prev > 0, step, -1))
+    return out
+
+
+def _take(x: np.ndarray, idx: np.ndarray) -> np.ndarray:
+    return np.where(idx >= 0, np.take_along_axis(x, np.maximum(idx, 0), axis=1), np.nan)
+
+
+def _broadcast(value: Optional[Any], shape: Tuple[int, int], default: float = np.nan) -> np.ndarray:
+    """Per-ticker (n,), (n, 1) or per-period (n, p) input -> (n, p) float array."""
+    if value is None:
+        return np.full(shape, default)
+    arr = np.asarray(value, dtype=float)
+    if arr.ndim == 1:
+        arr = arr.reshape(-1, 1)
+    return np.broadcast_to(arr, shape)
+
+
+# ---------------------------------------------------------------------------
+# Forensic signals — each returns an (n, p) array, NaN = not computable
+# ---------------------------------------------------------------------------
+
+def asset_growth(panel: StatementPanel) -> np.ndarray:
+    """ΔAssets / Assets between the last two balance rows with a fiscal year and assets reported."""
+    ta = panel.item("balance", "total_assets")
+    valid = panel.has_balance & _truthy(panel.year("balance")) & _truthy(ta)
+    i1, i2 = _last_valid(valid, 2)
+    curr, prev = _take(ta, i1), _take(ta, i2)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return (curr - prev) / prev
+
+
+def quality_acceleration(panel: StatementPanel) -> np.ndarray:
+    """Second difference of gross profits-to-assets over the last three valid years
+    (income and balance rows of the same year, the income row carrying the year)."""
+    rev = panel.item("income", "revenue")
+    cogs = panel.item("income", "cogs")
+    ta = panel.item("balance", "total_assets")
+    valid = (panel.has_income & panel.has_balance & ~np.isnan(panel.year("income"))
+             & ~np.isnan(rev) & ~np.isnan(cogs) & (ta > 0))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        gpoa = (rev - cogs) / ta
+    q1, q2, q3 = (_take(gpoa, i) for i in _last_valid(valid, 3))
+    return (q1 - q2) - (q2 - q3)
+
+
+def f_score_components(
+    panel: StatementPanel,
+    shares_outstanding: Optional[Any] = None,
+    prior_shares_outstanding: Optional[Any] = None,
+) -> Dict[str, np.ndarray]:
+    """The nine Piotroski signals for every ticker-period.
+
+    Each period compares its latest F-Score year (income + balance rows of
+    the same year, the income row carrying the year) at or before it with
+    the F-Score year before that; that year's cash-flow row is optional.
+    Missing statement values take the scalar scorer's defaults (0, or 1 for
+    assets/equity). Share counts are not part of the statement history, so
+    the equity-offering signal compares the given share counts (per ticker
+    or per period; default: no issuance).
+    """
+    inc, bal, cf = panel.income, panel.balance, panel.cash_flow
+    nan = np.full(panel.shape, np.nan)
+    i1, i2 = _last_valid(_f_score_rows(panel), 2)
+
+    columns: Dict[str, np.ndarray] = {}
+    for d, name, default in (
+        (inc, "net_income", 0),
+        (cf, "operating_cash_flow", 0),
+        (bal, "total_assets", 1),
+        (bal, "shareholder_equity", 1),
+        (bal, "current_assets", 0),
+        (bal, "current_liabilities", 0),
+        (bal, "total_debt", 0),
+        (inc, "revenue", 0),
+        (inc, "cogs", 0),
+    ):
+        columns[name] = _or(_take(d.get(name, nan), i1), default)
+        columns["prior_" + name] = _or(_take(d.get(name, nan), i2), default)
+    shares = _or(_broadcast(shares_outstanding, panel.shape), 0)
+    columns["shares_outstanding"] = shares
+    columns["prior_shares_outstanding"] = _or(_broadcast(prior_shares_outstanding, panel.shape), shares)
+    return piotroski_components(columns)
+
+
+def f_score(
+    panel: StatementPanel,
+    shares_outstanding: Optional[Any] = None,
+    prior_shares_outstanding: Optional[Any] = None,
+) -> np.ndarray:
+    """Piotroski F-Score (0-9); NaN without two F-Score years at or before the period."""
+    _, i2 = _last_valid(_f_score_rows(panel), 2)
+    ok = i2 >= 0
+    total = sum(f_score_components(panel, shares_outstanding, prior_shares_outstanding).values())
+    return np.where(ok, total, np.nan)
+
+
+def _f_score_rows(panel: StatementPanel) -> np.ndarray:
+    """Periods with income and balance rows, the income row carrying a fiscal year."""
+    return panel.has_income & panel.has_balance & ~np.isnan(panel.year("income"))
+
+
+def beneish_m(panel: StatementPanel) -> np.ndarray:
+    """Simplified Beneish M-Score from each statement's last two rows.
+
+    Every statement needs two rows at or before the period (its latest and
+    prior, as the scalar scorer took them). DEPI is fixed at 1; indices
+    whose inputs are missing default to their neutral value (1, or 0 for
+    TATA).
+    """
+    inc1, inc2 = _last_valid(panel.has_income, 2)
+    bal1, bal2 = _last_valid(panel.has_balance, 2)
+    cf1, cf2 = _last_valid(panel.has_cash_flow, 2)
+
+    def inc(name: str) -> Tuple[np.ndarray, np.ndarray]:
+        x = panel.item("income", name)
+        return _take(x, inc1), _take(x, inc2)
+
+    def bal(name: str) -> Tuple[np.ndarray, np.ndarray]:
+        x = panel.item("balance", name)
+        return _take(x, bal1), _take(x, bal2)
+
+    rev_t, rev_p = inc("revenue")
+    ok = (inc2 >= 0) & (bal2 >= 0) & (cf2 >= 0) & (rev_t > 0) & (rev_p > 0)
+
+    cogs_t, cogs_p = inc("cogs")
+    sga_t, sga_p = inc("operating_expense")
+    ni_t, _ = inc("net_income")
+    recv_t, recv_p = bal("accounts_receivable")
+    ta_t, ta_p = bal("total_assets")
+    ca_t, ca_p = (_or(x, 0) for x in bal("current_assets"))
+    debt_t, debt_p = (_or(x, 0) for x in bal("total_debt"))
+    ocf_t = _take(panel.item("cash_flow", "operating_cash_flow"), cf1)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        dsri = np.where(_truthy(recv_t) & _truthy(recv_p),
+                        (recv_t / rev_t) / (recv_p / rev_p), 1.0)
+
+        gm_t = (rev_t - cogs_t) / rev_t
+        gm_p = (rev_p - cogs_p) / rev_p
+        gmi = np.where(_truthy(gm_t) & _truthy(gm_p), gm_p / gm_t, 1.0)
+
+        assets_ok = (ta_t > 0) & (ta_p > 0)
+        nca_t = 1 - ca_t / ta_t
+        nca_p = 1 - ca_p / ta_p
+        aqi = np.where(assets_ok & (nca_p != 0), nca_t / nca_p, 1.0)
+
+        sgi = rev_t / rev_p
+        depi = 1.0
+
+        sga_ratio_p = sga_p / rev_p
+        sgai = np.where(~np.isnan(sga_t) & _truthy(sga_p) & (sga_ratio_p != 0),
+                        (sga_t / rev_t) / sga_ratio_p, 1.0)
+
+        tata = np.where(~np.isnan(ni_t) & ~np.isnan(ocf_t) & (ta_t > 0),
+                        (ni_t - ocf_t) / ta_t, 0.0)
+
+        lev_p = debt_p / ta_p
+        lvgi = np.where(assets_ok & (lev_p != 0), (debt_t / ta_t) / lev_p, 1.0)
+
+        m = (
+            -4.84
+            + 0.920 * dsri
+            + 0.528 * gmi
+            + 0.404 * aqi
+            + 0.892 * sgi
+            + 0.115 * depi
+            - 0.172 * sgai
+            + 4.679 * tata
+            - 0.327 * lvgi
+        )
+    return np.where(ok, m, np.nan)
+
+
+def shareholder_yield(
+    panel: StatementPanel,
+    market_cap: Any,
+    dividends: Optional[Any] = None,
+    buybacks: Optional[Any] = None,
+) -> np.ndarray:
+    """(|dividends| + |buybacks|) / market cap.
+
+    ``dividends``/``buybacks`` are reported payouts (per ticker or per
+    period); where dividends are missing or zero, the latest cash-flow row
+    at or before the period supplies both figures.
+    """
+    mcap = _broadcast(market_cap, panel.shape)
+    div = _or(_broadcast(dividends, panel.shape), 0.0)
+    buy = _or(_broadcast(buybacks, panel.shape), 0.0)
+    (cf1,) = _last_valid(panel.has_cash_flow, 1)
+    from_statement = (div == 0) & (cf1 >= 0)
+    paid = _take(panel.item("cash_flow", "dividends_paid"), cf1)
+    repurchased = _take(panel.item("cash_flow", "stock_repurchased"), cf1)
+    div = np.where(from_statement, np.abs(_or(paid, 0.0)), div)
+    buy = np.where(from_statement, np.abs(_or(repurchased, 0.0)), buy)
+    total = np.abs(div) + np.abs(buy)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where((mcap > 0) & (total != 0), total / mcap, np.nan)
+
+
+def expected_growth(panel: StatementPanel, market_cap: Any) -> np.ndarray:
+    """Hou-Mo-Xue-Zhang (2021) proxy: 0.4 log(B/P) + 0.4 CFOA + 0.2 ΔROE_2yr.
+
+    Book value and assets come from the latest balance row at or before the
+    period, OCF from the latest cash-flow row, and ΔROE from income and
+    balance rows of the same year. Components that cannot be computed are
+    left out of the sum.
+    """
+    mcap = _broadcast(market_cap, panel.shape)
+    (inc1,) = _last_valid(panel.has_income, 1)
+    (bal1,) = _last_valid(panel.has_balance, 1)
+    (cf1,) = _last_valid(panel.has_cash_flow, 1)
+    equity = panel.item("balance", "shareholder_equity")
+    book = _take(equity, bal1)
+    ta = _take(panel.item("balance", "total_assets"), bal1)
+    ocf = _take(panel.item("cash_flow", "operating_cash_flow"), cf1)
+    ni = panel.item("income", "net_income")
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        log_bp = np.where((mcap > 0) & (book > 0), np.log(book / mcap), np.nan)
+        cfoa = np.where((cf1 >= 0) & ~np.isnan(ocf) & (ta > 0), ocf / ta, np.nan)
+        roe = ni / equity
+    rows = panel.has_income & panel.has_balance
+    roe_ok = rows & ~np.isnan(ni) & (equity > 0)
+    i1, _, i3 = _last_valid(roe_ok, 3)
+    d_roe_2yr = _take(roe, i1) - _take(roe, i3)
+
+    total = np.zeros(panel.shape)
+    any_part = np.zeros(panel.shape, dtype=bool)
+    for weight, part in ((0.4, log_bp), (0.4, cfoa), (0.2, d_roe_2yr)):
+        has = ~np.isnan(part)
+        total = total + np.where(has, weight * part, 0.0)
+        any_part |= has
+    return np.where((inc1 >= 0) & (bal1 >= 0) & any_part, total, np.nan)
+
+
+def accrual_ratio(panel: StatementPanel) -> np.ndarray:
+    """Sloan accrual ratio: (NI - OCF) / average total assets (this and the prior year)."""
+    ta = panel.item("balance", "total_assets")
+    return accrual_ratios(
+        panel.item("income", "net_income"),
+        panel.item("cash_flow", "operating_cash_flow"),
+        ta,
+        _prior(ta),
+    )
+
+
+def cash_conversion(panel: StatementPanel) -> np.ndarray:
+    """OCF / NI per period; NaN where net income <= 0."""
+    return cash_conversions(
+        panel.item("cash_flow", "operating_cash_flow"),
+        panel.item("income", "net_income"),
+    )
+
+
+# ---------------------------------------------------------------------------
+# Frames
+# ---------------------------------------------------------------------------
+
+def forensic_scores(
+    panel: StatementPanel,
+    market_cap: Optional[Any] = None,
+    dividends: Optional[Any] = None,
+    buybacks: Optional[Any] = None,
+    shares_outstanding: Optional[Any] = None,
+    prior_shares_outstanding: Optional[Any] = None,
+) -> Dict[str, np.ndarray]:
+    """Every forensic signal for every ticker-period: {signal: (n, p) array}.
+
+    Per-ticker inputs may be (n,) / (n, 1) (applied to every period) or
+    (n, p) point-in-time values.
+    """
+    return {
+        "f_score": f_score(panel, shares_outstanding, prior_shares_outstanding),
+        "beneish_m": beneish_m(panel),
+        "asset_growth": asset_growth(panel),
+        "shareholder_yield": shareholder_yield(panel, market_cap, dividends, buybacks),
+        "expected_growth": expected_growth(panel, market_cap),
+        "quality_acceleration": quality_acceleration(panel),
+        "accrual_ratio": accrual_ratio(panel),
+        "cash_conversion": cash_conversion(panel),
+    }
+
+
+def forensic_frame(panel: StatementPanel, period: int = -1, **inputs: Any) -> pd.DataFrame:
+    """Tickers x FORENSIC_SIGNALS at one period (default: each ticker's latest).
+
+    Keyword arguments are passed to :func:`forensic_scores`.
+    """
+    n, p = panel.shape
+    if p == 0:
+        return pd.DataFrame(np.nan, index=pd.Index(panel.tickers, name="ticker"),
+                            columns=list(FORENSIC_SIGNALS))
+    scores = forensic_scores(panel, **inputs)
+    return pd.DataFrame(
+        {name: scores[name][:, period] for name in FORENSIC_SIGNALS},
+        index=pd.Index(panel.tickers, name="ticker"),
+    )
+
+
+def forensic_history(panel: StatementPanel, **inputs: Any) -> pd.DataFrame:
+    """Long (ticker, fiscal_year) frame of every signal for periods with a statement row."""
+    scores = forensic_scores(panel, **inputs)
+    rows = panel.has_income | panel.has_balance | panel.has_cash_flow
+    ti, ci = np.nonzero(rows)
+    frame = pd.DataFrame({name: scores[name][ti, ci] for name in FORENSIC_SIGNALS})
+    frame.insert(0, "fiscal_year", panel.fiscal_year[ti, ci])
+    frame.insert(0, "ticker", np.asarray(panel.tickers, dtype=object)[ti])
+    return frame
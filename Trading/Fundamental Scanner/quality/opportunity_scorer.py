@@ -29,6 +29,11 @@ Hard gates (exclude from opportunity list):
     Altman Z   >= 1.80   (Altman 1968)
     Interest coverage >= 2x
 
+History-based signals (F-Score, Beneish M, asset growth, shareholder yield,
+expected growth, quality acceleration) are computed for the whole universe at
+once on a `quality.forensic_panel.StatementPanel`; only the current-period
+fields are read per ticker.
+
 The scorer consumes the merged dict already produced by
 `data.enhanced_hybrid_fetcher.EnhancedHybridDataFetcher.fetch_complete_data`.
 It does not fetch any data itself.
@@ -41,7 +46,10 @@ import math
 from dataclasses import dataclass, field, asdict
 from typing import Any, Dict, Iterable, List, Optional, Tuple
 
-from .earnings_quality import EarningsQualityAnalyzer
+import numpy as np
+import pandas as pd
+
+from .forensic_panel import StatementPanel, forensic_frame, ticker_array
 
 logger = logging.getLogger(__name__)
 
@@ -78,6 +86,27 @@ VALUE_WEIGHTS: Dict[str, float] = {
 
 QARP_QUALITY_TILT = 0.60   # Quality vs. Value weight in QARP composite
 
+# Composite / value component -> (raw signal column, sign)
+COMPOSITE_SIGNALS: Dict[str, Tuple[str, int]] = {
+    "gross_profitability": ("gross_profitability", 1),
+    "roe_persistence": ("roe_persistence", 1),
+    "cash_flow_quality": ("cash_flow_quality", 1),
+    "expected_growth": ("expected_growth", 1),
+    "neg_accruals": ("accrual_ratio", -1),
+    "neg_asset_growth": ("asset_growth", -1),
+    "shareholder_yield": ("shareholder_yield", 1),
+    "quality_acceleration": ("quality_acceleration", 1),
+}
+
+VALUE_SIGNALS: Dict[str, Tuple[str, int]] = {
+    "fcf_yield": ("fcf_yield", 1),
+    "earnings_yield": ("earnings_yield", 1),
+    "neg_ev_ebitda": ("ev_ebitda", -1),
+}
+
+WINSOR_PCT = 0.01
+MIN_SECTOR_SIZE = 5        # sectors smaller than this fall back to universe z-scores
+
 
 # ---------------------------------------------------------------------------
 # Result types
@@ -137,10 +166,17 @@ class OpportunityScorer:
     """
     Cross-sectional opportunity scorer.
 
+    Scoring is columnar: signals are extracted once into a tickers x signals
+    frame, then winsorized, z-scored, weighted, gated and tiered with array
+    operations. Keep the frame to re-score what-if weightings in milliseconds.
+
     Usage:
         scorer = OpportunityScorer()
         reports = scorer.score_universe(merged_data_by_ticker)
         # reports: List[OpportunityReport] sorted by opportunity_score desc
+
+        frame = scorer.signal_frame(merged_data_by_ticker)
+        alt = OpportunityScorer(composite_weights=my_weights).score_frame(frame)
     """
 
     def __init__(
@@ -148,11 +184,13 @@ class OpportunityScorer:
         composite_weights: Optional[Dict[str, float]] = None,
         hard_gates: Optional[Dict[str, Tuple[str, float]]] = None,
         qarp_tilt: float = QARP_QUALITY_TILT,
+        sector_neutral: bool = False,
     ) -> None:
         self.weights = composite_weights or dict(COMPOSITE_WEIGHTS)
         self.gates = hard_gates or dict(HARD_GATES)
         self.qarp_tilt = qarp_tilt
-        self._fscore_analyzer = EarningsQualityAnalyzer()
+        # z-score within sector (after universe-wide winsorizing) instead of across the universe
+        self.sector_neutral = sector_neutral
 
         weight_sum = sum(self.weights.values())
         if abs(weight_sum - 1.0) > 0.001:
@@ -176,60 +214,130 @@ class OpportunityScorer:
         Returns:
             List of OpportunityReport sorted by opportunity_score descending.
         """
-        # Step 1: extract signals per ticker
-        signals_list: List[OpportunitySignals] = []
-        for ticker, data in merged_by_ticker.items():
-            if not data:
-                continue
-            sig = self._extract_signals(ticker, data)
-            if sig is not None:
-                signals_list.append(sig)
-
-        if not signals_list:
+        frame = self.signal_frame(merged_by_ticker)
+        if frame.empty:
             logger.warning("No scorable tickers found in universe")
             return []
+        return self.score_frame(frame)
 
-        # Step 2: cross-sectional z-scores for every composite signal
-        z_by_ticker = self._cross_sectional_z(signals_list)
+    def signal_frame(
+        self,
+        merged_by_ticker: Dict[str, Dict[str, Any]],
+    ) -> pd.DataFrame:
+        """Extract raw signals into one tickers x signals frame (index = ticker).
 
-        # Step 3: value z-scores (for QARP overlay)
-        value_z = self._value_z_scores(signals_list)
+        Current-period fields are read per ticker; the history-based
+        signals come from one :class:`StatementPanel` over the universe. The
+        frame can be re-scored any number of times with :meth:`score_frame`.
+        """
+        universe = {ticker: data for ticker, data in merged_by_ticker.items() if data}
+        rows = [vars(self._extract_signals(ticker, data)) for ticker, data in universe.items()]
+        frame = pd.DataFrame.from_records(rows, columns=_SIGNAL_FIELDS).set_index("ticker")
+        numeric = [c for c in frame.columns if c not in _TEXT_FIELDS]
+        frame[numeric] = frame[numeric].astype(float)
+        if universe:
+            forensic = self.forensic_frame(universe)
+            frame[list(_PANEL_SIGNALS)] = forensic[list(_PANEL_SIGNALS)].to_numpy()
+        return frame
+
+    def forensic_frame(
+        self,
+        merged_by_ticker: Dict[str, Dict[str, Any]],
+        period: int = -1,
+    ) -> pd.DataFrame:
+        """History-based forensic signals for every ticker (index = ticker).
 
-        # Step 4: build final reports
-        reports: List[OpportunityReport] = []
-        for sig in signals_list:
-            composite_raw = self._weighted_sum(z_by_ticker.get(sig.ticker, {}), self.weights)
-            value_raw = self._weighted_sum(value_z.get(sig.ticker, {}), VALUE_WEIGHTS)
+        ``period=-1`` is each ticker's latest fiscal year (what the composite
+        uses); earlier periods give the point-in-time values for backtests.
+        """
+        panel = StatementPanel.from_merged(merged_by_ticker)
+        datas = [data or {} for data in merged_by_ticker.values()]
+        return forensic_frame(
+            panel,
+            period=period,
+            market_cap=ticker_array(d.get("market_cap") or d.get("simfin_market_cap") for d in datas),
+            dividends=ticker_array(
+                d.get("dividends_paid") or d.get("simfin_dividends_paid") for d in datas
+            ),
+            buybacks=ticker_array(d.get("net_buybacks") or d.get("simfin_net_buybacks") for d in datas),
+            shares_outstanding=ticker_array(d.get("shares_outstanding") for d in datas),
+            prior_shares_outstanding=ticker_array(d.get("prior_shares_outstanding") for d in datas),
+        )
 
-            gates_ok, failures = self._evaluate_gates(sig)
+    def score_table(self, frame: pd.DataFrame) -> Tuple[pd.DataFrame, List[List[str]]]:
+        """Columnar scores for a :meth:`signal_frame` output, in frame order.
 
+        Returns a frame with ``opportunity_score``, ``qarp_score``,
+        ``gates_passed``, ``tier`` and one ``z_<component>`` column per
+        composite signal, plus each ticker's gate-failure labels. This is the
+        whole computation without building report objects, so what-if
+        weightings can be compared interactively.
+        """
+        quality_z = self._z_frame(frame, COMPOSITE_SIGNALS)
+        value_z = self._z_frame(frame, VALUE_SIGNALS)
+        composite_raw = _weighted_sum(quality_z, self.weights)
+        value_raw = _weighted_sum(value_z, VALUE_WEIGHTS)
+
+        quality_centile = _to_centile(composite_raw)
+        qarp = self.qarp_tilt * quality_centile + (1 - self.qarp_tilt) * _to_centile(value_raw)
+        failures = self._gate_failures(frame)
+        gates_ok = np.array([not f for f in failures], dtype=bool)
+
+        table = pd.DataFrame(
+            {
+                "opportunity_score": quality_centile,
+                "qarp_score": qarp,
+                "gates_passed": gates_ok,
+                "tier": self._classify_tiers(frame, quality_centile, qarp, gates_ok),
+            },
+            index=frame.index,
+        )
+        return table.join(quality_z.add_prefix("z_")), failures
+
+    def score_frame(self, frame: pd.DataFrame) -> List[OpportunityReport]:
+        """Score a :meth:`signal_frame` output; see :meth:`score_universe`."""
+        if frame.empty:
+            return []
+        table, failures = self.score_table(frame)
+        signal_rows = _records(frame)
+        z_rows = _records(table[["z_" + name for name in COMPOSITE_SIGNALS]])
+        tickers = frame.index.tolist()
+        scores = table["opportunity_score"].tolist()
+        qarp = table["qarp_score"].tolist()
+        gates_ok = table["gates_passed"].tolist()
+        tiers = table["tier"].tolist()
+
+        reports: List[OpportunityReport] = []
+        for i in np.argsort(-table["opportunity_score"].to_numpy(), kind="stable"):
+            sig = signal_rows[i]
+            if sig["f_score"] is not None:
+                sig["f_score"] = int(sig["f_score"])
             reports.append(
                 OpportunityReport(
-                    ticker=sig.ticker,
-                    opportunity_score=self._to_centile(composite_raw, 50, 15),
-                    qarp_score=self._qarp_score(composite_raw, value_raw),
-                    gates_passed=gates_ok,
-                    gate_failures=failures,
-                    tier=self._classify_tier(sig, composite_raw, value_raw, gates_ok),
-                    signals={k: v for k, v in asdict(sig).items() if k != "ticker"},
-                    z_scores=z_by_ticker.get(sig.ticker, {}),
-                    market_cap=sig.market_cap,
-                    sector=sig.sector,
+                    ticker=tickers[i],
+                    opportunity_score=scores[i],
+                    qarp_score=qarp[i],
+                    gates_passed=gates_ok[i],
+                    gate_failures=failures[i],
+                    tier=tiers[i],
+                    signals=sig,
+                    z_scores={name: z_rows[i]["z_" + name] for name in COMPOSITE_SIGNALS},
+                    market_cap=sig["market_cap"],
+                    sector=sig["sector"],
                 )
             )
-
-        reports.sort(key=lambda r: r.opportunity_score, reverse=True)
         return reports
 
     # ---- signal extraction -------------------------------------------------
 
     def _extract_signals(
         self, ticker: str, data: Dict[str, Any]
-    ) -> Optional[OpportunitySignals]:
-        """Pull every signal from one merged data dict.
+    ) -> OpportunitySignals:
+        """Pull the current-period signals from one merged data dict.
 
         Prefers SimFin-tagged fields (more consistent) then falls back to
-        yfinance-tagged fields on the same dict.
+        yfinance-tagged fields on the same dict. History-based signals are
+        left None here and filled from the forensic panel.
         """
         def pick(*keys: str) -> Optional[float]:
             for k in keys:
@@ -249,11 +357,6 @@ class OpportunityScorer:
             if rev is not None and cogs is not None and ta and ta > 0:
                 gp = (rev - cogs) / ta
 
-        historical = data.get("simfin_historical") or {}
-        income_hist = historical.get("income") or []
-        balance_hist = historical.get("balance") or []
-        cashflow_hist = historical.get("cash_flow") or []
-
         roe_hist = data.get("roe_history") or []
         if roe_hist:
             valid = [x for x in roe_hist if x is not None]
@@ -276,18 +379,6 @@ class OpportunityScorer:
             if ta and ta > 0:
                 accrual_ratio = (ni - ocf) / ta
 
-        asset_growth = _compute_asset_growth(balance_hist)
-
-        shareholder_yield = _compute_shareholder_yield(data, cashflow_hist)
-
-        expected_growth = _compute_expected_growth_proxy(
-            income_hist, balance_hist, cashflow_hist, data
-        )
-
-        quality_acceleration = _compute_quality_acceleration(
-            income_hist, balance_hist
-        )
-
         # Value overlay
         mcap = pick("market_cap", "simfin_market_cap")
         fcf = pick("simfin_free_cash_flow", "free_cash_flow")
@@ -302,8 +393,6 @@ class OpportunityScorer:
             ev_ebitda = ev / ebitda
 
         # Gate inputs
-        f_score = _compute_f_score(self._fscore_analyzer, data, income_hist, balance_hist, cashflow_hist)
-        beneish_m = _compute_beneish_m(income_hist, balance_hist, cashflow_hist)
         altman_z = pick("simfin_altman_z_score", "altman_z_score")
         interest_coverage = pick("simfin_interest_coverage", "interest_coverage")
 
@@ -312,16 +401,10 @@ class OpportunityScorer:
             gross_profitability=gp,
             roe_persistence=roe_persistence,
             cash_flow_quality=cfq,
-            expected_growth=expected_growth,
             accrual_ratio=accrual_ratio,
-            asset_growth=asset_growth,
-            shareholder_yield=shareholder_yield,
-            quality_acceleration=quality_acceleration,
             fcf_yield=fcf_yield,
             earnings_yield=earnings_yield,
             ev_ebitda=ev_ebitda,
-            f_score=f_score,
-            beneish_m=beneish_m,
             altman_z=altman_z,
             interest_coverage=interest_coverage,
             market_cap=mcap,
@@ -331,122 +414,56 @@ class OpportunityScorer:
 
     # ---- cross-sectional normalization -------------------------------------
 
-    def _cross_sectional_z(
-        self, signals: List[OpportunitySignals]
-    ) -> Dict[str, Dict[str, float]]:
-        """Compute cross-sectional z-score for every composite signal."""
-        field_map = {
-            "gross_profitability": ("gross_profitability", 1),
-            "roe_persistence": ("roe_persistence", 1),
-            "cash_flow_quality": ("cash_flow_quality", 1),
-            "expected_growth": ("expected_growth", 1),
-            "neg_accruals": ("accrual_ratio", -1),
-            "neg_asset_growth": ("asset_growth", -1),
-            "shareholder_yield": ("shareholder_yield", 1),
-            "quality_acceleration": ("quality_acceleration", 1),
-        }
-
-        z_by_ticker: Dict[str, Dict[str, float]] = {s.ticker: {} for s in signals}
-
-        for comp_name, (attr, sign) in field_map.items():
-            values = [(s.ticker, getattr(s, attr)) for s in signals]
-            winsorized = _winsorize([v for _, v in values if v is not None], 0.01)
-            mean, std = _mean_std(winsorized)
-            for ticker, val in values:
-                if val is None or std == 0:
-                    z_by_ticker[ticker][comp_name] = 0.0
-                else:
-                    clipped = _clip(val, winsorized[0], winsorized[-1]) if winsorized else val
-                    z_by_ticker[ticker][comp_name] = sign * (clipped - mean) / std
-
-        return z_by_ticker
-
-    def _value_z_scores(
-        self, signals: List[OpportunitySignals]
-    ) -> Dict[str, Dict[str, float]]:
-        """Cross-sectional z-scores for value overlay."""
-        field_map = {
-            "fcf_yield": ("fcf_yield", 1),
-            "earnings_yield": ("earnings_yield", 1),
-            "neg_ev_ebitda": ("ev_ebitda", -1),
-        }
-        z_by_ticker: Dict[str, Dict[str, float]] = {s.ticker: {} for s in signals}
-        for comp_name, (attr, sign) in field_map.items():
-            values = [(s.ticker, getattr(s, attr)) for s in signals]
-            winsorized = _winsorize([v for _, v in values if v is not None], 0.01)
-            mean, std = _mean_std(winsorized)
-            for ticker, val in values:
-                if val is None or std == 0:
-                    z_by_ticker[ticker][comp_name] = 0.0
-                else:
-                    clipped = _clip(val, winsorized[0], winsorized[-1]) if winsorized else val
-                    z_by_ticker[ticker][comp_name] = sign * (clipped - mean) / std
-        return z_by_ticker
-
-    # ---- composite helpers -------------------------------------------------
-
-    @staticmethod
-    def _weighted_sum(z_map: Dict[str, float], weights: Dict[str, float]) -> float:
-        return sum(z_map.get(k, 0.0) * w for k, w in weights.items())
-
-    @staticmethod
-    def _to_centile(raw_z: float, mean: float = 50.0, spread: float = 15.0) -> float:
-        """Map composite z (approx. standard normal) to 0-100 centile-style score."""
-        return max(0.0, min(100.0, mean + spread * raw_z))
-
-    def _qarp_score(self, quality_z: float, value_z: float) -> float:
-        q = self._to_centile(quality_z, 50.0, 15.0)
-        v = self._to_centile(value_z, 50.0, 15.0)
-        return self.qarp_tilt * q + (1 - self.qarp_tilt) * v
+    def _z_frame(
+        self, frame: pd.DataFrame, signal_map: Dict[str, Tuple[str, int]]
+    ) -> pd.DataFrame:
+        """Winsorized cross-sectional z-score of every mapped signal (0.0 where missing)."""
+        sectors = frame["sector"].to_numpy() if self.sector_neutral else None
+        return pd.DataFrame(
+            {name: _winsorized_z(frame[col].to_numpy(dtype=float), sign, sectors)
+             for name, (col, sign) in signal_map.items()},
+            index=frame.index,
+        )
 
     # ---- gates / tier classification ---------------------------------------
 
-    def _evaluate_gates(
-        self, sig: OpportunitySignals
-    ) -> Tuple[bool, List[str]]:
-        failures: List[str] = []
+    def _gate_failures(self, frame: pd.DataFrame) -> List[List[str]]:
+        """Per-ticker failed gate labels; a missing input skips that gate (does not exclude)."""
+        failures: List[List[str]] = [[] for _ in range(len(frame))]
         for key, (direction, threshold) in self.gates.items():
-            value = getattr(sig, key, None)
-            if value is None:
-                continue  # missing data → skip gate (do not exclude)
-            if direction == "min" and value < threshold:
-                failures.append(f"{key}<{threshold}")
-            elif direction == "max" and value > threshold:
-                failures.append(f"{key}>{threshold}")
-        return (len(failures) == 0, failures)
-
-    def _classify_tier(
+            if key not in frame.columns or direction not in ("min", "max"):
+                continue
+            values = frame[key].to_numpy(dtype=float)
+            if direction == "min":
+                failed, label = values < threshold, f"{key}<{threshold}"
+            else:
+                failed, label = values > threshold, f"{key}>{threshold}"
+            for i in np.flatnonzero(failed):
+                failures[i].append(label)
+        return failures
+
+    def _classify_tiers(
         self,
-        sig: OpportunitySignals,
-        quality_z: float,
-        value_z: float,
-        gates_ok: bool,
-    ) -> str:
-        if not gates_ok:
-            return "Flagged"
-
-        quality_centile = self._to_centile(quality_z)
-        qarp_centile = self.qarp_tilt * quality_centile + (1 - self.qarp_tilt) * self._to_centile(value_z)
-        accel_ok = sig.quality_acceleration is not None and sig.quality_acceleration > 0
-
-        if (
-            sig.shareholder_yield is not None
-            and sig.shareholder_yield > 0.05
-            and sig.gross_profitability is not None
-            and sig.gross_profitability > 0.30
-        ):
-            return "Cash Return"
-
-        if quality_centile >= 90:
-            return "Compounder"
-
-        if qarp_centile >= 80:
-            return "Discount Compounder"
-
-        if accel_ok and quality_centile >= 60:
-            return "Rising Quality"
-
-        return "Neutral"
+        frame: pd.DataFrame,
+        quality_centile: np.ndarray,
+        qarp_centile: np.ndarray,
+        gates_ok: np.ndarray,
+    ) -> np.ndarray:
+        """Tier for every ticker; the first matching rule wins."""
+        shareholder_yield = frame["shareholder_yield"].to_numpy(dtype=float)
+        gross_profitability = frame["gross_profitability"].to_numpy(dtype=float)
+        acceleration = frame["quality_acceleration"].to_numpy(dtype=float)
+        return np.select(
+            [
+                ~gates_ok,
+                (shareholder_yield > 0.05) & (gross_profitability > 0.30),
+                quality_centile >= 90,
+                qarp_centile >= 80,
+                (acceleration > 0) & (quality_centile >= 60),
+            ],
+            ["Flagged", "Cash Return", "Compounder", "Discount Compounder", "Rising Quality"],
+            default="Neutral",
+        )
 
 
 # ---------------------------------------------------------------------------
@@ -464,285 +481,57 @@ def _median(xs: Iterable[float]) -> Optional[float]:
     return 0.5 * (xs_sorted[mid - 1] + xs_sorted[mid])
 
 
-def _mean_std(xs: List[float]) -> Tuple[float, float]:
-    if not xs:
-        return 0.0, 0.0
-    mean = sum(xs) / len(xs)
-    var = sum((x - mean) ** 2 for x in xs) / len(xs)
-    return mean, math.sqrt(var)
-
-
-def _winsorize(xs: List[float], p: float = 0.01) -> List[float]:
-    """Clip extreme tail values to limit z-score distortion."""
-    if not xs:
-        return []
-    xs_sorted = sorted(xs)
-    n = len(xs_sorted)
-    lo = xs_sorted[max(0, int(n * p))]
-    hi = xs_sorted[min(n - 1, int(n * (1 - p)))]
-    return [_clip(x, lo, hi) for x in xs_sorted]
-
-
-def _clip(x: float, lo: float, hi: float) -> float:
-    return max(lo, min(hi, x))
-
-
-def _compute_asset_growth(balance_hist: List[Dict[str, Any]]) -> Optional[float]:
-    if not balance_hist or len(balance_hist) < 2:
-        return None
-    # SimFin historical is typically oldest -> newest; sort by fiscal year to be safe
-    rows = [r for r in balance_hist if r.get("fiscal_year") and r.get("total_assets")]
-    if len(rows) < 2:
-        return None
-    rows.sort(key=lambda r: r["fiscal_year"])
-    prev = rows[-2]["total_assets"]
-    curr = rows[-1]["total_assets"]
-    if prev is None or curr is None or prev == 0:
-        return None
-    return (curr - prev) / prev
-
-
-def _compute_shareholder_yield(
-    data: Dict[str, Any], cashflow_hist: List[Dict[str, Any]]
-) -> Optional[float]:
-    mcap = data.get("market_cap") or data.get("simfin_market_cap")
-    if not mcap or mcap <= 0:
-        return None
-    dividends = data.get("dividends_paid") or data.get("simfin_dividends_paid") or 0.0
-    buybacks = data.get("net_buybacks") or data.get("simfin_net_buybacks") or 0.0
-    # yfinance doesn't always expose these; use cashflow_hist fallback
-    if dividends == 0 and cashflow_hist:
-        last = cashflow_hist[-1] if cashflow_hist else {}
-        dividends = abs(last.get("dividends_paid") or 0.0)
-        buybacks = abs(last.get("stock_repurchased") or 0.0)
-    total = abs(dividends) + abs(buybacks)
-    if total == 0:
-        return None
-    return total / mcap
+_SIGNAL_FIELDS = [f.name for f in OpportunitySignals.__dataclass_fields__.values()]
+_TEXT_FIELDS = ("ticker", "sector", "data_quality")
+# Filled for the whole universe from the forensic panel
+_PANEL_SIGNALS = ("f_score", "beneish_m", "asset_growth", "shareholder_yield",
+                  "expected_growth", "quality_acceleration")
 
 
-def _compute_expected_growth_proxy(
-    income_hist: List[Dict[str, Any]],
-    balance_hist: List[Dict[str, Any]],
-    cashflow_hist: List[Dict[str, Any]],
-    data: Dict[str, Any],
-) -> Optional[float]:
-    """Hou-Mo-Xue-Zhang (2021) expected-growth proxy.
+def _winsorized_z(
+    values: np.ndarray, sign: int, sectors: Optional[np.ndarray] = None, p: float = WINSOR_PCT
+) -> np.ndarray:
+    """Clip tails at the p / 1-p order statistics, then z-score (population std).
 
-    expected_growth = 0.4 * log(B/P)  +  0.4 * CFOA  +  0.2 * ΔROE_2yr
-
-    log(B/P) approximated by log(book_equity / market_cap).
+    NaN (missing) and zero-dispersion columns score 0.0. With ``sectors``, names
+    in a sector of at least MIN_SECTOR_SIZE are z-scored against their sector.
     """
-    if not income_hist or not balance_hist:
-        return None
-
-    mcap = data.get("market_cap") or data.get("simfin_market_cap")
-    book = None
-    if balance_hist:
-        book = balance_hist[-1].get("shareholder_equity")
-
-    log_bp: Optional[float] = None
-    if mcap and mcap > 0 and book and book > 0:
-        log_bp = math.log(book / mcap)
-
-    cfoa = None
-    if cashflow_hist and balance_hist:
-        ocf = cashflow_hist[-1].get("operating_cash_flow")
-        ta = balance_hist[-1].get("total_assets")
-        if ocf is not None and ta and ta > 0:
-            cfoa = ocf / ta
-
-    d_roe_2yr: Optional[float] = None
-    roe_seq: List[float] = []
-    for i in range(min(len(income_hist), len(balance_hist))):
-        ni = income_hist[i].get("net_income")
-        eq = balance_hist[i].get("shareholder_equity")
-        if ni is not None and eq and eq > 0:
-            roe_seq.append(ni / eq)
-    if len(roe_seq) >= 3:
-        d_roe_2yr = roe_seq[-1] - roe_seq[-3]
-
-    parts = []
-    if log_bp is not None:
-        parts.append(0.4 * log_bp)
-    if cfoa is not None:
-        parts.append(0.4 * cfoa)
-    if d_roe_2yr is not None:
-        parts.append(0.2 * d_roe_2yr)
-    if not parts:
-        return None
-    return sum(parts)
-
-
-def _compute_quality_acceleration(
-    income_hist: List[Dict[str, Any]],
-    balance_hist: List[Dict[str, Any]],
-) -> Optional[float]:
-    """Second difference of a simple GPOA trajectory — Ma, Yang, Ye (2024)."""
-    pairs = []
-    for inc, bal in zip(income_hist, balance_hist):
-        rev = inc.get("revenue")
-        cogs = inc.get("cogs")
-        ta = bal.get("total_assets")
-        if rev is not None and cogs is not None and ta and ta > 0:
-            pairs.append((inc.get("fiscal_year"), (rev - cogs) / ta))
-    pairs = [p for p in pairs if p[0] is not None]
-    pairs.sort(key=lambda p: p[0])
-    if len(pairs) < 3:
-        return None
-    q = [v for _, v in pairs]
-    # acceleration = (q[-1] - q[-2]) - (q[-2] - q[-3])
-    return (q[-1] - q[-2]) - (q[-2] - q[-3])
-
-
-def _compute_f_score(
-    analyzer: EarningsQualityAnalyzer,
-    data: Dict[str, Any],
-    income_hist: List[Dict[str, Any]],
-    balance_hist: List[Dict[str, Any]],
-    cashflow_hist: List[Dict[str, Any]],
-) -> Optional[int]:
-    """Build the F-Score input dict from merged data + SimFin history."""
-    if not income_hist or not balance_hist:
-        return None
-
-    # Use most-recent and prior fiscal year
-    rows = list(zip(income_hist, balance_hist, cashflow_hist or [{}] * len(income_hist)))
-    rows = [r for r in rows if r[0].get("fiscal_year") is not None]
-    rows.sort(key=lambda r: r[0]["fiscal_year"])
-    if len(rows) < 2:
-        return None
-
-    prev_inc, prev_bal, prev_cf = rows[-2]
-    curr_inc, curr_bal, curr_cf = rows[-1]
-
-    payload = {
-        "net_income": curr_inc.get("net_income") or 0,
-        "prior_net_income": prev_inc.get("net_income") or 0,
-        "operating_cash_flow": curr_cf.get("operating_cash_flow") or 0,
-        "prior_operating_cash_flow": prev_cf.get("operating_cash_flow") or 0,
-        "total_assets": curr_bal.get("total_assets") or 1,
-        "prior_total_assets": prev_bal.get("total_assets") or 1,
-        "shareholder_equity": curr_bal.get("shareholder_equity") or 1,
-        "prior_shareholder_equity": prev_bal.get("shareholder_equity") or 1,
-        "current_assets": curr_bal.get("current_assets") or 0,
-        "prior_current_assets": prev_bal.get("current_assets") or 0,
-        "current_liabilities": curr_bal.get("current_liabilities") or 0,
-        "prior_current_liabilities": prev_bal.get("current_liabilities") or 0,
-        "total_debt": curr_bal.get("total_debt") or 0,
-        "prior_total_debt": prev_bal.get("total_debt") or 0,
-        "shares_outstanding": data.get("shares_outstanding") or 0,
-        "prior_shares_outstanding": data.get("prior_shares_outstanding") or data.get("shares_outstanding") or 0,
-        "revenue": curr_inc.get("revenue") or 0,
-        "prior_revenue": prev_inc.get("revenue") or 0,
-        "cogs": curr_inc.get("cogs") or 0,
-        "prior_cogs": prev_inc.get("cogs") or 0,
-    }
-
-    try:
-        total, _ = analyzer.calculate_piotroski_f_score(payload)
-        return int(total)
-    except Exception as exc:
-        logger.debug(f"F-Score failed for {data.get('ticker')}: {exc}")
-        return None
-
-
-def _compute_beneish_m(
-    income_hist: List[Dict[str, Any]],
-    balance_hist: List[Dict[str, Any]],
-    cashflow_hist: List[Dict[str, Any]],
-) -> Optional[float]:
-    """
-    Simplified Beneish M-Score (1999) using SimFin historical fields.
-
-    Requires two consecutive years. Falls back to None if any input missing.
-    """
-    if len(income_hist) < 2 or len(balance_hist) < 2 or len(cashflow_hist) < 2:
-        return None
-
-    inc_t = income_hist[-1]
-    inc_p = income_hist[-2]
-    bal_t = balance_hist[-1]
-    bal_p = balance_hist[-2]
-    cf_t = cashflow_hist[-1]
-
-    rev_t = inc_t.get("revenue")
-    rev_p = inc_p.get("revenue")
-    if not rev_t or not rev_p or rev_t <= 0 or rev_p <= 0:
-        return None
-
-    receivables_t = bal_t.get("accounts_receivable")
-    receivables_p = bal_p.get("accounts_receivable")
-
-    cogs_t = inc_t.get("cogs")
-    cogs_p = inc_p.get("cogs")
-    gm_t = ((rev_t - cogs_t) / rev_t) if rev_t and cogs_t is not None else None
-    gm_p = ((rev_p - cogs_p) / rev_p) if rev_p and cogs_p is not None else None
-
-    ta_t = bal_t.get("total_assets")
-    ta_p = bal_p.get("total_assets")
-
-    sga_t = inc_t.get("operating_expense")
-    sga_p = inc_p.get("operating_expense")
-
-    debt_t = bal_t.get("total_debt") or 0
-    debt_p = bal_p.get("total_debt") or 0
-
-    ni_t = inc_t.get("net_income")
-    ocf_t = cf_t.get("operating_cash_flow")
-
-    # DSRI — Days Sales in Receivables Index
-    dsri = 1.0
-    if receivables_t and receivables_p and rev_t and rev_p:
-        dsri = (receivables_t / rev_t) / (receivables_p / rev_p)
-
-    # GMI — inverse gross margin index
-    gmi = (gm_p / gm_t) if gm_t and gm_p else 1.0
-
-    # AQI — Asset Quality Index (proxy: 1 - current_assets/total_assets)
-    ca_t = bal_t.get("current_assets") or 0
-    ca_p = bal_p.get("current_assets") or 0
-    aqi = 1.0
-    if ta_t and ta_p and ta_t > 0 and ta_p > 0:
-        nca_t = 1 - ca_t / ta_t
-        nca_p = 1 - ca_p / ta_p
-        if nca_p:
-            aqi = nca_t / nca_p
-
-    # SGI — Sales Growth Index
-    sgi = rev_t / rev_p
-
-    # DEPI — depreciation index (use D&A / D&A + net PP&E proxy = 1)
-    depi = 1.0
-
-    # SGAI — SG&A Index (inverse)
-    sgai = 1.0
-    if sga_t is not None and sga_p and rev_t and rev_p:
-        if sga_p / rev_p:
-            sgai = (sga_t / rev_t) / (sga_p / rev_p)
-
-    # TATA — Total Accruals to Total Assets
-    tata = 0.0
-    if ni_t is not None and ocf_t is not None and ta_t and ta_t > 0:
-        tata = (ni_t - ocf_t) / ta_t
-
-    # LVGI — Leverage Index
-    lvgi = 1.0
-    if ta_t and ta_p and ta_t > 0 and ta_p > 0:
-        lt = debt_t / ta_t
-        lp = debt_p / ta_p
-        if lp:
-            lvgi = lt / lp
-
-    m = (
-        -4.84
-        + 0.920 * dsri
-        + 0.528 * gmi
-        + 0.404 * aqi
-        + 0.892 * sgi
-        + 0.115 * depi
-        - 0.172 * sgai
-        + 4.679 * tata
-        - 0.327 * lvgi
-    )
-    return m
+    z = np.zeros(len(values))
+    valid = ~np.isnan(values)
+    n = int(valid.sum())
+    if n == 0:
+        return z
+    ordered = np.sort(values[valid])
+    lo = ordered[max(0, int(n * p))]
+    hi = ordered[min(n - 1, int(n * (1 - p)))]
+    clipped = np.clip(values, lo, hi)
+    std = clipped[valid].std()
+    if std == 0:
+        return z
+    z[valid] = sign * (clipped[valid] - clipped[valid].mean()) / std
+    if sectors is not None:
+        grouped = pd.Series(np.where(valid, clipped, np.nan)).groupby(sectors)
+        mean = grouped.transform("mean").to_numpy()
+        sd = grouped.transform("std", ddof=0).to_numpy()
+        count = grouped.transform("count").to_numpy()
+        own = valid & (count >= MIN_SECTOR_SIZE) & (sd > 0)
+        z[own] = sign * (clipped[own] - mean[own]) / sd[own]
+    return z
+
+
+def _records(frame: pd.DataFrame) -> List[Dict[str, Any]]:
+    """Row dicts of plain Python values, NaN -> None."""
+    names = list(frame.columns)
+    columns = [[None if v != v else v for v in frame[c].tolist()] for c in names]
+    return [dict(zip(names, row)) for row in zip(*columns)]
+
+
+def _weighted_sum(z: pd.DataFrame, weights: Dict[str, float]) -> np.ndarray:
+    """Row-wise sum of z * weight; components without a z column count as 0."""
+    cols = z.reindex(columns=list(weights), fill_value=0.0).to_numpy()
+    return cols @ np.fromiter(weights.values(), dtype=float, count=len(weights))
+
+
+def _to_centile(raw_z: np.ndarray, mean: float = 50.0, spread: float = 15.0) -> np.ndarray:
+    """Map composite z (approx. standard normal) to 0-100 centile-style score."""
+    return np.clip(mean + spread * raw_z, 0.0, 100.0)
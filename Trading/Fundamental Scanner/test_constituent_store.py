@@ -0,0 +1,91 @@
+"""Constituent snapshots from local fixture pages (data/constituent_store.py)."""
+from datetime import datetime
+
+from data.constituent_store import ConstituentStore
+from data.financial_data_fetcher import WIKIPEDIA_CONSTITUENT_PAGES, parse_constituent_table
+from data.watchlist_config import WatchlistConfig, WatchlistIndex
+
+
+def _table(column, tickers):
+    rows = "".join(f"<tr><td>{t}</td><td>{t} Inc.</td></tr>" for t in tickers)
+    return f"<table><tr><th>{column}</th><th>Security</th></tr>{rows}</table>"
+
+
+def _page(tickers, column="Symbol"):
+    # A changes table after the constituents, as on the S&P pages
+    changes = "<table><tr><th>Date</th><th>Added</th></tr><tr><td>2024</td><td>X</td></tr></table>"
+    return f"<html><body>{_table(column, tickers)}{changes}</body></html>"
+
+
+def _pages(sp500, sp400, sp600, nasdaq100=("AAPL",)):
+    lists = {"sp500": (sp500, "Symbol"), "sp400": (sp400, "Symbol"),
+             "sp600": (sp600, "Symbol"), "nasdaq100": (nasdaq100, "Ticker")}
+    return {WIKIPEDIA_CONSTITUENT_PAGES[index][0]: _page(tickers, column)
+            for index, (tickers, column) in lists.items()}
+
+
+class FixtureSite:
+    """url -> HTML from saved pages, counting fetches"""
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.fetches = 0
+
+    def __call__(self, url):
+        self.fetches += 1
+        return self.pages[url]
+
+
+def test_parse_constituent_table_falls_back_to_the_table_with_the_column():
+    html = _page(["MSFT", "NVDA"], column="Ticker")
+    # nasdaq100 expects table 3; the fixture page only has two tables
+    assert parse_constituent_table(html, 3, "Ticker") == ["MSFT", "NVDA"]
+    assert parse_constituent_table(html, 0, "Ticker") == ["MSFT", "NVDA"]
+
+
+def test_rescrape_records_a_new_version_and_diffs_it(tmp_path):
+    site = FixtureSite(_pages(["AAPL", "MSFT", "XOM"], ["DECK"], ["SMCI"]))
+    store = ConstituentStore(tmp_path / "constituents.db", fetch_page=site,
+                             background_refresh=False)
+    assert store.get("sp500") == ["AAPL", "MSFT", "XOM"]
+    assert store.get("sp500") == ["AAPL", "MSFT", "XOM"]
+    assert site.fetches == 1                               # fresh snapshot: no re-scrape
+    before = datetime.now()
+
+    # Unchanged page: same version, checked_at bumped
+    store.refresh("sp500")
+    assert len(store.history("sp500")) == 1
+
+    site.pages = _pages(["AAPL", "MSFT", "DECK"], ["ELF"], ["SMCI"])
+    store.refresh("sp500")
+    assert len(store.history("sp500")) == 2
+    assert store.diff("sp500") == (["DECK"], ["XOM"])
+    assert store.diff("sp500", since=before) == (["DECK"], ["XOM"])
+    store.close()
+
+
+def test_composite_membership_and_changes(tmp_path):
+    site = FixtureSite(_pages(["AAPL", "MSFT"], ["DECK", "ELF"], ["SMCI", "ELF"]))
+    store = ConstituentStore(tmp_path / "constituents.db", fetch_page=site,
+                             background_refresh=False)
+
+    combined = WatchlistConfig(index=WatchlistIndex.COMBINED_SP, store=store)
+    assert combined.get_tickers() == ["AAPL", "MSFT", "DECK", "ELF", "SMCI"]
+    assert store.get("russell1000") == ["AAPL", "MSFT", "DECK", "ELF"]
+    assert store.get("russell2000") == ["SMCI", "ELF"]
+
+    multi = WatchlistConfig(index=WatchlistIndex.MULTI, store=store,
+                            multi_indices=[WatchlistIndex.SP500, WatchlistIndex.SP400])
+    assert sorted(multi.get_tickers()) == ["AAPL", "DECK", "ELF", "MSFT"]
+
+    # DECK is promoted from the S&P 400 to the S&P 500; ELF leaves the S&P 400 only
+    site.pages = _pages(["AAPL", "MSFT", "DECK"], ["CELH"], ["SMCI", "ELF"])
+    for index in ("sp500", "sp400", "sp600"):
+        store.refresh(index)
+
+    assert store.diff("combined_sp") == (["CELH"], [])     # ELF is still in the S&P 600
+    assert store.diff("russell1000") == (["CELH"], ["ELF"])
+    assert multi.get_constituent_changes() == (["CELH"], ["ELF"])
+    assert combined.get_constituent_changes() == (["CELH"], [])
+    assert combined.get_tickers() == ["AAPL", "MSFT", "DECK", "CELH", "SMCI", "ELF"]
+    store.close()
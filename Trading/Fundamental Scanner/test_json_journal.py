@@ -0,0 +1,36 @@
+"""Crash recovery for the append-only JSON cache journal (data/json_journal.py)."""
+from data.json_journal import JsonJournal
+
+
+def test_torn_last_line_is_dropped_and_next_put_survives(tmp_path):
+    journal = JsonJournal(tmp_path / "cache.json")
+    journal.load()
+    journal.put("A", {"ticker": "A"})
+    journal.close()
+    with journal.journal_path.open("a", encoding="utf-8") as f:
+        f.write('{"k": "B", "v": {"tic')                # crash mid-append
+
+    reopened = JsonJournal(tmp_path / "cache.json")
+    assert reopened.load() == {"A": {"ticker": "A"}}
+    assert journal.journal_path.read_bytes().endswith(b"\n")
+    reopened.put("Z", {"ticker": "Z"})
+    reopened.close()
+
+    state = JsonJournal(tmp_path / "cache.json").load()
+    assert state == {"A": {"ticker": "A"}, "Z": {"ticker": "Z"}}
+
+
+def test_replay_applies_deletes_and_compaction_keeps_state(tmp_path):
+    journal = JsonJournal(tmp_path / "cache.json", min_compact=2)
+    state = journal.load()
+    for key in ("A", "B", "C"):
+        state[key] = key.lower()
+        journal.put(key, key.lower())
+    del state["B"]
+    journal.delete("B")
+    assert journal.maybe_compact(state)
+    assert not journal.journal_path.exists()
+
+    journal.put("D", "d")
+    journal.close()
+    assert JsonJournal(tmp_path / "cache.json").load() == {"A": "a", "C": "c", "D": "d"}
@@ -0,0 +1,82 @@
+"""
+Merged Opportunity Cache
+
+Resumable per-ticker store of scorer-ready merged dicts for the opportunity
+discovery workflow, plus the paths of the files that sit next to it.
+
+Kept apart from ``opportunity_discovery`` so the CLI can inspect the cache
+(and the metadata index) without importing pandas, yfinance or the scorer.
+"""
+
+import sys
+from datetime import timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from data.kv_store import KeyValueStore
+from data.metadata_index import MetadataIndex
+
+MERGED_CACHE_FILE = Path(__file__).parent.parent / "merged_opportunity_cache.db"
+MERGED_CACHE_TTL = timedelta(days=7)
+METADATA_INDEX_FILE = Path(__file__).parent.parent / "metadata_index.db"
+
+
+class MergedCache:
+    """Per-ticker SQLite store of {ticker: merged_dict} with a fetch timestamp.
+
+    Each ``set`` is one upsert (committed every ``batch_size`` writes), so the
+    cache stays resumable without re-serializing the whole universe per ticker.
+    A legacy ``merged_opportunity_cache.pkl`` is imported on first use.
+    """
+
+    def __init__(self, path: Path = MERGED_CACHE_FILE, ttl: timedelta = MERGED_CACHE_TTL,
+                 batch_size: int = 1):
+        self.path = Path(path).with_suffix(".db")
+        self.ttl = ttl
+        self._store = KeyValueStore(self.path, batch_size=batch_size,
+                                    legacy_pickle=Path(path).with_suffix(".pkl"))
+
+    def get(self, ticker: str) -> Optional[Dict[str, Any]]:
+        return self._store.get(ticker, self.ttl)
+
+    def set(self, ticker: str, data: Dict[str, Any]) -> None:
+        self._store.set(ticker, data)
+
+    def set_many(self, items: Dict[str, Dict[str, Any]]) -> None:
+        self._store.set_many(items)
+
+    def flush(self) -> None:
+        self._store.flush()
+
+    def has_fresh(self, ticker: str) -> bool:
+        return bool(self._store.fresh_keys([ticker], self.ttl))
+
+    def fresh_keys(self, tickers: List[str]) -> List[str]:
+        return self._store.fresh_keys(tickers, self.ttl)
+
+    def keys(self) -> List[str]:
+        return self._store.keys()
+
+    def get_many(self, tickers: List[str]) -> Dict[str, Dict[str, Any]]:
+        found = self._store.get_many(tickers, self.ttl)
+        return {t: found[t] for t in tickers if t in found}
+
+    def __len__(self) -> int:
+        return len(self._store)
+
+
+def rebuild_metadata_index(cache: MergedCache, index: MetadataIndex, chunk: int = 500) -> int:
+    """Re-index every cached ticker (stale ones too) from its merged dict.
+
+    Score fields are left as they are; the next scoring run refreshes them.
+
+    Returns:
+        Number of tickers indexed
+    """
+    keys = cache.keys()
+    written = 0
+    for i in range(0, len(keys), chunk):
+        written += index.record_fetched(cache._store.get_many(keys[i:i + chunk]))
+    return written
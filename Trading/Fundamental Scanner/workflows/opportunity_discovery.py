@@ -1,10 +1,13 @@
 """
 Opportunity Discovery Workflow — yfinance-only, two-phase, resumable.
 
-Phase 1 (gather): fetches yfinance current fundamentals + multi-year history,
-respecting a 1 req/sec rate limit with exponential backoff. Persists to
-`merged_opportunity_cache.pkl` after every ticker, so the process can be
-interrupted (Ctrl-C) and resumed later without refetching.
+Phase 1 (gather): a staged pipeline. Network stage: each ticker's info +
+three statements are fetched once, concurrently, paced by adaptive token
+buckets that back off on 429s. Build stage: batches of raw payloads are
+normalized into scorer-shape dicts in a process pool (line items resolved
+per statement in one vectorized pass). Persist stage: each finished batch is
+upserted into `merged_opportunity_cache.db` (SQLite) in one transaction, so
+the process can be interrupted (Ctrl-C) and resumed later without refetching.
 
 Phase 2 (score): reads only from the cache and runs the cross-sectional
 OpportunityScorer. No network calls.
@@ -21,27 +24,35 @@ from __future__ import annotations
 
 import json
 import logging
+import multiprocessing
 import os
-import pickle
 import sys
-import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from dataclasses import asdict
-from datetime import datetime, timedelta
+from datetime import datetime
 from pathlib import Path
-from threading import Lock
-from typing import Any, Dict, List, Optional, Tuple
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
-import yfinance as yf
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from data.financial_data_fetcher import FinancialData
-from data.parallel_fetcher import ParallelFetcher
+from data.metadata_index import MetadataIndex
 from data.watchlist_config import WatchlistConfig
 from quality.opportunity_scorer import OpportunityReport, OpportunityScorer
+from workflows.merged_cache import (  # noqa: F401  (re-exported)
+    MERGED_CACHE_FILE,
+    MERGED_CACHE_TTL,
+    METADATA_INDEX_FILE,
+    MergedCache,
+)
+
+if TYPE_CHECKING:
+    # yfinance-backed; imported on first fetch / build so scoring never loads it
+    from data.financial_data_fetcher import FinancialData
+    from data.parallel_fetcher import ParallelFetcher
 
 try:
     from tqdm import tqdm
@@ -52,98 +63,105 @@ except ImportError:
 logger = logging.getLogger(__name__)
 
 OUTPUTS_DIR = Path(__file__).parent.parent / "outputs"
-MERGED_CACHE_FILE = Path(__file__).parent.parent / "merged_opportunity_cache.pkl"
-MERGED_CACHE_TTL = timedelta(days=7)
-
-
-# ---------------------------------------------------------------------------
-# Persistent merged cache — resumable across sessions
-# ---------------------------------------------------------------------------
-
-class MergedCache:
-    """Pickle-backed store of {ticker: (merged_dict, fetched_at)}."""
-
-    def __init__(self, path: Path = MERGED_CACHE_FILE, ttl: timedelta = MERGED_CACHE_TTL):
-        self.path = Path(path)
-        self.ttl = ttl
-        self._lock = Lock()
-        self._data: Dict[str, Tuple[Dict[str, Any], datetime]] = self._load()
-
-    def _load(self) -> Dict[str, Tuple[Dict[str, Any], datetime]]:
-        if not self.path.exists():
-            return {}
-        try:
-            with self.path.open("rb") as f:
-                return pickle.load(f)
-        except Exception as exc:
-            logger.warning(f"merged cache load failed: {exc}")
-            return {}
-
-    def _save(self) -> None:
-        tmp = self.path.with_suffix(".pkl.tmp")
-        with tmp.open("wb") as f:
-            pickle.dump(self._data, f)
-        os.replace(tmp, self.path)
-
-    def get(self, ticker: str) -> Optional[Dict[str, Any]]:
-        with self._lock:
-            entry = self._data.get(ticker)
-        if entry is None:
-            return None
-        data, fetched_at = entry
-        if datetime.now() - fetched_at > self.ttl:
-            return None
-        return data
-
-    def set(self, ticker: str, data: Dict[str, Any]) -> None:
-        with self._lock:
-            self._data[ticker] = (data, datetime.now())
-            self._save()
-
-    def has_fresh(self, ticker: str) -> bool:
-        return self.get(ticker) is not None
-
-    def keys(self) -> List[str]:
-        with self._lock:
-            return list(self._data.keys())
-
-    def get_many(self, tickers: List[str]) -> Dict[str, Dict[str, Any]]:
-        out: Dict[str, Dict[str, Any]] = {}
-        for t in tickers:
-            d = self.get(t)
-            if d is not None:
-                out[t] = d
-        return out
+BUILD_BATCH_SIZE = 25  # tickers per process-pool task / cache transaction
 
 
 # ---------------------------------------------------------------------------
 # yfinance → scorer-shape adapter
 # ---------------------------------------------------------------------------
 
-def _safe_col(df: pd.DataFrame, key: str, col) -> Optional[float]:
-    try:
-        if df is None or df.empty or key not in df.index or col not in df.columns:
-            return None
-        v = df.loc[key, col]
-        if pd.notna(v) and not np.isinf(v):
-            return float(v)
-    except Exception:
-        return None
-    return None
-
-
-def _first_present(df: pd.DataFrame, keys: List[str], col) -> Optional[float]:
-    for k in keys:
-        v = _safe_col(df, k, col)
-        if v is not None:
-            return v
-    return None
+# yfinance line-item aliases per output field, tried in order: the first
+# finite value wins, independently for each period column.
+INCOME_FIELDS = {
+    "revenue": ["Total Revenue", "Revenue"],
+    "cogs": ["Cost Of Revenue", "Cost Of Goods Sold"],
+    "net_income": ["Net Income", "Net Income Common Stockholders"],
+    "operating_income": ["Operating Income", "EBIT"],
+    "operating_expense": ["Operating Expense"],
+    "ebitda": ["EBITDA", "Normalized EBITDA"],
+}
+BALANCE_FIELDS = {
+    "total_assets": ["Total Assets"],
+    "shareholder_equity": ["Stockholders Equity", "Common Stock Equity",
+                           "Total Equity Gross Minority Interest"],
+    "total_debt": ["Total Debt", "Long Term Debt"],
+    "current_assets": ["Current Assets", "Total Current Assets"],
+    "current_liabilities": ["Current Liabilities", "Total Current Liabilities"],
+    "retained_earnings": ["Retained Earnings"],
+    "accounts_receivable": ["Accounts Receivable", "Receivables"],
+}
+CASHFLOW_FIELDS = {
+    "operating_cash_flow": ["Operating Cash Flow", "Cash Flow From Continuing Operating Activities",
+                            "Total Cash From Operating Activities"],
+    "free_cash_flow": ["Free Cash Flow"],
+    "dividends_paid": ["Cash Dividends Paid", "Common Stock Dividend Paid"],
+    "stock_repurchased": ["Repurchase Of Capital Stock", "Common Stock Repurchased"],
+    # Current-year shareholder-yield inputs accept a wider set of labels
+    "net_buybacks": ["Repurchase Of Capital Stock", "Common Stock Repurchased", "Repurchase of Stock"],
+    "total_dividends": ["Cash Dividends Paid", "Common Stock Dividend Paid", "Dividends Paid"],
+}
+
+# Fields written to each simfin_historical row (in this order)
+_HISTORY_INCOME = ["revenue", "cogs", "net_income", "operating_income", "operating_expense"]
+_HISTORY_BALANCE = ["total_assets", "shareholder_equity", "total_debt", "current_assets",
+                    "current_liabilities", "retained_earnings", "accounts_receivable"]
+_HISTORY_CASHFLOW = ["operating_cash_flow", "free_cash_flow", "dividends_paid", "stock_repurchased"]
+
+
+def _resolve_fields(df: Optional[pd.DataFrame], fields: Dict[str, List[str]],
+                    columns: List[Any]) -> Dict[str, np.ndarray]:
+    """Resolve every field's alias list across ``columns`` in one pass.
+
+    Returns {field: float array aligned with ``columns``}, NaN where no alias
+    has a finite value (missing row, missing period, non-numeric or inf).
+    """
+    n = len(columns)
+    if not isinstance(df, pd.DataFrame) or df.empty:
+        return {name: np.full(n, np.nan) for name in fields}
+    if not all(pd.api.types.is_numeric_dtype(t) for t in df.dtypes):
+        df = df.apply(pd.to_numeric, errors="coerce")
+    matrix = df.to_numpy(dtype=float, na_value=np.nan)
+
+    # Positions of each alias row / requested column (first occurrence; -1 = absent),
+    # gathered in one fancy-index instead of a label lookup per cell
+    row_at = _first_positions(df.index)
+    col_at = _first_positions(df.columns)
+    rows = np.array([row_at.get(alias, -1) for aliases in fields.values() for alias in aliases])
+    col_pos = np.array([col_at.get(col, -1) for col in columns], dtype=int)
+    values = matrix[np.ix_(np.maximum(rows, 0), np.maximum(col_pos, 0))]
+    present = (rows >= 0)[:, None] & (col_pos >= 0)[None, :] & np.isfinite(values)
+    values = np.where(present, values, np.nan)
+
+    out: Dict[str, np.ndarray] = {}
+    start = 0
+    cols = np.arange(n)
+    for name, aliases in fields.items():
+        sub = values[start:start + len(aliases)]
+        start += len(aliases)
+        ok = ~np.isnan(sub)
+        out[name] = np.where(ok.any(axis=0), sub[ok.argmax(axis=0), cols], np.nan)
+    return out
+
+
+def _first_positions(labels: pd.Index) -> Dict[Any, int]:
+    """label -> position of its first occurrence."""
+    out: Dict[Any, int] = {}
+    for i, label in enumerate(labels):
+        out.setdefault(label, i)
+    return out
+
+
+def _opt(value: float) -> Optional[float]:
+    return None if np.isnan(value) else float(value)
 
 
 def _build_merged_dict(
     ticker: str,
     current: FinancialData,
-    stock: yf.Ticker,
+    financials: Optional[pd.DataFrame],
+    balance: Optional[pd.DataFrame],
+    cashflow: Optional[pd.DataFrame],
+    shares_outstanding: Optional[float] = None,
 ) -> Dict[str, Any]:
     """Adapt yfinance data into the dict shape `OpportunityScorer` expects.
 
@@ -155,41 +173,33 @@ def _build_merged_dict(
     merged: Dict[str, Any] = current.to_dict()
     merged["ticker"] = ticker
 
-    # Raw statements from this ticker (shared across historical + accrual calcs)
-    try:
-        financials = stock.financials
-    except Exception:
-        financials = pd.DataFrame()
-    try:
-        balance = stock.balance_sheet
-    except Exception:
-        balance = pd.DataFrame()
-    try:
-        cashflow = stock.cashflow
-    except Exception:
-        cashflow = pd.DataFrame()
+    statements = [df if isinstance(df, pd.DataFrame) else pd.DataFrame()
+                  for df in (financials, balance, cashflow)]
+
+    # Every period across the non-empty statements, oldest first (yfinance
+    # columns are datetimes), resolved once per statement
+    cols_sorted = sorted(set().union(*(df.columns for df in statements if not df.empty)))
+    inc, bal, cf = (
+        _resolve_fields(df, fields, cols_sorted)
+        for df, fields in zip(statements, (INCOME_FIELDS, BALANCE_FIELDS, CASHFLOW_FIELDS))
+    )
 
-    # Most-recent column (yfinance orders newest-first)
-    def latest_col(df: pd.DataFrame):
-        return df.columns[0] if isinstance(df, pd.DataFrame) and not df.empty else None
+    # Most-recent column of each statement (yfinance orders newest-first)
+    def latest(df: pd.DataFrame, resolved: Dict[str, np.ndarray], name: str) -> Optional[float]:
+        if df.empty:
+            return None
+        return _opt(resolved[name][cols_sorted.index(df.columns[0])])
 
-    lc_inc = latest_col(financials)
-    lc_bal = latest_col(balance)
-    lc_cf = latest_col(cashflow)
+    financials, balance, cashflow = statements
 
     # Current-year OCF (missing from FinancialData)
-    ocf = _first_present(
-        cashflow,
-        ["Operating Cash Flow", "Cash Flow From Continuing Operating Activities",
-         "Total Cash From Operating Activities"],
-        lc_cf,
-    ) if lc_cf is not None else None
+    ocf = latest(cashflow, cf, "operating_cash_flow")
     if ocf is not None:
         merged["operating_cash_flow"] = ocf
 
     # Current assets / liabilities (for F-Score current ratio + Beneish)
-    ca = _first_present(balance, ["Current Assets", "Total Current Assets"], lc_bal) if lc_bal is not None else None
-    cl = _first_present(balance, ["Current Liabilities", "Total Current Liabilities"], lc_bal) if lc_bal is not None else None
+    ca = latest(balance, bal, "current_assets")
+    cl = latest(balance, bal, "current_liabilities")
     if ca is not None:
         merged["current_assets"] = ca
     if cl is not None:
@@ -197,35 +207,21 @@ def _build_merged_dict(
 
     # EBITDA (fallback when FinancialData didn't capture it)
     if not merged.get("ebitda"):
-        ebitda = _first_present(financials, ["EBITDA", "Normalized EBITDA"], lc_inc) if lc_inc is not None else None
+        ebitda = latest(financials, inc, "ebitda")
         if ebitda is not None:
             merged["ebitda"] = ebitda
 
     # Shares outstanding (for shareholder yield + F-Score equity issuance)
-    try:
-        info = stock.fast_info if hasattr(stock, "fast_info") else {}
-        shares = getattr(info, "shares", None) if info else None
-        if shares:
-            merged["shares_outstanding"] = float(shares)
-    except Exception:
-        pass
+    if shares_outstanding:
+        merged["shares_outstanding"] = float(shares_outstanding)
 
     # Buybacks + dividends (for shareholder yield)
-    if lc_cf is not None:
-        buybacks = _first_present(
-            cashflow,
-            ["Repurchase Of Capital Stock", "Common Stock Repurchased", "Repurchase of Stock"],
-            lc_cf,
-        )
-        dividends = _first_present(
-            cashflow,
-            ["Cash Dividends Paid", "Common Stock Dividend Paid", "Dividends Paid"],
-            lc_cf,
-        )
-        if buybacks is not None:
-            merged["net_buybacks"] = abs(buybacks)
-        if dividends is not None:
-            merged["dividends_paid"] = abs(dividends)
+    buybacks = latest(cashflow, cf, "net_buybacks")
+    dividends = latest(cashflow, cf, "total_dividends")
+    if buybacks is not None:
+        merged["net_buybacks"] = abs(buybacks)
+    if dividends is not None:
+        merged["dividends_paid"] = abs(dividends)
 
     # Derived ratios expected by the scorer
     if merged.get("revenue") and merged.get("cogs") is not None and merged.get("total_assets"):
@@ -261,18 +257,18 @@ def _build_merged_dict(
         pass
 
     # ---- Historical (simfin_historical-shape so scorer logic is untouched)
-    simfin_historical = _build_historical(financials, balance, cashflow)
+    simfin_historical = _build_historical(cols_sorted, inc, bal, cf)
     if simfin_historical:
         merged["simfin_historical"] = simfin_historical
 
     # ROE history for persistence scoring
     roe_history: List[float] = []
-    for inc, bal in zip(
+    for inc_row, bal_row in zip(
         simfin_historical.get("income", []),
         simfin_historical.get("balance", []),
     ):
-        ni = inc.get("net_income")
-        eq = bal.get("shareholder_equity")
+        ni = inc_row.get("net_income")
+        eq = bal_row.get("shareholder_equity")
         if ni is not None and eq and eq > 0:
             roe_history.append(ni / eq)
     if roe_history:
@@ -284,71 +280,97 @@ def _build_merged_dict(
 
 
 def _build_historical(
-    financials: pd.DataFrame, balance: pd.DataFrame, cashflow: pd.DataFrame
+    cols_sorted: List[Any],
+    inc: Dict[str, np.ndarray],
+    bal: Dict[str, np.ndarray],
+    cf: Dict[str, np.ndarray],
 ) -> Dict[str, List[Dict[str, Any]]]:
-    """Extract multi-year history as {income, balance, cash_flow} arrays ordered oldest → newest."""
-    all_cols = set()
-    for df in (financials, balance, cashflow):
-        if isinstance(df, pd.DataFrame) and not df.empty:
-            all_cols.update(df.columns)
-    if not all_cols:
+    """Lay resolved fields out as {income, balance, cash_flow} arrays ordered oldest → newest."""
+    if not cols_sorted:
         return {}
 
-    # yfinance columns are datetimes — sort ascending (oldest first)
-    cols_sorted = sorted(all_cols)
-
-    income_rows: List[Dict[str, Any]] = []
-    balance_rows: List[Dict[str, Any]] = []
-    cashflow_rows: List[Dict[str, Any]] = []
-
-    for col in cols_sorted:
-        fy = getattr(col, "year", None)
-
-        income_rows.append({
-            "fiscal_year": fy,
-            "revenue": _first_present(financials, ["Total Revenue", "Revenue"], col),
-            "cogs": _first_present(financials, ["Cost Of Revenue", "Cost Of Goods Sold"], col),
-            "net_income": _first_present(financials, ["Net Income", "Net Income Common Stockholders"], col),
-            "operating_income": _first_present(financials, ["Operating Income", "EBIT"], col),
-            "operating_expense": _first_present(financials, ["Operating Expense"], col),
-            "accounts_receivable": None,
-        })
-        balance_rows.append({
-            "fiscal_year": fy,
-            "total_assets": _first_present(balance, ["Total Assets"], col),
-            "shareholder_equity": _first_present(
-                balance, ["Stockholders Equity", "Common Stock Equity", "Total Equity Gross Minority Interest"], col
-            ),
-            "total_debt": _first_present(balance, ["Total Debt", "Long Term Debt"], col),
-            "current_assets": _first_present(balance, ["Current Assets", "Total Current Assets"], col),
-            "current_liabilities": _first_present(balance, ["Current Liabilities", "Total Current Liabilities"], col),
-            "retained_earnings": _first_present(balance, ["Retained Earnings"], col),
-            "accounts_receivable": _first_present(balance, ["Accounts Receivable", "Receivables"], col),
-        })
-        cashflow_rows.append({
-            "fiscal_year": fy,
-            "operating_cash_flow": _first_present(
-                cashflow,
-                ["Operating Cash Flow", "Cash Flow From Continuing Operating Activities",
-                 "Total Cash From Operating Activities"],
-                col,
-            ),
-            "free_cash_flow": _first_present(cashflow, ["Free Cash Flow"], col),
-            "dividends_paid": _first_present(
-                cashflow, ["Cash Dividends Paid", "Common Stock Dividend Paid"], col
-            ),
-            "stock_repurchased": _first_present(
-                cashflow, ["Repurchase Of Capital Stock", "Common Stock Repurchased"], col
-            ),
-        })
-
-    # Attach receivables to income rows too (for Beneish DSRI lookups)
-    for inc, bal in zip(income_rows, balance_rows):
-        inc["accounts_receivable"] = bal.get("accounts_receivable")
-
+    def column_lists(resolved: Dict[str, np.ndarray], names: List[str]) -> List[List[Optional[float]]]:
+        return [[None if v != v else v for v in resolved[name].tolist()] for name in names]
+
+    years = [getattr(col, "year", None) for col in cols_sorted]
+    inc_cols = column_lists(inc, _HISTORY_INCOME)
+    bal_cols = column_lists(bal, _HISTORY_BALANCE)
+    cf_cols = column_lists(cf, _HISTORY_CASHFLOW)
+
+    balance_rows = [
+        {"fiscal_year": fy, **dict(zip(_HISTORY_BALANCE, values))}
+        for fy, *values in zip(years, *bal_cols)
+    ]
+    # Receivables ride along on income rows too (for Beneish DSRI lookups)
+    income_rows = [
+        {"fiscal_year": fy, **dict(zip(_HISTORY_INCOME, values)),
+         "accounts_receivable": bal_row["accounts_receivable"]}
+        for (fy, *values), bal_row in zip(zip(years, *inc_cols), balance_rows)
+    ]
+    cashflow_rows = [
+        {"fiscal_year": fy, **dict(zip(_HISTORY_CASHFLOW, values))}
+        for fy, *values in zip(years, *cf_cols)
+    ]
     return {"income": income_rows, "balance": balance_rows, "cash_flow": cashflow_rows}
 
 
+def build_merged_record(
+    ticker: str, payloads: Dict[str, Any]
+) -> Tuple[FinancialData, Optional[Dict[str, Any]]]:
+    """Raw yfinance payloads -> (FinancialData, scorer-shape dict or None if insufficient)."""
+    from data.parallel_fetcher import build_financial_data
+
+    current = build_financial_data(
+        ticker,
+        payloads.get("info"),
+        payloads.get("financials"),
+        payloads.get("balance_sheet"),
+        payloads.get("cashflow"),
+    )
+    if current.data_quality == "insufficient":
+        return current, None
+    info = payloads.get("info") or {}
+    shares = info.get("sharesOutstanding") or info.get("impliedSharesOutstanding")
+    merged = _build_merged_dict(
+        ticker, current,
+        payloads.get("financials"), payloads.get("balance_sheet"), payloads.get("cashflow"),
+        shares_outstanding=shares,
+    )
+    return current, merged
+
+
+def _build_batch(
+    batch: List[Tuple[str, Dict[str, Any]]]
+) -> List[Tuple[str, Optional[FinancialData], Optional[Dict[str, Any]]]]:
+    """Process-pool task: build one batch, isolating per-ticker failures."""
+    out = []
+    for ticker, payloads in batch:
+        try:
+            current, merged = build_merged_record(ticker, payloads)
+        except Exception as exc:
+            logger.warning(f"{ticker}: build failed: {exc}")
+            current, merged = None, None
+        out.append((ticker, current, merged))
+    return out
+
+
+def _build_executor(workers: int) -> Executor:
+    """Process pool for the build stage; in-thread fallback where processes are unavailable.
+
+    Workers are started lazily from inside the fetch callback, while fetch
+    threads hold locks, so they must not be forked from this process:
+    forkserver (or spawn where forkserver is unavailable) starts them clean.
+    """
+    if workers > 0:
+        try:
+            method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+            return ProcessPoolExecutor(max_workers=workers,
+                                       mp_context=multiprocessing.get_context(method))
+        except (OSError, NotImplementedError, PermissionError) as exc:
+            logger.warning(f"Process pool unavailable ({exc}); building in a thread")
+    return ThreadPoolExecutor(max_workers=1)
+
+
 # ---------------------------------------------------------------------------
 # Workflow
 # ---------------------------------------------------------------------------
@@ -365,21 +387,40 @@ class OpportunityDiscoveryWorkflow:
         write_outputs: bool = True,
         cache: Optional[MergedCache] = None,
         scorer: Optional[OpportunityScorer] = None,
+        metadata_index: Optional[MetadataIndex] = None,
+        build_workers: Optional[int] = None,
+        build_batch_size: int = BUILD_BATCH_SIZE,
     ) -> None:
         self.watchlist_config = watchlist_config
         self.max_workers = max_workers
         self.requests_per_second = requests_per_second
         self.top_n = top_n
         self.write_outputs = write_outputs
-        self.cache = cache or MergedCache()
+        self.cache = cache if cache is not None else MergedCache()
         self.scorer = scorer or OpportunityScorer()
-
-        self._parallel_fetcher = ParallelFetcher(
-            max_workers=max_workers,
-            requests_per_second=requests_per_second,
-            enable_cache=True,
-            max_retries=3,
+        # Lookup table for the CLI, kept next to the cache it describes
+        self.metadata_index = metadata_index if metadata_index is not None else MetadataIndex(
+            self.cache.path.with_name(METADATA_INDEX_FILE.name)
         )
+        # Statement normalization is CPU-bound; default leaves a core for the fetch loop
+        self.build_workers = (max(1, min(4, (os.cpu_count() or 2) - 1))
+                              if build_workers is None else build_workers)
+        self.build_batch_size = max(1, build_batch_size)
+        self._parallel_fetcher: Optional[ParallelFetcher] = None
+
+    @property
+    def parallel_fetcher(self) -> ParallelFetcher:
+        """yfinance fetcher, constructed on first use (score-only runs never need it)."""
+        if self._parallel_fetcher is None:
+            from data.parallel_fetcher import ParallelFetcher
+
+            self._parallel_fetcher = ParallelFetcher(
+                max_workers=self.max_workers,
+                requests_per_second=self.requests_per_second,
+                enable_cache=True,
+                max_retries=3,
+            )
+        return self._parallel_fetcher
 
     # ---- public API --------------------------------------------------------
 
@@ -398,22 +439,17 @@ class OpportunityDiscoveryWorkflow:
 
     def gather(self, tickers: List[str]) -> None:
         """Phase 1: fetch + cache any tickers not already in the merged cache."""
-        missing = [t for t in tickers if not self.cache.has_fresh(t)]
+        fresh = set(self.cache.fresh_keys(tickers))
+        missing = [t for t in tickers if t not in fresh]
         cached = len(tickers) - len(missing)
         print(f"[opportunity-discovery] Cache: {cached} hit, {len(missing)} to fetch")
 
         if not missing:
             return
 
-        # Step 1: batch-fetch current fundamentals via ParallelFetcher
-        #         (rate-limited, retries on 429, reuses financial_cache.pkl)
-        current_map = self._parallel_fetcher.batch_fetch_with_progress(
-            missing, desc="Fetching current", suppress_logging=True,
-        )
-
-        # Step 2: fetch historical + adapt to scorer shape, persisting after each
-        print(f"[opportunity-discovery] Fetching {len(missing)} histories (rate-limited)...")
-        self._fetch_and_cache_histories(missing, current_map)
+        print(f"[opportunity-discovery] Fetching {len(missing)} tickers "
+              f"(fetch → build in {self.build_workers or 'no'} worker process(es) → persist)...")
+        self._fetch_build_persist(missing)
 
     def score(self, tickers: List[str]) -> List[OpportunityReport]:
         """Phase 2: read from cache, run scorer, write outputs."""
@@ -423,52 +459,89 @@ class OpportunityDiscoveryWorkflow:
             return []
         print(f"[opportunity-discovery] Scoring {len(merged)} tickers from cache")
         reports = self.scorer.score_universe(merged)
+        self.metadata_index.record_scores(reports)
         if self.write_outputs:
             self._write_outputs(reports)
         return reports
 
-    # ---- history fetch (adds OCF, current assets/liabs, accruals fields) ---
-
-    def _fetch_and_cache_histories(
-        self, tickers: List[str], current_map: Dict[str, Optional[FinancialData]]
-    ) -> None:
-        rate = self._parallel_fetcher.rate_limiter
-
-        def fetch_one(ticker: str) -> None:
-            current = current_map.get(ticker)
-            if current is None or current.data_quality == "insufficient":
-                logger.debug(f"{ticker}: skipping history (insufficient current data)")
+    # ---- gather pipeline: fetch -> build -> persist --------------------------
+
+    def _fetch_build_persist(self, tickers: List[str]) -> Dict[str, int]:
+        """Run the three gather stages concurrently.
+
+        The fetch stage (asyncio, rate-limited) hands each ticker's raw
+        payloads over as they arrive; every ``build_batch_size`` of them go to
+        the build pool while fetching continues, and each built batch is
+        upserted in a single cache transaction from its completion callback.
+        """
+        stats = {"saved": 0, "insufficient": 0, "failed": 0}
+        lock = threading.Lock()
+        pbar = (tqdm(total=len(tickers), desc="Fetching", unit="ticker", file=sys.stdout)
+                if HAS_TQDM else None)
+        financial_cache = self.parallel_fetcher.cache
+
+        def advance(key: str, n: int) -> None:
+            if n:
+                with lock:
+                    stats[key] += n
+                    if pbar is not None:
+                        pbar.update(n)
+
+        def persist(future, n: int) -> None:
+            try:
+                built = future.result()
+            except Exception as exc:
+                logger.warning(f"Build batch of {n} failed: {exc}")
+                advance("failed", n)
                 return
+            merged = {t: m for t, _, m in built if m is not None}
             try:
-                rate.acquire()
-                stock = yf.Ticker(ticker)
-                merged = _build_merged_dict(ticker, current, stock)
-                self.cache.set(ticker, merged)
+                if merged:
+                    self.cache.set_many(merged)
+                    self.metadata_index.record_fetched(merged)
+                if financial_cache is not None:
+                    for ticker, current, _ in built:
+                        if current is not None:
+                            financial_cache.set(ticker, current)
             except Exception as exc:
-                err = str(exc).lower()
-                if "429" in err or "too many requests" in err:
-                    # backoff and retry once
-                    time.sleep(8)
-                    try:
-                        rate.acquire()
-                        stock = yf.Ticker(ticker)
-                        merged = _build_merged_dict(ticker, current, stock)
-                        self.cache.set(ticker, merged)
-                    except Exception as exc2:
-                        logger.warning(f"{ticker}: history retry failed: {exc2}")
-                else:
-                    logger.warning(f"{ticker}: history fetch failed: {exc}")
-
-        iterator_desc = "Fetching history"
-        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
-            futures = [pool.submit(fetch_one, t) for t in tickers]
-            if HAS_TQDM:
-                for _ in tqdm(as_completed(futures), total=len(futures), desc=iterator_desc,
-                              unit="ticker", file=sys.stdout):
-                    pass
-            else:
-                for fut in as_completed(futures):
-                    fut.result()
+                logger.warning(f"Persisting batch of {n} failed: {exc}")
+                advance("failed", n)
+                return
+            advance("saved", len(merged))
+            advance("insufficient", sum(1 for _, c, m in built if c is not None and m is None))
+            advance("failed", sum(1 for _, c, _ in built if c is None))
+
+        pending: List[Tuple[str, Dict[str, Any]]] = []
+        with _build_executor(self.build_workers) as pool:
+            def submit() -> None:
+                batch = pending[:]
+                pending.clear()
+                future = pool.submit(_build_batch, batch)
+                future.add_done_callback(lambda f, n=len(batch): persist(f, n))
+
+            def on_payloads(ticker: str, payloads: Optional[Dict[str, Any]]) -> None:
+                if payloads is None:
+                    advance("failed", 1)
+                    return
+                pending.append((ticker, payloads))
+                if len(pending) >= self.build_batch_size:
+                    submit()
+
+            try:
+                self.parallel_fetcher.fetch_payloads(tickers, on_payloads)
+            finally:
+                if pending:
+                    submit()
+        # Leaving the executor joins its workers, so every persist callback has run.
+
+        self.cache.flush()
+        if financial_cache is not None:
+            financial_cache.flush()
+        if pbar is not None:
+            pbar.close()
+        print(f"[opportunity-discovery] Cached {stats['saved']}, insufficient data "
+              f"{stats['insufficient']}, failed {stats['failed']}")
+        return stats
 
     # ---- output writers ----------------------------------------------------
 
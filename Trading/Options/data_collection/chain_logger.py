@@ -1,5 +1,5 @@
 #!/usr/bin/env python3
-"""Append today's SPY option chain to data/raw/chains/SPY_chain_YYYY-MM-DD.csv.
+"""Append today's SPY option chain to the raw snapshot archive under data/raw/chains/.
 
 Run this daily after the close to build a REAL point-in-time option-chain history — the honest fix
 for the synthetic-data limitation. After a few weeks you can backtest on real chains.
@@ -10,28 +10,59 @@ Two sources, in order of preference (auto-detected):
   2. yfinance fallback — bid/ask/IV from Yahoo; greeks are filled from IV with the repo's Black-Scholes
      so delta-based strike selection still works. No account needed.
 
+Pipeline: fetch the provider's raw payload -> normalize it into one typed columnar frame (greeks for
+the whole chain in a single vectorized pass) -> validate against SNAPSHOT_SCHEMA -> write one file
+per snapshot. With pyarrow installed a snapshot is Parquet, partitioned by day:
+``data/raw/chains/YYYY-MM-DD/SPY_chain_YYYY-MM-DD_HHMM.parquet``; without it (or with
+``--format csv``) it is the flat ``SPY_chain_YYYY-MM-DD_HHMM.csv``. ``snapshot_files`` and
+``read_snapshot`` read both layouts, for compile_chains.py and live_monitor.py.
+
+The raw payload can be saved (``--record DIR``) and replayed later (``--replay FILE``) without any
+network access, which is how the normalizers are tested against recorded provider responses.
+
 Output columns match the synthetic generator, so the file is a drop-in for the backtester's loader.
 
     opt_venv/bin/python data_collection/chain_logger.py            # auto source, max 70 DTE
     opt_venv/bin/python data_collection/chain_logger.py --max-dte 90 --source yfinance
+    opt_venv/bin/python data_collection/chain_logger.py --record data/raw/payloads
+    opt_venv/bin/python data_collection/chain_logger.py --replay data/raw/payloads/yfinance_2026-06-09_1500.json
 """
 from __future__ import annotations
 
 import argparse
+import json
 import os
 import sys
 from datetime import datetime
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
-from src.utils.black_scholes import calculate_all_greeks  # noqa: E402
+from src.utils.black_scholes import greeks_array  # noqa: E402
+
+try:
+    import pyarrow  # noqa: F401  (Parquet snapshots; CSV without it)
+    _HAS_PARQUET = True
+except ImportError:
+    _HAS_PARQUET = False
 
 OUT_DIR = Path(__file__).resolve().parent.parent / "data" / "raw" / "chains"
 SYMBOL = "SPY"
 R, Q = 0.04, 0.015  # risk-free, SPY dividend yield (for filling greeks on the yfinance path)
 
+# Column -> dtype of every snapshot written (canonical order, same as real_chain_loader.CANONICAL_COLS).
+SNAPSHOT_SCHEMA = {
+    "quote_date": "datetime64[ns]", "underlying_symbol": "str", "underlying_price": "float64",
+    "vix": "float64", "expiration": "datetime64[ns]", "dte": "int64", "strike": "float64",
+    "option_type": "str", "bid": "float64", "ask": "float64", "last": "float64",
+    "volume": "float64", "open_interest": "float64", "iv": "float64", "delta": "float64",
+    "abs_delta": "float64", "gamma": "float64", "theta": "float64", "vega": "float64",
+}
+# yfinance option_chain columns kept in a recorded payload
+_YF_COLS = ["strike", "bid", "ask", "lastPrice", "volume", "openInterest", "impliedVolatility"]
+
 
 def _current_vix() -> float | None:
     """Latest ^VIX close (the regime gate strategies filter on). None if unavailable."""
@@ -43,37 +74,30 @@ def _current_vix() -> float | None:
         return None
 
 
-def from_yfinance(max_dte: int) -> pd.DataFrame:
+# ---------------------------------------------------------------------------
+# Providers: raw payloads (JSON-serializable, so they can be recorded and replayed)
+# ---------------------------------------------------------------------------
+def fetch_yfinance_payload(max_dte: int) -> dict:
     import yfinance as yf
 
     tk = yf.Ticker(SYMBOL)
     spot = float(tk.history(period="1d")["Close"].iloc[-1])
     today = pd.Timestamp.today().normalize()
-    rows = []
+    expirations = {}
     for exp in tk.options:
-        exp_ts = pd.Timestamp(exp)
-        dte = (exp_ts - today).days
+        dte = (pd.Timestamp(exp) - today).days
         if dte <= 0 or dte > max_dte:
             continue
         chain = tk.option_chain(exp)
-        for opt_type, df in (("call", chain.calls), ("put", chain.puts)):
-            for _, o in df.iterrows():
-                iv = float(o.get("impliedVolatility") or 0.0)
-                g = calculate_all_greeks(spot, float(o["strike"]), dte / 365.0, R, iv, opt_type, Q) \
-                    if iv > 0 else {"delta": None, "gamma": None, "theta": None, "vega": None}
-                rows.append({
-                    "underlying_price": spot, "expiration": exp_ts, "dte": dte,
-                    "strike": float(o["strike"]), "option_type": opt_type,
-                    "bid": float(o.get("bid") or 0.0), "ask": float(o.get("ask") or 0.0),
-                    "last": float(o.get("lastPrice") or 0.0),
-                    "volume": o.get("volume"), "open_interest": o.get("openInterest"),
-                    "iv": iv, "delta": g["delta"], "gamma": g["gamma"],
-                    "theta": (g["theta"] / 365.0) if g["theta"] is not None else None, "vega": g["vega"],
-                })
-    return pd.DataFrame(rows)
+        expirations[exp] = {
+            side: df.reindex(columns=_YF_COLS).to_dict("list")
+            for side, df in (("calls", chain.calls), ("puts", chain.puts))
+        }
+    return {"source": "yfinance", "asof": today.strftime("%Y-%m-%d"), "spot": spot,
+            "expirations": expirations}
 
 
-def from_schwab(max_dte: int) -> pd.DataFrame:
+def fetch_schwab_payload() -> dict:
     from schwab.auth import client_from_token_file
 
     client = client_from_token_file(
@@ -81,9 +105,54 @@ def from_schwab(max_dte: int) -> pd.DataFrame:
         api_key=os.environ["SCHWAB_APP_KEY"],
         app_secret=os.environ["SCHWAB_APP_SECRET"],
     )
-    data = client.get_option_chain(symbol=SYMBOL).json()
+    return {"source": "schwab", "asof": pd.Timestamp.today().strftime("%Y-%m-%d"),
+            "chain": client.get_option_chain(symbol=SYMBOL).json()}
+
+
+# ---------------------------------------------------------------------------
+# Normalizers: payload -> typed columnar frame (no per-contract greeks calls)
+# ---------------------------------------------------------------------------
+def normalize_yfinance(payload: dict, max_dte: int) -> pd.DataFrame:
+    today = pd.Timestamp(payload["asof"]).normalize()
+    spot = float(payload["spot"])
+    frames = []
+    for exp, sides in payload["expirations"].items():
+        exp_ts = pd.Timestamp(exp)
+        dte = (exp_ts - today).days
+        if dte <= 0 or dte > max_dte:
+            continue
+        for opt_type, side in (("call", "calls"), ("put", "puts")):
+            df = pd.DataFrame(sides[side]).reindex(columns=_YF_COLS)
+            df["expiration"], df["dte"], df["option_type"] = exp_ts, dte, opt_type
+            frames.append(df)
+    if not frames:
+        return pd.DataFrame()
+    raw = pd.concat(frames, ignore_index=True)
+
+    num = {c: pd.to_numeric(raw[c], errors="coerce").to_numpy(float) for c in _YF_COLS}
+    dte = raw["dte"].to_numpy(int)
+    is_call = (raw["option_type"] == "call").to_numpy()
+    iv = num["impliedVolatility"]
+    has_iv = iv > 0
+    g = greeks_array(spot, num["strike"], dte / 365.0, R, np.where(has_iv, iv, 1.0), is_call, Q)
+    greek = {k: np.where(has_iv, v, np.nan) for k, v in g.items()}
+    return pd.DataFrame({
+        "underlying_price": spot, "expiration": raw["expiration"], "dte": dte,
+        "strike": num["strike"], "option_type": raw["option_type"],
+        "bid": num["bid"], "ask": num["ask"], "last": num["lastPrice"],
+        "volume": num["volume"], "open_interest": num["openInterest"],
+        "iv": iv, "delta": greek["delta"], "gamma": greek["gamma"],
+        "theta": greek["theta"] / 365.0, "vega": greek["vega"],
+    })
+
+
+def normalize_schwab(payload: dict, max_dte: int) -> pd.DataFrame:
+    data = payload["chain"]
     spot = float(data.get("underlyingPrice") or 0.0)
-    rows = []
+    # Walk the nested exp -> strike -> [contract] maps once into column lists.
+    cols: dict[str, list] = {k: [] for k in (
+        "expiration", "dte", "strike", "option_type", "bid", "ask", "last", "volume",
+        "open_interest", "iv", "delta", "gamma", "theta", "vega")}
     for side, opt_type in (("callExpDateMap", "call"), ("putExpDateMap", "put")):
         for _exp, strikes in data.get(side, {}).items():
             for _strike, contracts in strikes.items():
@@ -91,17 +160,135 @@ def from_schwab(max_dte: int) -> pd.DataFrame:
                 dte = int(o.get("daysToExpiration", -1))
                 if dte <= 0 or dte > max_dte:
                     continue
-                rows.append({
-                    "underlying_price": spot,
-                    "expiration": pd.Timestamp(o["expirationDate"]).normalize(), "dte": dte,
-                    "strike": float(o["strikePrice"]), "option_type": opt_type,
-                    "bid": float(o.get("bid") or 0.0), "ask": float(o.get("ask") or 0.0),
-                    "last": float(o.get("last") or 0.0),
-                    "volume": o.get("totalVolume"), "open_interest": o.get("openInterest"),
-                    "iv": (float(o.get("volatility") or 0.0) / 100.0), "delta": o.get("delta"),
-                    "gamma": o.get("gamma"), "theta": o.get("theta"), "vega": o.get("vega"),
-                })
-    return pd.DataFrame(rows)
+                cols["expiration"].append(o["expirationDate"])
+                cols["dte"].append(dte)
+                cols["strike"].append(o["strikePrice"])
+                cols["option_type"].append(opt_type)
+                cols["bid"].append(o.get("bid") or 0.0)
+                cols["ask"].append(o.get("ask") or 0.0)
+                cols["last"].append(o.get("last") or 0.0)
+                cols["volume"].append(o.get("totalVolume"))
+                cols["open_interest"].append(o.get("openInterest"))
+                cols["iv"].append(o.get("volatility") or 0.0)
+                for greek in ("delta", "gamma", "theta", "vega"):
+                    cols[greek].append(o.get(greek))
+    if not cols["dte"]:
+        return pd.DataFrame()
+    df = pd.DataFrame(cols)
+    numeric = [c for c in cols if c not in ("expiration", "option_type")]
+    df[numeric] = df[numeric].apply(pd.to_numeric, errors="coerce")
+    df["iv"] = df["iv"] / 100.0
+    df["expiration"] = pd.to_datetime(df["expiration"], utc=True).dt.tz_localize(None).dt.normalize()
+    df.insert(0, "underlying_price", spot)
+    return df
+
+
+NORMALIZERS = {"yfinance": normalize_yfinance, "schwab": normalize_schwab}
+
+
+def from_yfinance(max_dte: int) -> pd.DataFrame:
+    return normalize_yfinance(fetch_yfinance_payload(max_dte), max_dte)
+
+
+def from_schwab(max_dte: int) -> pd.DataFrame:
+    return normalize_schwab(fetch_schwab_payload(), max_dte)
+
+
+def finish_snapshot(df: pd.DataFrame, asof, vix: float | None) -> pd.DataFrame:
+    """Add the per-snapshot columns (quote date, symbol, |delta|, VIX) and validate."""
+    df = df.copy()
+    df.insert(0, "quote_date", pd.Timestamp(asof).normalize())
+    df.insert(1, "underlying_symbol", SYMBOL)
+    df["abs_delta"] = df["delta"].abs()
+    # Capture the current VIX so logged chains satisfy the strategies' VIX gates without a post-hoc
+    # merge (and so compile_chains.py doesn't have to backfill it).
+    df["vix"] = np.nan if vix is None else vix
+    return validate_snapshot(df)
+
+
+# ---------------------------------------------------------------------------
+# Schema + archive
+# ---------------------------------------------------------------------------
+def validate_snapshot(df: pd.DataFrame) -> pd.DataFrame:
+    """Cast to SNAPSHOT_SCHEMA (canonical column order); raise ValueError on a malformed chain."""
+    missing = [c for c in SNAPSHOT_SCHEMA if c not in df.columns]
+    if missing:
+        raise ValueError(f"snapshot is missing columns {missing}")
+    try:
+        out = df[list(SNAPSHOT_SCHEMA)].astype(SNAPSHOT_SCHEMA)
+    except (TypeError, ValueError) as exc:
+        raise ValueError(f"snapshot column has the wrong type: {exc}") from exc
+    bad_type = ~out["option_type"].isin(["call", "put"])
+    if bad_type.any():
+        raise ValueError(f"unknown option_type values {sorted(out.loc[bad_type, 'option_type'].unique())}")
+    if (out["dte"] < 0).any() or not (out["strike"] > 0).all():
+        raise ValueError("snapshot has negative DTE or non-positive strikes")
+    if out.duplicated(["expiration", "strike", "option_type"]).any():
+        raise ValueError("snapshot has duplicate (expiration, strike, option_type) rows")
+    return out.reset_index(drop=True)
+
+
+def write_snapshot(df: pd.DataFrame, taken_at: datetime, out_dir: Path = OUT_DIR,
+                   fmt: str | None = None) -> Path:
+    """Validate and write one snapshot (Parquet day partition, or flat CSV); returns its path."""
+    df = validate_snapshot(df)
+    fmt = fmt or ("parquet" if _HAS_PARQUET else "csv")
+    name = f"SPY_chain_{taken_at:%Y-%m-%d_%H%M}"
+    if fmt == "parquet":
+        out = Path(out_dir) / f"{taken_at:%Y-%m-%d}" / f"{name}.parquet"
+    else:
+        out = Path(out_dir) / f"{name}.csv"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    tmp = out.with_name(out.name + ".tmp")
+    if fmt == "parquet":
+        df.to_parquet(tmp, index=False)
+    else:
+        df.to_csv(tmp, index=False)
+    os.replace(tmp, out)
+    return out
+
+
+def snapshot_files(raw_dir: Path = OUT_DIR) -> list[Path]:
+    """Every logged snapshot: flat CSVs and day-partitioned Parquet files, by file name."""
+    raw_dir = Path(raw_dir)
+    files = [*raw_dir.glob("SPY_chain_*.csv"), *raw_dir.glob("*/SPY_chain_*.parquet")]
+    return sorted(files, key=lambda f: f.name)
+
+
+def read_snapshot(path: Path) -> pd.DataFrame:
+    path = Path(path)
+    return pd.read_parquet(path) if path.suffix == ".parquet" else pd.read_csv(path)
+
+
+def storage_filter(df: pd.DataFrame, moneyness: float, delta_min: float,
+                   delta_max: float) -> tuple[pd.DataFrame, str | None]:
+    """Storage-smart filter: a full SPY chain is ~4,500 contracts/day (~15 expirations x dense $1
+    strikes). A +/-12% moneyness band keeps every strategy leg (calendar ATM; vertical/IC legs to
+    ~0.08 delta ~= +/-10%) and drops the far wings -- ~700 KB -> ~640 KB/snap, ~160 MB/yr at 2
+    snaps/day vs ~480 unfiltered. The optional delta band cuts harder (~1/3 kept) but only fires
+    when IV is healthy, because yfinance IV is often ~1e-5 (degenerate 0/1 deltas) pre-/post-market.
+
+    Returns:
+        (filtered frame, description of the band applied or None)
+    """
+    if df.empty or not (delta_max or moneyness):
+        return df, None
+    before = len(df)
+    ad = df["delta"].abs() if "delta" in df.columns else None
+    # Try the opt-in delta band first, but accept it only if it retains a plausible fraction of
+    # the chain (a real chain has ~1/3 in this band). yfinance IV is often ~1e-5 pre-/post-market,
+    # which makes deltas a degenerate 0/1 step function; then the band keeps almost nothing, so we
+    # reject it and fall back to the robust, greek-independent moneyness band.
+    if delta_max and ad is not None and ad.notna().mean() >= 0.5:
+        cand = df[(ad >= delta_min) & (ad <= delta_max)]
+        if len(cand) >= 0.15 * before:
+            return cand.copy(), f"|delta| in [{delta_min:.2f}, {delta_max:.2f}]"
+    if moneyness and "underlying_price" in df.columns:
+        spot = float(df["underlying_price"].iloc[0])
+        lo, hi = spot * (1 - moneyness), spot * (1 + moneyness)
+        return (df[(df["strike"] >= lo) & (df["strike"] <= hi)].copy(),
+                f"strike within +/-{moneyness:.0%} of ${spot:.0f}")
+    return df, None
 
 
 def main() -> int:
@@ -119,62 +306,57 @@ def main() -> int:
                     help="opt-in delta-band lower |delta| (used only with --delta-max and healthy IV)")
     ap.add_argument("--delta-max", type=float, default=0.0,
                     help="opt-in: also require |delta| <= this (e.g. 0.72); 0 = disabled (use moneyness)")
+    ap.add_argument("--format", choices=["parquet", "csv"], default=None,
+                    help="snapshot file format (default: parquet if pyarrow is installed, else csv)")
+    ap.add_argument("--out-dir", type=Path, default=OUT_DIR, help="snapshot archive root")
+    ap.add_argument("--record", type=Path, metavar="DIR",
+                    help="also save the raw provider payload as JSON in DIR (replayable)")
+    ap.add_argument("--replay", type=Path, metavar="FILE",
+                    help="build the snapshot from a recorded payload instead of the network")
     args = ap.parse_args()
 
-    use_schwab = args.source == "schwab" or (args.source == "auto" and os.environ.get("SCHWAB_APP_KEY"))
-    try:
-        df = from_schwab(args.max_dte) if use_schwab else from_yfinance(args.max_dte)
-        source = "schwab" if use_schwab else "yfinance"
-    except Exception as exc:
-        if use_schwab and args.source == "auto":
-            print(f"  Schwab failed ({exc}); falling back to yfinance.")
-            df, source = from_yfinance(args.max_dte), "yfinance"
-        else:
-            print(f"  ERROR: {exc}")
-            return 1
+    if args.replay:
+        payload = json.loads(args.replay.read_text())
+        source = payload["source"]
+    else:
+        use_schwab = args.source == "schwab" or (args.source == "auto" and os.environ.get("SCHWAB_APP_KEY"))
+        try:
+            payload = fetch_schwab_payload() if use_schwab else fetch_yfinance_payload(args.max_dte)
+            source = "schwab" if use_schwab else "yfinance"
+        except Exception as exc:
+            if use_schwab and args.source == "auto":
+                print(f"  Schwab failed ({exc}); falling back to yfinance.")
+                payload, source = fetch_yfinance_payload(args.max_dte), "yfinance"
+            else:
+                print(f"  ERROR: {exc}")
+                return 1
+        payload["taken_at"] = datetime.now().isoformat(timespec="minutes")
+        payload["vix"] = _current_vix()
+        if args.record:
+            args.record.mkdir(parents=True, exist_ok=True)
+            rec = args.record / f"{source}_{datetime.now():%Y-%m-%d_%H%M}.json"
+            rec.write_text(json.dumps(payload, default=str))
+            print(f"  recorded payload -> {rec}")
 
+    df = NORMALIZERS[source](payload, args.max_dte)
     if df.empty:
         print("  No contracts returned — market closed or source unavailable.")
         return 1
+    taken_at = datetime.fromisoformat(payload["taken_at"])
+    try:
+        df = finish_snapshot(df, payload["asof"], payload.get("vix"))
 
-    df.insert(0, "quote_date", pd.Timestamp.today().normalize())
-    df.insert(1, "underlying_symbol", SYMBOL)
-    df["abs_delta"] = df["delta"].abs() if "delta" in df else None
-
-    # Capture the current VIX so logged chains satisfy the strategies' VIX gates without a post-hoc
-    # merge (and so compile_chains.py doesn't have to backfill it).
-    df["vix"] = _current_vix()
-
-    # Storage-smart filter: a full SPY chain is ~4,500 contracts/day (~15 expirations x dense $1
-    # strikes). A +/-12% moneyness band keeps every strategy leg (calendar ATM; vertical/IC legs to
-    # ~0.08 delta ~= +/-10%) and drops the far wings -- ~700 KB -> ~640 KB/snap, ~160 MB/yr at 2
-    # snaps/day vs ~480 unfiltered. The optional delta band cuts harder (~1/3 kept) but only fires
-    # when IV is healthy, because yfinance IV is often ~1e-5 (degenerate 0/1 deltas) pre-/post-market.
-    if not df.empty and (args.delta_max or args.moneyness):
         before = len(df)
-        how = None
-        ad = df["delta"].abs() if "delta" in df.columns else None
-        # Try the opt-in delta band first, but accept it only if it retains a plausible fraction of
-        # the chain (a real chain has ~1/3 in this band). yfinance IV is often ~1e-5 pre-/post-market,
-        # which makes deltas a degenerate 0/1 step function; then the band keeps almost nothing, so we
-        # reject it and fall back to the robust, greek-independent moneyness band.
-        if args.delta_max and ad is not None and ad.notna().mean() >= 0.5:
-            cand = df[(ad >= args.delta_min) & (ad <= args.delta_max)]
-            if len(cand) >= 0.15 * before:
-                df, how = cand.copy(), f"|delta| in [{args.delta_min:.2f}, {args.delta_max:.2f}]"
-        if how is None and args.moneyness and "underlying_price" in df.columns:
-            spot = float(df["underlying_price"].iloc[0])
-            lo, hi = spot * (1 - args.moneyness), spot * (1 + args.moneyness)
-            df = df[(df["strike"] >= lo) & (df["strike"] <= hi)].copy()
-            how = f"strike within +/-{args.moneyness:.0%} of ${spot:.0f}"
+        df, how = storage_filter(df, args.moneyness, args.delta_min, args.delta_max)
         if how:
             print(f"  storage-smart: kept {len(df):,}/{before:,} contracts ({how})")
 
-    OUT_DIR.mkdir(parents=True, exist_ok=True)
-    # Stamp date + HHMM so multiple intraday snapshots (e.g. 10:00 and 15:00) coexist instead of
-    # overwriting each other.
-    out = OUT_DIR / f"SPY_chain_{datetime.now():%Y-%m-%d_%H%M}.csv"
-    df.to_csv(out, index=False)
+        # Stamp date + HHMM so multiple intraday snapshots (e.g. 10:00 and 15:00) coexist instead of
+        # overwriting each other.
+        out = write_snapshot(df, taken_at, args.out_dir, args.format)
+    except ValueError as exc:
+        print(f"  Malformed {source} chain, not written: {exc}")
+        return 1
     print(f"  [{source}] wrote {len(df):,} contracts -> {out}")
     return 0
 
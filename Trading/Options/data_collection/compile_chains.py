@@ -1,7 +1,8 @@
 """Assemble the daily logged SPY chains into one backtestable dataset.
 
-`chain_logger.py` drops a snapshot per run into `data/raw/chains/SPY_chain_YYYY-MM-DD[_HHMM].csv`,
-but nothing consumed them. This rolls them up into the canonical
+`chain_logger.py` drops a snapshot per run into `data/raw/chains/` (day-partitioned
+`YYYY-MM-DD/SPY_chain_YYYY-MM-DD_HHMM.parquet`, or flat `SPY_chain_YYYY-MM-DD[_HHMM].csv`), but
+nothing consumed them. This rolls them up into the canonical
 `data/processed/SPY_real_options_<min>_<max>.csv` that `load_sample_spy_options_data` reads under
 `data_source.mode: real`. Unlike the sparse DoltHub dump, these are the *full* chain you actually
 trade (every quoted strike), so they persist day-to-day and suit multi-day calendars.
@@ -11,11 +12,26 @@ Rules:
   * Dedupe by (quote_date, expiration, strike, option_type).
   * Backfill a `vix` column from yfinance ^VIX for any snapshot logged before VIX capture existed.
 
+Incremental: `data/processed/chains/` holds one compiled partition per snapshot date plus a
+`manifest.jsonl` of every ingested snapshot (name, mtime, size, sha256). A run only reads the
+snapshots of dates with a new, changed or deleted file and rebuilds those partitions. When every
+rebuilt date is past the previous export's range, the new range's export is that file's bytes plus the
+new rows (a copy and an append, no parsing), so the daily compile costs one day however large the
+archive. Otherwise the export is rewritten from the partitions. Earlier exports are left in place
+(calibrations pin their file names), and a run that adds no contracts keeps the previous export.
+`--full` discards the store and re-ingests everything.
+
     opt_venv/bin/python data_collection/compile_chains.py
+    opt_venv/bin/python data_collection/compile_chains.py --full
 """
 from __future__ import annotations
 
+import argparse
+import hashlib
+import json
+import os
 import re
+import shutil
 import sys
 from pathlib import Path
 
@@ -25,12 +41,21 @@ _PROJECT_ROOT = Path(__file__).resolve().parent.parent
 if str(_PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(_PROJECT_ROOT))
 
+from data_collection.chain_logger import read_snapshot, snapshot_files  # noqa: E402
 from src.data_fetchers.real_chain_loader import CANONICAL_COLS, _fetch_underlying  # noqa: E402
 
+try:
+    import pyarrow  # noqa: F401  (Parquet partitions; CSV partitions without it)
+    _HAS_PARQUET = True
+except ImportError:
+    _HAS_PARQUET = False
+
 RAW_DIR = _PROJECT_ROOT / "data" / "raw" / "chains"
 PROCESSED_DIR = _PROJECT_ROOT / "data" / "processed"
+STORE_DIR = PROCESSED_DIR / "chains"
+_KEY = ["quote_date", "expiration", "strike", "option_type"]
 # Sort key so the latest intraday snapshot of a day wins: date, then HHMM (no-time files sort first).
-_STAMP = re.compile(r"SPY_chain_(\d{4}-\d{2}-\d{2})(?:_(\d{4}))?\.csv$")
+_STAMP = re.compile(r"SPY_chain_(\d{4}-\d{2}-\d{2})(?:_(\d{4}))?\.(?:csv|parquet)$")
 
 
 def _snapshot_order(path: Path):
@@ -38,55 +63,255 @@ def _snapshot_order(path: Path):
     return (m.group(1), m.group(2) or "0000") if m else (path.name, "")
 
 
-def compile_chains(verbose: bool = True) -> Path:
-    files = sorted(RAW_DIR.glob("SPY_chain_*.csv"), key=_snapshot_order)
-    if not files:
-        raise FileNotFoundError(f"No logged chains in {RAW_DIR}. Run chain_logger.py first.")
+def _sha256(path: Path) -> str:
+    h = hashlib.sha256()
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class ChainStore:
+    """Date-partitioned compiled chains plus the manifest of ingested snapshots.
+
+    ``manifest.jsonl`` is append-only; the last line for a snapshot name wins and a
+    ``removed`` line retires it. ``export.json`` remembers the last canonical CSV written
+    so the next run can extend it.
+    """
+
+    def __init__(self, root: Path = STORE_DIR):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.manifest_path = self.root / "manifest.jsonl"
+        self.export_path = self.root / "export.json"
+        self.entries: dict[str, dict] = {}
+        self._digests: dict[str, str] = {}
+        if self.manifest_path.exists():
+            text = self.manifest_path.read_text()
+            complete = text[:text.rfind("\n") + 1]
+            if complete != text:          # torn last line from an interrupted append
+                self.manifest_path.write_text(complete)
+            for line in complete.splitlines():
+                entry = json.loads(line)
+                if entry.get("removed"):
+                    self.entries.pop(entry["file"], None)
+                else:
+                    self.entries[entry["file"]] = entry
+
+    # ---- snapshots ---------------------------------------------------------
+    def changed_dates(self, files: list[Path]) -> set[str]:
+        """Snapshot dates with a new, modified or deleted file.
+
+        Unchanged files are recognized by (mtime, size) alone; a file whose stat differs is
+        hashed, so a touched-but-identical snapshot is re-recorded without a rebuild.
+        """
+        dates: set[str] = set()
+        seen = set()
+        for f in files:
+            seen.add(f.name)
+            st = f.stat()
+            old = self.entries.get(f.name)
+            if old and old["mtime"] == st.st_mtime and old["size"] == st.st_size:
+                continue
+            digest = self._digests[f.name] = _sha256(f)
+            if old and old["sha256"] == digest:
+                self._record({**old, "mtime": st.st_mtime, "size": st.st_size})
+                continue
+            dates.add(_snapshot_order(f)[0])
+        for name in set(self.entries) - seen:
+            dates.add(self.entries[name]["date"])
+        return dates
+
+    def record_date(self, date: str, files: list[Path]) -> None:
+        """Mark a rebuilt date's snapshots as ingested (and its vanished ones as removed)."""
+        names = {f.name for f in files}
+        for name, entry in list(self.entries.items()):
+            if entry["date"] == date and name not in names:
+                self._record({"file": name, "removed": True})
+        for f in files:
+            st = f.stat()
+            self._record({"file": f.name, "date": date, "mtime": st.st_mtime,
+                          "size": st.st_size, "sha256": self._digests.get(f.name) or _sha256(f)})
+
+    def _record(self, entry: dict) -> None:
+        with self.manifest_path.open("a") as fh:
+            fh.write(json.dumps(entry) + "\n")
+        if entry.get("removed"):
+            self.entries.pop(entry["file"], None)
+        else:
+            self.entries[entry["file"]] = entry
+
+    # ---- partitions --------------------------------------------------------
+    def _partition(self, date: str) -> Path:
+        return self.root / f"SPY_chains_{date}.{'parquet' if _HAS_PARQUET else 'csv'}"
+
+    def write_partition(self, date: str, df: pd.DataFrame | None) -> None:
+        for stale in self.root.glob(f"SPY_chains_{date}.*"):
+            stale.unlink()
+        if df is None or df.empty:
+            return
+        path = self._partition(date)
+        tmp = path.with_name(path.name + ".tmp")
+        if _HAS_PARQUET:
+            df.to_parquet(tmp, index=False)
+        else:
+            df.to_csv(tmp, index=False)
+        os.replace(tmp, path)
+
+    def partitions(self, after: str | None = None):
+        """Compiled partitions in date order (optionally only dates > ``after``)."""
+        for path in sorted(self.root.glob("SPY_chains_*")):
+            if path.suffix not in (".parquet", ".csv"):
+                continue
+            if after is not None and path.stem[len("SPY_chains_"):] <= after:
+                continue
+            yield pd.read_parquet(path) if path.suffix == ".parquet" else pd.read_csv(path)
+
+    # ---- export state ------------------------------------------------------
+    def last_export(self) -> dict | None:
+        if not self.export_path.exists():
+            return None
+        state = json.loads(self.export_path.read_text())
+        path = Path(state["path"])
+        if not path.exists() or path.stat().st_size != state["size"]:
+            return None           # moved or edited since: rewrite instead of extending
+        return state
+
+    def save_export(self, path: Path, lo: str, hi: str) -> None:
+        self.export_path.write_text(json.dumps(
+            {"path": str(path), "lo": lo, "hi": hi, "size": path.stat().st_size}))
 
+
+def _compile_date(files: list[Path]) -> pd.DataFrame:
+    """One date's snapshots (in time order) -> rows, latest snapshot winning."""
     frames = []
     for f in files:
-        df = pd.read_csv(f)
+        df = read_snapshot(f)
         df["quote_date"] = pd.to_datetime(df["quote_date"]).dt.normalize()
         df["expiration"] = pd.to_datetime(df["expiration"]).dt.normalize()
         frames.append(df)
-    allrows = pd.concat(frames, ignore_index=True)
+    rows = pd.concat(frames, ignore_index=True)
 
     # Latest snapshot wins: files are processed in time order, so keep the last occurrence.
-    allrows = allrows.drop_duplicates(
-        subset=["quote_date", "expiration", "strike", "option_type"], keep="last"
-    )
-
-    # Backfill VIX where missing (older snapshots predate VIX capture in the logger).
-    if "vix" not in allrows.columns or allrows["vix"].isna().any():
-        lo = allrows["quote_date"].min().strftime("%Y-%m-%d")
-        hi = allrows["quote_date"].max().strftime("%Y-%m-%d")
-        und = _fetch_underlying(lo, hi)
-        vix_by_date = und["vix"]
+    return rows.drop_duplicates(subset=_KEY, keep="last")
+
+
+def _backfill_vix(days: dict[str, pd.DataFrame]) -> None:
+    """Fill missing `vix` (older snapshots predate VIX capture in the logger), one market-context
+    read for all the given days. A week of lookback lets the ffill in _fetch_underlying cover a day
+    that has no VIX bar yet."""
+    need = [d for d, rows in days.items() if "vix" not in rows.columns or rows["vix"].isna().any()]
+    if not need:
+        return
+    lo = (min(days[d]["quote_date"].min() for d in need) - pd.Timedelta(days=7)).strftime("%Y-%m-%d")
+    hi = max(days[d]["quote_date"].max() for d in need).strftime("%Y-%m-%d")
+    try:
+        vix_by_date = _fetch_underlying(lo, hi)["vix"]
         vix_by_date.index = pd.to_datetime(vix_by_date.index).normalize()
-        filled = allrows["quote_date"].map(vix_by_date)
-        allrows["vix"] = allrows["vix"].fillna(filled) if "vix" in allrows.columns else filled
+    except ValueError as exc:
+        print(f"  VIX backfill unavailable for {lo}..{hi} ({exc}); left blank — rerun with --full later")
+        return
+    for d in need:
+        rows = days[d]
+        filled = rows["quote_date"].map(vix_by_date)
+        rows["vix"] = rows["vix"].fillna(filled) if "vix" in rows.columns else filled
 
-    # Conform to the canonical schema (add any missing optional columns as NA, order them).
+
+def _conform(rows: pd.DataFrame) -> pd.DataFrame:
+    """Canonical schema (missing optional columns as NA, ordered) sorted by contract key."""
     for col in CANONICAL_COLS:
-        if col not in allrows.columns:
-            allrows[col] = pd.NA
-    out = allrows[CANONICAL_COLS].sort_values(
-        ["quote_date", "expiration", "strike", "option_type"]
-    ).reset_index(drop=True)
+        if col not in rows.columns:
+            rows[col] = pd.NA
+    return rows[CANONICAL_COLS].sort_values(_KEY).reset_index(drop=True)
+
+
+def _stack(frames) -> pd.DataFrame:
+    """Concatenate partitions in date order; a later partition wins a duplicate contract.
+
+    No partitions (every snapshot of the changed days was empty) -> an empty canonical frame.
+    """
+    frames = list(frames)
+    out = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=CANONICAL_COLS)
+    out["quote_date"] = pd.to_datetime(out["quote_date"])
+    out["expiration"] = pd.to_datetime(out["expiration"])
+    return out.drop_duplicates(subset=_KEY, keep="last").sort_values(_KEY).reset_index(drop=True)
+
+
+def compile_chains(verbose: bool = True, full: bool = False) -> Path:
+    """Ingest new/changed snapshots and refresh the canonical dataset.
+
+    Args:
+        verbose: Print a summary
+        full: Discard the partition store and manifest and rebuild from every snapshot
+
+    Returns:
+        Path of the canonical SPY_real_options_<min>_<max>.csv
+    """
+    files = sorted(snapshot_files(RAW_DIR), key=_snapshot_order)
+    if not files:
+        raise FileNotFoundError(f"No logged chains in {RAW_DIR}. Run chain_logger.py first.")
+
+    if full and STORE_DIR.exists():
+        shutil.rmtree(STORE_DIR)
+    store = ChainStore(STORE_DIR)
+    by_date: dict[str, list[Path]] = {}
+    for f in files:
+        by_date.setdefault(_snapshot_order(f)[0], []).append(f)
+
+    dates = sorted(store.changed_dates(files))
+    compiled = {d: _compile_date(by_date[d]) for d in dates if d in by_date}
+    _backfill_vix(compiled)
+    for date in dates:
+        store.write_partition(date, _conform(compiled[date]) if date in compiled else None)
+        store.record_date(date, by_date.get(date, []))
 
     PROCESSED_DIR.mkdir(parents=True, exist_ok=True)
-    lo = out["quote_date"].min().strftime("%Y-%m-%d")
-    hi = out["quote_date"].max().strftime("%Y-%m-%d")
-    dest = PROCESSED_DIR / f"SPY_real_options_{lo}_{hi}.csv"
-    out.to_csv(dest, index=False)
+    prev = store.last_export()
+    # Only days after the last export changed: the new export is the previous one plus those days.
+    # The previous file stays as it is — calibrations reference exports by name.
+    extend = bool(prev and dates and dates[0] > prev["hi"])
+    if prev and not dates:
+        out = None
+    elif extend:
+        out = _stack(store.partitions(after=prev["hi"]))
+        out = out[out["quote_date"] > pd.Timestamp(prev["hi"])]
+    else:
+        out = _stack(store.partitions())
+
+    if out is None or out.empty:
+        if not prev:
+            raise ValueError(f"No contracts in the logged chains in {RAW_DIR}.")
+        # Nothing new (or nothing left) to export: keep the previous export
+        dest, lo, hi, added = Path(prev["path"]), prev["lo"], prev["hi"], 0
+    elif extend:
+        lo = prev["lo"]
+        hi = out["quote_date"].max().strftime("%Y-%m-%d")
+        dest = PROCESSED_DIR / f"SPY_real_options_{lo}_{hi}.csv"
+        tmp = dest.with_name(dest.name + ".tmp")
+        shutil.copyfile(prev["path"], tmp)
+        out.to_csv(tmp, mode="a", header=False, index=False)
+        os.replace(tmp, dest)
+        added = len(out)
+    else:
+        lo = out["quote_date"].min().strftime("%Y-%m-%d")
+        hi = out["quote_date"].max().strftime("%Y-%m-%d")
+        dest = PROCESSED_DIR / f"SPY_real_options_{lo}_{hi}.csv"
+        tmp = dest.with_name(dest.name + ".tmp")
+        out.to_csv(tmp, index=False)
+        os.replace(tmp, dest)
+        added = len(out)
+    store.save_export(dest, lo, hi)
 
     if verbose:
-        print(f"Compiled {len(files)} snapshots -> {len(out):,} contracts over "
-              f"{out['quote_date'].nunique()} day(s) [{lo} .. {hi}]")
+        print(f"Compiled {len(dates)} changed day(s) of {len(by_date)} ({len(files)} snapshots) -> "
+              f"{added:,} contracts written [{lo} .. {hi}]")
         print(f"Saved -> {dest}")
         print(f"Backtest it: set config data_source.mode=real and real_data.start/end to {lo}/{hi}")
     return dest
 
 
 if __name__ == "__main__":
-    compile_chains()
+    ap = argparse.ArgumentParser(description="Compile logged SPY chain snapshots into the real dataset.")
+    ap.add_argument("--full", action="store_true",
+                    help="discard data/processed/chains/ and rebuild every partition from the raw snapshots")
+    compile_chains(full=ap.parse_args().full)
@@ -61,10 +61,11 @@ def _current_chain(from_logged: bool) -> tuple[pd.DataFrame, float]:
         except Exception as exc:
             print(f"  (live pull failed: {exc}; falling back to latest logged snapshot)")
 
-    files = sorted(RAW_CHAINS.glob("SPY_chain_*.csv"))
+    from data_collection.chain_logger import read_snapshot, snapshot_files
+    files = snapshot_files(RAW_CHAINS)
     if not files:
         raise FileNotFoundError("No live chain and no logged snapshots in data/raw/chains/.")
-    df = pd.read_csv(files[-1])
+    df = read_snapshot(files[-1])
     df["expiration"] = pd.to_datetime(df["expiration"]).dt.normalize()
     print(f"  using logged snapshot: {files[-1].name}")
     return df, float(df["underlying_price"].iloc[0])
@@ -24,29 +24,26 @@ warnings.filterwarnings("ignore")
 
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "Trend Reversal"))
 from trendrev import data as tr_data          # noqa: E402
+from trendrev import live as tr_live          # noqa: E402
 from trendrev import scanner as tr_scanner     # noqa: E402
-from trendrev.strategies import trend_reversal_frame  # noqa: E402
 
 FRESH_BARS = 2  # a "fresh" flip = within the last N 3-day bars (~ last 6 trading days)
+START = "2023-01-01"
 
 
-def state_info(ticker: str):
-    """Return (state, bars_since_flip, flip_date, price_at_flip, last_price) on 3-day bars."""
-    df = tr_data.resample_ohlcv(tr_data.get_ohlcv(ticker, start="2023-01-01"), "3D")
-    if len(df) < 30:
+def state_info(ticker: str, live: tr_live.LiveScanState, daily=None):
+    """Return (state, bars_since_flip, flip_date, price_at_flip, last_price) on 3-day bars.
+
+    The persisted ``live`` snapshot is advanced with only the daily bars that arrived since the
+    last scan (full rebuild on a data revision) instead of recomputing the whole history.
+    """
+    if daily is None:
+        daily = tr_data.get_ohlcv(ticker, start=START)
+    st = live.advance(ticker, daily)
+    if st is None or st.n_bars < 30:
         return None
-    f = trend_reversal_frame(df)
-    buy, sell = f["buysignal"].values, f["sellsignal"].values
-    state = "green" if buy[-1] == 1 else "red" if sell[-1] == 1 else "neutral"
-    series = buy if state == "green" else sell if state == "red" else None
-    bars_since, flip_date, price_at_flip = None, None, None
-    if series is not None:
-        i = len(series) - 1
-        while i > 0 and series[i - 1] == 1:
-            i -= 1
-        bars_since = len(series) - 1 - i
-        flip_date, price_at_flip = df.index[i].date(), float(df["close"].iloc[i])
-    return state, bars_since, flip_date, price_at_flip, float(df["close"].iloc[-1])
+    flip_date = st.flip_date.date() if st.flip_date is not None else None
+    return st.state, st.bars_since_flip, flip_date, st.price_at_flip, st.last_price
 
 
 def main():
@@ -59,9 +56,13 @@ def main():
     print(f"\nScanner top-{args.top_n} quality names x Trend Reversal (3-day bars). Risk/idea ${args.risk:.0f}.\n")
     print(f"{'TICKER':<7}{'TIER':<16}{'STATE':<9}{'SINCE':<22}{'MOVE':>7}   IDEA")
 
+    live = tr_live.LiveScanState("3D")
+    daily = tr_data.get_many([c.ticker for c in cands], start=START, errors="skip")
     fresh = []
     for c in cands:
-        info = state_info(c.ticker)
+        if c.ticker not in daily:
+            continue
+        info = state_info(c.ticker, live, daily[c.ticker])
         if info is None:
             continue
         state, bars, flip_date, p0, p1 = info
@@ -80,6 +81,8 @@ def main():
         flag = "* " if is_fresh else "  "
         print(f"{flag}{c.ticker:<5}{c.tier[:15]:<16}{state:<9}{since:<22}{move:>7}   {idea}")
 
+    live.save()
+
     print("\n" + "=" * 70)
     if fresh:
         print(f"FRESH BUYS ({len(fresh)}): {', '.join(fresh)}")
@@ -394,3 +394,237 @@ def calculate_performance_metrics(backtest_results: Dict) -> Dict:
     metrics = analyzer.calculate_all_metrics(initial_capital)
 
     return metrics
+
+
+# ---------------------------------------------------------------------------
+# Batch engine — many backtests in one vectorized pass
+# ---------------------------------------------------------------------------
+
+def batch_performance_metrics(
+    equity: np.ndarray,
+    dates,
+    trades: pd.DataFrame = None,
+    initial_capital=None,
+    config_ids=None,
+    config_col: str = 'config',
+) -> pd.DataFrame:
+    """
+    The ``calculate_all_metrics`` metrics for many backtests at once.
+
+    Every metric is a reduction along the day axis of one ``configs x days``
+    matrix (and one bincount over the concatenated trade table), so scoring a
+    sweep costs a handful of numpy calls instead of a pandas pipeline per
+    configuration. Definitions match ``PerformanceAnalyzer`` (same 2% risk-free
+    Sharpe, Calmar on the first equity value, month-end returns) to floating-point
+    roundoff, except that a flat equity curve always scores Sharpe 0 here
+    (PerformanceAnalyzer divides by the roundoff left in its std).
+
+    Args:
+        equity: (configs, days) total account value. Days outside a config's
+            own run are NaN (leading or trailing padding on a shared axis).
+        dates: Trading dates of the day axis (length ``days``)
+        trades: Concatenated trade table with ``config_col``, ``net_pnl`` and
+            ``days_in_trade`` columns (None = no trades)
+        initial_capital: Starting capital, scalar or one per config
+        config_ids: Labels of the rows of ``equity`` (default: 0..configs-1);
+            trades are matched to rows through these
+        config_col: Column of ``trades`` holding the config label
+
+    Returns:
+        DataFrame indexed by config, one column per metric
+    """
+    v = np.atleast_2d(np.asarray(equity, dtype=float))
+    n_cfg, n_days = v.shape
+    ids = pd.Index(np.arange(n_cfg) if config_ids is None else config_ids, name=config_col)
+    rows = np.arange(n_cfg)
+    valid = ~np.isnan(v)
+    days = valid.sum(axis=1)
+    if (days == 0).any():
+        raise ValueError("Every config needs at least one equity value")
+    first = valid.argmax(axis=1)
+    last = n_days - 1 - valid[:, ::-1].argmax(axis=1)
+    start_value = v[rows, first]
+    final_value = v[rows, last]
+    capital = start_value if initial_capital is None else \
+        np.broadcast_to(np.asarray(initial_capital, dtype=float), (n_cfg,))
+
+    out = {}
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # --- P&L ---
+        years = days / 252  # Trading days per year
+        out['initial_capital'] = capital
+        out['final_value'] = final_value
+        out['total_pnl'] = final_value - capital
+        out['total_return_pct'] = (final_value - capital) / capital * 100
+        out['annualized_return_pct'] = _annualized(final_value, capital, years)
+
+        # --- Risk ---
+        # Returns are NaN wherever either day is padding; the moments below mask once and
+        # reuse the zero-filled matrix rather than calling numpy's nan* reductions (each
+        # of which copies the whole matrix).
+        returns = v[:, 1:] / v[:, :-1] - 1
+        counted = ~np.isnan(returns)
+        r0 = np.where(counted, returns, 0.0)
+        mean_ret, std_ret = _masked_moments(r0, counted)
+        mean_excess = mean_ret - 0.02 / 252         # 2% annual risk-free
+        # A flat equity curve leaves only summation roundoff (~1e-20) in the std; treat that as
+        # zero volatility (Sharpe 0) instead of dividing by it.
+        zero_vol = ~(std_ret > 1e-9 * np.abs(mean_excess))
+        out['sharpe_ratio'] = np.where(zero_vol, 0.0, np.sqrt(252) * mean_excess / std_ret)
+        down = counted & (r0 < 0)
+        _, downside_std = _masked_moments(np.where(down, r0, 0.0), down)
+        out['sortino_ratio'] = np.where(downside_std > 0, np.sqrt(252) * mean_excess / downside_std, 0.0)
+        cummax = np.fmax.accumulate(v, axis=1)
+        max_dd = np.fmin.reduce((v - cummax) / cummax, axis=1) * 100
+        out['max_drawdown_pct'] = max_dd
+        calmar_ann = _annualized(final_value, start_value, years)
+        out['calmar_ratio'] = np.where(max_dd != 0, np.abs(calmar_ann / max_dd), 0.0)
+        out['volatility_pct'] = std_ret * np.sqrt(252) * 100
+
+    out.update(_batch_trade_stats(trades, ids, config_col))
+    out.update(_batch_month_stats(v, pd.DatetimeIndex(dates), last))
+    return pd.DataFrame(out, index=ids)
+
+
+def stack_backtest_results(results: Dict) -> Tuple[np.ndarray, pd.DatetimeIndex, pd.DataFrame, np.ndarray]:
+    """
+    Stack ``{config: backtest_results}`` into ``batch_performance_metrics`` inputs.
+
+    Equity curves are placed on the union of their dates (NaN outside each
+    run) and the trade ledgers' ``net_pnl`` / ``days_in_trade`` are concatenated
+    with a ``config`` column (the position of the config in ``results``).
+
+    Returns:
+        (equity matrix, dates, trades, initial capital per config)
+    """
+    keys = list(results)
+    curves = [results[k]['equity_curve'] for k in keys]
+    days = [c['date'].to_numpy('datetime64[ns]') for c in curves]
+    dates = np.unique(np.concatenate(days)) if days else np.array([], 'datetime64[ns]')
+    equity = np.full((len(keys), len(dates)), np.nan)
+    for i, (curve, d) in enumerate(zip(curves, days)):
+        equity[i, np.searchsorted(dates, d)] = curve['total_value'].to_numpy(float)
+
+    ledgers = [results[k]['trades'] for k in keys]
+    counts = np.array([len(t) for t in ledgers], dtype=int)
+    columns = {'config': np.repeat(np.arange(len(keys)), counts)}
+    for col in ('net_pnl', 'days_in_trade'):
+        parts = [t[col].to_numpy(float) if col in t else np.full(len(t), np.nan)
+                 for t in ledgers if len(t)]
+        columns[col] = np.concatenate(parts) if parts else np.array([], float)
+    capital = np.array([results[k]['initial_capital'] for k in keys], dtype=float)
+    return equity, pd.DatetimeIndex(dates), pd.DataFrame(columns), capital
+
+
+def calculate_batch_metrics(results: Dict) -> pd.DataFrame:
+    """
+    ``calculate_performance_metrics`` for a whole sweep: ``{config: backtest_results}``
+    in, one row of metrics per config out (indexed by the dict keys).
+    """
+    equity, dates, trades, capital = stack_backtest_results(results)
+    metrics = batch_performance_metrics(equity, dates, trades, capital)
+    metrics.index = pd.Index(list(results), name='config')
+    return metrics
+
+
+def _annualized(final_value: np.ndarray, start_value: np.ndarray, years: np.ndarray) -> np.ndarray:
+    with np.errstate(divide='ignore', invalid='ignore'):
+        growth = (final_value / start_value) ** (1 / np.where(years > 0, years, 1)) - 1
+    return np.where(years > 0, growth * 100, 0.0)
+
+
+def _masked_moments(x0: np.ndarray, mask: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Per-row mean and sample std (ddof=1) of the ``mask``-ed entries of ``x0`` (zero
+    elsewhere); std is NaN below two observations, as in pandas."""
+    n = mask.sum(axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean = x0.sum(axis=1) / n
+        dev = np.where(mask, x0 - mean[:, None], 0.0)
+        std = np.sqrt(np.einsum('ij,ij->i', dev, dev) / (n - 1))
+    return mean, np.where(n > 1, std, np.nan)
+
+
+def _batch_trade_stats(trades: pd.DataFrame, ids: pd.Index, config_col: str) -> Dict:
+    n_cfg = len(ids)
+    if trades is None or len(trades) == 0:
+        zeros = np.zeros(n_cfg)
+        return {
+            'total_trades': zeros.astype(int), 'winning_trades': zeros.astype(int),
+            'losing_trades': zeros.astype(int), 'win_rate_pct': zeros, 'avg_win': zeros,
+            'avg_loss': zeros, 'largest_win': zeros, 'largest_loss': zeros,
+            'profit_factor': zeros, 'avg_days_in_trade': zeros,
+        }
+
+    codes = ids.get_indexer(trades[config_col])
+    if (codes < 0).any():
+        raise ValueError(f"Trades reference configs not in config_ids: "
+                         f"{sorted(set(trades[config_col][codes < 0]))[:5]}")
+    pnl = trades['net_pnl'].to_numpy(float)
+    win = pnl > 0
+    loss = pnl <= 0
+
+    total = np.bincount(codes, minlength=n_cfg)
+    n_win = np.bincount(codes, weights=win, minlength=n_cfg).astype(int)
+    n_loss = np.bincount(codes, weights=loss, minlength=n_cfg).astype(int)
+    sum_win = np.bincount(codes[win], weights=pnl[win], minlength=n_cfg)
+    sum_loss = np.bincount(codes[loss], weights=pnl[loss], minlength=n_cfg)
+    largest_win = np.full(n_cfg, -np.inf)
+    np.maximum.at(largest_win, codes[win], pnl[win])
+    largest_loss = np.full(n_cfg, np.inf)
+    np.minimum.at(largest_loss, codes[loss], pnl[loss])
+
+    days = trades['days_in_trade'].to_numpy(float) if 'days_in_trade' in trades else np.full(len(pnl), np.nan)
+    has_days = ~np.isnan(days)
+    n_days = np.bincount(codes[has_days], minlength=n_cfg)
+    sum_days = np.bincount(codes[has_days], weights=days[has_days], minlength=n_cfg)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        total_losses = np.abs(sum_loss)
+        # Configs without trades get the zeroed block PerformanceAnalyzer returns for them.
+        traded = total > 0
+        return {
+            'total_trades': total,
+            'winning_trades': n_win,
+            'losing_trades': n_loss,
+            'win_rate_pct': np.where(traded, n_win / total * 100, 0.0),
+            'avg_win': np.where(n_win > 0, sum_win / n_win, 0.0),
+            'avg_loss': np.where(n_loss > 0, sum_loss / n_loss, 0.0),
+            'largest_win': np.where(n_win > 0, largest_win, 0.0),
+            'largest_loss': np.where(n_loss > 0, largest_loss, 0.0),
+            'profit_factor': np.where(total_losses > 0, sum_win / total_losses,
+                                      np.where(traded, np.inf, 0.0)),
+            'avg_days_in_trade': np.where(traded, sum_days / n_days, 0.0),
+        }
+
+
+def _batch_month_stats(v: np.ndarray, dates: pd.DatetimeIndex, last: np.ndarray) -> Dict:
+    """Month-end value per config (last valid day of each calendar month), then
+    month-over-month returns — the ``resample('ME').last().pct_change()`` of each run."""
+    n_cfg = v.shape[0]
+    months = dates.to_period('M')
+    span = pd.period_range(months.min(), months.max(), freq='M')
+    month_idx = ((months.year - span[0].year) * 12 + months.month - span[0].month).to_numpy()
+    # Position of each month's last trading day (-1 for calendar months with none).
+    month_end = np.full(len(span), -1)
+    np.maximum.at(month_end, month_idx, np.arange(len(dates)))
+
+    monthly = np.full((n_cfg, len(span)), np.nan)
+    has = month_end >= 0
+    monthly[:, has] = v[:, month_end[has]]
+    # A run ending mid-month closes that month at its own last day.
+    monthly[np.arange(n_cfg), month_idx[last]] = v[np.arange(n_cfg), last]
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mret = (monthly[:, 1:] / monthly[:, :-1] - 1) * 100
+        counted = ~np.isnan(mret)
+        total = counted.sum(axis=1)
+        positive = (np.nan_to_num(mret, nan=0.0) > 0).sum(axis=1)
+        any_month = total > 0
+        return {
+            'positive_months': positive,
+            'total_months': total,
+            'positive_months_pct': np.where(any_month, positive / total * 100, 0.0),
+            'best_month_pct': np.where(any_month, np.nanmax(np.where(counted, mret, -np.inf), axis=1), 0.0),
+            'worst_month_pct': np.where(any_month, np.nanmin(np.where(counted, mret, np.inf), axis=1), 0.0),
+            'avg_monthly_return_pct': np.where(any_month, np.nansum(mret, axis=1) / total, 0.0),
+        }
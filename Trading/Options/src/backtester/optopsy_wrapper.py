@@ -13,6 +13,7 @@ import numpy as np
 import optopsy as op  # Will be imported once data is ready
 
 from ..strategies.base_strategy import BaseStrategy, Position, Signal
+from ..utils.chain_index import OPTION_TYPE_CODES, DayChain, expiration_ns
 from ..utils.execution import net_open
 
 
@@ -59,6 +60,7 @@ class OptopsyBacktester:
         # still correctly invalidates and recomputes (identity check, not a stale-content bug).
         self._prepared_cache = None    # (raw_data, prepared_df)
         self._day_groups_cache = None  # (prepared_df, {quote_date: sub_df})
+        self._day_chains_cache = None  # (prepared_df, {quote_date: DayChain}), filled lazily
 
     def _calculate_position_max_risk(self, position: Position) -> float:
         """
@@ -93,14 +95,10 @@ class OptopsyBacktester:
             strategy: Strategy instance with open positions
 
         Returns:
-            Total risk in dollars across all open positions
+            Total risk in dollars across all open positions (the position book's vectorized
+            form of _calculate_position_max_risk)
         """
-        open_positions = strategy.get_open_positions()
-        total_risk = sum(
-            self._calculate_position_max_risk(pos)
-            for pos in open_positions
-        )
-        return total_risk
+        return float(strategy.book.max_risk().sum())
 
     def _calculate_available_risk_budget(self, strategy) -> float:
         """
@@ -117,10 +115,7 @@ class OptopsyBacktester:
             return float('inf')
 
         # Get current portfolio value (account + unrealized P&L)
-        total_unrealized = sum(
-            p.unrealized_pnl for p in strategy.get_open_positions()
-        )
-        current_portfolio_value = self.account_value + total_unrealized
+        current_portfolio_value = self.account_value + strategy.book.total_unrealized()
 
         # Get max risk from config
         max_risk_pct = self.config.get('position_sizing', {}).get('max_risk_percent', 50.0)
@@ -220,6 +215,53 @@ class OptopsyBacktester:
         self._day_groups_cache = (optopsy_data, groups)
         return groups
 
+    def _get_day_chain(self, optopsy_data: pd.DataFrame, date: pd.Timestamp,
+                       daily_options: pd.DataFrame) -> DayChain:
+        """The day's DayChain (sorted contract index), built on first use and cached by IDENTITY
+        of optopsy_data like _get_day_groups, so an optimizer search indexes each day once."""
+        if self._day_chains_cache is None or self._day_chains_cache[0] is not optopsy_data:
+            self._day_chains_cache = (optopsy_data, {})
+        chains = self._day_chains_cache[1]
+        day = chains.get(date)
+        if day is None:
+            day = chains[date] = DayChain(daily_options)
+        return day
+
+    def _exit_signals(self, strategy: BaseStrategy, optopsy_data: pd.DataFrame,
+                      current_date: pd.Timestamp, daily_options: pd.DataFrame,
+                      underlying_price: float) -> List[Tuple[Position, Signal]]:
+        """(position, exit signal) for every open position that exits today, in opening order.
+
+        Strategies with an array exit path (``evaluate_exits``, e.g. vertical spreads) evaluate
+        the whole position book at once; the rest are asked position by position and the book
+        re-reads the marks they set.
+        """
+        fills = dict(
+            limit_fraction=self.limit_frac,
+            market_fraction=self.market_frac,
+            extra_slippage=self.extra_slip,
+            stop_slippage=self.stop_slip
+        )
+        if not strategy.positions:
+            return []
+        if hasattr(strategy, 'evaluate_exits'):
+            day = self._get_day_chain(optopsy_data, current_date, daily_options)
+            return strategy.evaluate_exits(current_date, strategy.book, day, daily_options,
+                                           underlying_price, **fills)
+        exits = []
+        for position in strategy.get_open_positions():
+            exit_signal = strategy.generate_exit_signal(
+                date=current_date,
+                position=position,
+                options_data=daily_options,
+                underlying_price=underlying_price,
+                **fills
+            )
+            if exit_signal:
+                exits.append((position, exit_signal))
+        strategy.book.pull()
+        return exits
+
     def run_backtest(
         self,
         strategy: BaseStrategy,
@@ -247,8 +289,7 @@ class OptopsyBacktester:
         self.equity_curve = []
         self.all_trades = []
         self.daily_entry_log = []  # Track daily entry attempts for reporting
-        strategy.positions = []
-        strategy.closed_positions = []
+        strategy.reset_positions()
 
         # Determine actual trading date range from available data
         # Use the intersection of config dates and available data
@@ -334,19 +375,9 @@ class OptopsyBacktester:
             vix = daily_options['vix'].iloc[0] if 'vix' in daily_options.columns else None
 
             # Check exit signals for open positions
-            open_positions = strategy.get_open_positions()
-            for position in open_positions:
-                exit_signal = strategy.generate_exit_signal(
-                    date=current_date,
-                    position=position,
-                    options_data=daily_options,
-                    underlying_price=underlying_price,
-                    limit_fraction=self.limit_frac,
-                    market_fraction=self.market_frac,
-                    extra_slippage=self.extra_slip,
-                    stop_slippage=self.stop_slip
-                )
-
+            for position, exit_signal in self._exit_signals(
+                strategy, optopsy_data, current_date, daily_options, underlying_price
+            ):
                 if exit_signal:
                     # Close position. Guard: if a strategy emitted an exit without pricing the
                     # position, fall back to the entry price (breakeven) rather than crash on None.
@@ -438,26 +469,25 @@ class OptopsyBacktester:
 
                 # Only attempt entry if we have risk budget available
                 if available_risk_budget > 0:
+                    day = self._get_day_chain(optopsy_data, current_date, daily_options)
                     entry_signal = strategy.generate_entry_signal(
                         date=current_date,
                         options_data=daily_options,
                         underlying_price=underlying_price,
                         vix=vix,
                         fill_fraction=self.limit_frac,
-                        extra_slippage=self.extra_slip
+                        extra_slippage=self.extra_slip,
+                        day_chain=day
                     )
 
                     if entry_signal:
                         # Get current portfolio value for position sizing
-                        total_unrealized = sum(
-                            p.unrealized_pnl for p in strategy.get_open_positions()
-                        )
-                        current_portfolio_value = self.account_value + total_unrealized
+                        current_portfolio_value = self.account_value + strategy.book.total_unrealized()
 
                         # Price the spread FIRST so sizing uses the ACTUAL debit/credit per contract,
                         # not a worst-case max_debit estimate (which made a $10k account that dipped
                         # after one loss size 0 contracts and stop trading for the rest of the run).
-                        entry_price = self._get_entry_price(daily_options, entry_signal, self.limit_frac, self.extra_slip)
+                        entry_price = self._get_entry_price(daily_options, entry_signal, self.limit_frac, self.extra_slip, day)
 
                         # Calculate position size with available risk constraint
                         contracts = strategy.calculate_position_size(
@@ -471,11 +501,11 @@ class OptopsyBacktester:
                         if entry_price and contracts > 0:
                             # Iron condor = 4 legs at one expiration; everything else = 2 legs.
                             if getattr(entry_signal, 'put_short_strike', None) is not None:
-                                legs = self._ic_position_legs(daily_options, entry_signal)
+                                legs = self._ic_position_legs(daily_options, entry_signal, day)
                             else:
                                 option_type = 'put' if 'put' in strategy.spread_type else 'call'
-                                short_d = self._get_leg_details(daily_options, entry_signal.short_strike, option_type, entry_signal)
-                                long_d = self._get_leg_details(daily_options, entry_signal.long_strike, option_type, entry_signal, is_long=True)
+                                short_d = self._get_leg_details(daily_options, entry_signal.short_strike, option_type, entry_signal, day=day)
+                                long_d = self._get_leg_details(daily_options, entry_signal.long_strike, option_type, entry_signal, is_long=True, day=day)
                                 legs = [
                                     {'strike': entry_signal.short_strike, 'option_type': option_type, 'position': 'short',
                                      'delta': short_d.get('delta'), 'price': short_d.get('price'), 'expiration': short_d.get('expiration')},
@@ -502,7 +532,7 @@ class OptopsyBacktester:
                             # slippage isn't captured here (each strategy prices its own exit), so
                             # this is a friction LOWER BOUND, not the full round-trip cost -- see
                             # the 'friction_dollars'/'friction_pct_of_credit' trade_record fields.
-                            entry_mid_price = self._get_entry_price(daily_options, entry_signal, 0.0, 0.0)
+                            entry_mid_price = self._get_entry_price(daily_options, entry_signal, 0.0, 0.0, day)
                             position.entry_mid_price = entry_mid_price
                             position.entry_slippage_dollars = (
                                 abs(entry_price - entry_mid_price) * contracts * 100
@@ -519,7 +549,7 @@ class OptopsyBacktester:
                             if hasattr(entry_signal, 'far_expiration'):
                                 position.far_expiration = entry_signal.far_expiration
 
-                            strategy.positions.append(position)
+                            strategy.open_position(position)
 
                             # Increment daily trade counter (enforce max one trade per day)
                             trades_entered_today += 1
@@ -549,15 +579,13 @@ class OptopsyBacktester:
             })
 
             # Record equity curve
-            total_unrealized = sum(
-                p.unrealized_pnl for p in strategy.get_open_positions()
-            )
+            total_unrealized = strategy.book.total_unrealized()
             self.equity_curve.append({
                 'date': current_date,
                 'account_value': self.account_value,
                 'unrealized_pnl': total_unrealized,
                 'total_value': self.account_value + total_unrealized,
-                'open_positions': len(strategy.get_open_positions()),
+                'open_positions': len(strategy.book),
                 'trades_entered_today': trades_entered_today
             })
 
@@ -584,16 +612,29 @@ class OptopsyBacktester:
         signal: Signal,
         fraction: float = 0.5,
         extra: float = 0.0,
+        day: Optional[DayChain] = None,
     ) -> Optional[float]:
-        """Signed cash to open the spread, per share (>0 debit, <0 credit), at the limit-fill price."""
+        """Signed cash to open the spread, per share (>0 debit, <0 credit), at the limit-fill price.
+
+        With the day's DayChain, legs pinned to an expiration are looked up in the index instead
+        of filtering the chain.
+        """
         # Iron condor: four legs pinned to one expiration; net_open is negative (a net credit).
         if getattr(signal, 'put_short_strike', None) is not None:
-            legs = self._ic_leg_quotes(options_data, signal)
+            legs = self._ic_leg_quotes(options_data, signal, day)
             return net_open(legs, fraction, extra) if legs else None
 
         option_type = 'put' if 'put' in signal.strategy_name.lower() else 'call'
         is_calendar = (signal.short_strike == signal.long_strike) and ('calendar' in signal.strategy_name.lower())
 
+        if not is_calendar and day is not None and getattr(signal, 'expiration', None) is not None:
+            rows = self._locate_legs(day, [(signal.short_strike, option_type), (signal.long_strike, option_type)],
+                                     signal.expiration)
+            if rows is None:
+                return None
+            short, long = rows
+            return net_open([(day.bid[short], day.ask[short], False), (day.bid[long], day.ask[long], True)], fraction, extra)
+
         same = options_data[
             (options_data['strike'] == signal.short_strike) & (options_data['option_type'] == option_type)
         ]
@@ -614,10 +655,10 @@ class OptopsyBacktester:
 
         # Vertical spread - distinct strikes, both legs pinned to the signal's expiration (without
         # the pin, iloc[0] booked the entry off whichever expiration listed the strike first).
+        exp = getattr(signal, 'expiration', None)
         long_option = options_data[
             (options_data['strike'] == signal.long_strike) & (options_data['option_type'] == option_type)
         ]
-        exp = getattr(signal, 'expiration', None)
         if exp is not None and 'expiration' in options_data.columns:
             same = same[same['expiration'] == exp]
             long_option = long_option[long_option['expiration'] == exp]
@@ -635,11 +676,24 @@ class OptopsyBacktester:
             (signal.call_long_strike, 'call', True, 'long'),
         ]
 
-    def _ic_leg_quotes(self, options_data: pd.DataFrame, signal: Signal):
+    def _locate_legs(self, day: DayChain, legs, expiration) -> Optional[np.ndarray]:
+        """Chain rows of (strike, option_type) legs at one expiration, or None if any is unquoted."""
+        exp = expiration_ns(expiration)
+        rows = day.locate([k for k, _ in legs], [OPTION_TYPE_CODES.get(t, -1) for _, t in legs],
+                          [exp] * len(legs))
+        return None if (rows < 0).any() else rows
+
+    def _ic_leg_quotes(self, options_data: pd.DataFrame, signal: Signal, day: Optional[DayChain] = None):
         """The four (bid, ask, is_long) quotes for an iron condor at its pinned expiration, or None."""
         exp = getattr(signal, 'expiration', None)
+        specs = self._ic_specs(signal)
+        if day is not None and exp is not None:
+            rows = self._locate_legs(day, [(k, t) for k, t, _l, _s in specs], exp)
+            if rows is None:
+                return None
+            return [(day.bid[r], day.ask[r], is_long) for r, (_k, _t, is_long, _s) in zip(rows, specs)]
         legs = []
-        for strike, otype, is_long, _side in self._ic_specs(signal):
+        for strike, otype, is_long, _side in specs:
             row = options_data[(options_data['strike'] == strike) & (options_data['option_type'] == otype)]
             if exp is not None and 'expiration' in options_data.columns:
                 row = row[row['expiration'] == exp]
@@ -649,9 +703,19 @@ class OptopsyBacktester:
             legs.append((r['bid'], r['ask'], is_long))
         return legs
 
-    def _ic_position_legs(self, options_data: pd.DataFrame, signal: Signal):
+    def _ic_position_legs(self, options_data: pd.DataFrame, signal: Signal, day: Optional[DayChain] = None):
         """Position leg dicts (4) for an iron condor, with delta/price/expiration for the trade log."""
         exp = getattr(signal, 'expiration', None)
+        if day is not None and exp is not None:
+            specs = self._ic_specs(signal)
+            rows = day.locate([k for k, _t, _l, _s in specs],
+                              [OPTION_TYPE_CODES.get(t, -1) for _k, t, _l, _s in specs],
+                              [expiration_ns(exp)] * len(specs))
+            return [{
+                'strike': strike, 'option_type': otype, 'position': side, 'expiration': exp,
+                'delta': (day.delta[r] if r >= 0 else None),
+                'price': ((day.bid[r] if side == 'short' else day.ask[r]) if r >= 0 else None),
+            } for r, (strike, otype, _is_long, side) in zip(rows, specs)]
         legs = []
         for strike, otype, _is_long, side in self._ic_specs(signal):
             row = options_data[(options_data['strike'] == strike) & (options_data['option_type'] == otype)]
@@ -671,7 +735,8 @@ class OptopsyBacktester:
         strike: float,
         option_type: str,
         signal: Signal,
-        is_long: bool = False
+        is_long: bool = False,
+        day: Optional[DayChain] = None
     ) -> Dict:
         """
         Get detailed leg information (delta, price, expiration) for trade export.
@@ -682,6 +747,7 @@ class OptopsyBacktester:
             option_type: 'call' or 'put'
             signal: Entry signal (contains expiration info for calendar spreads)
             is_long: True if this is the long leg, False for short leg
+            day: The day's DayChain; a leg pinned to an expiration is looked up there
 
         Returns:
             Dictionary with delta, price, and expiration
@@ -714,11 +780,21 @@ class OptopsyBacktester:
         else:
             # Vertical spread - filter by strike AND the signal's pinned expiration, so the leg
             # record (delta/price/expiration) describes the contract actually traded.
+            exp = getattr(signal, 'expiration', None)
+            if day is not None and exp is not None:
+                rows = self._locate_legs(day, [(strike, option_type)], exp)
+                if rows is None:
+                    return {'delta': None, 'price': None, 'expiration': None}
+                row = rows[0]
+                return {
+                    'delta': day.delta[row] if day.delta is not None else None,
+                    'price': day.ask[row] if is_long else day.bid[row],
+                    'expiration': options_data['expiration'].iloc[row]
+                }
             leg_options = options_data[
                 (options_data['strike'] == strike) &
                 (options_data['option_type'] == option_type)
             ]
-            exp = getattr(signal, 'expiration', None)
             if exp is not None and 'expiration' in options_data.columns:
                 leg_options = leg_options[leg_options['expiration'] == exp]
 
@@ -0,0 +1,206 @@
+"""On-disk artifacts for the skew / vol-level calibrations.
+
+``skew_calibration.fit`` and ``vol_level_calibration.fit`` used to re-read the full real-chain
+CSVs and redo the ATM anchoring every run, although the only thing the fits consume is a small
+set of per-row sufficient statistics (ATM-anchored skew ratios, ATM IV/VIX ratios). This module
+keeps those statistics per source file under ``data/processed/calibration/`` next to a JSON
+manifest holding each source's size, mtime and sha256 and the last fit result:
+
+  * unchanged sources (same size + mtime, or same content hash after a touch) are not read;
+  * a source that only GREW (its old bytes are an exact prefix, e.g. a CSV appended to in place)
+    has just the new tail parsed and its statistics extended;
+  * anything else (rewritten file, changed calibration constants) rebuilds that source's
+    statistics from scratch;
+  * the fit itself is cached under the source hashes + constants, so a repeat run with no new
+    data returns the stored parameters without touching any CSV.
+
+Usage (see skew_calibration / vol_level_calibration):
+
+    cache = CalibrationCache("skew", params={...})
+    result = cache.cached_fit({"dolthub": DOLTHUB_FILE})
+    if result is None:
+        stats = cache.stats("dolthub", DOLTHUB_FILE, usecols, extract)
+        result = ...fit on stats...
+        cache.save_fit(result)
+"""
+from __future__ import annotations
+
+import hashlib
+import io
+import json
+import os
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401  (Parquet statistics; CSV without it)
+    _HAS_PARQUET = True
+except ImportError:
+    _HAS_PARQUET = False
+
+_PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+CACHE_DIR = _PROJECT_ROOT / "data" / "processed" / "calibration"
+
+_HASH_BLOCK = 1 << 20
+
+
+class CalibrationCache:
+    """Per-source sufficient statistics + last fit for one calibration (``name``).
+
+    ``params`` are the calibration constants the statistics depend on (DTE band, moneyness
+    bands, ...); a change invalidates every cached source and the cached fit.
+    """
+
+    def __init__(self, name: str, params: dict, cache_dir: Optional[str | Path] = None):
+        self.name = name
+        self.params = params
+        self.dir = Path(cache_dir) if cache_dir is not None else CACHE_DIR
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self.manifest_path = self.dir / f"{name}.json"
+        self.manifest = {"params": params, "sources": {}, "fit": None}
+        if self.manifest_path.exists():
+            manifest = json.loads(self.manifest_path.read_text())
+            if manifest.get("params") == params:
+                self.manifest = manifest
+        self._used: List[str] = []
+
+    # ---- statistics ----------------------------------------------------------
+
+    def stats(self, label: str, path: Path, usecols: List[str],
+              extract: Callable[[pd.DataFrame], pd.DataFrame]) -> pd.DataFrame:
+        """Sufficient statistics of one source CSV, extracted by ``extract(raw_rows)``.
+
+        ``extract`` must be row-group local in ``quote_date`` (statistics of one quote date
+        never depend on another's rows) for the append path to be exact; appended rows are
+        only accepted when they start after the last cached quote date.
+        """
+        path = Path(path)
+        st = os.stat(path)
+        entry = self.manifest["sources"].get(label)
+        stats_file = self.dir / f"{self.name}_{label}.{'parquet' if _HAS_PARQUET else 'csv'}"
+        cached = entry is not None and entry["path"] == str(path) and \
+            (self.dir / entry["stats"]).exists()
+
+        if cached and (entry["size"], entry["mtime"]) == (st.st_size, st.st_mtime):
+            self._used.append(label)
+            return self._read(entry["stats"])
+
+        digest = None
+        if cached and st.st_size >= entry["size"]:
+            prefix, digest = _hash_prefix(path, entry["size"])
+            if prefix == entry["sha256"] and digest == entry["sha256"]:
+                entry["mtime"] = st.st_mtime           # touched, not changed
+                self._save_manifest()
+                self._used.append(label)
+                return self._read(entry["stats"])
+            if prefix == entry["sha256"] and _ends_with_newline(path, entry["size"]):
+                tail = _read_tail(path, entry["size"], usecols)
+                if tail.empty or str(tail["quote_date"].min()) > entry["max_quote_date"]:
+                    old = self._read(entry["stats"])
+                    new = extract(tail)
+                    print(f"  {self.name} calibration: {label} grew by {len(tail):,} rows "
+                          f"-> +{len(new):,} statistics rows")
+                    merged = pd.concat([old, new], ignore_index=True) if len(new) else old
+                    return self._store(label, path, st, digest, tail, merged, stats_file, entry)
+
+        print(f"  {self.name} calibration: reading {path.name}")
+        raw = pd.read_csv(path, usecols=usecols)
+        if digest is None:
+            _, digest = _hash_prefix(path, 0)
+        return self._store(label, path, st, digest, raw, extract(raw), stats_file, None)
+
+    # ---- fit ------------------------------------------------------------------
+
+    def cached_fit(self, sources: Dict[str, Path]) -> Optional[dict]:
+        """The stored fit if every source (label -> path) is still byte-for-byte what it was
+        fitted on (a size + mtime check, no read), else None."""
+        fit = self.manifest.get("fit")
+        if not fit or sorted(fit["sources"]) != sorted(sources):
+            return None
+        for label, path in sources.items():
+            entry = self.manifest["sources"].get(label)
+            if entry is None or entry["sha256"] != fit["sources"][label] or \
+                    entry["path"] != str(path):
+                return None
+            st = os.stat(path)
+            if (entry["size"], entry["mtime"]) != (st.st_size, st.st_mtime):
+                return None
+        return fit["result"]
+
+    def save_fit(self, result: dict) -> None:
+        """Store ``result`` as the fit of the sources read through ``stats`` since opening."""
+        self.manifest["fit"] = {
+            "sources": {label: self.manifest["sources"][label]["sha256"] for label in self._used},
+            "result": result,
+        }
+        self._save_manifest()
+
+    # ---- internals ------------------------------------------------------------
+
+    def _store(self, label: str, path: Path, st: os.stat_result, digest: str,
+               raw: pd.DataFrame, stats: pd.DataFrame, stats_file: Path,
+               previous: Optional[dict]) -> pd.DataFrame:
+        tmp = stats_file.with_name(stats_file.name + ".tmp")
+        if _HAS_PARQUET:
+            stats.to_parquet(tmp, index=False)
+        else:
+            stats.to_csv(tmp, index=False)
+        os.replace(tmp, stats_file)
+        max_date = str(raw["quote_date"].max()) if len(raw) else ""
+        if previous is not None:
+            max_date = max(max_date, previous["max_quote_date"])
+        self.manifest["sources"][label] = {
+            "path": str(path), "size": st.st_size, "mtime": st.st_mtime, "sha256": digest,
+            "max_quote_date": max_date, "rows": len(stats), "stats": stats_file.name,
+        }
+        self._save_manifest()
+        self._used.append(label)
+        return stats
+
+    def _read(self, name: str) -> pd.DataFrame:
+        path = self.dir / name
+        if path.suffix == ".parquet":
+            return pd.read_parquet(path)
+        return pd.read_csv(path, float_precision="round_trip")
+
+    def _save_manifest(self) -> None:
+        tmp = self.manifest_path.with_name(self.manifest_path.name + ".tmp")
+        tmp.write_text(json.dumps(self.manifest, indent=2))
+        os.replace(tmp, self.manifest_path)
+
+
+def _hash_prefix(path: Path, n: int):
+    """(sha256 of the first ``n`` bytes, sha256 of the whole file) in one read."""
+    h = hashlib.sha256()
+    prefix = h.hexdigest() if n == 0 else None
+    done = 0
+    with open(path, "rb") as f:
+        while True:
+            want = _HASH_BLOCK if prefix is not None else min(_HASH_BLOCK, n - done)
+            block = f.read(want)
+            if not block:
+                break
+            h.update(block)
+            done += len(block)
+            if prefix is None and done == n:
+                prefix = h.hexdigest()
+    return prefix, h.hexdigest()
+
+
+def _ends_with_newline(path: Path, n: int) -> bool:
+    if n == 0:
+        return False
+    with open(path, "rb") as f:
+        f.seek(n - 1)
+        return f.read(1) == b"\n"
+
+
+def _read_tail(path: Path, offset: int, usecols: List[str]) -> pd.DataFrame:
+    """Rows appended after byte ``offset``, parsed under the file's own header line."""
+    with open(path, "rb") as f:
+        header = f.readline()
+        f.seek(offset)
+        tail = f.read()
+    return pd.read_csv(io.BytesIO(header + tail), usecols=usecols)
@@ -5,93 +5,211 @@ For each day with DoltHub real data (~25 contracts across ~4 expirations), fit a
 bivariate polynomial IV surface model.  Use the fitted surface to generate synthetic
 quotes for any (strike, expiration) on that day — so the synthetic chain inherits
 that day's actual skew + term structure instead of a global parametric guess.
+
+All dates are fitted together (``fit_surfaces``: one batched QR over the stacked
+per-date design matrices) and all fill rows are repriced together
+(``reprice_from_surfaces``: one vectorised pass), so a multi-year chain costs a few
+array operations rather than a groupby of small lstsq / DataFrame copies.
 """
-from typing import Optional, Dict
+from typing import Dict, Optional, Tuple
 import numpy as np
 import pandas as pd
 
 
+# Surface table columns: polynomial coefficients, then spot / point count / (m, t) support.
+COEFF_COLS = ['p00', 'p10', 'p01', 'p20', 'p11', 'p02']
+SURFACE_COLS = COEFF_COLS + ['spot', 'n', 'm_lo', 'm_hi', 't_lo', 't_hi']
+
+# Padded design-matrix cells per batched QR call (dates x max points x 6 floats).
+_BATCH_CELLS = 2_000_000
+
+
 # ---------------------------------------------------------------------------
-# Per-date surface fitting
+# Batched surface fitting — every date in one pass
 # ---------------------------------------------------------------------------
 
-def fit_day_surface(day_chain: pd.DataFrame,
-                    min_points: int = 6) -> Optional[Dict]:
-    """Fit a bivariate polynomial IV surface to one day's real quotes.
+def fit_surfaces(real_data: pd.DataFrame, min_points: int = 6,
+                 date_col: str = '_date') -> pd.DataFrame:
+    """Fit the per-date IV surface for EVERY date of *real_data* at once.
 
     Model
     -----
         IV = p00 + p10·m + p01·t + p20·m² + p11·m·t + p02·t²
 
     where
-        m = log(strike / spot)      (log-moneyness, 0 = ATM)
+        m = log(strike / spot)      (log-moneyness, 0 = ATM; spot = the day's first quote)
         t = dte / 365               (years to expiration)
 
+    Instead of one ``lstsq`` per date, each date's design rows are stacked into a
+    zero-padded ``(dates, points, 6)`` array (zero rows leave a least-squares problem
+    unchanged) and solved with one batched QR plus a batched SVD of the 6×6 ``R``
+    factors. Singular values below ``eps·max(points, 6)·s_max`` are dropped, exactly as
+    ``np.linalg.lstsq(rcond=None)`` does, so rank-deficient days (one or two
+    expirations) get the same minimum-norm coefficients as the per-date fit.
+
     Parameters
     ----------
-    day_chain : DataFrame
-        One day's real options chain (must have columns 'iv', 'dte', 'strike',
-        'underlying_price').
+    real_data : DataFrame
+        Real quotes with columns 'iv', 'dte', 'strike', 'underlying_price' and *date_col*.
     min_points : int
-        Minimum number of valid rows required to attempt a fit.
+        Minimum number of valid rows required to fit a date.
 
     Returns
     -------
-    dict with keys {'coeffs': ndarray(6,), 'spot': float, 'n': int}, or None on
-    failure (too few points, singular matrix, implausible fit).
+    DataFrame indexed by date with ``SURFACE_COLS``, one row per date whose fit
+    succeeded. Dates with too few points, a non-positive spot or an implausible fit
+    (any fitted IV more than 0.75 from the observed) are left out.
     """
-    df = day_chain.dropna(subset=['iv', 'dte', 'underlying_price', 'strike'])
-    if len(df) < min_points:
-        return None
-
-    spot = float(df['underlying_price'].iloc[0])
-    if spot <= 0:
-        return None
-
-    m = np.log(np.maximum(df['strike'].values, 0.01) / spot)
-    t = np.maximum(df['dte'].values, 1) / 365.0
-    iv = np.clip(pd.to_numeric(df['iv'], errors='coerce').values, 0.03, 3.0)
+    # Rows without a date belong to no fit (factorize would code them -1)
+    df = real_data.dropna(subset=['iv', 'dte', 'underlying_price', 'strike', date_col])
+    codes, dates = pd.factorize(df[date_col], sort=True)
+    if len(dates) == 0:
+        return pd.DataFrame(columns=SURFACE_COLS, dtype=float)
+
+    order = np.argsort(codes, kind='stable')
+    codes = codes[order]
+    counts = np.bincount(codes, minlength=len(dates))
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+
+    S = df['underlying_price'].to_numpy(float)[order]
+    spot = S[starts]
+    K = df['strike'].to_numpy(float)[order]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        m = np.log(np.maximum(K, 0.01) / spot[codes])
+    t = np.maximum(df['dte'].to_numpy(float)[order], 1) / 365.0
+    iv = np.clip(pd.to_numeric(df['iv'], errors='coerce').to_numpy(float)[order], 0.03, 3.0)
 
     # Design matrix: [1, m, t, m², m·t, t²]
     A = np.column_stack([np.ones_like(m), m, t, m * m, m * t, t * t])
-    try:
-        coeffs, *_ = np.linalg.lstsq(A, iv, rcond=None)
-    except np.linalg.LinAlgError:
-        return None
+    pos = np.arange(len(codes)) - starts[codes]
+    coeffs = np.full((len(dates), 6), np.nan)
+
+    ok = (counts >= min_points) & (spot > 0)
+    fit_dates = np.flatnonzero(ok)
+    fit_dates = fit_dates[np.argsort(counts[fit_dates], kind='stable')]  # tight padding
+    row_of = np.full(len(dates), -1)
+    i = 0
+    while i < len(fit_dates):
+        # Grow the batch while the padded stack stays under _BATCH_CELLS.
+        j = i + 1
+        while j < len(fit_dates) and (j + 1 - i) * counts[fit_dates[j]] * 6 <= _BATCH_CELLS:
+            j += 1
+        batch = fit_dates[i:j]
+        n_max = int(counts[batch[-1]])
+        row_of[batch] = np.arange(len(batch))
+        rows = np.flatnonzero(row_of[codes] >= 0)
+        Ap = np.zeros((len(batch), n_max, 6))
+        yp = np.zeros((len(batch), n_max))
+        Ap[row_of[codes[rows]], pos[rows]] = A[rows]
+        yp[row_of[codes[rows]], pos[rows]] = iv[rows]
+        coeffs[batch] = _batched_lstsq(Ap, yp, counts[batch])
+        row_of[batch] = -1
+        i = j
 
     # Sanity check: fitted values at data points should be close to observed IV.
-    fitted = A @ coeffs
-    if np.any(np.isnan(fitted)) or np.any(np.abs(fitted - iv) > 0.75):
-        return None
+    fitted = np.einsum('ij,ij->i', A, coeffs[codes])
+    bad_row = np.isnan(fitted) | (np.abs(fitted - iv) > 0.75)
+    ok &= np.bincount(codes, weights=bad_row, minlength=len(dates)) == 0
 
     # Record the (m, t) support of the fit. A bivariate polynomial with t²/m² terms
     # blows up when EXTRAPOLATED past its data — e.g. a 87-DTE far leg priced off a
     # surface fit only to 10-66 DTE gets a fabricated IV that the optimizer then games.
-    # Storing the range lets _reprice_group clamp evaluation to the support (flat
+    # Storing the range lets the repricer clamp evaluation to the support (flat
     # extrapolation at the boundary IV) instead of quadratic divergence.
+    surfaces = pd.DataFrame(coeffs, index=dates, columns=COEFF_COLS)
+    surfaces['spot'] = spot
+    surfaces['n'] = counts
+    nonempty = starts[counts > 0]
+    for name, values in (('m', m), ('t', t)):
+        lo = np.full(len(dates), np.nan)
+        hi = np.full(len(dates), np.nan)
+        lo[counts > 0] = np.minimum.reduceat(values, nonempty)
+        hi[counts > 0] = np.maximum.reduceat(values, nonempty)
+        surfaces[f'{name}_lo'] = lo
+        surfaces[f'{name}_hi'] = hi
+    return surfaces[ok]
+
+
+def _batched_lstsq(A: np.ndarray, y: np.ndarray, n: np.ndarray) -> np.ndarray:
+    """Minimum-norm least squares for a stack of zero-padded problems.
+
+    ``A = QR`` (batched), then ``x = R⁺ Qᵀy`` through the SVD of ``R`` — the singular
+    values of ``R`` are those of ``A``, so the cutoff matches ``lstsq(rcond=None)``.
+    """
+    Q, R = np.linalg.qr(A)
+    qty = np.einsum('bnk,bn->bk', Q, y)
+    U, s, Vt = np.linalg.svd(R, full_matrices=False)
+    cutoff = np.finfo(float).eps * np.maximum(n, A.shape[2])[:, None] * s[:, :1]
+    with np.errstate(divide='ignore'):
+        inv_s = np.where(s > cutoff, 1.0 / s, 0.0)
+    return np.einsum('bkj,bk->bj', Vt, inv_s * np.einsum('bik,bi->bk', U, qty))
+
+
+def fit_day_surface(day_chain: pd.DataFrame,
+                    min_points: int = 6) -> Optional[Dict]:
+    """Fit the IV surface to one day's real quotes (see ``fit_surfaces`` for the model).
+
+    Parameters
+    ----------
+    day_chain : DataFrame
+        One day's real options chain (must have columns 'iv', 'dte', 'strike',
+        'underlying_price').
+    min_points : int
+        Minimum number of valid rows required to attempt a fit.
+
+    Returns
+    -------
+    dict with keys {'coeffs': ndarray(6,), 'spot': float, 'n': int} plus the
+    (m, t) support, or None on failure (too few points, implausible fit).
+    """
+    surfaces = fit_surfaces(day_chain.assign(_day=0), min_points, date_col='_day')
+    if surfaces.empty:
+        return None
+    row = surfaces.iloc[0]
     return {
-        'coeffs': coeffs, 'spot': spot, 'n': len(df),
-        'm_lo': float(m.min()), 'm_hi': float(m.max()),
-        't_lo': float(t.min()), 't_hi': float(t.max()),
+        'coeffs': row[COEFF_COLS].to_numpy(float), 'spot': float(row['spot']),
+        'n': int(row['n']),
+        'm_lo': float(row['m_lo']), 'm_hi': float(row['m_hi']),
+        't_lo': float(row['t_lo']), 't_hi': float(row['t_hi']),
     }
 
 
 # ---------------------------------------------------------------------------
-# Vectorised apply — one date group at a time
+# Vectorised apply — every date in one pass
 # ---------------------------------------------------------------------------
 
-def _reprice_group(grp: pd.DataFrame, params: Dict,
-                   r: float, spread_frac: float, min_spread: float,
-                   dividend_yield: float) -> pd.DataFrame:
-    """Reprice ALL rows in *grp* from a single fitted IV surface — numpy fast."""
-    from scipy.stats import norm
+def reprice_from_surfaces(rows: pd.DataFrame, surfaces: pd.DataFrame,
+                          r: float = 0.04, spread_frac: float = 0.03,
+                          min_spread: float = 0.05, dividend_yield: float = 0.015,
+                          date_col: str = '_date') -> Tuple[pd.DataFrame, int]:
+    """Reprice every row of *rows* whose date has a surface, in one vectorised pass.
 
-    d = grp.copy()
-    c = params['coeffs']
+    Each row picks up its date's coefficients and support by index lookup, so there is
+    no per-date grouping or copying. The surfaces do not depend on r / spread /
+    dividend, so a table from ``fit_surfaces`` can be reused to rebuild the repriced
+    rows under new assumptions without refitting.
 
-    S = d['underlying_price'].to_numpy(float)
-    K = d['strike'].to_numpy(float)
-    T = np.clip(d['dte'].to_numpy(float), 0.0, None) / 365.0
+    Returns
+    -------
+    (copy of *rows* with iv / bid / ask / last / greeks replaced where a surface
+    exists, number of rows repriced)
+    """
+    from scipy.stats import norm
+
+    d = rows.copy()
+    which = surfaces.index.get_indexer(d[date_col]) if len(surfaces) else np.full(len(d), -1)
+    hit = which >= 0
+    if not hit.any():
+        return d, 0
+    p = surfaces.to_numpy(float)[which[hit]]
+    c = p[:, :6].T
+    spot, m_lo, m_hi, t_lo, t_hi = (p[:, SURFACE_COLS.index(k)]
+                                    for k in ('spot', 'm_lo', 'm_hi', 't_lo', 't_hi'))
+    sub = d.loc[hit]
+
+    S = sub['underlying_price'].to_numpy(float)
+    K = sub['strike'].to_numpy(float)
+    T = np.clip(sub['dte'].to_numpy(float), 0.0, None) / 365.0
 
     # --- IV from fitted surface ---
     # Clamp (m, t) to the fit's support BEFORE evaluating the polynomial. Beyond the
@@ -99,14 +217,14 @@ def _reprice_group(grp: pd.DataFrame, params: Dict,
     # priced off a 10-66 DTE fit was getting a fabricated IV the optimizer exploited).
     # Clamping = flat extrapolation at the nearest-edge IV, which is conservative and
     # internally consistent with the near leg.
-    m_raw = np.log(np.maximum(K, 0.01) / params['spot'])
-    m = np.clip(m_raw, params.get('m_lo', -np.inf), params.get('m_hi', np.inf))
-    t = np.clip(T, params.get('t_lo', 0.0), params.get('t_hi', np.inf))
+    m_raw = np.log(np.maximum(K, 0.01) / spot)
+    m = np.clip(m_raw, m_lo, m_hi)
+    t = np.clip(T, t_lo, t_hi)
     iv = c[0] + c[1]*m + c[2]*t + c[3]*m*m + c[4]*m*t + c[5]*t*t
     iv = np.clip(iv, 0.03, 3.0)
 
     # --- Black-Scholes vectorised (same pattern as reprice_from_iv) ---
-    is_call = d['option_type'].astype(str).str.lower().isin(['call', 'c']).to_numpy()
+    is_call = sub['option_type'].astype(str).str.lower().isin(['call', 'c']).to_numpy()
     with np.errstate(divide='ignore', invalid='ignore'):
         sqrtT = np.sqrt(T)
         d1 = (np.log(S / K) + (r - dividend_yield + 0.5 * iv ** 2) * T) / (iv * sqrtT)
@@ -122,21 +240,18 @@ def _reprice_group(grp: pd.DataFrame, params: Dict,
     mid = np.nan_to_num(np.maximum(mid, 0.0), nan=0.0, posinf=0.0, neginf=0.0)
 
     half = np.maximum(spread_frac * mid, min_spread) / 2.0
-    d['iv'] = iv
-    d['bid'] = np.maximum(mid - half, 0.01)
-    d['ask'] = mid + half
-    d['last'] = mid
+    out = {'iv': iv, 'bid': np.maximum(mid - half, 0.01), 'ask': mid + half, 'last': mid}
 
     # --- Greeks (delta, gamma, theta, vega) vectorised ---
     with np.errstate(divide='ignore', invalid='ignore'):
         norm_pdf_d1 = norm.pdf(d1)
-        d['gamma'] = norm_pdf_d1 / (S * iv * sqrtT) * np.exp(-dividend_yield * T)
+        out['gamma'] = norm_pdf_d1 / (S * iv * sqrtT) * np.exp(-dividend_yield * T)
 
         # delta
         delta_call = np.exp(-dividend_yield * T) * norm.cdf(d1)
         delta_put  = -np.exp(-dividend_yield * T) * norm.cdf(-d1)
-        d['delta'] = np.where(is_call, delta_call, delta_put)
-        d['abs_delta'] = np.abs(d['delta'])
+        out['delta'] = np.where(is_call, delta_call, delta_put)
+        out['abs_delta'] = np.abs(out['delta'])
 
         # theta (per-day)
         term1 = -S * norm_pdf_d1 * iv * np.exp(-dividend_yield * T) / (2 * sqrtT)
@@ -144,12 +259,17 @@ def _reprice_group(grp: pd.DataFrame, params: Dict,
         term2_q = dividend_yield * S * np.exp(-dividend_yield * T)
         theta_call = term1 - term2_r * norm.cdf(d2) + term2_q * norm.cdf(d1)
         theta_put  = term1 + term2_r * norm.cdf(-d2) - term2_q * norm.cdf(-d1)
-        d['theta'] = np.where(is_call, theta_call, theta_put) / 365.0
+        out['theta'] = np.where(is_call, theta_call, theta_put) / 365.0
 
         # vega
-        d['vega'] = S * norm_pdf_d1 * np.sqrt(T) * np.exp(-dividend_yield * T) / 100.0
+        out['vega'] = S * norm_pdf_d1 * np.sqrt(T) * np.exp(-dividend_yield * T) / 100.0
 
-    return d
+    for col, values in out.items():
+        if col not in d.columns:
+            d[col] = np.nan
+        d[col] = d[col].astype(float)
+        d.loc[hit, col] = values
+    return d, int(hit.sum())
 
 
 # ---------------------------------------------------------------------------
@@ -161,7 +281,8 @@ def apply_surface_fill(fill_rows: pd.DataFrame,
                        r: float = 0.04,
                        spread_frac: float = 0.03,
                        min_spread: float = 0.05,
-                       dividend_yield: float = 0.015) -> pd.DataFrame:
+                       dividend_yield: float = 0.015,
+                       surfaces: Optional[pd.DataFrame] = None) -> pd.DataFrame:
     """Reprice synthetic fill rows using per-date IV surfaces fitted from real data.
 
     Parameters
@@ -173,6 +294,9 @@ def apply_surface_fill(fill_rows: pd.DataFrame,
         Complete real dataset.  Must have ``_date`` column (normalized).
     r, spread_frac, min_spread, dividend_yield : float
         Black-Scholes + spread parameters.
+    surfaces : DataFrame, optional
+        Table from ``fit_surfaces(real_data)``; pass it to reprice under new
+        spread / dividend assumptions without refitting.
 
     Returns
     -------
@@ -180,24 +304,11 @@ def apply_surface_fill(fill_rows: pd.DataFrame,
     by surface-fit values for every date where a surface could be fitted.  Rows
     for dates without a valid fit are returned unchanged.
     """
-    result = fill_rows.copy()
+    if surfaces is None:
+        surfaces = fit_surfaces(real_data)
+    result, n_fitted = reprice_from_surfaces(fill_rows, surfaces, r, spread_frac,
+                                             min_spread, dividend_yield)
     n_total = len(result)
-    n_fitted = 0
-
-    for date, day_real in real_data.groupby('_date'):
-        params = fit_day_surface(day_real)
-        if params is None:
-            continue
-        mask = result['_date'] == date
-        if not mask.any():
-            continue
-        idx = result.index[mask]
-        subgroup = result.loc[idx]
-        repaired = _reprice_group(subgroup, params,
-                                   r, spread_frac, min_spread, dividend_yield)
-        result.loc[idx] = repaired.values
-        n_fitted += len(idx)
-
     pct = 100.0 * n_fitted / n_total if n_total else 0.0
     print(f"  Surface-fit: {n_fitted:,} / {n_total:,} synthetic-fill rows repriced"
           f" ({pct:.1f}%)")
@@ -0,0 +1,410 @@
+"""One local, incrementally refreshed store of the underlying and VIX-complex daily context.
+
+``synthetic_generator.fetch_underlying_data``, ``real_chain_loader._fetch_underlying``,
+``optionsdx_loader._fetch_vix``, ``compile_chains`` (through ``_fetch_underlying``) and
+``vix_gate`` each downloaded SPY and/or the VIX tenors on every run, reindexed them their own
+way, and ``vix_iv_rank`` recomputed a 252-day rolling rank over the whole history each call.
+``MarketContext`` keeps all of it in one columnar file per underlying:
+
+    data/processed/market_context_SPY.parquet   (CSV without pyarrow)
+    data/processed/market_context_SPY.json      (manifest: window, dates each source returned)
+
+  * columns: open / high / low / close / volume of the underlying, vix / vix9d / vix3m / vix6m
+    closes, and the derived trailing-``window`` ``vix_rank`` (same formula as
+    ``vix_gate.vix_iv_rank``) and ``vix_percentile`` (share of the window's closes at or below
+    today's), one row per date any of them traded;
+  * the manifest records, per source (the underlying and each VIX tenor), the settled dates it
+    actually returned — an empty or failed reply covers nothing, so that span is asked for again
+    on the next refresh instead of staying NaN. ``ensure(start, end)`` fetches, per source, only
+    the dates outside its coverage: after it (re-reading the last cached row, so a provisional
+    intraday bar is replaced) or before it (through the first cached row). Derived columns are
+    recomputed from the first changed VIX row on, with a ``window - 1`` row lookback, so a tail
+    refresh costs a few rows of rolling work. A moved adjusted close on an overlap row (a dividend
+    re-basing the source's adjusted history) refetches the underlying's full range instead of
+    splicing two price bases;
+  * reads are date-aligned numpy views of the in-memory columns (read-only, zero-copy for a
+    date range); ``get_market_context`` hands every caller in the process the same instance.
+
+The source is injectable — ``source(ticker, start, end)`` returning a yfinance-style frame
+(``Open``/``High``/``Low``/``Close``/``Volume`` by date, ``end`` inclusive) — so the whole
+service runs offline on fixture frames (``fixture_source``).
+
+Usage:
+    ctx = get_market_context("SPY").ensure("2024-01-01", "2026-06-30")
+    cols = ctx.arrays("2025-01-01", "2025-12-31")     # {'date': ..., 'close': ..., 'vix': ...}
+    vix = ctx.series("vix", "2025-01-01", "2025-12-31")
+
+    offline = MarketContext("SPY", cache_dir=tmp, source=fixture_source({"SPY": spy, "^VIX": vix}))
+"""
+from __future__ import annotations
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401  (Parquet context file; CSV without it)
+    _HAS_PARQUET = True
+except ImportError:
+    _HAS_PARQUET = False
+
+_PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+CACHE_DIR = _PROJECT_ROOT / "data" / "processed"
+
+UNDERLYING_COLUMNS = ("open", "high", "low", "close", "volume")
+VIX_TICKERS = {"vix": "^VIX", "vix9d": "^VIX9D", "vix3m": "^VIX3M", "vix6m": "^VIX6M"}
+DERIVED_COLUMNS = ("vix_rank", "vix_percentile")
+BASE_COLUMNS = UNDERLYING_COLUMNS + tuple(VIX_TICKERS)
+COLUMNS = BASE_COLUMNS + DERIVED_COLUMNS
+RANK_WINDOW = 252
+# A reply counts from the requested start when its first bar is at most this many days later (the
+# start fell on a weekend or holiday); otherwise coverage starts at the first bar returned.
+EDGE_DAYS = 7
+
+Source = Callable[[str, str, str], pd.DataFrame]
+
+
+def yfinance_history(ticker: str, start: str, end: str) -> pd.DataFrame:
+    """Default source: daily yfinance history over [start, end] (yfinance's end is exclusive)."""
+    import yfinance as yf  # local import: only needed when the cache has to grow
+    end_excl = (pd.Timestamp(end) + pd.Timedelta(days=1)).strftime("%Y-%m-%d")
+    return yf.Ticker(ticker).history(start=start, end=end_excl, interval="1d")
+
+
+def fixture_source(frames: Dict[str, pd.DataFrame]) -> Source:
+    """Offline source serving date slices of fixture frames (ticker -> yfinance-style frame)."""
+    def _source(ticker: str, start: str, end: str) -> pd.DataFrame:
+        frame = frames.get(ticker)
+        if frame is None:
+            return pd.DataFrame()
+        index = _dates(frame.index)
+        return frame[(index >= pd.Timestamp(start)) & (index <= pd.Timestamp(end))]
+    return _source
+
+
+class MarketContext:
+    """Underlying OHLCV + VIX complex + derived rank columns for one underlying ``symbol``."""
+
+    def __init__(self, symbol: str = "SPY", cache_dir: Optional[str | Path] = None,
+                 source: Optional[Source] = None, window: int = RANK_WINDOW):
+        self.symbol = symbol
+        self.window = window
+        self.source = source or yfinance_history
+        self.dir = Path(cache_dir) if cache_dir is not None else CACHE_DIR
+        self.path = self.dir / f"market_context_{symbol}.{'parquet' if _HAS_PARQUET else 'csv'}"
+        self.manifest_path = self.dir / f"market_context_{symbol}.json"
+        self._lock = threading.Lock()
+        self._session: Optional[tuple] = None           # span already refreshed in this process
+        self.manifest = {"symbol": symbol, "window": window, "lo": None, "hi": None, "coverage": {}}
+        self._frame = pd.DataFrame(columns=list(COLUMNS), dtype=float,
+                                   index=pd.DatetimeIndex([], name="date"))
+        if self.manifest_path.exists() and self.path.exists():
+            manifest = json.loads(self.manifest_path.read_text())
+            if manifest.get("window") == window and manifest.get("symbol") == symbol:
+                # Manifests from before per-column coverage: the VIX columns shared lo/hi
+                manifest.setdefault("coverage", {col: [manifest.get("lo"), manifest.get("hi")]
+                                                 for col in VIX_TICKERS})
+                self.manifest = manifest
+                self._frame = self._read()
+        self._publish()
+
+    # ---- refresh --------------------------------------------------------------
+
+    def ensure(self, start, end) -> "MarketContext":
+        """Make [start, end] available, fetching per source only dates it has not returned."""
+        want_lo, want_hi = pd.Timestamp(start).normalize(), pd.Timestamp(end).normalize()
+        with self._lock:
+            if all(self._covers(key, want_lo, want_hi) for key in self._sources()):
+                return self
+            try:
+                self._refresh(want_lo, want_hi)
+            except Exception as exc:
+                if self._frame.empty:
+                    raise
+                print(f"  market context: refresh for {want_lo.date()}..{want_hi.date()} "
+                      f"failed ({exc}); serving the cached {self._describe()}")
+        return self
+
+    def _covers(self, key: str, want_lo: pd.Timestamp, want_hi: pd.Timestamp) -> bool:
+        """[want_lo, want_hi] is inside what ``key`` returned or what this session asked for."""
+        lo, hi = self._coverage(key)
+        if self._session is not None:
+            lo = self._session[0] if lo is None else min(lo, self._session[0])
+            hi = self._session[1] if hi is None else max(hi, self._session[1])
+        return lo is not None and lo <= want_lo and hi >= want_hi
+
+    def _refresh(self, want_lo: pd.Timestamp, want_hi: pd.Timestamp) -> None:
+        frame = self._frame[list(BASE_COLUMNS)]
+        settled = pd.Timestamp.today().normalize() - pd.Timedelta(days=1)
+        coverage = {key: self._coverage(key) for key in self._sources()}
+        changed_from = frame.index[-1] if len(frame) else None   # first changed VIX row
+        for key, (_, _, columns) in self._sources().items():
+            lo, hi = coverage[key]
+            have = frame.index[frame["close" if key == "underlying" else key].notna()]
+            blocks = []                                 # (start, end, extends the head)
+            if lo is None:
+                blocks.append((want_lo, want_hi, True))
+            else:
+                if want_lo < lo:
+                    # End on the first cached row so the rebase check has a close to compare
+                    after = have[have >= lo]
+                    end = after[0] if len(after) else lo - pd.Timedelta(days=1)
+                    blocks.append((want_lo, end, True))
+                if want_hi > hi:
+                    # Re-read the last settled cached row (a provisional bar is replaced)
+                    before = have[have <= hi]
+                    begin = before[-1] if len(before) else hi + pd.Timedelta(days=1)
+                    blocks.append((begin, want_hi, False))
+
+            for block_lo, block_hi, head in blocks:
+                part = self._fetch_source(key, block_lo, block_hi)
+                if part is None or part.empty:
+                    continue                            # nothing returned: retried next refresh
+                if key == "underlying" and _rebased(frame, part):
+                    full_lo = want_lo if lo is None else min(lo, want_lo)
+                    full_hi = want_hi if hi is None else max(hi, want_hi)
+                    print(f"  market context: {self.symbol} adjusted history moved; refetching "
+                          f"{full_lo.date()}..{full_hi.date()}")
+                    part = self._fetch_source(key, full_lo, full_hi)
+                    if part.empty:
+                        break                           # keep the cached basis until replaceable
+                    frame = frame.drop(columns=columns).dropna(how="all")
+                    frame = part.combine_first(frame)
+                    lo, hi = _extend(None, None, full_lo, part, settled)
+                    break                               # the refetch covers every block
+                frame = part.combine_first(frame)
+                # A VIX tenor that answers only from some later date has no earlier history (^VIX9D
+                # starts in 2011); a short underlying reply only counts for the bars it holds.
+                lo, hi = _extend(lo, hi, block_lo, part, settled, from_start=key != "underlying")
+                if key == "vix":
+                    changed_from = None if head or changed_from is None \
+                        else min(changed_from, part.index[0])
+            coverage[key] = (lo, hi)
+
+        self._frame = self._derive(frame.reindex(columns=list(BASE_COLUMNS)), changed_from)
+        self._session = (want_lo, want_hi) if self._session is None else \
+            (min(self._session[0], want_lo), max(self._session[1], want_hi))
+        for key, (lo, hi) in coverage.items():
+            span = [str(lo.date()), str(hi.date())] if lo is not None else [None, None]
+            if key == "underlying":
+                self.manifest.update(lo=span[0], hi=span[1])
+            else:
+                self.manifest["coverage"][key] = span
+        self.manifest["rows"] = len(self._frame)
+        self._store()
+        self._publish()
+        print(f"  market context: {self._describe()}")
+
+    def _sources(self) -> Dict[str, tuple]:
+        """key ("underlying" or a VIX column) -> (ticker, source columns, context columns)."""
+        sources = {"underlying": (self.symbol, ["Open", "High", "Low", "Close", "Volume"],
+                                  list(UNDERLYING_COLUMNS))}
+        for col, ticker in VIX_TICKERS.items():
+            sources[col] = (ticker, ["Close"], [col])
+        return sources
+
+    def _fetch_source(self, key: str, start: pd.Timestamp,
+                      end: pd.Timestamp) -> Optional[pd.DataFrame]:
+        """One source's context columns over [start, end], date-sorted. A failing VIX tenor is
+        reported and gives None (its range stays unfetched); an underlying failure raises."""
+        ticker, raw_columns, columns = self._sources()[key]
+        try:
+            raw = self._fetch(ticker, start, end)
+        except Exception as exc:
+            if key == "underlying":
+                raise
+            print(f"  ⚠️  {ticker}: fetch failed ({exc}) — '{key}' retried on the next refresh")
+            return None
+        if raw.empty:
+            return pd.DataFrame(columns=columns, dtype=float,
+                                index=pd.DatetimeIndex([], name="date"))
+        part = raw[raw_columns].set_axis(columns, axis=1).astype(float)
+        part.index = pd.DatetimeIndex(part.index, name="date")
+        return part.sort_index()
+
+    def _fetch(self, ticker: str, start: pd.Timestamp, end: pd.Timestamp) -> pd.DataFrame:
+        raw = self.source(ticker, start.strftime("%Y-%m-%d"), end.strftime("%Y-%m-%d"))
+        if raw is None or raw.empty:
+            return pd.DataFrame()
+        raw = raw.copy()
+        raw.index = _dates(raw.index)
+        return raw[~raw.index.duplicated(keep="last")]
+
+    def _derive(self, frame: pd.DataFrame, changed_from: Optional[pd.Timestamp]) -> pd.DataFrame:
+        """``frame`` plus vix_rank / vix_percentile, recomputed for rows from ``changed_from``
+        on (all rows when None) over the trailing ``window`` VIX closes."""
+        out = frame.copy()
+        old = self._frame
+        for col in DERIVED_COLUMNS:
+            out[col] = old[col].reindex(out.index) if changed_from is not None else np.nan
+        vix = out["vix"].dropna()
+        first = 0 if changed_from is None else int(vix.index.searchsorted(changed_from))
+        if first < len(vix):
+            window_vix = vix.iloc[max(first - self.window + 1, 0):]
+            rank, pct = _rank_and_percentile(window_vix, self.window)
+            keep = window_vix.index[window_vix.index >= vix.index[first]]
+            out.loc[keep, "vix_rank"] = rank.loc[keep]
+            out.loc[keep, "vix_percentile"] = pct.loc[keep]
+        return out[list(COLUMNS)]
+
+    # ---- reads ----------------------------------------------------------------
+
+    def arrays(self, start=None, end=None,
+               columns: Optional[Sequence[str]] = None) -> Dict[str, np.ndarray]:
+        """Read-only views of the columns (and ``'date'``, datetime64[ns]) over [start, end];
+        no copy is made."""
+        lo, hi = self._bounds(start, end)
+        out = {"date": self._dates[lo:hi]}
+        for col in columns or COLUMNS:
+            out[col] = self._columns[col][lo:hi]
+        return out
+
+    def rows(self, dates: Iterable) -> np.ndarray:
+        """Row of each date (normalized) in the context, -1 where it has none."""
+        want = _dates(pd.DatetimeIndex(dates)).to_numpy(dtype="datetime64[ns]")
+        pos = np.searchsorted(self._dates, want)
+        hit = pos < len(self._dates)
+        hit[hit] &= self._dates[pos[hit]] == want[hit]
+        return np.where(hit, pos, -1)
+
+    def take(self, column: str, dates: Iterable) -> np.ndarray:
+        """``column`` aligned to arbitrary ``dates`` (NaN where the context has no row)."""
+        rows = self.rows(dates)
+        values = self._columns[column]
+        return np.where(rows >= 0, values[np.maximum(rows, 0)], np.nan) if len(values) \
+            else np.full(len(rows), np.nan)
+
+    def frame(self, start=None, end=None,
+              columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """Date-indexed DataFrame over [start, end] built on the column views."""
+        cols = self.arrays(start, end, columns)
+        index = pd.DatetimeIndex(cols.pop("date"), name="date")
+        return pd.DataFrame(cols, index=index, copy=False)
+
+    def series(self, column: str, start=None, end=None, dropna: bool = True) -> pd.Series:
+        """One column over [start, end] as a date-indexed Series (missing dates dropped)."""
+        cols = self.arrays(start, end, [column])
+        s = pd.Series(cols[column], index=pd.DatetimeIndex(cols["date"], name="date"),
+                      name=column, copy=False)
+        return s.dropna() if dropna else s
+
+    # ---- internals ------------------------------------------------------------
+
+    def _coverage(self, key: str):
+        """Settled dates [lo, hi] ``key`` ("underlying" or a VIX column) returned; Nones if none."""
+        if key == "underlying":
+            lo, hi = self.manifest.get("lo"), self.manifest.get("hi")
+        else:
+            lo, hi = self.manifest["coverage"].get(key) or (None, None)
+        return (pd.Timestamp(lo) if lo else None), (pd.Timestamp(hi) if hi else None)
+
+    def _bounds(self, start, end):
+        lo = 0 if start is None else \
+            int(np.searchsorted(self._dates, np.datetime64(pd.Timestamp(start).normalize(), "ns")))
+        hi = len(self._dates) if end is None else \
+            int(np.searchsorted(self._dates, np.datetime64(pd.Timestamp(end), "ns"), side="right"))
+        return lo, max(lo, hi)
+
+    def _publish(self) -> None:
+        """Freeze the current frame into the contiguous read-only arrays the reads slice."""
+        self._dates = self._frame.index.to_numpy(dtype="datetime64[ns]")
+        self._columns = {}
+        for col in COLUMNS:
+            values = np.ascontiguousarray(self._frame[col].to_numpy(dtype=float))
+            values.setflags(write=False)
+            self._columns[col] = values
+        self._dates.setflags(write=False)
+
+    def _describe(self) -> str:
+        if self._frame.empty:
+            return f"{self.symbol}: empty"
+        return (f"{self.symbol} {self._frame.index[0].date()}..{self._frame.index[-1].date()} "
+                f"({len(self._frame):,} rows)")
+
+    def _read(self) -> pd.DataFrame:
+        if self.path.suffix == ".parquet":
+            frame = pd.read_parquet(self.path)
+        else:
+            frame = pd.read_csv(self.path, parse_dates=["date"], float_precision="round_trip")
+        frame = frame.set_index(pd.DatetimeIndex(frame["date"], name="date").as_unit("ns"))
+        return frame.reindex(columns=list(COLUMNS)).astype(float)
+
+    def _store(self) -> None:
+        self.dir.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        # Today's provisional bar stays in memory only, so the persisted last row is always a
+        # settled close for the next refresh to overlap on.
+        settled = pd.Timestamp.today().normalize() - pd.Timedelta(days=1)
+        frame = self._frame.loc[:settled].reset_index()
+        if _HAS_PARQUET:
+            frame.to_parquet(tmp, index=False)
+        else:
+            frame.to_csv(tmp, index=False)
+        os.replace(tmp, self.path)
+        tmp = self.manifest_path.with_name(self.manifest_path.name + ".tmp")
+        tmp.write_text(json.dumps(self.manifest, indent=2))
+        os.replace(tmp, self.manifest_path)
+
+
+_contexts: Dict[str, MarketContext] = {}
+_contexts_lock = threading.Lock()
+
+
+def get_market_context(symbol: str = "SPY") -> MarketContext:
+    """Process-wide context for ``symbol`` (opened from disk on first use)."""
+    with _contexts_lock:
+        if symbol not in _contexts:
+            _contexts[symbol] = MarketContext(symbol)
+        return _contexts[symbol]
+
+
+def set_market_context(context: MarketContext) -> None:
+    """Install ``context`` as the process-wide one for its symbol (e.g. a fixture-backed one)."""
+    with _contexts_lock:
+        _contexts[context.symbol] = context
+
+
+def _dates(index) -> pd.DatetimeIndex:
+    """Naive, midnight-normalized DatetimeIndex (yfinance returns exchange-tz timestamps)."""
+    index = pd.DatetimeIndex(pd.to_datetime(index))
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    return index.normalize().as_unit("ns")
+
+
+def _extend(lo: Optional[pd.Timestamp], hi: Optional[pd.Timestamp], start: pd.Timestamp,
+            part: pd.DataFrame, settled: pd.Timestamp, from_start: bool = False):
+    """Coverage [lo, hi] grown by a non-empty reply to a request starting at ``start``: up to the
+    last settled bar returned, and back to ``start`` if ``from_start`` or the first bar is within
+    EDGE_DAYS of it."""
+    first, last = part.index[0], min(part.index[-1], settled)
+    if from_start or first - start <= pd.Timedelta(days=EDGE_DAYS):
+        first = start
+    if last < first:
+        return lo, hi                                   # only a provisional bar
+    return (first if lo is None else min(lo, first)), (last if hi is None else max(hi, last))
+
+
+def _rebased(frame: pd.DataFrame, part: pd.DataFrame) -> bool:
+    """True if the part's copy of an already-cached close disagrees with the cached one."""
+    common = frame.index.intersection(part.index)
+    if not len(common):
+        return False
+    old, new = frame.loc[common, "close"], part.loc[common, "close"]
+    both = old.notna() & new.notna()
+    return not np.allclose(old[both], new[both], rtol=1e-9, atol=0.0)
+
+
+def _rank_and_percentile(vix: pd.Series, window: int):
+    """Trailing IV-Rank (0-100, ``vix_gate.vix_iv_rank``'s formula) and IV percentile (0-100)."""
+    rolling = vix.rolling(window, min_periods=window // 2)
+    lo, hi = rolling.min(), rolling.max()
+    span = hi - lo
+    rank = ((vix - lo) / span.where(span != 0) * 100.0).astype(float)
+    pct = rolling.rank(method="max", pct=True) * 100.0
+    return rank, pct
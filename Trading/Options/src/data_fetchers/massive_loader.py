@@ -16,8 +16,12 @@ Strategy (avoids the snapshot endpoint which requires paid tier):
 Output: data/processed/SPY_real_options_<start>_<end>.csv
   — identical schema to optionsdx_loader.py so mode:real loads it with no extra plumbing.
 
-Resume: progress is checkpointed to data/raw/massive/progress.json after every contract so
-the script can be stopped and restarted without losing work.
+Resume: finished contracts are spooled to data/raw/massive/spool/ in segments of 50 (Parquet
+when pyarrow is installed, else CSV) with an append-only manifest.jsonl of completed contracts.
+A checkpoint costs one segment write however large the pull, memory stays flat, and a restart
+only reads the manifest. IV and greeks are derived per segment in one vectorized pass, and the
+output CSV is assembled from the segments at the end. An old progress.json checkpoint is imported
+into the spool on the next run.
 
 CLI:
     opt_venv/bin/python -m src.data_fetchers.massive_loader --api-key YOUR_KEY
@@ -39,6 +43,12 @@ import numpy as np
 import pandas as pd
 import requests
 
+try:
+    import pyarrow  # noqa: F401  (Parquet spool segments; CSV segments without it)
+    _HAS_PARQUET = True
+except ImportError:
+    _HAS_PARQUET = False
+
 # ---------------------------------------------------------------------------
 # Constants
 # ---------------------------------------------------------------------------
@@ -56,6 +66,8 @@ ANCHOR_OFFSET_DAYS = 45      # ~midpoint of the near/far DTE window this strateg
 MONEYNESS_BAND  = 0.15       # keep strikes within ±15% of SPY's anchor-date close
 MAX_DTE         = 90         # skip contracts with more than 90 DTE at listing
 
+SEGMENT_CONTRACTS = 50      # contracts per spool segment (= checkpoint interval)
+
 RISK_FREE_RATE   = 0.04
 DIVIDEND_YIELD   = 0.015
 SPREAD_FRAC      = 0.03      # half-spread = max(SPREAD_FRAC * mid, MIN_SPREAD) / 2
@@ -70,35 +82,143 @@ OUT_COLS = [
 
 
 # ---------------------------------------------------------------------------
-# BS helpers (wraps src/utils/black_scholes.py)
+# Bars → rows (vectorized over a spool segment; wraps src/utils/black_scholes.py)
 # ---------------------------------------------------------------------------
-def _bs_greeks(S: float, K: float, T: float, r: float, q: float,
-               iv: float, option_type: str) -> dict:
-    """Return all greeks + mid price for one contract."""
-    from src.utils.black_scholes import (
-        black_scholes_price, delta, gamma, theta, vega
-    )
-    mid  = black_scholes_price(S, K, T, r, iv, option_type)
-    d    = delta(S, K, T, r, iv, option_type, q)
-    g    = gamma(S, K, T, r, iv, q)
-    th   = theta(S, K, T, r, iv, option_type, q) / 365.0  # per-day
-    v    = vega(S, K, T, r, iv, q)
-    return {"mid": mid, "delta": d, "gamma": g, "theta": th, "vega": v}
-
-
-def _bs_iv(mid: float, S: float, K: float, T: float, r: float, q: float,
-           option_type: str) -> Optional[float]:
-    """Back-solve implied volatility from mid price. Returns None if fails."""
-    from src.utils.black_scholes import implied_volatility
-    if mid <= 0 or T <= 0:
-        return None
-    try:
-        iv = implied_volatility(mid, S, K, T, r, option_type, q)
-        if iv is None or iv <= 0.01 or iv > 5.0:
-            return None
-        return float(iv)
-    except Exception:
-        return None
+BAR_COLS = ["ticker", "strike", "option_type", "expiration", "t", "c", "v"]
+
+
+def _derive_rows(bars: pd.DataFrame, spy_close: pd.Series, vix_close: pd.Series,
+                 symbol: str) -> pd.DataFrame:
+    """Raw daily bars (BAR_COLS) for a batch of contracts → OUT_COLS rows.
+
+    Same rules as the per-bar loop this replaces: close = EOD mid, rows without a
+    positive mid, a SPY close, a non-negative DTE or a usable IV (0.01 < iv <= 5)
+    are dropped; bid/ask come from the spread model (same as reprice_from_iv).
+    """
+    from src.utils.black_scholes import greeks_array, implied_volatility_array
+
+    if bars.empty:
+        return pd.DataFrame(columns=OUT_COLS)
+    q_date = pd.to_datetime(bars["t"].to_numpy("int64"), unit="ms").normalize()
+    exp_date = pd.to_datetime(bars["expiration"]).dt.normalize().to_numpy()
+    mid = bars["c"].to_numpy(float)
+    spot = spy_close.reindex(q_date).to_numpy(float)
+    vix = vix_close.reindex(q_date).to_numpy(float)
+    dte = (exp_date - q_date.to_numpy()).astype("timedelta64[D]").astype(int)
+    strike = bars["strike"].to_numpy(float)
+    is_call = (bars["option_type"] == "call").to_numpy()
+
+    keep = (mid > 0) & ~np.isnan(spot) & (dte > 0)
+    T = np.where(keep, dte, 1) / 365.0
+    iv = np.full(len(bars), np.nan)
+    iv[keep] = implied_volatility_array(mid[keep], spot[keep], strike[keep], T[keep],
+                                        RISK_FREE_RATE, is_call[keep], DIVIDEND_YIELD)
+    keep &= (iv > 0.01) & (iv <= 5.0)
+
+    mid, spot, vix, strike, is_call, iv, T = (
+        a[keep] for a in (mid, spot, vix, strike, is_call, iv, T))
+    g = greeks_array(spot, strike, T, RISK_FREE_RATE, iv, is_call, DIVIDEND_YIELD)
+    half = np.maximum(SPREAD_FRAC * mid, MIN_SPREAD) / 2.0
+    return pd.DataFrame({
+        "quote_date":        q_date[keep].strftime("%Y-%m-%d"),
+        "underlying_symbol": symbol,
+        "underlying_price":  _round(spot, 4),
+        "vix":               _round(vix, 4),
+        "expiration":        pd.DatetimeIndex(exp_date[keep]).strftime("%Y-%m-%d"),
+        "dte":               dte[keep],
+        "strike":            strike,
+        "option_type":       np.where(is_call, "call", "put"),
+        "bid":               _round(np.maximum(mid - half, 0.01), 4),
+        "ask":               _round(mid + half, 4),
+        "last":              _round(mid, 4),
+        "volume":            bars["v"].to_numpy(float)[keep].astype(int),
+        "open_interest":     np.nan,
+        "iv":                _round(iv, 6),
+        "delta":             _round(g["delta"], 6),
+        "abs_delta":         _round(np.abs(g["delta"]), 6),
+        "gamma":             _round(g["gamma"], 6),
+        "theta":             _round(g["theta"] / 365.0, 6),   # per-day
+        "vega":              _round(g["vega"], 6),
+    }, columns=OUT_COLS)
+
+
+def _round(values: np.ndarray, digits: int) -> np.ndarray:
+    """Python's round() per element — np.round rounds half-way cases differently, and
+    the output must match the per-bar rows byte for byte."""
+    return np.fromiter((round(v, digits) for v in np.asarray(values, float).tolist()),
+                       float, count=np.size(values))
+
+
+# ---------------------------------------------------------------------------
+# Spool: append-only segment files + done-set manifest
+# ---------------------------------------------------------------------------
+class ContractSpool:
+    """Append-only on-disk spool of finished contracts under ``<raw_dir>/spool``.
+
+    Each flush writes one segment file (Parquet when pyarrow is installed, CSV
+    otherwise; temp file + atomic rename) and then appends one JSON line to
+    ``manifest.jsonl`` naming the segment and the contracts it completes
+    (including contracts that had no usable bars). A checkpoint is therefore
+    O(batch), independent of how much has already been downloaded, and
+    resuming only reads the manifest. A segment without a manifest line (crash
+    between the two writes) is discarded and its contracts are fetched again.
+    """
+
+    def __init__(self, raw_dir: str | Path):
+        self.dir = Path(raw_dir) / "spool"
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self.manifest = self.dir / "manifest.jsonl"
+        self.done: set = set()
+        self.segments: list[str] = []
+        self.rows = 0
+        if self.manifest.exists():
+            text = self.manifest.read_text()
+            complete = text[:text.rfind("\n") + 1]
+            if complete != text:          # torn last line from an interrupted append
+                self.manifest.write_text(complete)
+            for line in complete.splitlines():
+                entry = json.loads(line)
+                self.done.update(entry["tickers"])
+                if entry.get("segment"):
+                    self.segments.append(entry["segment"])
+                self.rows += entry.get("rows", 0)
+        listed = set(self.segments)
+        for path in self.dir.glob("segment_*"):
+            if path.name not in listed:
+                path.unlink()
+
+    def write(self, tickers: list[str], rows: pd.DataFrame) -> None:
+        """Persist one batch: segment first, then its manifest line."""
+        name = ""
+        if not rows.empty:
+            ext = "parquet" if _HAS_PARQUET else "csv"
+            name = f"segment_{len(self.segments) + 1:06d}.{ext}"
+            tmp = self.dir / (name + ".tmp")
+            if _HAS_PARQUET:
+                rows.to_parquet(tmp, index=False)
+            else:
+                rows.to_csv(tmp, index=False)
+            os.replace(tmp, self.dir / name)
+            self.segments.append(name)
+        with self.manifest.open("a") as f:
+            f.write(json.dumps({"segment": name, "tickers": tickers, "rows": len(rows)}) + "\n")
+        self.done.update(tickers)
+        self.rows += len(rows)
+
+    def frames(self):
+        """Segments in write order, one DataFrame at a time."""
+        for name in self.segments:
+            path = self.dir / name
+            yield pd.read_parquet(path) if name.endswith(".parquet") else pd.read_csv(path)
+
+    def import_progress(self, progress_file: Path) -> None:
+        """Fold a legacy progress.json (done list + every row) into the spool once."""
+        progress = json.loads(progress_file.read_text())
+        rows = pd.DataFrame(progress.get("rows", []), columns=OUT_COLS)
+        for col in ("vix", "open_interest"):
+            rows[col] = pd.to_numeric(rows[col], errors="coerce")
+        self.write(sorted(set(progress.get("done", [])) - self.done), rows)
+        progress_file.rename(progress_file.with_name(progress_file.name + ".migrated"))
 
 
 # ---------------------------------------------------------------------------
@@ -141,7 +261,9 @@ def _get(session: requests.Session, url: str, params: dict, api_key: str,
 
 def _paginate_contracts(session: requests.Session, api_key: str,
                         start: str, end: str,
-                        expired: str = "true") -> list[dict]:
+                        expired: str = "true",
+                        base_url: str = BASE_URL,
+                        delay: float = RATE_LIMIT_DELAY) -> list[dict]:
     """Fetch SPY option contracts with pagination.
 
     expired="true"  → only expired contracts (default; safe for historical pulls)
@@ -149,7 +271,7 @@ def _paginate_contracts(session: requests.Session, api_key: str,
                       far-leg expirations fall past the original pull's end date)
     """
     contracts = []
-    url = f"{BASE_URL}/v3/reference/options/contracts"
+    url = f"{base_url}/v3/reference/options/contracts"
     params = {
         "underlying_ticker": "SPY",
         "expired": expired,
@@ -162,7 +284,7 @@ def _paginate_contracts(session: requests.Session, api_key: str,
         page += 1
         print(f"  Fetching contract page {page} …")
         data = _get(session, url, params, api_key)
-        time.sleep(RATE_LIMIT_DELAY)
+        time.sleep(delay)
         if data is None or "results" not in data:
             break
         contracts.extend(data["results"])
@@ -175,16 +297,17 @@ def _paginate_contracts(session: requests.Session, api_key: str,
         params = dict(urllib.parse.parse_qs(urllib.parse.urlsplit(nxt).query),
                       apiKey=api_key)
         params = {k: v[0] if isinstance(v, list) else v for k, v in params.items()}
-        url = f"{BASE_URL}/v3/reference/options/contracts"
+        url = f"{base_url}/v3/reference/options/contracts"
         params["cursor"] = urllib.parse.parse_qs(urllib.parse.urlsplit(nxt).query).get(
             "cursor", [None])[0]
     return contracts
 
 
 def _fetch_aggs(session: requests.Session, api_key: str,
-                ticker: str, start: str, end: str) -> list[dict]:
+                ticker: str, start: str, end: str,
+                base_url: str = BASE_URL) -> list[dict]:
     """Fetch daily OHLCV for one options ticker. Returns list of bar dicts."""
-    url = f"{BASE_URL}/v2/aggs/ticker/{ticker}/range/1/day/{start}/{end}"
+    url = f"{base_url}/v2/aggs/ticker/{ticker}/range/1/day/{start}/{end}"
     params = {"adjusted": "false", "sort": "asc", "limit": 5000}
     data = _get(session, url, params, api_key)
     if data is None or data.get("resultsCount", 0) == 0:
@@ -205,35 +328,49 @@ def download_massive(
     option_type: str = "both",
     moneyness_band: float = MONEYNESS_BAND,
     expired: str = "true",
+    segment_contracts: int = SEGMENT_CONTRACTS,
+    base_url: str = BASE_URL,
+    rate_limit_delay: float = RATE_LIMIT_DELAY,
+    spy_close: Optional[pd.Series] = None,
+    vix_close: Optional[pd.Series] = None,
 ) -> str:
-    """Download and convert Massive EOD options data into the project's long-format CSV."""
+    """Download and convert Massive EOD options data into the project's long-format CSV.
+
+    Finished contracts are streamed to a ContractSpool in batches of
+    ``segment_contracts``; IV and greeks are derived per batch, and the output
+    CSV is assembled from the spool segments at the end. ``base_url``,
+    ``rate_limit_delay`` and the SPY/VIX close series can be overridden to run
+    against a local fake server.
+    """
     Path(raw_dir).mkdir(parents=True, exist_ok=True)
     Path(out_dir).mkdir(parents=True, exist_ok=True)
-    progress_file = Path(raw_dir) / "progress.json"
 
     # ---- Load checkpoint ------------------------------------------------
-    progress: dict = {}
+    spool = ContractSpool(raw_dir)
+    progress_file = Path(raw_dir) / "progress.json"
     if progress_file.exists():
-        progress = json.loads(progress_file.read_text())
-        print(f"Resuming from checkpoint: {len(progress['done'])} contracts already done.")
-
-    done_set: set = set(progress.get("done", []))
-    rows_cache: list = progress.get("rows", [])
+        print(f"Importing legacy checkpoint {progress_file} into the spool …")
+        spool.import_progress(progress_file)
+    if spool.done:
+        print(f"Resuming from checkpoint: {len(spool.done)} contracts already done.")
 
     # ---- Fetch underlying (SPY) + VIX prices ----------------------------
-    print("Fetching SPY + VIX prices from yfinance …")
-    import yfinance as yf
-    # Extra lookback so the anchor-spot filter below can estimate SPY's price near
-    # each contract's relevant trading window, even for contracts expiring shortly
-    # after `start`.
-    fetch_start = (pd.Timestamp(start) - pd.Timedelta(days=ANCHOR_OFFSET_DAYS + 5)).strftime("%Y-%m-%d")
-    spy_hist = yf.Ticker("SPY").history(start=fetch_start, end=end, interval="1d")
-    spy_hist.index = pd.to_datetime(spy_hist.index).tz_localize(None).normalize()
-    spy_close = spy_hist["Close"].sort_index()
-
-    vix_hist = yf.Ticker("^VIX").history(start=fetch_start, end=end, interval="1d")
-    vix_hist.index = pd.to_datetime(vix_hist.index).tz_localize(None).normalize()
-    vix_close = vix_hist["Close"]
+    if spy_close is None or vix_close is None:
+        print("Fetching SPY + VIX prices from yfinance …")
+        import yfinance as yf
+        # Extra lookback so the anchor-spot filter below can estimate SPY's price near
+        # each contract's relevant trading window, even for contracts expiring shortly
+        # after `start`.
+        fetch_start = (pd.Timestamp(start) - pd.Timedelta(days=ANCHOR_OFFSET_DAYS + 5)).strftime("%Y-%m-%d")
+        spy_hist = yf.Ticker("SPY").history(start=fetch_start, end=end, interval="1d")
+        spy_hist.index = pd.to_datetime(spy_hist.index).tz_localize(None).normalize()
+        spy_close = spy_hist["Close"]
+
+        vix_hist = yf.Ticker("^VIX").history(start=fetch_start, end=end, interval="1d")
+        vix_hist.index = pd.to_datetime(vix_hist.index).tz_localize(None).normalize()
+        vix_close = vix_hist["Close"]
+    spy_close = spy_close[~spy_close.index.duplicated(keep="last")].sort_index()
+    vix_close = vix_close[~vix_close.index.duplicated(keep="last")]
 
     # ---- Fetch contract list --------------------------------------------
     # Cache key includes expired flag so an active-contract supplemental run
@@ -251,7 +388,8 @@ def download_massive(
     else:
         print(f"Fetching SPY contract list from Massive (expired={expired}) …")
         with requests.Session() as sess:
-            all_contracts = _paginate_contracts(sess, api_key, start, end, expired=expired)
+            all_contracts = _paginate_contracts(sess, api_key, start, end, expired=expired,
+                                                base_url=base_url, delay=rate_limit_delay)
         contracts_file.write_text(json.dumps(all_contracts))
         print(f"  Found {len(all_contracts):,} total SPY contracts")
 
@@ -293,7 +431,7 @@ def download_massive(
     print(f"  After filter: {len(filtered):,} contracts "
           f"({option_type}, ±{moneyness_band:.0%} ATM, expiry in [{start}, {end}+{MAX_DTE}d])")
 
-    remaining = [c for c in filtered if c["ticker"] not in done_set]
+    remaining = [c for c in filtered if c["ticker"] not in spool.done]
     total = len(filtered)
     done_n = total - len(remaining)
     print(f"  {done_n} done, {len(remaining)} remaining\n")
@@ -307,7 +445,7 @@ def download_massive(
         probe = remaining[0]
         with requests.Session() as sess:
             try:
-                _fetch_aggs(sess, api_key, probe["ticker"], start, end)
+                _fetch_aggs(sess, api_key, probe["ticker"], start, end, base_url)
             except NotAuthorizedError as e:
                 if "HTTP 401" in str(e):
                     # Bad/missing key — NOT a date-coverage problem. The most common cause is
@@ -323,115 +461,70 @@ def download_massive(
                 print(f"  The free tier's 2-year history is a rolling window from today, "
                       f"not a fixed date. Estimated earliest authorized date: ~{est_earliest}.")
                 print(f"  Delete the stale checkpoint and retry with a later --start:")
-                print(f"    rm {progress_file} {contracts_file}")
+                print(f"    rm -r {spool.dir} {contracts_file}")
                 print(f"    opt_venv/bin/python -m src.data_fetchers.massive_loader "
                       f"--api-key YOUR_KEY --start {est_earliest} --end {end}")
                 return ""
-            time.sleep(RATE_LIMIT_DELAY)
+            time.sleep(rate_limit_delay)
 
     # ---- Download daily aggs per contract --------------------------------
-    with requests.Session() as sess:
-        for i, contract in enumerate(remaining):
-            ticker   = contract["ticker"]           # e.g. O:SPY240119C00500000
-            strike   = float(contract["strike_price"])
-            opt_type = contract["contract_type"].lower()
-            exp_date = pd.Timestamp(contract["expiration_date"]).normalize()
-
-            pct = 100 * (done_n + i + 1) / total
-            print(f"  [{pct:5.1f}%] {ticker} … ", end="", flush=True)
-
-            try:
-                bars = _fetch_aggs(sess, api_key, ticker, start, end)
-            except NotAuthorizedError as e:
-                print(f"\n✗ ABORTED — {ticker}: {e}")
-                _save_progress(progress_file, done_set, rows_cache)
-                _flush_partial(rows_cache, out_dir, symbol, start, end)
-                print(f"  Checkpoint saved ({len(rows_cache):,} rows). Adjust --start and rerun.")
-                return ""
-            time.sleep(RATE_LIMIT_DELAY)
+    # Raw bars are buffered for at most `segment_contracts` contracts, then derived and
+    # spooled as one segment — memory and checkpoint cost stay flat however long the pull.
+    batch_tickers: list[str] = []
+    batch_bars: list[pd.DataFrame] = []
+
+    def flush_batch() -> None:
+        if not batch_tickers:
+            return
+        bars = pd.concat(batch_bars, ignore_index=True) if batch_bars else pd.DataFrame(columns=BAR_COLS)
+        spool.write(list(batch_tickers), _derive_rows(bars, spy_close, vix_close, symbol))
+        batch_tickers.clear()
+        batch_bars.clear()
 
-            if not bars:
-                print("no data")
-                done_set.add(ticker)
-                continue
+    with requests.Session() as sess:
+        try:
+            for i, contract in enumerate(remaining):
+                ticker   = contract["ticker"]           # e.g. O:SPY240119C00500000
+                pct = 100 * (done_n + i + 1) / total
+                print(f"  [{pct:5.1f}%] {ticker} … ", end="", flush=True)
 
-            n_rows = 0
-            for bar in bars:
-                ts_ms   = bar.get("t", 0)
-                q_date  = pd.Timestamp(ts_ms, unit="ms").normalize()
-                mid     = float(bar.get("c", 0))     # close = EOD mid
-                volume  = float(bar.get("v", 0))
-
-                if mid <= 0:
-                    continue
-
-                # SPY spot + VIX for this day
-                spot = spy_close.get(q_date)
-                vix  = vix_close.get(q_date)
-                if spot is None or pd.isna(spot):
-                    # try next business day's spot
-                    continue
-                spot = float(spot)
-                vix_val = float(vix) if vix is not None and not pd.isna(vix) else np.nan
-
-                dte_days = (exp_date - q_date).days
-                if dte_days < 0:
-                    continue
-                T = max(dte_days, 0) / 365.0
-
-                # Back-solve IV from EOD mid price
-                iv = _bs_iv(mid, spot, strike, T, RISK_FREE_RATE, DIVIDEND_YIELD, opt_type)
-                if iv is None:
-                    continue
-
-                # Greeks
                 try:
-                    g = _bs_greeks(spot, strike, T, RISK_FREE_RATE, DIVIDEND_YIELD, iv, opt_type)
-                except Exception:
-                    continue
-
-                # Bid/ask from spread model (same as reprice_from_iv)
-                half = max(SPREAD_FRAC * mid, MIN_SPREAD) / 2.0
-                bid  = max(mid - half, 0.01)
-                ask  = mid + half
-
-                rows_cache.append({
-                    "quote_date":        q_date.strftime("%Y-%m-%d"),
-                    "underlying_symbol": symbol,
-                    "underlying_price":  round(spot, 4),
-                    "vix":               round(vix_val, 4) if not np.isnan(vix_val) else "",
-                    "expiration":        exp_date.strftime("%Y-%m-%d"),
-                    "dte":               int(dte_days),
-                    "strike":            strike,
-                    "option_type":       opt_type,
-                    "bid":               round(bid, 4),
-                    "ask":               round(ask, 4),
-                    "last":              round(mid, 4),
-                    "volume":            int(volume),
-                    "open_interest":     "",
-                    "iv":                round(iv, 6),
-                    "delta":             round(g["delta"], 6),
-                    "abs_delta":         round(abs(g["delta"]), 6),
-                    "gamma":             round(g["gamma"], 6),
-                    "theta":             round(g["theta"], 6),
-                    "vega":              round(g["vega"], 6),
-                })
-                n_rows += 1
-
-            print(f"{n_rows} rows")
-            done_set.add(ticker)
-
-            # Checkpoint every 50 contracts
-            if (i + 1) % 50 == 0:
-                _save_progress(progress_file, done_set, rows_cache)
-                # Flush rows to disk as partial CSV too
-                _flush_partial(rows_cache, out_dir, symbol, start, end)
-                print(f"    [checkpoint] {len(done_set)}/{total} done, {len(rows_cache):,} rows saved")
+                    bars = _fetch_aggs(sess, api_key, ticker, start, end, base_url)
+                except NotAuthorizedError as e:
+                    print(f"\n✗ ABORTED — {ticker}: {e}")
+                    flush_batch()
+                    _assemble(spool, out_dir, symbol, start, end)
+                    print(f"  Checkpoint saved ({spool.rows:,} rows). Adjust --start and rerun.")
+                    return ""
+                time.sleep(rate_limit_delay)
+
+                batch_tickers.append(ticker)
+                if bars:
+                    frame = pd.DataFrame(bars).reindex(columns=["t", "c", "v"]).fillna({"t": 0, "c": 0, "v": 0})
+                    frame.insert(0, "ticker", ticker)
+                    frame.insert(1, "strike", float(contract["strike_price"]))
+                    frame.insert(2, "option_type", contract["contract_type"].lower())
+                    frame.insert(3, "expiration", contract["expiration_date"])
+                    batch_bars.append(frame)
+                print(f"{len(bars)} bars" if bars else "no data")
+
+                if len(batch_tickers) >= segment_contracts:
+                    flush_batch()
+                    print(f"    [checkpoint] {len(spool.done)}/{total} done, {spool.rows:,} rows spooled")
+        except BaseException:
+            # Ctrl-C / errors keep every contract fetched so far — without letting a
+            # failed flush replace the original exception
+            try:
+                flush_batch()
+            except Exception as e:
+                print(f"\n✗ Could not checkpoint the last {len(batch_tickers)} contracts: {e!r}")
+            raise
+        else:
+            flush_batch()
 
     # ---- Write final CSV ------------------------------------------------
-    _save_progress(progress_file, done_set, rows_cache)
-    out_path = _flush_partial(rows_cache, out_dir, symbol, start, end, final=True)
-    print(f"\n✓ Done. {len(rows_cache):,} rows → {out_path}")
+    out_path = _assemble(spool, out_dir, symbol, start, end, final=True)
+    print(f"\n✓ Done. {spool.rows:,} rows → {out_path}")
     print(f"  Set config.yaml: real_data.start_date={start}, end_date={end}, mode: real, price_from_iv: false")
     return out_path
 
@@ -457,15 +550,13 @@ def merge_into(base_csv: str, supplement_csv: str, out_csv: str | None = None) -
     return dest
 
 
-def _save_progress(progress_file: Path, done_set: set, rows: list) -> None:
-    progress_file.write_text(json.dumps({"done": list(done_set), "rows": rows}))
-
-
-def _flush_partial(rows: list, out_dir: str, symbol: str,
-                   start: str, end: str, final: bool = False) -> str:
-    if not rows:
+def _assemble(spool: ContractSpool, out_dir: str, symbol: str,
+              start: str, end: str, final: bool = False) -> str:
+    """Merge the spool segments into the canonical sorted, de-duplicated CSV."""
+    frames = [f for f in spool.frames() if not f.empty]
+    if not frames:
         return ""
-    df = pd.DataFrame(rows, columns=OUT_COLS)
+    df = pd.concat(frames, ignore_index=True)
     df = df.sort_values(["quote_date", "expiration", "strike", "option_type"]).drop_duplicates()
     out_name = f"{symbol}_real_options_{start}_{end}.csv"
     out_path = str(Path(out_dir) / out_name)
@@ -14,14 +14,20 @@ exact contracts ARE quoted every trading day — the marks become real quotes, n
 
 This converter:
   * globs every ``spy_eod_*.txt`` under the raw dir (drop new yearly downloads in and re-run),
+  * streams each file in typed chunks (only the ~22 columns used, numerics parsed as float64),
+    applying the DTE / moneyness band to the WIDE chunk before it is widened,
+  * converts files in parallel worker processes, each into its own partition under
+    ``data/processed/optionsdx/<symbol>/`` (Parquet when pyarrow is installed, else CSV) with a
+    manifest, so unchanged files are not parsed again on the next run,
   * melts each wide row into a call row + a put row,
   * recomputes integer ``dte`` = (expiration - quote_date).days for consistency with the rest
     of the pipeline (OptionsDX's own DTE is fractional, measured to the expiry timestamp),
   * trims to a near-ATM / bounded-DTE band by default (the strategies only use <=~120 DTE,
     near-ATM strikes) to keep the file workable — widen via flags for wider-wing strategies,
   * merges ^VIX (yfinance) onto each quote_date so the strategies' VIX filters work,
-  * writes ``data/processed/SPY_real_options_<start>_<end>.csv`` so the existing
-    ``data_source.mode: real`` path loads it with NO further plumbing.
+  * writes ``data/processed/SPY_real_options_<start>_<end>.csv`` partition by partition (memory
+    stays at one month of filtered rows) so the existing ``data_source.mode: real`` path loads
+    it with NO further plumbing.
 
 Crucially the OptionsDX bid/ask is genuine exchange quotes (unlike DoltHub's inflated mids),
 so set ``data_source.price_from_iv: false`` to BACKTEST THE REAL QUOTES rather than repricing
@@ -29,19 +35,29 @@ them off the IV column — the whole point of paying for clean data.
 
 CLI:
     opt_venv/bin/python -m src.data_fetchers.optionsdx_loader \
-        --raw-dir data/raw/optionsdx --symbol SPY
+        --raw-dir data/raw/optionsdx --symbol SPY [--workers 4] [--full]
 """
 from __future__ import annotations
 
 import argparse
 import glob
+import json
 import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
 
+from .market_context import get_market_context
+
+try:
+    import pyarrow  # noqa: F401  (Parquet partitions; CSV partitions without it)
+    _HAS_PARQUET = True
+except ImportError:
+    _HAS_PARQUET = False
+
 # Raw OptionsDX columns (after stripping the "[ ... ]" brackets and surrounding spaces).
 _SHARED = {
     "QUOTE_DATE": "quote_date",
@@ -60,50 +76,205 @@ _OUT_COLS = [
     "strike", "option_type", "bid", "ask", "last", "volume", "open_interest",
     "iv", "delta", "abs_delta", "gamma", "theta", "vega",
 ]
+# What a partition stores: everything derivable from one file. The symbol, abs_delta,
+# open_interest and VIX are added when the output CSV is assembled.
+_PART_COLS = [
+    "quote_date", "underlying_price", "expiration", "dte", "strike", "option_type",
+    "bid", "ask", "last", "volume", "iv", "delta", "gamma", "theta", "vega",
+]
+CHUNK_ROWS = 100_000    # wide rows per read_csv chunk (~2-3 weeks of a full SPY chain)
+
+
+def _raw_columns(path: str) -> Dict[str, str]:
+    """Canonical OptionsDX name (brackets and spaces stripped) -> raw header name."""
+    header = pd.read_csv(path, nrows=0, skipinitialspace=True).columns
+    return {c.strip().strip("[]"): c for c in header}
 
 
-def _read_one(path: str) -> pd.DataFrame:
-    """Read a single OptionsDX monthly file and melt it into long (call+put) rows."""
-    raw = pd.read_csv(path, low_memory=False)  # mixed-type "N x M" size cols — read whole then coerce
-    raw.columns = [c.strip().strip("[]") for c in raw.columns]
+def _read_chunks(path: str, chunksize: int, strict: bool = True) -> Iterator[pd.DataFrame]:
+    """Wide chunks of the columns we use, numerics parsed as float64 by the C reader.
 
-    out_frames = []
+    Only the 2 dates + 2 shared numerics + 9 per side are read (not the ~33 raw columns),
+    and ``skipinitialspace`` turns OptionsDX's " " blanks into NaN so the float dtypes hold.
+    A file with stray text in a numeric column is re-read as strings and coerced, which is
+    what the old whole-file ``to_numeric(errors="coerce")`` pass did for every file
+    (``strict=False``; see ``_read_one``).
+    """
+    raw = _raw_columns(path)
+    wanted = list(_SHARED) + [f"{p}{c}" for p in ("C_", "P_") for c in _SIDE]
+    missing = [c for c in wanted if c not in raw]
+    if missing:
+        raise ValueError(f"{os.path.basename(path)}: missing OptionsDX columns {missing}")
+    names = {raw[c]: c for c in wanted}
+    numeric = [raw[c] for c in wanted if c not in ("QUOTE_DATE", "EXPIRE_DATE")]
+    base = dict(usecols=list(names), skipinitialspace=True, chunksize=chunksize)
+    if strict:
+        for chunk in pd.read_csv(path, dtype={c: "float64" for c in numeric}, **base):
+            yield chunk.rename(columns=names)
+        return
+    for chunk in pd.read_csv(path, dtype=str, **base):
+        for c in numeric:
+            chunk[c] = pd.to_numeric(chunk[c], errors="coerce")
+        yield chunk.rename(columns=names)
+
+
+def _widen(wide: pd.DataFrame) -> pd.DataFrame:
+    """Melt filtered wide rows into long call + put rows (calls first, like before)."""
+    shared = wide[list(_SHARED)].rename(columns=_SHARED)
+    frames = []
     for side, prefix in (("call", "C_"), ("put", "P_")):
-        cols = dict(_SHARED)
+        sub = shared.copy()
         for src, dst in _SIDE.items():
-            cols[f"{prefix}{src}"] = dst
-        sub = raw[list(cols.keys())].rename(columns=cols).copy()
+            sub[dst] = wide[f"{prefix}{src}"].to_numpy()
         sub["option_type"] = side
-        out_frames.append(sub)
+        frames.append(sub)
+    return pd.concat(frames, ignore_index=True)
 
-    df = pd.concat(out_frames, ignore_index=True)
 
-    df["quote_date"] = pd.to_datetime(df["quote_date"])
-    df["expiration"] = pd.to_datetime(df["expiration"])
-    for c in ("underlying_price", "strike", "bid", "ask", "last", "volume",
-              "iv", "delta", "gamma", "theta", "vega"):
-        df[c] = pd.to_numeric(df[c], errors="coerce")
+def _read_one(path: str, max_dte: Optional[int] = None, moneyness_band: Optional[float] = None,
+              chunksize: int = CHUNK_ROWS) -> Tuple[pd.DataFrame, int]:
+    """Read one OptionsDX monthly file into long (call+put) rows, streaming.
 
-    # Integer calendar-day DTE (the convention used everywhere else in the pipeline).
-    df["dte"] = (df["expiration"].dt.normalize() - df["quote_date"].dt.normalize()).dt.days
-    return df
+    The DTE and moneyness bands depend only on the shared columns, so they are applied to
+    each wide chunk BEFORE it is melted — the default near-ATM / <=120 DTE trim drops most rows
+    without ever widening them. Rows missing bid/ask are dropped per side.
+
+    Returns the sorted long frame and the long row count before filtering.
+    """
+    try:
+        return _filter_chunks(_read_chunks(path, chunksize), max_dte, moneyness_band)
+    except ValueError as e:
+        if "could not convert" not in str(e):
+            raise
+    print(f"  ! {os.path.basename(path)}: non-numeric values in numeric columns — coercing")
+    return _filter_chunks(_read_chunks(path, chunksize, strict=False), max_dte, moneyness_band)
+
+
+def _filter_chunks(chunks: Iterable[pd.DataFrame], max_dte: Optional[int],
+                   moneyness_band: Optional[float]) -> Tuple[pd.DataFrame, int]:
+    parts = []
+    seen = 0
+    for wide in chunks:
+        seen += 2 * len(wide)
+        quote = pd.to_datetime(wide["QUOTE_DATE"])
+        expiry = pd.to_datetime(wide["EXPIRE_DATE"])
+        # Integer calendar-day DTE (the convention used everywhere else in the pipeline).
+        dte = (expiry.dt.normalize() - quote.dt.normalize()).dt.days
+        keep = pd.Series(True, index=wide.index)
+        if max_dte is not None:
+            keep &= dte.between(0, max_dte)
+        if moneyness_band is not None:
+            keep &= (wide["STRIKE"] / wide["UNDERLYING_LAST"] - 1.0).abs() <= moneyness_band
+        wide = wide[keep].assign(QUOTE_DATE=quote[keep], EXPIRE_DATE=expiry[keep])
+        if wide.empty:
+            continue
+        df = _widen(wide)
+        df["dte"] = np.tile(dte[keep].to_numpy(), 2)
+        parts.append(df.dropna(subset=["bid", "ask", "strike", "underlying_price"]))
+
+    if not parts:
+        return pd.DataFrame(columns=_PART_COLS), seen
+    df = pd.concat(parts, ignore_index=True)
+    df = df.sort_values(["quote_date", "expiration", "strike", "option_type"]).reset_index(drop=True)
+    return df[_PART_COLS], seen
 
 
 def _fetch_vix(start: pd.Timestamp, end: pd.Timestamp) -> Optional[pd.Series]:
-    """Daily ^VIX close indexed by date, or None if yfinance is unavailable."""
+    """Daily ^VIX close indexed by date (from the shared market context), or None if it has
+    none and yfinance is unavailable to fetch it."""
     try:
-        import yfinance as yf
+        vix = get_market_context().ensure(start, end).series("vix", start, end)
     except ImportError:
         print("  ! yfinance not installed — 'vix' column will be NaN")
         return None
-    end_excl = (end + pd.Timedelta(days=1)).strftime("%Y-%m-%d")
-    vix = yf.Ticker("^VIX").history(start=start.strftime("%Y-%m-%d"), end=end_excl, interval="1d")
     if vix.empty:
         print("  ! ^VIX history empty — 'vix' column will be NaN")
         return None
-    s = vix["Close"].copy()
-    s.index = pd.to_datetime(s.index).tz_localize(None).normalize()
-    return s
+    return vix
+
+
+class PartitionStore:
+    """Converted OptionsDX rows, one partition per source file, under ``<out_dir>/optionsdx/<symbol>``.
+
+    Each partition is written to a temp file and renamed into place, then one JSON line is
+    appended to ``manifest.jsonl`` recording the source's size / mtime, the filters it was
+    cut with, its row count and its quote dates. A source whose size, mtime and filters
+    still match its latest manifest line is not converted again, so dropping a new month
+    into the raw dir and re-running only parses that month. The last manifest line per
+    source wins; a torn last line (crash mid-append) is truncated on open.
+    """
+
+    def __init__(self, root: str | Path):
+        self.dir = Path(root)
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self.manifest = self.dir / "manifest.jsonl"
+        self.entries: Dict[str, dict] = {}
+        if self.manifest.exists():
+            text = self.manifest.read_text()
+            complete = text[:text.rfind("\n") + 1]
+            if complete != text:
+                self.manifest.write_text(complete)
+            for line in complete.splitlines():
+                entry = json.loads(line)
+                self.entries[entry["source"]] = entry
+
+    def is_current(self, path: str, max_dte: int, moneyness_band: float) -> bool:
+        entry = self.entries.get(os.path.basename(path))
+        if entry is None or not (self.dir / entry["partition"]).exists():
+            return False
+        st = os.stat(path)
+        return (entry["size"], entry["mtime"], entry["max_dte"], entry["moneyness_band"]) == \
+            (st.st_size, st.st_mtime, max_dte, moneyness_band)
+
+    def partition_path(self, path: str) -> Path:
+        ext = "parquet" if _HAS_PARQUET else "csv"
+        return self.dir / f"{Path(path).stem}.{ext}"
+
+    def record(self, entry: dict) -> None:
+        with self.manifest.open("a") as f:
+            f.write(json.dumps(entry) + "\n")
+        self.entries[entry["source"]] = entry
+
+    def read(self, entry: dict) -> pd.DataFrame:
+        path = self.dir / entry["partition"]
+        if path.suffix == ".parquet":
+            return pd.read_parquet(path)
+        return pd.read_csv(path, parse_dates=["quote_date", "expiration"],
+                           float_precision="round_trip")
+
+
+def _convert_file(path: str, part_path: str, max_dte: int, moneyness_band: float,
+                  chunksize: int = CHUNK_ROWS) -> dict:
+    """Worker: stream one raw file into its partition; returns the manifest entry."""
+    st = os.stat(path)
+    df, seen = _read_one(path, max_dte, moneyness_band, chunksize)
+    tmp = part_path + ".tmp"
+    if part_path.endswith(".parquet"):
+        df.to_parquet(tmp, index=False)
+    else:
+        df.to_csv(tmp, index=False)
+    os.replace(tmp, part_path)
+    dates = df["quote_date"].dt.normalize().drop_duplicates() if len(df) else []
+    return {
+        "source": os.path.basename(path), "size": st.st_size, "mtime": st.st_mtime,
+        "max_dte": max_dte, "moneyness_band": moneyness_band,
+        "partition": os.path.basename(part_path), "seen": seen, "rows": len(df),
+        "dates": [d.strftime("%Y-%m-%d") for d in dates],
+    }
+
+
+def _overlapping_groups(entries: List[dict]) -> List[List[dict]]:
+    """Entries ordered by first quote date, with date-overlapping ones grouped together
+    (monthly files never overlap, so every group is normally a single partition)."""
+    groups: List[List[dict]] = []
+    last = ""
+    for entry in sorted(entries, key=lambda e: (e["dates"][0], e["source"])):
+        if groups and entry["dates"][0] <= last:
+            groups[-1].append(entry)
+        else:
+            groups.append([entry])
+        last = max(last, entry["dates"][-1])
+    return groups
 
 
 def convert_optionsdx(
@@ -113,6 +284,9 @@ def convert_optionsdx(
     max_dte: int = 120,
     moneyness_band: float = 0.15,
     pattern: str = "spy_eod_*.txt",
+    workers: Optional[int] = None,
+    full: bool = False,
+    chunksize: int = CHUNK_ROWS,
 ) -> str:
     """Convert all OptionsDX monthly files under *raw_dir* to one long-format real CSV.
 
@@ -121,6 +295,14 @@ def convert_optionsdx(
     max_dte : keep only contracts with dte <= this (strategies use <=~66; 120 leaves headroom).
     moneyness_band : keep only |strike/spot - 1| <= this (0.15 = ±15%, covers calendars/verticals/ICs).
                      Set to a large value (e.g. 1.0) to keep the entire chain.
+    workers : processes converting files in parallel (default: one per core; 1 = in-process).
+    full : reconvert every file, ignoring partitions already in the store.
+    chunksize : wide rows per read chunk — peak memory per worker scales with this, not the file.
+
+    Each file is streamed in chunks into its own partition under
+    ``<out_dir>/optionsdx/<symbol>/``; unchanged files keep their partition from the last run.
+    The output CSV is then written partition by partition, so memory stays at one month of
+    filtered rows however many years are converted.
 
     Returns the written CSV path. The filename matches ``real_data_filename`` so
     ``data_source.mode: real`` loads it with the matching ``real_data`` date range.
@@ -128,49 +310,67 @@ def convert_optionsdx(
     files: List[str] = sorted(glob.glob(os.path.join(raw_dir, pattern)))
     if not files:
         raise FileNotFoundError(f"No OptionsDX files matching {pattern!r} under {raw_dir!r}")
-    print(f"Converting {len(files)} OptionsDX file(s) from {raw_dir} ...")
+    store = PartitionStore(Path(out_dir) / "optionsdx" / symbol)
+    todo = [f for f in files if full or not store.is_current(f, max_dte, moneyness_band)]
+    workers = max(1, min(workers or os.cpu_count() or 1, len(todo) or 1))
+    print(f"Converting {len(todo)} of {len(files)} OptionsDX file(s) from {raw_dir} "
+          f"({workers} worker{'s' if workers > 1 else ''}) ...")
 
-    parts = []
-    for f in files:
-        df = _read_one(f)
-        n0 = len(df)
-        # Trim to the useful band so the file stays workable (full chain is ~1.3M rows/yr).
-        df = df[df["dte"].between(0, max_dte)]
-        mny = (df["strike"] / df["underlying_price"] - 1.0).abs()
-        df = df[mny <= moneyness_band]
-        print(f"  {os.path.basename(f)}: {n0:,} -> {len(df):,} rows "
+    def _done(entry: dict) -> None:
+        store.record(entry)
+        print(f"  {entry['source']}: {entry['seen']:,} -> {entry['rows']:,} rows "
               f"(dte<= {max_dte}, |moneyness|<= {moneyness_band:.0%})")
-        parts.append(df)
 
-    data = pd.concat(parts, ignore_index=True)
-    data = data.dropna(subset=["bid", "ask", "strike", "underlying_price"])
-    data = data.sort_values(["quote_date", "expiration", "strike", "option_type"]).reset_index(drop=True)
+    args = [(f, str(store.partition_path(f)), max_dte, moneyness_band, chunksize) for f in todo]
+    if workers == 1:
+        for a in args:
+            _done(_convert_file(*a))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for future in as_completed([pool.submit(_convert_file, *a) for a in args]):
+                _done(future.result())
 
-    # Enrich to the canonical schema.
-    data["underlying_symbol"] = symbol
-    data["abs_delta"] = data["delta"].abs()
-    data["open_interest"] = np.nan  # not provided in this OptionsDX EOD export
+    entries = [store.entries[os.path.basename(f)] for f in files]
+    entries = [e for e in entries if e["rows"]]
+    if not entries:
+        raise ValueError(f"No contracts left after filtering (dte<= {max_dte}, "
+                         f"|moneyness|<= {moneyness_band:.0%})")
+    dates = pd.DatetimeIndex(sorted({d for e in entries for d in e["dates"]}))
+    start, end = dates[0], dates[-1]
 
-    start, end = data["quote_date"].min(), data["quote_date"].max()
+    # VIX per quote date. Rows are written in date order, so filling over the sorted
+    # dates is the same forward/back fill the whole-frame version did.
     vix = _fetch_vix(start, end)
     if vix is not None:
-        data["vix"] = data["quote_date"].dt.normalize().map(vix).astype(float)
         # Forward/back fill the rare missing VIX day so filters never see NaN.
-        data["vix"] = data["vix"].ffill().bfill()
+        vix_by_date = pd.Series(dates.map(vix), index=dates, dtype=float).ffill().bfill()
     else:
-        data["vix"] = np.nan
-
-    data = data[_OUT_COLS]
+        vix_by_date = pd.Series(np.nan, index=dates)
 
     out_name = f"{symbol}_real_options_{start.strftime('%Y-%m-%d')}_{end.strftime('%Y-%m-%d')}.csv"
     out_path = Path(out_dir) / out_name
     out_path.parent.mkdir(parents=True, exist_ok=True)
-    data.to_csv(out_path, index=False)
+    tmp = out_path.with_name(out_name + ".tmp")
+    total = calls = 0
+    expirations: set = set()
+    for i, group in enumerate(_overlapping_groups(entries)):
+        data = pd.concat([store.read(e) for e in group], ignore_index=True)
+        if len(group) > 1:
+            data = data.sort_values(["quote_date", "expiration", "strike", "option_type"])
+        # Enrich to the canonical schema.
+        data["underlying_symbol"] = symbol
+        data["abs_delta"] = data["delta"].abs()
+        data["open_interest"] = np.nan  # not provided in this OptionsDX EOD export
+        data["vix"] = data["quote_date"].dt.normalize().map(vix_by_date).astype(float)
+        data[_OUT_COLS].to_csv(tmp, index=False, mode="w" if i == 0 else "a", header=i == 0)
+        total += len(data)
+        calls += int((data["option_type"] == "call").sum())
+        expirations.update(data["expiration"].unique())
+    os.replace(tmp, out_path)
 
-    print(f"\n✓ Wrote {len(data):,} contracts -> {out_path}")
-    print(f"  Date range : {start.date()} to {end.date()}  ({data['quote_date'].nunique()} trading days)")
-    print(f"  Expirations: {data['expiration'].nunique()}  |  Calls/Puts: "
-          f"{(data['option_type']=='call').sum():,} / {(data['option_type']=='put').sum():,}")
+    print(f"\n✓ Wrote {total:,} contracts -> {out_path}")
+    print(f"  Date range : {start.date()} to {end.date()}  ({len(dates)} trading days)")
+    print(f"  Expirations: {len(expirations)}  |  Calls/Puts: {calls:,} / {total - calls:,}")
     print(f"\nNext: set config/config.yaml -> real_data.start_date={start.date()}, "
           f"end_date={end.date()}, data_source.mode: real, price_from_iv: false")
     return str(out_path)
@@ -184,10 +384,15 @@ def main() -> None:
     p.add_argument("--max-dte", type=int, default=120, help="Keep contracts with dte <= this")
     p.add_argument("--moneyness-band", type=float, default=0.15, help="Keep |strike/spot-1| <= this")
     p.add_argument("--pattern", default="spy_eod_*.txt")
+    p.add_argument("--workers", type=int, default=None,
+                   help="Parallel conversion processes (default: one per core)")
+    p.add_argument("--full", action="store_true",
+                   help="Reconvert every file instead of reusing unchanged partitions")
     args = p.parse_args()
     convert_optionsdx(
         raw_dir=args.raw_dir, symbol=args.symbol, out_dir=args.out_dir,
         max_dte=args.max_dte, moneyness_band=args.moneyness_band, pattern=args.pattern,
+        workers=args.workers, full=args.full,
     )
 
 
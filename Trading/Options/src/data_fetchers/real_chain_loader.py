@@ -38,6 +38,7 @@ if str(_PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(_PROJECT_ROOT))
 
 from src.data_fetchers.synthetic_generator import real_data_filename  # noqa: E402
+from src.data_fetchers.market_context import get_market_context  # noqa: E402
 
 DOLT_BASE = "https://www.dolthub.com/api/v1alpha1/post-no-preference/options/master"
 PROCESSED_DIR = _PROJECT_ROOT / "data" / "processed"
@@ -78,28 +79,16 @@ def _dolt_query(sql: str, max_retries: int = 4, timeout: int = 40) -> List[dict]
 def _fetch_underlying(start: str, end: str, symbol: str = "SPY") -> pd.DataFrame:
     """SPY close + VIX by trading date (the price/regime context DoltHub's chain lacks).
 
-    Mirrors the yfinance pattern in ``synthetic_generator.fetch_underlying_data`` so the
-    underlying here is consistent with what the optimizer loads separately.
+    Read from the shared market context (``market_context``), the same store
+    ``synthetic_generator.fetch_underlying_data`` loads from, so the underlying here is consistent
+    with what the optimizer loads separately and is only downloaded for dates never fetched.
     """
-    import yfinance as yf
-
-    # yfinance's end is exclusive; pad a day so the requested end date is included.
-    end_excl = (pd.to_datetime(end) + pd.Timedelta(days=1)).strftime("%Y-%m-%d")
-
-    spy = yf.Ticker(symbol).history(start=start, end=end_excl, interval="1d")
-    if spy.empty:
-        raise ValueError(f"No {symbol} price data from yfinance for {start}..{end}")
-    spy.index = spy.index.tz_localize(None).normalize()
-    out = spy["Close"].rename("underlying_price").to_frame()
-
-    vix = yf.Ticker("^VIX").history(start=start, end=end_excl, interval="1d")
-    if not vix.empty:
-        vix.index = vix.index.tz_localize(None).normalize()
-        out = out.join(vix["Close"].rename("vix"), how="left")
-        out["vix"] = out["vix"].ffill()
-    else:
-        out["vix"] = np.nan
-
+    context = get_market_context(symbol).ensure(start, end)
+    out = context.frame(start, end, ["close", "vix"])
+    out = out[out["close"].notna()].rename(columns={"close": "underlying_price"})
+    if out.empty:
+        raise ValueError(f"No {symbol} price data for {start}..{end}")
+    out["vix"] = out["vix"].ffill()
     return out
 
 
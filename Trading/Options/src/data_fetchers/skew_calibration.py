@@ -29,8 +29,12 @@ data_collection/chain_logger.py and compiled by data_collection/compile_chains.p
 DoltHub 2021-2026 sample (data/processed/SPY_real_options_2021-01-01_2026-06-08.csv, sparser
 strikes but 5+ years / multiple VIX regimes). Both already carry a computed `iv` column.
 
+The anchored ratios of each source and the last fit are cached under
+data/processed/calibration/ with the sources' content hashes (calibration_cache.py): a rerun with
+no new chain data reads no CSV, and days appended to a source are anchored on their own.
+
 Usage:
-    opt_venv/bin/python -m src.data_fetchers.skew_calibration --report
+    opt_venv/bin/python -m src.data_fetchers.skew_calibration --report [--refit]
 """
 from __future__ import annotations
 
@@ -42,6 +46,8 @@ import numpy as np
 import pandas as pd
 from scipy.optimize import least_squares
 
+from .calibration_cache import CalibrationCache
+
 _PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
 PROCESSED = _PROJECT_ROOT / "data" / "processed"
 
@@ -66,27 +72,38 @@ PUT_M_MIN, PUT_M_MAX = -0.20, 0.0
 CALL_M_MIN, CALL_M_MAX = 0.0, 0.06
 
 
-def _load_side(path: Path, m_min: float, m_max: float, option_type: str) -> pd.DataFrame:
-    """Rows on ONE wing, each carrying its own (date, dte) group's ATM-anchor IV."""
-    cols = ["quote_date", "underlying_price", "dte", "strike", "option_type", "bid", "ask", "iv"]
-    df = pd.read_csv(path, usecols=cols)
-    df = df[(df["dte"].between(DTE_MIN, DTE_MAX)) & (df["bid"] > 0) & (df["ask"] > df["bid"]) & (df["iv"] > 0)]
+_COLS = ["quote_date", "underlying_price", "dte", "strike", "option_type", "bid", "ask", "iv"]
+
+
+def _anchored_rows(df: pd.DataFrame) -> pd.DataFrame:
+    """Both wings' rows from raw chain rows, each carrying its own (date, dte) group's
+    ATM-anchor ratio: columns m, ratio, option_type.
+
+    Everything here is local to a (quote_date, dte) group, so the rows of a chain are the
+    concatenation of the rows of its parts — which is what lets the calibration cache extend
+    them from newly appended days only.
+    """
+    df = df[(df["dte"].between(DTE_MIN, DTE_MAX)) & (df["bid"] > 0) & (df["ask"] > df["bid"]) & (df["iv"] > 0)].copy()
     df["m"] = np.log(df["strike"] / df["underlying_price"])
     df["grp"] = df["quote_date"].astype(str) + "_" + df["dte"].astype(str)
 
     anchors = df[df["m"].abs() <= ANCHOR_M_ABS_MAX]
     if anchors.empty:
-        return pd.DataFrame(columns=["m", "ratio", "grp"])
+        return pd.DataFrame({"m": pd.Series(dtype=float), "ratio": pd.Series(dtype=float),
+                             "option_type": pd.Series(dtype=str)})
     # If multiple quotes qualify as anchors (both option types, several near-ATM strikes), use the
     # single closest-to-the-money one per group -- least skew contamination in the anchor itself.
-    anchors = anchors.loc[anchors.groupby("grp")["m"].apply(lambda s: s.abs().idxmin())]
-    anchor_iv = anchors.set_index("grp")["iv"]
+    # (Stable sort by |m| then first per group == the first idxmin per group.)
+    anchors = anchors.iloc[np.argsort(anchors["m"].abs().to_numpy(), kind="stable")]
+    anchor_iv = anchors.drop_duplicates("grp").set_index("grp")["iv"]
 
-    side = df[(df["option_type"] == option_type) & (df["m"].between(m_min, m_max))].copy()
+    wing = (((df["option_type"] == "put") & df["m"].between(PUT_M_MIN, PUT_M_MAX)) |
+            ((df["option_type"] == "call") & df["m"].between(CALL_M_MIN, CALL_M_MAX)))
+    side = df[wing].copy()
     side["iv_atm"] = side["grp"].map(anchor_iv)
     side = side.dropna(subset=["iv_atm"])
     side["ratio"] = side["iv"] / side["iv_atm"]
-    return side[["m", "ratio", "grp"]]
+    return side[["m", "ratio", "option_type"]].reset_index(drop=True)
 
 
 def _fit_skew(df: pd.DataFrame, n_bins: int = 16) -> Tuple[float, float, int, float]:
@@ -136,14 +153,16 @@ def _r_squared(df: pd.DataFrame, slope: float, curv: float, n_bins: int = 16) ->
     return float(1 - ss_res / ss_tot) if ss_tot > 0 else float("nan")
 
 
-def _fit_side(m_min: float, m_max: float, option_type: str) -> dict:
+def _sources() -> dict:
+    return {label: path for path, label in [(LIVE_CHAINS_FILE, "live_chains"), (DOLTHUB_FILE, "dolthub")]
+            if path.exists()}
+
+
+def _fit_side(m_min: float, m_max: float, option_type: str, stats: dict) -> dict:
     frames = []
-    for path, label in [(LIVE_CHAINS_FILE, "live_chains"), (DOLTHUB_FILE, "dolthub")]:
-        if not path.exists():
-            continue
-        d = _load_side(path, m_min, m_max, option_type)
-        d["source"] = label
-        frames.append(d)
+    for label, rows in stats.items():
+        d = rows[(rows["option_type"] == option_type) & rows["m"].between(m_min, m_max)][["m", "ratio"]]
+        frames.append(d.assign(source=label))
     if not frames:
         raise FileNotFoundError("No real-chain source found for skew calibration.")
     raw = pd.concat(frames, ignore_index=True)
@@ -156,9 +175,31 @@ def _fit_side(m_min: float, m_max: float, option_type: str) -> dict:
             "n_dolthub": int((raw.source == "dolthub").sum())}
 
 
-def fit(report: bool = False) -> dict:
-    put_fit = _fit_side(PUT_M_MIN, PUT_M_MAX, "put")
-    call_fit = _fit_side(CALL_M_MIN, CALL_M_MAX, "call")
+def _fit_wings(use_cache: bool = True) -> tuple:
+    """(put_fit, call_fit), from the calibration cache when the sources are unchanged."""
+    sources = _sources()
+    if not sources:
+        raise FileNotFoundError("No real-chain source found for skew calibration.")
+    cache = CalibrationCache("skew", params={
+        "dte": [DTE_MIN, DTE_MAX], "anchor_m": ANCHOR_M_ABS_MAX,
+        "put_m": [PUT_M_MIN, PUT_M_MAX], "call_m": [CALL_M_MIN, CALL_M_MAX],
+    })
+    if use_cache:
+        cached = cache.cached_fit(sources)
+        if cached is not None:
+            return cached["put"], cached["call"]
+    stats = {label: cache.stats(label, path, _COLS, _anchored_rows) for label, path in sources.items()}
+    put_fit = _fit_side(PUT_M_MIN, PUT_M_MAX, "put", stats)
+    call_fit = _fit_side(CALL_M_MIN, CALL_M_MAX, "call", stats)
+    cache.save_fit({"put": put_fit, "call": call_fit})
+    return put_fit, call_fit
+
+
+def fit(report: bool = False, use_cache: bool = True) -> dict:
+    """Fit both wings. With ``use_cache`` the anchored ratios and the result come from
+    data/processed/calibration/ (see calibration_cache) unless a source CSV has changed;
+    ``use_cache=False`` recomputes the fit from the (cached) ratios."""
+    put_fit, call_fit = _fit_wings(use_cache)
 
     if report:
         print(f"PUT wing  (m in [{PUT_M_MIN}, {PUT_M_MAX}]):  "
@@ -197,5 +238,6 @@ def fit(report: bool = False) -> dict:
 if __name__ == "__main__":
     p = argparse.ArgumentParser()
     p.add_argument("--report", action="store_true")
+    p.add_argument("--refit", action="store_true", help="Ignore the cached fit result")
     args = p.parse_args()
-    fit(report=True)
+    fit(report=True, use_cache=not args.refit)
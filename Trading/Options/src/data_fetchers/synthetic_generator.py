@@ -12,13 +12,13 @@ from datetime import datetime, timedelta
 from typing import List, Optional, Tuple
 import pandas as pd
 import numpy as np
-import yfinance as yf
 
 from ..utils.black_scholes import (
     black_scholes_price,
     calculate_all_greeks,
     find_strike_by_delta
 )
+from .market_context import UNDERLYING_COLUMNS, VIX_TICKERS, get_market_context
 from .skew_calibration import PUT_M_MIN as _PUT_SKEW_FIT_MIN, CALL_M_MAX as _CALL_SKEW_FIT_MAX
 
 
@@ -244,8 +244,8 @@ class SyntheticOptionsGenerator:
         end_date: str
     ) -> pd.DataFrame:
         """
-        Fetch historical underlying price data and VIX from Yahoo Finance.
-        Calculates IV Percentile based on SPY's implied volatility over 252 trading days.
+        Fetch historical underlying price data and VIX from Yahoo Finance (via the local market
+        context cache). IV Rank / IV Percentile of VIX over 252 trading days come precomputed.
 
         Args:
             start_date: Start date (YYYY-MM-DD)
@@ -257,19 +257,19 @@ class SyntheticOptionsGenerator:
         print(f"Fetching {self.symbol} price data from Yahoo Finance...")
         print(f"Date range: {start_date} to {end_date}")
 
-        # Fetch underlying (SPY) data
-        ticker = yf.Ticker(self.symbol)
-        data = ticker.history(start=start_date, end=end_date)
+        # Underlying OHLCV + VIX complex from the shared market context, which downloads only the
+        # dates it has never fetched (end_date is exclusive, as in the yfinance call this replaced).
+        last_day = (pd.Timestamp(end_date) - pd.Timedelta(days=1)).strftime("%Y-%m-%d")
+        context = get_market_context(self.symbol).ensure(start_date, last_day)
+        frame = context.frame(start_date, last_day)
+        frame = frame[frame['close'].notna()]
 
-        if data.empty:
+        if frame.empty:
             raise ValueError(f"No data found for {self.symbol}")
 
-        # Remove timezone info and normalize to 12:00 PM (noon) ET for market midday
-        data.index = data.index.tz_localize(None)
-        data.index = data.index.map(lambda x: x.replace(hour=12, minute=0, second=0, microsecond=0))
-
-        # Standardize column names
-        data.columns = [col.lower() for col in data.columns]
+        # Normalize to 12:00 PM (noon) ET for market midday
+        frame.index = (frame.index + pd.Timedelta(hours=12)).rename('Date')
+        data = frame[list(UNDERLYING_COLUMNS)].copy()
 
         # Calculate returns first (needed for volatility calculation)
         data['returns'] = data['close'].pct_change()
@@ -282,50 +282,30 @@ class SyntheticOptionsGenerator:
         # Forward fill any NaN volatility values
         data['volatility'] = data['volatility'].bfill()
 
-        # Fetch VIX data (implied volatility index for reference)
-        print(f"Fetching VIX data from Yahoo Finance...")
-        vix_ticker = yf.Ticker("^VIX")
-        vix_data = vix_ticker.history(start=start_date, end=end_date)
-
-        if not vix_data.empty:
-            # Remove timezone and normalize to 12:00 PM (noon) ET
-            vix_data.index = vix_data.index.tz_localize(None)
-            vix_data.index = vix_data.index.map(lambda x: x.replace(hour=12, minute=0, second=0, microsecond=0))
-            vix_close = vix_data['Close'].rename('vix')
-
-            # Merge VIX data with underlying data
-            data = data.join(vix_close, how='left')
-
-            # Forward fill any missing VIX values (for holidays/weekends)
-            data['vix'] = data['vix'].ffill()
-
+        # VIX (implied volatility index for reference), forward filled over holidays
+        data['vix'] = frame['vix'].ffill()
+        if data['vix'].notna().any():
             print(f"✓ VIX data merged (for reference)")
             print(f"  VIX range: {data['vix'].min():.2f} - {data['vix'].max():.2f}")
         else:
             print(f"⚠️  Warning: Could not fetch VIX data")
-            data['vix'] = np.nan
 
-        # Fetch VIX term-structure complex for per-day term-ratio calibration.
-        # ^VIX9D / ^VIX3M / ^VIX6M combined with ^VIX (30d, already fetched) give 4 tenor
-        # points; _build_term_curve() interpolates these into a daily term-ratio curve so the
+        # VIX term-structure complex for per-day term-ratio calibration.
+        # ^VIX9D / ^VIX3M / ^VIX6M combined with ^VIX (30d) give 4 tenor points;
+        # _build_term_curve() interpolates these into a daily term-ratio curve so the
         # calendar sees real contango/backwardation regimes rather than a hardcoded constant.
-        for vix_sym, col_name in [("^VIX9D", "vix9d"), ("^VIX3M", "vix3m"), ("^VIX6M", "vix6m")]:
-            try:
-                vt = yf.Ticker(vix_sym)
-                vd = vt.history(start=start_date, end=end_date)
-                if not vd.empty:
-                    vd.index = vd.index.tz_localize(None)
-                    vd.index = vd.index.map(
-                        lambda x: x.replace(hour=12, minute=0, second=0, microsecond=0))
-                    data = data.join(vd['Close'].rename(col_name), how='left')
-                    data[col_name] = data[col_name].ffill()
-                    print(f"  ✓ {vix_sym} → '{col_name}' ({data[col_name].notna().sum()} days)")
-                else:
-                    data[col_name] = np.nan
-                    print(f"  ⚠️  {vix_sym}: no data returned — term-structure will use fallback")
-            except Exception as e:
-                data[col_name] = np.nan
-                print(f"  ⚠️  {vix_sym}: fetch failed ({e}) — term-structure will use fallback")
+        for col_name, vix_sym in VIX_TICKERS.items():
+            if col_name == 'vix':
+                continue
+            data[col_name] = frame[col_name].ffill()
+            if data[col_name].notna().any():
+                print(f"  ✓ {vix_sym} → '{col_name}' ({data[col_name].notna().sum()} days)")
+            else:
+                print(f"  ⚠️  {vix_sym}: no data returned — term-structure will use fallback")
+
+        # 252-day VIX IV-Rank / IV Percentile, precomputed in the market context
+        data['vix_rank'] = frame['vix_rank']
+        data['vix_percentile'] = frame['vix_percentile']
 
         # Calculate SPY's Implied Volatility from ATM options
         # For synthetic data, we use VIX as a proxy for SPY IV since:
@@ -1132,12 +1112,12 @@ def load_sample_spy_options_data(specific_file: str = None, config: dict = None)
         synth_data['_exp'] = synth_data['expiration'].dt.normalize()
 
         # Build set of (date, expiration) pairs present in real data
-        real_pairs = set(zip(real_data['_date'], real_data['_exp']))
+        real_pairs = pd.MultiIndex.from_arrays([real_data['_date'], real_data['_exp']])
 
         # Keep synthetic rows whose (date, expiration) pair DoltHub did NOT sample
-        mask = ~synth_data.apply(
-            lambda r: (r['_date'], r['_exp']) in real_pairs, axis=1
-        )
+        mask = ~pd.MultiIndex.from_arrays(
+            [synth_data['_date'], synth_data['_exp']]
+        ).isin(real_pairs)
         fill_rows = synth_data[mask].copy()
 
         # Reprice fill rows using per-date IV surfaces fitted from REAL data.
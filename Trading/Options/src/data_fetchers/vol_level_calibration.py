@@ -24,8 +24,12 @@ before 2021, so nothing pins the level for 2008-2020. This module extrapolates F
 the conservative choice, but still an assumption, not a fit. Backtest years 2008-2021 (which
 includes the entire GFC stress-test window) should be read as best-effort, not validated.
 
+The ATM ratios of each source and the yearly table are cached under data/processed/calibration/
+with the sources' content hashes (calibration_cache.py), so a rerun with no new chain data reads
+no CSV and days appended to a source are processed on their own.
+
 Usage:
-    opt_venv/bin/python -m src.data_fetchers.vol_level_calibration --report
+    opt_venv/bin/python -m src.data_fetchers.vol_level_calibration --report [--refit]
 """
 from __future__ import annotations
 
@@ -35,6 +39,8 @@ from pathlib import Path
 import numpy as np
 import pandas as pd
 
+from .calibration_cache import CalibrationCache
+
 _PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
 PROCESSED = _PROJECT_ROOT / "data" / "processed"
 
@@ -46,30 +52,56 @@ ATM_M_ABS_MAX = 0.02
 FIT_START_YEAR = 2022  # 2021 excluded: thin, ~5x noisier std than any other year
 
 
-def _load_atm() -> pd.DataFrame:
-    frames = []
-    for path in (DOLTHUB_FILE, LIVE_CHAINS_FILE):
-        if not path.exists():
-            continue
-        df = pd.read_csv(path, usecols=[
-            "quote_date", "underlying_price", "dte", "strike", "option_type", "vix", "iv",
-        ])
-        frames.append(df)
-    if not frames:
-        raise FileNotFoundError("No real-chain source found for vol-level calibration.")
-    df = pd.concat(frames, ignore_index=True)
+_COLS = ["quote_date", "underlying_price", "dte", "strike", "option_type", "vix", "iv"]
+
+
+def _atm_rows(df: pd.DataFrame) -> pd.DataFrame:
+    """ATM call rows (quote_date, ratio = iv / (vix/100)) from raw chain rows -- row-local, so
+    the calibration cache can extend them from newly appended days only."""
+    df = df.copy()
     df["m"] = np.log(df["strike"] / df["underlying_price"])
     atm = df[(df["option_type"] == "call") & (df["m"].abs() <= ATM_M_ABS_MAX) &
              (df["dte"].between(DTE_MIN, DTE_MAX)) & (df["vix"] > 0)].copy()
     atm["quote_date"] = pd.to_datetime(atm["quote_date"])
     atm = atm[atm["quote_date"].dt.year >= FIT_START_YEAR]
     atm["ratio"] = atm["iv"] / (atm["vix"] / 100.0)
+    return atm[["quote_date", "ratio"]].reset_index(drop=True)
+
+
+def _sources() -> dict:
+    return {label: path for path, label in [(DOLTHUB_FILE, "dolthub"), (LIVE_CHAINS_FILE, "live_chains")]
+            if path.exists()}
+
+
+def _load_atm(cache: CalibrationCache) -> pd.DataFrame:
+    sources = _sources()
+    if not sources:
+        raise FileNotFoundError("No real-chain source found for vol-level calibration.")
+    frames = [cache.stats(label, path, _COLS, _atm_rows) for label, path in sources.items()]
+    atm = pd.concat(frames, ignore_index=True)
+    atm["quote_date"] = pd.to_datetime(atm["quote_date"])  # CSV statistics read back as text
     return atm
 
 
-def fit(report: bool = False) -> dict:
-    atm = _load_atm()
-    yearly = atm.groupby(atm["quote_date"].dt.year).agg(ratio=("ratio", "median"), n=("ratio", "size"))
+def _cache() -> CalibrationCache:
+    return CalibrationCache("vol_level", params={
+        "dte": [DTE_MIN, DTE_MAX], "atm_m": ATM_M_ABS_MAX, "fit_start_year": FIT_START_YEAR,
+    })
+
+
+def fit(report: bool = False, use_cache: bool = True) -> dict:
+    """Fit the ratio trend. With ``use_cache`` the ATM ratios and the yearly table come from
+    data/processed/calibration/ (see calibration_cache) unless a source CSV has changed."""
+    cache = _cache()
+    cached = cache.cached_fit(_sources()) if use_cache else None
+    if cached is not None:
+        yearly = pd.DataFrame({"ratio": cached["ratio"], "n": cached["n"]},
+                              index=pd.Index(cached["year"], name="quote_date"))
+    else:
+        atm = _load_atm(cache)
+        yearly = atm.groupby(atm["quote_date"].dt.year).agg(ratio=("ratio", "median"), n=("ratio", "size"))
+        cache.save_fit({"year": yearly.index.tolist(), "ratio": yearly["ratio"].tolist(),
+                        "n": yearly["n"].tolist()})
 
     yr = yearly.index.to_numpy(dtype=float)
     y = yearly["ratio"].to_numpy()
@@ -105,5 +137,6 @@ def fit(report: bool = False) -> dict:
 if __name__ == "__main__":
     p = argparse.ArgumentParser()
     p.add_argument("--report", action="store_true")
-    p.parse_args()
-    fit(report=True)
+    p.add_argument("--refit", action="store_true", help="Ignore the cached yearly table")
+    args = p.parse_args()
+    fit(report=True, use_cache=not args.refit)
@@ -9,10 +9,12 @@ management, and performance tracking.
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple
 import pandas as pd
 import numpy as np
 
+from ..utils.chain_index import NO_EXPIRATION, OPTION_TYPE_CODES, expiration_ns
+
 
 @dataclass
 class Position:
@@ -63,6 +65,130 @@ class Position:
         return (self.exit_price - self.entry_price) / abs(self.entry_price) * 100
 
 
+class PositionBook:
+    """
+    Open positions as parallel arrays, one row per position (structure of arrays).
+
+    The ``Position`` objects stay the reporting view (trade records, exports,
+    ``get_open_positions``); the book mirrors them row for row, in opening order, so daily
+    marking, exit rules and exposure aggregates run as array operations over every open
+    position at once instead of a Python loop of per-position DataFrame lookups.
+
+    Legs are columns (up to ``max_legs``): ``strike``, ``option_type`` (0 put, 1 call, -1 none),
+    ``side`` (+1 long, -1 short, 0 none) and ``expiration`` (int64 ns, NO_EXPIRATION if unset).
+    Per position: ``n_legs``, ``contracts``, ``entry_price`` and the running marks
+    ``current_price`` (NaN = not yet marked) and ``unrealized_pnl``. Column attributes are views
+    of the first ``len(book)`` rows.
+    """
+
+    # name -> (dtype, per-leg, empty value)
+    _FIELDS = {
+        'strike': (np.float64, True, np.nan),
+        'option_type': (np.int8, True, -1),
+        'side': (np.int8, True, 0),
+        'expiration': (np.int64, True, NO_EXPIRATION),
+        'n_legs': (np.int8, False, 0),
+        'contracts': (np.int64, False, 0),
+        'entry_price': (np.float64, False, np.nan),
+        'current_price': (np.float64, False, np.nan),
+        'unrealized_pnl': (np.float64, False, 0.0),
+    }
+
+    def __init__(self, max_legs: int = 4, capacity: int = 64):
+        self.max_legs = max_legs
+        self.positions: List[Position] = []
+        self._arrays: Dict[str, np.ndarray] = {}
+        self._allocate(capacity)
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    def __getattr__(self, name: str) -> np.ndarray:
+        arrays = self.__dict__.get('_arrays')
+        if arrays is not None and name in arrays:
+            return arrays[name][:len(self.positions)]
+        raise AttributeError(name)
+
+    def add(self, position: Position) -> int:
+        """Append an open position; returns its row."""
+        row = len(self.positions)
+        if row == len(self._arrays['contracts']):
+            self._allocate(2 * row)
+        a = self._arrays
+        for name, (_dtype, per_leg, empty) in self._FIELDS.items():
+            a[name][row] = empty
+        for i, leg in enumerate(position.legs[:self.max_legs]):
+            a['strike'][row, i] = leg['strike'] if leg.get('strike') is not None else np.nan
+            a['option_type'][row, i] = OPTION_TYPE_CODES.get(leg.get('option_type'), -1)
+            a['side'][row, i] = 1 if leg.get('position') == 'long' else -1
+            a['expiration'][row, i] = expiration_ns(leg.get('expiration'))
+        a['n_legs'][row] = min(len(position.legs), self.max_legs)
+        a['contracts'][row] = position.contracts
+        a['entry_price'][row] = position.entry_price
+        if position.current_price is not None:
+            a['current_price'][row] = position.current_price
+        a['unrealized_pnl'][row] = position.unrealized_pnl
+        self.positions.append(position)
+        return row
+
+    def remove(self, positions: Iterable[Position]) -> None:
+        """Drop positions (by identity), keeping the remaining rows in order."""
+        gone = {id(p) for p in positions}
+        keep = np.array([id(p) not in gone for p in self.positions], dtype=bool)
+        if keep.all():
+            return
+        n, kept = len(keep), int(keep.sum())
+        for name, array in self._arrays.items():
+            array[:kept] = array[:n][keep]
+        self.positions = [p for p, k in zip(self.positions, keep) if k]
+
+    def mark(self, rows: np.ndarray, price: np.ndarray) -> None:
+        """Set the per-share close value of ``rows`` and their unrealized P&L from it."""
+        self._arrays['current_price'][rows] = price
+        self._arrays['unrealized_pnl'][rows] = \
+            (price - self._arrays['entry_price'][rows]) * self._arrays['contracts'][rows] * 100
+
+    def sync(self, rows: Optional[Iterable[int]] = None) -> None:
+        """Write the array marks back into the ``Position`` views (all rows by default)."""
+        current, unrealized = self.current_price, self.unrealized_pnl
+        for row in (range(len(self.positions)) if rows is None else rows):
+            position = self.positions[row]
+            price = current[row]
+            position.current_price = None if np.isnan(price) else float(price)
+            position.unrealized_pnl = float(unrealized[row])
+
+    def pull(self) -> None:
+        """Re-read the marks from the ``Position`` views (after a strategy marked them itself)."""
+        for row, position in enumerate(self.positions):
+            self._arrays['current_price'][row] = \
+                np.nan if position.current_price is None else position.current_price
+            self._arrays['unrealized_pnl'][row] = position.unrealized_pnl
+
+    def max_risk(self) -> np.ndarray:
+        """Theoretical max loss in dollars per open position (0 for single-leg positions).
+
+        Two-leg width vs the signed open cost: credit (entry<0) risks width + entry, debit risks
+        the debit.
+        """
+        width = np.abs(self.strike[:, 0] - self.strike[:, 1])
+        entry = self.entry_price
+        per_contract = np.where(entry < 0, (width + entry) * 100, entry * 100)
+        risk = np.maximum(0.0, per_contract) * self.contracts
+        return np.where(self.n_legs >= 2, risk, 0.0)
+
+    def total_unrealized(self) -> float:
+        return float(self.unrealized_pnl.sum())
+
+    def _allocate(self, capacity: int) -> None:
+        n = len(self.positions)
+        for name, (dtype, per_leg, empty) in self._FIELDS.items():
+            shape = (capacity, self.max_legs) if per_leg else (capacity,)
+            array = np.full(shape, empty, dtype=dtype)
+            if name in self._arrays:
+                array[:n] = self._arrays[name][:n]
+            self._arrays[name] = array
+
+
 @dataclass
 class Signal:
     """Represents a trading signal."""
@@ -108,6 +234,7 @@ class BaseStrategy(ABC):
         self.config = config
         self.positions: List[Position] = []
         self.closed_positions: List[Position] = []
+        self.book = PositionBook()
 
     @abstractmethod
     def generate_entry_signal(
@@ -191,6 +318,17 @@ class BaseStrategy(ABC):
         # based on current options data
         pass
 
+    def open_position(self, position: Position) -> None:
+        """Add a newly opened position to the open list and the position book."""
+        self.positions.append(position)
+        self.book.add(position)
+
+    def reset_positions(self) -> None:
+        """Forget all open and closed positions (start of a backtest)."""
+        self.positions = []
+        self.closed_positions = []
+        self.book = PositionBook()
+
     def get_open_positions(self) -> List[Position]:
         """Get all currently open positions."""
         return [p for p in self.positions if p.is_open]
@@ -221,6 +359,7 @@ class BaseStrategy(ABC):
         position.notes = exit_reason
 
         self.positions.remove(position)
+        self.book.remove([position])
         self.closed_positions.append(position)
 
     def get_performance_summary(self) -> Dict:
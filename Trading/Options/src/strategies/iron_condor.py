@@ -14,6 +14,7 @@ import pandas as pd
 import numpy as np
 
 from .base_strategy import BaseStrategy, Signal, Position
+from ..utils.chain_index import OPTION_TYPE_CODES, DayChain
 from ..utils.execution import net_close
 
 
@@ -34,42 +35,36 @@ class IronCondor(BaseStrategy):
         self.debug = config.get('debug', False)
         self.spread_type = 'iron_condor'
 
-    def _find_strike_by_delta(
+    def _find_strikes_by_delta(
         self,
-        options_chain: pd.DataFrame,
-        target_delta: float,
+        day: DayChain,
+        expiration: int,
         option_type: str,
+        short_delta: float,
+        long_delta: float,
         tolerance: float = 0.05
-    ) -> Optional[float]:
+    ) -> Tuple[Optional[float], Optional[float]]:
         """
-        Find strike price closest to target delta.
+        Strikes closest to the short and long target deltas at one expiration.
 
         Args:
-            options_chain: DataFrame with options data including delta
-            target_delta: Target delta value (e.g., 0.30)
+            day: The day's chain index
+            expiration: Pinned expiration (int64 ns)
             option_type: 'call' or 'put'
+            short_delta, long_delta: Target deltas (e.g., 0.20 / 0.10)
             tolerance: Acceptable delta tolerance
 
         Returns:
-            Strike price or None if not found
+            (short_strike, long_strike), None for a leg with no strike within tolerance
         """
-        filtered = options_chain[options_chain['option_type'] == option_type].copy()
-
-        if filtered.empty:
-            return None
-
-        # Find closest delta
-        filtered['delta_diff'] = abs(abs(filtered['delta']) - abs(target_delta))
-        closest = filtered.loc[filtered['delta_diff'].idxmin()]
-
-        if closest['delta_diff'] <= tolerance:
-            return closest['strike']
-
-        return None
+        rows = day.nearest_delta(expiration, OPTION_TYPE_CODES[option_type],
+                                 [short_delta, long_delta], tolerance=tolerance)
+        return tuple(day.strike[row] if row >= 0 else None for row in rows)
 
     def _get_spread_price(
         self,
-        options_chain: pd.DataFrame,
+        day: DayChain,
+        expiration: int,
         short_strike: float,
         long_strike: float,
         option_type: str
@@ -78,7 +73,8 @@ class IronCondor(BaseStrategy):
         Calculate the net credit for a spread.
 
         Args:
-            options_chain: Options chain data
+            day: The day's chain index
+            expiration: Pinned expiration (int64 ns)
             short_strike: Strike price of short option
             long_strike: Strike price of long option
             option_type: 'call' or 'put'
@@ -86,27 +82,19 @@ class IronCondor(BaseStrategy):
         Returns:
             Net credit (positive for credit spread)
         """
-        short_option = options_chain[
-            (options_chain['strike'] == short_strike) &
-            (options_chain['option_type'] == option_type)
-        ]
-        long_option = options_chain[
-            (options_chain['strike'] == long_strike) &
-            (options_chain['option_type'] == option_type)
-        ]
-
-        if short_option.empty or long_option.empty:
+        code = OPTION_TYPE_CODES[option_type]
+        short_row, long_row = day.locate([short_strike, long_strike], [code, code],
+                                         [expiration, expiration])
+        if short_row < 0 or long_row < 0:
             return None
 
         # For credit spreads: receive at bid for short, pay at ask for long
-        short_price = short_option.iloc[0]['bid']
-        long_price = long_option.iloc[0]['ask']
-
-        return short_price - long_price
+        return day.bid[short_row] - day.ask[long_row]
 
     def _find_put_strikes(
         self,
-        options_chain: pd.DataFrame,
+        day: DayChain,
+        expiration: int,
         underlying_price: float
     ) -> Optional[Tuple[float, float, float]]:
         """
@@ -118,11 +106,8 @@ class IronCondor(BaseStrategy):
         put_long_delta = self.entry_config.get('put_long_delta', 0.10)
 
         # Find strikes by delta
-        short_strike = self._find_strike_by_delta(
-            options_chain, put_short_delta, 'put', tolerance=0.05
-        )
-        long_strike = self._find_strike_by_delta(
-            options_chain, put_long_delta, 'put', tolerance=0.05
+        short_strike, long_strike = self._find_strikes_by_delta(
+            day, expiration, 'put', put_short_delta, put_long_delta, tolerance=0.05
         )
 
         if not short_strike or not long_strike:
@@ -134,7 +119,7 @@ class IronCondor(BaseStrategy):
 
         # Calculate put spread credit
         put_credit = self._get_spread_price(
-            options_chain, short_strike, long_strike, 'put'
+            day, expiration, short_strike, long_strike, 'put'
         )
 
         if put_credit is None or put_credit <= 0:
@@ -144,7 +129,8 @@ class IronCondor(BaseStrategy):
 
     def _find_call_strikes(
         self,
-        options_chain: pd.DataFrame,
+        day: DayChain,
+        expiration: int,
         underlying_price: float
     ) -> Optional[Tuple[float, float, float]]:
         """
@@ -156,11 +142,8 @@ class IronCondor(BaseStrategy):
         call_long_delta = self.entry_config.get('call_long_delta', 0.10)
 
         # Find strikes by delta
-        short_strike = self._find_strike_by_delta(
-            options_chain, call_short_delta, 'call', tolerance=0.05
-        )
-        long_strike = self._find_strike_by_delta(
-            options_chain, call_long_delta, 'call', tolerance=0.05
+        short_strike, long_strike = self._find_strikes_by_delta(
+            day, expiration, 'call', call_short_delta, call_long_delta, tolerance=0.05
         )
 
         if not short_strike or not long_strike:
@@ -172,7 +155,7 @@ class IronCondor(BaseStrategy):
 
         # Calculate call spread credit
         call_credit = self._get_spread_price(
-            options_chain, short_strike, long_strike, 'call'
+            day, expiration, short_strike, long_strike, 'call'
         )
 
         if call_credit is None or call_credit <= 0:
@@ -182,7 +165,8 @@ class IronCondor(BaseStrategy):
 
     def _get_iron_condor_credit(
         self,
-        options_chain: pd.DataFrame,
+        day: DayChain,
+        expiration: int,
         put_short: float,
         put_long: float,
         call_short: float,
@@ -190,10 +174,10 @@ class IronCondor(BaseStrategy):
     ) -> Optional[float]:
         """Calculate total credit received for Iron Condor."""
         # Put spread credit
-        put_credit = self._get_spread_price(options_chain, put_short, put_long, 'put')
+        put_credit = self._get_spread_price(day, expiration, put_short, put_long, 'put')
 
         # Call spread credit
-        call_credit = self._get_spread_price(options_chain, call_short, call_long, 'call')
+        call_credit = self._get_spread_price(day, expiration, call_short, call_long, 'call')
 
         if put_credit is None or call_credit is None:
             return None
@@ -220,12 +204,13 @@ class IronCondor(BaseStrategy):
         dte_min = self.entry_config.get('dte_min', 30)
         dte_max = self.entry_config.get('dte_max', 45)
 
-        valid_options = options_data[
-            (options_data['dte'] >= dte_min) &
-            (options_data['dte'] <= dte_max)
-        ].copy()
+        day = kwargs.get('day_chain')
+        if day is None:
+            day = DayChain(options_data)
+        expirations, dtes, first_rows = day.expirations()
+        valid = (dtes >= dte_min) & (dtes <= dte_max)
 
-        if valid_options.empty:
+        if not valid.any():
             return None
 
         # Check VIX filters
@@ -240,13 +225,15 @@ class IronCondor(BaseStrategy):
 
         # Pin ALL four legs to a single expiration (the one nearest the DTE-window midpoint) so the
         # spread is priced and managed consistently — otherwise strikes leak across expirations.
+        # Ties go to the earlier expiration.
         target_dte = (dte_min + dte_max) / 2
-        exp_dte = valid_options.groupby('expiration')['dte'].first()
-        chosen_exp = (exp_dte - target_dte).abs().idxmin()
-        valid_options = valid_options[valid_options['expiration'] == chosen_exp]
+        expirations, dtes, first_rows = expirations[valid], dtes[valid], first_rows[valid]
+        by_exp = np.argsort(expirations)
+        pick = by_exp[np.argmin(np.abs(dtes[by_exp] - target_dte))]
+        chosen_exp = expirations[pick]
 
         # Find put spread strikes (below current price)
-        put_strikes = self._find_put_strikes(valid_options, underlying_price)
+        put_strikes = self._find_put_strikes(day, chosen_exp, underlying_price)
         if not put_strikes:
             if self.debug:
                 print(f"  ❌ Could not find put spread strikes")
@@ -255,7 +242,7 @@ class IronCondor(BaseStrategy):
         put_short, put_long, put_credit = put_strikes
 
         # Find call spread strikes (above current price)
-        call_strikes = self._find_call_strikes(valid_options, underlying_price)
+        call_strikes = self._find_call_strikes(day, chosen_exp, underlying_price)
         if not call_strikes:
             if self.debug:
                 print(f"  ❌ Could not find call spread strikes")
@@ -265,7 +252,7 @@ class IronCondor(BaseStrategy):
 
         # Get total credit
         total_credit = self._get_iron_condor_credit(
-            valid_options, put_short, put_long, call_short, call_long
+            day, chosen_exp, put_short, put_long, call_short, call_long
         )
 
         if not total_credit:
@@ -284,7 +271,7 @@ class IronCondor(BaseStrategy):
             return None
 
         # Get DTE for tracking
-        dte = int(valid_options.iloc[0]['dte'])
+        dte = int(dtes[pick])
 
         # Signal carries only the base dataclass fields; the four IC strikes + credit + expiration
         # are attached as attributes (the engine and calculate_position_size read them back).
@@ -301,7 +288,7 @@ class IronCondor(BaseStrategy):
         signal.call_short_strike = call_short
         signal.call_long_strike = call_long
         signal.total_credit = total_credit
-        signal.expiration = chosen_exp
+        signal.expiration = options_data['expiration'].iloc[first_rows[pick]]
         return signal
 
     def generate_exit_signal(
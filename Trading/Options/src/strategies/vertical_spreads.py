@@ -9,11 +9,12 @@ Implements four types of vertical spreads:
 """
 
 from datetime import datetime
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Tuple
 import pandas as pd
 import numpy as np
 
-from .base_strategy import BaseStrategy, Signal, Position
+from .base_strategy import BaseStrategy, Signal, Position, PositionBook
+from ..utils.chain_index import DAY_NS, NO_EXPIRATION, OPTION_TYPE_CODES, DayChain
 from ..utils.execution import net_open, net_close
 
 
@@ -35,39 +36,6 @@ class VerticalSpread(BaseStrategy):
         self.exit_config = config.get('exit', {})
         self.debug = config.get('debug', False)
 
-    def _find_strike_by_delta(
-        self,
-        options_chain: pd.DataFrame,
-        target_delta: float,
-        option_type: str,
-        tolerance: float = 0.05
-    ) -> Optional[float]:
-        """
-        Find strike price closest to target delta.
-
-        Args:
-            options_chain: DataFrame with options data including delta
-            target_delta: Target delta value (e.g., 0.30)
-            option_type: 'call' or 'put'
-            tolerance: Acceptable delta tolerance
-
-        Returns:
-            Strike price or None if not found
-        """
-        filtered = options_chain[options_chain['option_type'] == option_type].copy()
-
-        if filtered.empty:
-            return None
-
-        # Find closest delta
-        filtered['delta_diff'] = abs(abs(filtered['delta']) - abs(target_delta))
-        closest = filtered.loc[filtered['delta_diff'].idxmin()]
-
-        if closest['delta_diff'] <= tolerance:
-            return closest['strike']
-
-        return None
-
     def _leg_rows(self, chain, short_strike, long_strike, option_type, expiration=None):
         """The (short_row, long_row) option quotes for this spread, or None if either is missing.
 
@@ -130,19 +98,19 @@ class VerticalSpread(BaseStrategy):
             dte_target = (dte_lo + dte_hi) / 2.0
 
         option_type = self._get_option_type()
-        candidates = options_data[
-            (options_data['dte'] >= dte_lo) &
-            (options_data['dte'] <= dte_hi) &
-            (options_data['option_type'] == option_type)
-        ]
+        type_code = OPTION_TYPE_CODES[option_type]
+        day = kwargs.get('day_chain')
+        if day is None:
+            day = DayChain(options_data)
+        expirations, dtes, _ = day.expirations(type_code)
 
         # The position must OUTLIVE the DTE exit rule, or that exit is already true at entry and
         # the trade is force-closed immediately (the degenerate ~1-day trades the 2026-07-12
         # calendar audit found; same failure class here).
         exit_dte = self.exit_config.get('dte_min', 21)
-        candidates = candidates[candidates['dte'] > exit_dte]
+        window = (dtes >= dte_lo) & (dtes <= dte_hi) & (dtes > exit_dte)
 
-        if candidates.empty:
+        if not window.any():
             return None
 
         # Check VIX filters - strategy-specific first, then global fallback
@@ -155,19 +123,21 @@ class VerticalSpread(BaseStrategy):
                 print(f"  ❌ VIX filter failed: {vix:.1f}, range=[{vix_min}, {vix_max}]")
             return None  # VIX outside strategy's acceptable range
 
-        # Pin BOTH legs to the ONE expiration whose DTE is closest to the target. Delta-targeting
-        # across the whole window let each leg come from a different expiration — a diagonal
-        # priced and risk-modeled as if it were a vertical.
-        dte_pick = min(candidates['dte'].unique(), key=lambda d: abs(d - dte_target))
-        chain = candidates[candidates['dte'] == dte_pick]
+        # Pin BOTH legs to the ONE expiration whose DTE is closest to the target (first in chain
+        # order on a tie). Delta-targeting across the whole window let each leg come from a
+        # different expiration — a diagonal priced and risk-modeled as if it were a vertical.
+        pick = np.argmin(np.abs(dtes[window] - dte_target))
+        dte_pick, expiration = dtes[window][pick], expirations[window][pick]
 
-        # Find strikes based on delta targeting (within the pinned expiration only)
+        # Find strikes based on delta targeting (within the pinned expiration only); both targets
+        # resolve in one lookup against the day's sorted delta index.
         short_delta = self.entry_config.get('short_delta', 0.30)
         long_delta = self.entry_config.get('long_delta', 0.20)
-
-        short_strike = self._find_strike_by_delta(chain, short_delta, option_type)
-        if short_strike is None:
+        short_row, long_row = day.nearest_delta(expiration, type_code, [short_delta, long_delta],
+                                                tolerance=0.05)
+        if short_row < 0:
             return None  # No strike within delta tolerance on this expiration
+        short_strike = day.strike[short_row]
 
         # Fixed strike-width wing (takes precedence over long_delta): pin the long leg a fixed
         # dollar width further OTM than the short leg (puts: lower strike, calls: higher strike).
@@ -179,18 +149,18 @@ class VerticalSpread(BaseStrategy):
             long_strike = (short_strike - strike_width if option_type == 'put'
                            else short_strike + strike_width)
         else:
-            long_strike = self._find_strike_by_delta(chain, long_delta, option_type)
+            long_strike = day.strike[long_row] if long_row >= 0 else None
 
         if not short_strike or not long_strike or short_strike == long_strike:
             return None  # Need two distinct strikes (degenerate spread otherwise)
 
         # Price from the exact legs selected above; net debit (>0) or credit (<0) at the limit fill
-        rows = self._leg_rows(chain, short_strike, long_strike, option_type)
-        if rows is None:
+        short_row, long_row = day.locate([short_strike, long_strike], [type_code, type_code],
+                                         [expiration, expiration])
+        if short_row < 0 or long_row < 0:
             return None  # A leg is missing from the chain
-        short_row, long_row = rows
         spread_price = net_open(
-            [(short_row['bid'], short_row['ask'], False), (long_row['bid'], long_row['ask'], True)],
+            [(day.bid[short_row], day.ask[short_row], False), (day.bid[long_row], day.ask[long_row], True)],
             fraction, extra
         )
 
@@ -215,7 +185,7 @@ class VerticalSpread(BaseStrategy):
         )
         # Both legs share this expiration; exits re-quote against it, never a lookalike strike
         # at some other expiration.
-        signal.expiration = short_row['expiration']
+        signal.expiration = options_data['expiration'].iloc[short_row]
         return signal
 
     def generate_exit_signal(
@@ -329,6 +299,111 @@ class VerticalSpread(BaseStrategy):
 
         return None  # No exit conditions met
 
+    def evaluate_exits(
+        self,
+        date: datetime,
+        book: PositionBook,
+        day: DayChain,
+        options_data: pd.DataFrame,
+        underlying_price: float,
+        **kwargs
+    ) -> List[Tuple[Position, Signal]]:
+        """
+        generate_exit_signal for every open position at once, over the position book.
+
+        Same rules, same order of checks and the same fills as generate_exit_signal (which stays
+        the reference); the held contracts are re-quoted through ``day`` in one batch and the
+        marks are written to the book and synced to the Position views. A position whose
+        expiration was never recorded (no pinned contract to re-quote) goes through
+        generate_exit_signal itself.
+
+        Returns:
+            (position, exit signal) pairs in book order
+        """
+        lf = kwargs.get('limit_fraction', 0.5)
+        mf = kwargs.get('market_fraction', 1.0)
+        extra = kwargs.get('extra_slippage', 0.0)
+        stop_slip = kwargs.get('stop_slippage', 0.0)
+        profit_target = self.exit_config.get('profit_target', 0.50)
+        stop_loss_pct = self.exit_config.get('stop_loss', 0.50)
+        dte_min = self.exit_config.get('dte_min', 21)
+        today = pd.Timestamp(date).normalize().as_unit('ns').value
+
+        expiration = book.expiration[:, 0]
+        scalar = (expiration == NO_EXPIRATION) | (book.n_legs < 2)
+        reasons: Dict[int, str] = {}
+
+        for row in np.flatnonzero(scalar):
+            signal = self.generate_exit_signal(date, book.positions[row], options_data,
+                                               underlying_price, **kwargs)
+            book.current_price[row] = np.nan if book.positions[row].current_price is None \
+                else book.positions[row].current_price
+            book.unrealized_pnl[row] = book.positions[row].unrealized_pnl
+            if signal is not None:
+                reasons[row] = signal.exit_reason
+
+        rows = np.flatnonzero(~scalar)
+        short_k, long_k = book.strike[rows, 0], book.strike[rows, 1]
+        option_type = book.option_type[rows, 0]
+        entry = book.entry_price[rows]
+        days_left = (expiration[rows] - expiration[rows] % DAY_NS - today) // DAY_NS
+
+        strike_width = np.abs(short_k - long_k)
+        max_profit = np.where(entry < 0, -entry, strike_width - entry)
+        max_loss = np.where(entry < 0, strike_width - max_profit, entry)
+
+        # Expiration reached: settle at intrinsic value (see generate_exit_signal).
+        expired = days_left <= 0
+
+        def _intrinsic(strike, code):
+            return np.where(code == 0, np.maximum(strike - underlying_price, 0.0),
+                            np.maximum(underlying_price - strike, 0.0))
+        settle = _intrinsic(long_k, book.option_type[rows, 1]) - _intrinsic(short_k, option_type)
+
+        # Re-quote the exact held contracts; a data gap holds the position unmarked.
+        exp = expiration[rows]
+        short_row = day.locate(short_k, option_type, exp)
+        long_row = day.locate(long_k, option_type, exp)
+        quoted = ~expired & (short_row >= 0) & (long_row >= 0)
+        # Unquoted legs (-1) read some row's quote, masked out by `quoted`; a day without any
+        # quotes reads a NaN one.
+        bid, ask = (day.bid, day.ask) if day.size else (np.full(1, np.nan), np.full(1, np.nan))
+        legs = [(bid[short_row], ask[short_row], False), (bid[long_row], ask[long_row], True)]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            close_val = np.where(quoted, net_close(legs, lf, extra), np.nan)
+            profit = close_val - entry
+            take = quoted & (profit > 0) & (max_profit > 0) & (profit / max_profit >= profit_target)
+            stop = quoted & ~take & (profit < 0) & (max_loss > 0) & ((-profit) / max_loss >= stop_loss_pct)
+        stop_val = net_close(legs, mf, extra) - stop_slip * np.abs(entry)
+        dte_exit = quoted & ~take & ~stop & (days_left <= dte_min)
+
+        marked = expired | quoted
+        price = np.where(expired, settle, np.where(stop, stop_val, close_val))
+        book.mark(rows[marked], price[marked])
+
+        for i in np.flatnonzero(expired | take | stop | dte_exit):
+            if expired[i]:
+                reason = "Expired: settled at intrinsic value"
+            elif take[i]:
+                reason = f"Profit target reached: {profit[i] / max_profit[i]:.1%} (target: {profit_target:.1%})"
+            elif stop[i]:
+                reason = f"Stop loss triggered: {(-profit[i]) / max_loss[i]:.1%} loss (limit: {stop_loss_pct:.1%})"
+            else:
+                reason = f"DTE exit: {days_left[i]} <= {dte_min}"
+            reasons[int(rows[i])] = reason
+
+        book.sync(rows[marked])
+        return [
+            (book.positions[row], Signal(
+                date=date,
+                signal_type='exit',
+                strategy_name=self.name,
+                underlying_price=underlying_price,
+                exit_reason=reasons[row]
+            ))
+            for row in sorted(reasons)
+        ]
+
     def calculate_position_size(
         self,
         signal: Signal,
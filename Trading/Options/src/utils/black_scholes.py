@@ -358,3 +358,152 @@ def calculate_all_greeks(
         'theta': theta(S, K, T, r, sigma, option_type, q),
         'vega': vega(S, K, T, r, sigma, q)
     }
+
+
+# ---------------------------------------------------------------------------
+# Array versions — same formulas, one call per batch of contracts
+# ---------------------------------------------------------------------------
+
+def black_scholes_price_array(
+    S: np.ndarray,
+    K: np.ndarray,
+    T: np.ndarray,
+    r: float,
+    sigma: np.ndarray,
+    is_call: np.ndarray,
+    q: float = 0.0
+) -> np.ndarray:
+    """
+    Vectorized `black_scholes_price` (same expiry / zero-vol conventions).
+
+    Args:
+        S, K, T, sigma: Arrays (or scalars) broadcast together
+        r: Risk-free interest rate (annual)
+        is_call: Boolean array, True for calls
+        q: Dividend yield (annual)
+
+    Returns:
+        Option prices (floored at 0)
+    """
+    S, K, T, sigma = (np.asarray(x, dtype=float) for x in (S, K, T, sigma))
+    is_call = np.asarray(is_call, dtype=bool)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sqrtT = np.sqrt(np.maximum(T, 0.0))
+        d1 = (np.log(S / K) + (r - q + 0.5 * sigma ** 2) * T) / (sigma * sqrtT)
+        d2 = d1 - sigma * sqrtT
+        disc_S = S * np.exp(-q * T)
+        disc_K = K * np.exp(-r * T)
+        price = np.where(is_call,
+                         disc_S * norm.cdf(d1) - disc_K * norm.cdf(d2),
+                         disc_K * norm.cdf(-d2) - disc_S * norm.cdf(-d1))
+    price = np.where(sigma <= 0, np.where(is_call, disc_S - disc_K, disc_K - disc_S), price)
+    price = np.where(T <= 0, np.where(is_call, S - K, K - S), price)
+    return np.maximum(price, 0.0)
+
+
+def implied_volatility_array(
+    option_price: np.ndarray,
+    S: np.ndarray,
+    K: np.ndarray,
+    T: np.ndarray,
+    r: float,
+    is_call: np.ndarray,
+    q: float = 0.0,
+    lo: float = 0.001,
+    hi: float = 5.0,
+    iterations: int = 60
+) -> np.ndarray:
+    """
+    Vectorized implied volatility by bisection on [lo, hi].
+
+    Price is monotone in volatility, so bisection brackets the same root
+    `implied_volatility` finds with Brent's method; 60 halvings of [0.001, 5]
+    are below float resolution. Where vega is so small that the price cannot
+    pin the volatility to 1e-12 (deep ITM / short-dated contracts, whose
+    price is flat in sigma over a wide range), the root is not unique and
+    the two solvers stop at different points; those contracts are re-solved
+    with `implied_volatility` so the result is the scalar one.
+
+    Returns:
+        Implied volatilities; NaN where T <= 0 or the price is outside the
+        [lo, hi] volatility bracket (where the scalar version returns 0.0)
+    """
+    price, S, K, T = (np.asarray(x, dtype=float) for x in (option_price, S, K, T))
+    is_call = np.asarray(is_call, dtype=bool)
+    shape = np.broadcast_shapes(price.shape, S.shape, K.shape, T.shape, is_call.shape)
+    a = np.full(shape, lo)
+    b = np.full(shape, hi)
+
+    def objective(sigma):
+        return black_scholes_price_array(S, K, T, r, sigma, is_call, q) - price
+
+    f_a, f_b = objective(a), objective(b)
+    solvable = (T > 0) & (f_a * f_b <= 0)
+    for _ in range(iterations):
+        mid = 0.5 * (a + b)
+        f_mid = objective(mid)
+        left = f_a * f_mid <= 0
+        b = np.where(left, mid, b)
+        a = np.where(left, a, mid)
+        f_a = np.where(left, f_a, f_mid)
+    iv = np.where(solvable, 0.5 * (a + b), np.nan)
+
+    # Flat price: float resolution of the price / vega exceeds 1e-12 in sigma
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sqrtT = np.sqrt(np.maximum(T, 0.0))
+        d1 = (np.log(S / K) + (r - q + 0.5 * iv ** 2) * T) / (iv * sqrtT)
+        vega_ = S * np.exp(-q * T) * norm.pdf(d1) * sqrtT
+    flat = solvable & ~(vega_ * 1e-12 > np.finfo(float).eps * (S + K))
+    if flat.any():
+        args = [np.broadcast_to(x, shape).ravel() for x in (price, S, K, T, is_call)]
+        iv = iv.ravel()
+        for j in np.flatnonzero(flat):
+            p_, S_, K_, T_, c_ = (x[j] for x in args)
+            sigma = implied_volatility(p_, S_, K_, T_, r, 'call' if c_ else 'put', q)
+            iv[j] = sigma if sigma > 0 else np.nan
+        iv = iv.reshape(shape)
+    return iv
+
+
+def greeks_array(
+    S: np.ndarray,
+    K: np.ndarray,
+    T: np.ndarray,
+    r: float,
+    sigma: np.ndarray,
+    is_call: np.ndarray,
+    q: float = 0.0
+) -> dict:
+    """
+    Vectorized delta, gamma, theta (per year) and vega (per 1% vol).
+
+    Matches `delta` / `gamma` / `theta` / `vega` for T > 0 and sigma > 0;
+    expired or zero-vol entries get the scalar functions' boundary values.
+
+    Returns:
+        Dictionary of arrays keyed 'delta', 'gamma', 'theta', 'vega'
+    """
+    S, K, T, sigma = (np.asarray(x, dtype=float) for x in (S, K, T, sigma))
+    is_call = np.asarray(is_call, dtype=bool)
+    live = (T > 0) & (sigma > 0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sqrtT = np.sqrt(np.maximum(T, 0.0))
+        d1 = (np.log(S / K) + (r - q + 0.5 * sigma ** 2) * T) / (sigma * sqrtT)
+        d2 = d1 - sigma * sqrtT
+        div = np.exp(-q * T)
+        disc_K = K * np.exp(-r * T)
+        pdf_d1 = norm.pdf(d1)
+        delta_ = np.where(is_call, div * norm.cdf(d1), -div * norm.cdf(-d1))
+        gamma_ = div * pdf_d1 / (S * sigma * sqrtT)
+        term1 = -(S * pdf_d1 * sigma * div) / (2 * sqrtT)
+        theta_ = np.where(is_call,
+                          term1 - r * disc_K * norm.cdf(d2) + q * S * div * norm.cdf(d1),
+                          term1 + r * disc_K * norm.cdf(-d2) - q * S * div * norm.cdf(-d1))
+        vega_ = S * div * pdf_d1 * sqrtT / 100
+    intrinsic_delta = np.where(is_call, (S > K).astype(float), -(S < K).astype(float))
+    return {
+        'delta': np.where(live, delta_, intrinsic_delta),
+        'gamma': np.where(live, gamma_, 0.0),
+        'theta': np.where(live, theta_, 0.0),
+        'vega': np.where(live, vega_, 0.0),
+    }
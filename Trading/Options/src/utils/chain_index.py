@@ -0,0 +1,172 @@
+"""Array index over one quote date's option chain, for vectorized contract lookup.
+
+Re-quoting a held contract used to be a boolean filter over the whole day's chain per leg per open
+position (``chain[(strike == K) & (option_type == t) & (expiration == e)]``), so a daily-cadence
+book of ~25 concurrent spreads paid ~50 full-chain scans every trading day. ``DayChain`` sorts the
+day's rows once by (expiration, option_type, strike) and answers a whole batch of contract lookups
+with one ``searchsorted``.
+
+Matching is exact (the same ``==`` the DataFrame filters used) and, where the chain lists a
+contract more than once, returns the FIRST such row in chain order, i.e. what ``.iloc[0]`` on the
+old filter picked.
+
+Strike-by-delta selection works the same way: entries used to copy the pinned expiration's slice
+and ``idxmin`` the |delta| distance once per leg per entry attempt. The delta index keeps each
+(expiration, option_type) group's rows sorted by |delta|, so any number of target deltas resolve
+with one ``searchsorted`` against their two neighbours.
+
+Usage:
+    day = DayChain(daily_options)
+    rows = day.locate(strikes, option_type_codes(types), expirations_ns)   # -1 = not quoted
+    bid, ask = day.bid[rows], day.ask[rows]
+    exps, dtes, first_rows = day.expirations(OPTION_TYPE_CODES['put'])
+    short_row, long_row = day.nearest_delta(exps[0], OPTION_TYPE_CODES['put'], [0.30, 0.20])
+"""
+from __future__ import annotations
+
+from typing import Iterable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# option_type -> small-int code used by DayChain and PositionBook (anything else -> -1)
+OPTION_TYPE_CODES = {'put': 0, 'call': 1}
+
+# int64 nanosecond stand-in for "no expiration" (NaT's own integer value)
+NO_EXPIRATION = np.iinfo(np.int64).min
+
+DAY_NS = 86_400 * 10**9
+
+
+def option_type_codes(types: Iterable) -> np.ndarray:
+    """'put'/'call' labels -> int8 codes (-1 for anything else, including None)."""
+    return np.array([OPTION_TYPE_CODES.get(t, -1) for t in types], dtype=np.int8)
+
+
+def expiration_ns(expiration) -> int:
+    """A leg's expiration (Timestamp / datetime / str / None) as int64 ns, NO_EXPIRATION if unset."""
+    if expiration is None or pd.isna(expiration):
+        return NO_EXPIRATION
+    return int(pd.Timestamp(expiration).as_unit('ns').value)
+
+
+class DayChain:
+    """One quote date's chain as flat arrays plus a sorted (expiration, type, strike) key."""
+
+    def __init__(self, chain: pd.DataFrame):
+        self.size = len(chain)
+        self.strike = chain['strike'].to_numpy(dtype=float)
+        self.option_type = chain['option_type'].map(OPTION_TYPE_CODES).fillna(-1).to_numpy(dtype=np.int8)
+        self.expiration = chain['expiration'].to_numpy(dtype='datetime64[ns]').view(np.int64)
+        self.bid = chain['bid'].to_numpy(dtype=float)
+        self.ask = chain['ask'].to_numpy(dtype=float)
+        self.dte = chain['dte'].to_numpy(dtype=float) if 'dte' in chain.columns else None
+        self.delta = chain['delta'].to_numpy(dtype=float) if 'delta' in chain.columns else None
+
+        # Dense ranks make the composite key an exact int64 (no float packing of the strike).
+        self._expirations = np.unique(self.expiration)
+        self._strikes = np.unique(self.strike)
+        self._exp_rank = np.searchsorted(self._expirations, self.expiration)
+        strike_rank = np.searchsorted(self._strikes, self.strike)
+        self._group = self._group_key(self._exp_rank, self.option_type)
+        key = self._group * (len(self._strikes) + 1) + strike_rank
+        self._order = np.argsort(key, kind='stable')  # stable: duplicates keep chain order
+        self._keys = key[self._order]
+        self._delta_index = None  # built on the first nearest_delta call
+
+    @staticmethod
+    def _group_key(exp_rank: np.ndarray, type_code: np.ndarray) -> np.ndarray:
+        """(expiration, option_type) group id."""
+        return np.asarray(exp_rank, dtype=np.int64) * 3 + (np.asarray(type_code, dtype=np.int64) + 1)
+
+    def _exp_rank_of(self, expirations: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """(rank, known) of expirations among the day's expirations."""
+        rank = np.searchsorted(self._expirations, expirations)
+        known = rank < len(self._expirations)
+        known[known] &= self._expirations[rank[known]] == expirations[known]
+        return rank, known
+
+    def locate(self, strikes, type_codes, expirations) -> np.ndarray:
+        """Chain row positions (``iloc``) of the contracts (strike, type code, expiration ns),
+        -1 where the day does not quote that exact contract."""
+        strikes = np.asarray(strikes, dtype=float)
+        type_codes = np.asarray(type_codes, dtype=np.int8)
+        expirations = np.asarray(expirations, dtype=np.int64)
+        if self.size == 0 or strikes.size == 0:
+            return np.full(strikes.shape, -1, dtype=np.int64)
+
+        exp_rank, known = self._exp_rank_of(expirations)
+        strike_rank = np.searchsorted(self._strikes, strikes)
+        known &= (strike_rank < len(self._strikes)) & (type_codes >= 0)
+        known[known] &= self._strikes[strike_rank[known]] == strikes[known]
+
+        key = self._group_key(np.where(known, exp_rank, 0), type_codes) * (len(self._strikes) + 1) \
+            + np.where(known, strike_rank, 0)
+        pos = np.searchsorted(self._keys, key)
+        hit = known & (pos < len(self._keys))
+        hit[hit] &= self._keys[pos[hit]] == key[hit]
+        return np.where(hit, self._order[np.minimum(pos, len(self._order) - 1)], -1)
+
+    def expirations(self, type_code: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(expiration ns, dte, first chain row) of every expiration the day quotes for one option
+        type (both types when ``type_code`` is None), in order of first appearance in the chain.
+
+        The dte is the first row's, which is the expiration's dte on any chain whose dte column
+        is derived from (expiration - quote_date).
+        """
+        rows = np.arange(self.size) if type_code is None else np.flatnonzero(self.option_type == type_code)
+        _, first = np.unique(self._exp_rank[rows], return_index=True)
+        first_rows = np.sort(rows[first])
+        dte = self.dte[first_rows] if self.dte is not None else np.full(len(first_rows), np.nan)
+        return self.expiration[first_rows], dte, first_rows
+
+    def nearest_delta(self, expiration: int, type_code: int, targets,
+                      tolerance: float = np.inf) -> np.ndarray:
+        """Chain rows whose |delta| is closest to each |target| within one (expiration, type)
+        group, -1 where the group is empty or the closest distance exceeds ``tolerance``.
+
+        Ties resolve like ``idxmin`` over the group in chain order: among rows at the minimal
+        distance (equal |delta|, or an exact tie between the neighbour below and the neighbour
+        above the target), the first row in the chain wins. Rows with a NaN delta are ignored.
+        """
+        targets = np.abs(np.atleast_1d(np.asarray(targets, dtype=float)))
+        out = np.full(targets.shape, -1, dtype=np.int64)
+        if self.delta is None:
+            return out
+        rank, known = self._exp_rank_of(np.array([expiration], dtype=np.int64))
+        if not known[0] or type_code < 0:
+            return out
+        keys, starts, ends, abs_delta, rows, run_start = self._get_delta_index()
+        key = self._group_key(rank, type_code)[0]
+        g = np.searchsorted(keys, key)
+        if g == len(keys) or keys[g] != key:
+            return out
+
+        lo, hi = starts[g], ends[g]
+        a, r, first = abs_delta[lo:hi], rows[lo:hi], run_start[lo:hi] - lo
+        pos = np.searchsorted(a, targets)
+        below, above = np.maximum(pos - 1, 0), np.minimum(pos, len(a) - 1)
+        d_below = np.where(pos > 0, np.abs(a[below] - targets), np.inf)
+        d_above = np.where(pos < len(a), np.abs(a[above] - targets), np.inf)
+        row_below, row_above = r[first[below]], r[above]   # `above` already starts its run
+        best = np.where(d_below < d_above, row_below,
+                        np.where(d_above < d_below, row_above, np.minimum(row_below, row_above)))
+        return np.where(np.minimum(d_below, d_above) <= tolerance, best, out)
+
+    def _get_delta_index(self):
+        """Rows with a delta, sorted by (group, |delta|, chain row), with group bounds and the
+        start of each run of equal |delta| (whose first element is its earliest chain row)."""
+        if self._delta_index is None:
+            abs_delta = np.abs(self.delta)
+            rows = np.flatnonzero(~np.isnan(abs_delta) & (self.option_type >= 0))
+            group = self._group[rows]
+            order = np.lexsort((rows, abs_delta[rows], group))
+            rows, group = rows[order], group[order]
+            a = abs_delta[rows]
+            new_run = np.ones(len(rows), dtype=bool)
+            new_run[1:] = (group[1:] != group[:-1]) | (a[1:] != a[:-1])
+            run_start = np.maximum.accumulate(np.where(new_run, np.arange(len(rows)), 0))
+            keys, starts = np.unique(group, return_index=True)
+            ends = np.append(starts[1:], len(group))
+            self._delta_index = (keys, starts, ends, a, rows, run_start)
+        return self._delta_index
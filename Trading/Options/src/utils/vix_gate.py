@@ -18,33 +18,17 @@ degrees of freedom to the search and does not deflate the Deflated Sharpe.
 """
 from __future__ import annotations
 
-from pathlib import Path
-
 import pandas as pd
 
-_CACHE = Path(__file__).resolve().parents[2] / "data" / "processed" / "vix_history.csv"
+from ..data_fetchers.market_context import get_market_context
 
 
 def _load_vix(start: str, end: str) -> pd.Series:
-    """Daily ^VIX close over [start, end], disk-cached. Refetches only if the cache can't cover it."""
-    want_start, want_end = pd.Timestamp(start), pd.Timestamp(end)
-    if _CACHE.exists():
-        cached = pd.read_csv(_CACHE, parse_dates=["date"]).set_index("date")["vix"].sort_index()
-        if cached.index.min() <= want_start and cached.index.max() >= want_end:
-            return cached
-
-    import yfinance as yf  # local import: only needed when (re)building the cache
-    raw = yf.download("^VIX", start=start, end=end, progress=False, auto_adjust=False)
-    if raw.empty:
-        raise RuntimeError(f"yfinance returned no ^VIX data for {start}..{end}")
-    close = raw["Close"]
-    if isinstance(close, pd.DataFrame):  # yfinance can return a 1-col frame for a single ticker
-        close = close.iloc[:, 0]
-    vix = close.dropna()
-    vix.index = pd.to_datetime(vix.index).tz_localize(None).normalize()
-    vix.name = "vix"
-    _CACHE.parent.mkdir(parents=True, exist_ok=True)
-    vix.rename_axis("date").to_frame().to_csv(_CACHE)
+    """Daily ^VIX close, covering [start, end], from the shared market context (which fetches only
+    the dates it has never been asked for)."""
+    vix = get_market_context().ensure(start, end).series("vix")
+    if vix.loc[pd.Timestamp(start):pd.Timestamp(end)].empty:
+        raise RuntimeError(f"no ^VIX data for {start}..{end}")
     return vix
 
 
@@ -53,13 +37,18 @@ def vix_iv_rank(start: str, end: str, window: int = 252, warmup_days: int = 420)
 
     Causal w.r.t. the same-day VIX close, matching how the engine's existing absolute VIX filter
     already gates entries (it reads that day's `vix` column). min_periods is set to a half-window so
-    a slightly-short warmup still yields a usable (if wider-windowed) rank rather than NaN.
+    a slightly-short warmup still yields a usable (if wider-windowed) rank rather than NaN. The
+    default window is stored precomputed in the market context, so only other windows roll here.
     """
     warm_start = (pd.Timestamp(start) - pd.Timedelta(days=warmup_days)).strftime("%Y-%m-%d")
     vix = _load_vix(warm_start, end)
-    lo = vix.rolling(window, min_periods=window // 2).min()
-    hi = vix.rolling(window, min_periods=window // 2).max()
-    rank = (vix - lo) / (hi - lo).replace(0, pd.NA) * 100.0
+    context = get_market_context()
+    if window == context.window:
+        rank = context.series("vix_rank", dropna=False).reindex(vix.index)
+    else:
+        lo = vix.rolling(window, min_periods=window // 2).min()
+        hi = vix.rolling(window, min_periods=window // 2).max()
+        rank = (vix - lo) / (hi - lo).replace(0, pd.NA) * 100.0
     return rank.loc[pd.Timestamp(start):pd.Timestamp(end)]
 
 
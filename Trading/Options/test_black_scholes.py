@@ -0,0 +1,83 @@
+"""Vectorized Black-Scholes functions against the scalar ones (src/utils/black_scholes.py)."""
+import numpy as np
+
+from src.utils.black_scholes import (
+    black_scholes_price, black_scholes_price_array, delta, gamma, greeks_array,
+    implied_volatility, implied_volatility_array, theta, vega,
+)
+
+R, Q = 0.045, 0.013
+
+
+def _grid(n=400, seed=0):
+    rng = np.random.default_rng(seed)
+    S = rng.uniform(300, 600, n)
+    K = S * rng.uniform(0.6, 1.4, n)
+    T = rng.integers(0, 120, n) / 365.0                       # includes expired (T = 0)
+    sigma = np.where(rng.random(n) < 0.05, 0.0, rng.uniform(0.05, 0.8, n))
+    is_call = rng.random(n) < 0.5
+    return S, K, T, sigma, is_call
+
+
+def _kind(is_call):
+    return "call" if is_call else "put"
+
+
+def test_price_array_matches_scalar_including_expiry_and_zero_vol():
+    S, K, T, sigma, is_call = _grid()
+    scalar = [black_scholes_price(*args, R, sig, _kind(c), Q)
+              for *args, sig, c in zip(S, K, T, sigma, is_call)]
+    np.testing.assert_allclose(black_scholes_price_array(S, K, T, R, sigma, is_call, Q),
+                               scalar, rtol=1e-12, atol=1e-12)
+
+
+def test_greeks_array_matches_scalar_functions():
+    S, K, T, sigma, is_call = _grid(seed=1)
+    g = greeks_array(S, K, T, R, sigma, is_call, Q)
+    rows = list(zip(S, K, T, sigma, is_call))
+    np.testing.assert_allclose(g["delta"], [delta(s, k, t, R, v, _kind(c), Q)
+                                            for s, k, t, v, c in rows], rtol=1e-12, atol=1e-15)
+    np.testing.assert_allclose(g["gamma"], [gamma(s, k, t, R, v, Q)
+                                            for s, k, t, v, c in rows], rtol=1e-12, atol=1e-15)
+    np.testing.assert_allclose(g["theta"], [theta(s, k, t, R, v, _kind(c), Q)
+                                            for s, k, t, v, c in rows], rtol=1e-12, atol=1e-12)
+    np.testing.assert_allclose(g["vega"], [vega(s, k, t, R, v, Q)
+                                           for s, k, t, v, c in rows], rtol=1e-12, atol=1e-15)
+
+
+def _scalar_iv(price, S, K, T, is_call):
+    iv = np.array([implied_volatility(p, s, k, t, R, _kind(c), Q)
+                   for p, s, k, t, c in zip(price, S, K, T, is_call)])
+    return np.where(iv > 0, iv, np.nan)                       # the scalar version's 0.0 = failed
+
+
+def test_implied_volatility_array_matches_scalar_and_nan_placement():
+    S, K, T, sigma, is_call = _grid(seed=2)
+    sigma = np.maximum(sigma, 0.05)
+    price = black_scholes_price_array(S, K, T, R, sigma, is_call, Q)
+    # Below intrinsic / above the underlying (unsolvable), and zero prices
+    price[:10] = np.maximum(price[:10] - 50.0, 0.0)
+    price[10:20] = S[10:20] * 2
+    price[20:25] = 0.0
+
+    array = implied_volatility_array(price, S, K, T, R, is_call, Q)
+    scalar = _scalar_iv(price, S, K, T, is_call)
+    np.testing.assert_array_equal(np.isnan(array), np.isnan(scalar))
+    assert np.isnan(array[T == 0]).all()
+    assert np.isnan(array[10:20]).all()
+    np.testing.assert_allclose(array, scalar, rtol=0, atol=1e-8)
+
+
+def test_flat_vega_contracts_fall_back_to_the_scalar_root():
+    # Deep ITM / short-dated: the price is flat in sigma, so the root is not unique
+    S = np.full(6, 500.0)
+    K = np.array([300.0, 320.0, 350.0, 650.0, 700.0, 505.0])
+    T = np.array([2, 3, 5, 2, 3, 30]) / 365.0
+    is_call = np.array([True, True, True, False, False, True])
+    sigma = np.array([0.15, 0.2, 0.1, 0.2, 0.15, 0.2])
+    price = black_scholes_price_array(S, K, T, R, sigma, is_call, Q)
+
+    array = implied_volatility_array(price, S, K, T, R, is_call, Q)
+    scalar = _scalar_iv(price, S, K, T, is_call)
+    np.testing.assert_array_equal(array[:5], scalar[:5])      # re-solved with the scalar solver
+    np.testing.assert_allclose(array[5], sigma[5], rtol=1e-10)  # a normal contract: bisection
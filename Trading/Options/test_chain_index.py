@@ -0,0 +1,116 @@
+"""DayChain lookups against the DataFrame filters they replace (src/utils/chain_index.py)."""
+import numpy as np
+import pandas as pd
+
+from src.utils.chain_index import (
+    NO_EXPIRATION, OPTION_TYPE_CODES, DayChain, expiration_ns, option_type_codes,
+)
+
+EXPIRATIONS = pd.to_datetime(["2024-03-15", "2024-03-22", "2024-04-19"])
+
+
+def _chain(seed=0, n=600):
+    """A day's chain with duplicate contracts, NaN deltas and many equal |delta| values."""
+    rng = np.random.default_rng(seed)
+    chain = pd.DataFrame({
+        "expiration": EXPIRATIONS[rng.integers(0, len(EXPIRATIONS), n)],
+        "option_type": rng.choice(["put", "call"], n),
+        "strike": rng.integers(90, 130, n) * 5.0,
+        # Multiples of 1/64 are exact in binary, so equal |delta| and exact midpoint ties occur
+        "delta": rng.integers(1, 64, n) / 64.0,
+        "bid": rng.uniform(0, 5, n),
+        "ask": rng.uniform(5, 10, n),
+    })
+    chain["delta"] = np.where(chain["option_type"] == "put", -chain["delta"], chain["delta"])
+    chain.loc[rng.random(n) < 0.05, "delta"] = np.nan
+    chain.loc[rng.random(n) < 0.03, "option_type"] = "weekly"   # not a put/call label
+    chain["dte"] = (chain["expiration"] - pd.Timestamp("2024-03-01")).dt.days
+    return chain
+
+
+def _old_nearest(chain, expiration, option_type, target, tolerance=np.inf):
+    """The per-leg ``idxmin`` selection nearest_delta replaces (RangeIndex: label = row)."""
+    group = chain[(chain["expiration"] == expiration) & (chain["option_type"] == option_type)]
+    diff = (group["delta"].abs() - abs(target)).abs()
+    if diff.isna().all():
+        return -1
+    row = diff.idxmin()
+    return row if diff[row] <= tolerance else -1
+
+
+def _old_locate(chain, strike, option_type, expiration):
+    match = chain[(chain["strike"] == strike) & (chain["option_type"] == option_type)
+                  & (chain["expiration"] == expiration)]
+    return match.index[0] if len(match) else -1
+
+
+def test_nearest_delta_matches_idxmin_including_ties():
+    chain = _chain()
+    day = DayChain(chain)
+    # Exact midpoints between two quantized deltas (below/above distance ties), quantized deltas
+    # (equal-|delta| runs), arbitrary targets, and negative (put-signed) targets
+    targets = np.concatenate([np.arange(1, 128, 2) / 128.0, np.arange(0, 65) / 64.0,
+                              np.random.default_rng(1).uniform(0, 1, 50), [-0.30, -0.16]])
+    for expiration in EXPIRATIONS:
+        for option_type in ("put", "call"):
+            code = OPTION_TYPE_CODES[option_type]
+            got = day.nearest_delta(expiration_ns(expiration), code, targets)
+            want = [_old_nearest(chain, expiration, option_type, t) for t in targets]
+            np.testing.assert_array_equal(got, want)
+
+            got = day.nearest_delta(expiration_ns(expiration), code, targets, tolerance=1 / 256)
+            want = [_old_nearest(chain, expiration, option_type, t, 1 / 256) for t in targets]
+            np.testing.assert_array_equal(got, want)
+
+
+def test_nearest_delta_exact_distance_tie_takes_the_first_chain_row():
+    chain = pd.DataFrame({
+        "expiration": EXPIRATIONS[0], "option_type": "call",
+        "strike": [100.0, 105.0, 110.0, 115.0, 120.0],
+        "delta": [0.75, np.nan, 0.25, 0.25, 0.75],
+        "bid": 1.0, "ask": 1.1,
+    })
+    day = DayChain(chain)
+    exp = expiration_ns(EXPIRATIONS[0])
+    # 0.5 is equidistant from 0.25 (rows 2, 3) and 0.75 (rows 0, 4): row 0 is first in the chain
+    assert day.nearest_delta(exp, OPTION_TYPE_CODES["call"], [0.5, 0.25, 0.8]).tolist() == [0, 2, 0]
+    assert _old_nearest(chain, EXPIRATIONS[0], "call", 0.5) == 0
+
+    reordered = chain.iloc[[2, 1, 0, 3, 4]].reset_index(drop=True)
+    day = DayChain(reordered)
+    assert day.nearest_delta(exp, OPTION_TYPE_CODES["call"], [0.5]).tolist() == [0]   # the 0.25 row
+
+
+def test_nearest_delta_empty_and_all_nan_groups():
+    chain = pd.DataFrame({
+        "expiration": [EXPIRATIONS[0]] * 2 + [EXPIRATIONS[1]],
+        "option_type": ["put", "put", "call"],
+        "strike": [100.0, 105.0, 110.0], "delta": [np.nan, np.nan, 0.3],
+        "bid": 1.0, "ask": 1.1,
+    })
+    day = DayChain(chain)
+    put, call = OPTION_TYPE_CODES["put"], OPTION_TYPE_CODES["call"]
+    assert day.nearest_delta(expiration_ns(EXPIRATIONS[0]), put, [0.3]).tolist() == [-1]
+    assert day.nearest_delta(expiration_ns(EXPIRATIONS[0]), call, [0.3]).tolist() == [-1]
+    assert day.nearest_delta(expiration_ns(EXPIRATIONS[2]), call, [0.3]).tolist() == [-1]
+    assert day.nearest_delta(expiration_ns(EXPIRATIONS[1]), call, [0.3]).tolist() == [2]
+    assert day.nearest_delta(NO_EXPIRATION, call, [0.3]).tolist() == [-1]
+
+
+def test_locate_matches_the_filter_first_row_with_duplicates():
+    chain = _chain(seed=2)
+    day = DayChain(chain)
+    rng = np.random.default_rng(3)
+    n = 400
+    strikes = rng.integers(85, 135, n) * 5.0                    # some never quoted
+    strikes[:5] = [452.5, 0.0, -5.0, 1e9, np.nan]
+    types = rng.choice(["put", "call", "weekly", None], n, p=[0.45, 0.45, 0.05, 0.05])
+    expirations = list(rng.choice(list(EXPIRATIONS) + [pd.Timestamp("2024-05-17"), None], n))
+
+    got = day.locate(strikes, option_type_codes(types), [expiration_ns(e) for e in expirations])
+    want = [-1 if t not in OPTION_TYPE_CODES or e is None else _old_locate(chain, k, t, e)
+            for k, t, e in zip(strikes, types, expirations)]
+    np.testing.assert_array_equal(got, want)
+    duplicated = chain.duplicated(["expiration", "option_type", "strike"], keep=False).to_numpy()
+    assert duplicated[got[got >= 0]].any()                      # listed twice: first row wins
+    assert (got >= 0).sum() > n // 4
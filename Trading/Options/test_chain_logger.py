@@ -0,0 +1,142 @@
+"""Recorded provider payloads replayed through data_collection/chain_logger.py."""
+import json
+import sys
+
+import numpy as np
+import pandas as pd
+
+from data_collection import chain_logger
+from data_collection.chain_logger import (
+    SNAPSHOT_SCHEMA, finish_snapshot, normalize_schwab, normalize_yfinance, read_snapshot,
+    snapshot_files, validate_snapshot, write_snapshot,
+)
+
+
+def _yf_side(strikes, iv):
+    return {"strike": strikes, "bid": [4.1, 2.0, 0.55], "ask": [4.3, 2.1, 0.6],
+            "lastPrice": [4.2, 2.05, None], "volume": [10, None, 3],
+            "openInterest": [100, 50, 7], "impliedVolatility": iv}
+
+
+# What ``--record`` saves from yfinance (trimmed to three strikes per side)
+YF_PAYLOAD = {
+    "source": "yfinance", "asof": "2026-06-09", "spot": 512.3, "taken_at": "2026-06-09T15:00",
+    "vix": 17.2,
+    "expirations": {
+        "2026-06-09": {"calls": _yf_side([505.0, 510.0, 515.0], [0.2, 0.2, 0.2]),   # 0 DTE: dropped
+                       "puts": _yf_side([505.0, 510.0, 515.0], [0.2, 0.2, 0.2])},
+        "2026-06-16": {"calls": _yf_side([505.0, 510.0, 515.0], [0.18, 0.17, 0.0]),
+                       "puts": _yf_side([505.0, 510.0, 515.0], [0.2, 1e-5, None])},
+        "2026-07-17": {"calls": _yf_side([500.0, 510.0, 520.0], [0.19, 0.18, 0.17]),
+                       "puts": _yf_side([500.0, 510.0, 520.0], [0.21, 0.2, 0.19])},
+        "2026-10-16": {"calls": _yf_side([500.0, 510.0, 520.0], [0.2, 0.2, 0.2]),   # > max DTE
+                       "puts": _yf_side([500.0, 510.0, 520.0], [0.2, 0.2, 0.2])},
+    },
+}
+
+
+def _schwab_contract(exp, dte, strike, delta, **overrides):
+    contract = {"expirationDate": f"{exp}T20:00:00.000+00:00", "daysToExpiration": dte,
+                "strikePrice": strike, "bid": 1.5, "ask": 1.6, "last": 1.55, "totalVolume": 12,
+                "openInterest": 340, "volatility": 18.5, "delta": delta, "gamma": 0.02,
+                "theta": -0.15, "vega": 0.3}
+    contract.update(overrides)
+    return [contract]
+
+
+# What ``--record`` saves from Schwab (get_option_chain JSON, trimmed)
+SCHWAB_PAYLOAD = {
+    "source": "schwab", "asof": "2026-06-09", "taken_at": "2026-06-09T15:00", "vix": None,
+    "chain": {
+        "underlyingPrice": 512.3,
+        "callExpDateMap": {
+            "2026-06-16:7": {
+                "510.0": _schwab_contract("2026-06-16", 7, 510.0, 0.55),
+                "520.0": _schwab_contract("2026-06-16", 7, 520.0, 0.21, bid=None, volatility="NaN"),
+            },
+            "2026-09-18:101": {"510.0": _schwab_contract("2026-09-18", 101, 510.0, 0.52)},
+        },
+        "putExpDateMap": {
+            "2026-06-16:7": {
+                "500.0": _schwab_contract("2026-06-16", 7, 500.0, -0.18),
+                "510.0": _schwab_contract("2026-06-16", 7, 510.0, -0.45, last=0),
+            },
+        },
+    },
+}
+
+
+def _replay(tmp_path, monkeypatch, payload, *args):
+    recorded = tmp_path / "payload.json"
+    recorded.write_text(json.dumps(payload))
+    monkeypatch.setattr(sys, "argv", ["chain_logger.py", "--replay", str(recorded),
+                                      "--out-dir", str(tmp_path / "chains"), *args])
+    return chain_logger.main()
+
+
+def test_yfinance_payload_normalizes_and_round_trips(tmp_path):
+    df = finish_snapshot(normalize_yfinance(YF_PAYLOAD, 70), YF_PAYLOAD["asof"], YF_PAYLOAD["vix"])
+    assert list(df.columns) == list(SNAPSHOT_SCHEMA)
+    assert sorted(df["dte"].unique()) == [7, 38]
+    assert len(df) == 12
+    assert (df["vix"] == 17.2).all() and (df["quote_date"] == pd.Timestamp("2026-06-09")).all()
+
+    # Greeks only where yfinance gave an IV (a ~1e-5 IV gives a degenerate 0/1 delta)
+    no_iv = ~(df["iv"] > 0)
+    assert no_iv.sum() == 2
+    assert df.loc[no_iv, ["delta", "gamma", "theta", "vega"]].isna().all().all()
+    assert (df.loc[~no_iv & (df["option_type"] == "put"), "delta"] <= 0).all()
+    assert (df.loc[~no_iv & (df["option_type"] == "call"), "delta"] >= 0).all()
+    np.testing.assert_array_equal(df["abs_delta"], df["delta"].abs())
+
+    for fmt in ("parquet", "csv"):
+        out = write_snapshot(df, pd.Timestamp("2026-06-09 15:00"), tmp_path, fmt)
+        back = validate_snapshot(read_snapshot(out).assign(
+            quote_date=lambda f: pd.to_datetime(f["quote_date"]),
+            expiration=lambda f: pd.to_datetime(f["expiration"])))
+        pd.testing.assert_frame_equal(back, df)
+    assert [f.suffix for f in snapshot_files(tmp_path)] == [".csv", ".parquet"]
+
+
+def test_schwab_payload_normalizes_provider_fields(tmp_path):
+    df = finish_snapshot(normalize_schwab(SCHWAB_PAYLOAD, 70), SCHWAB_PAYLOAD["asof"], None)
+    assert len(df) == 4                                          # the 101-DTE call is dropped
+    assert (df["expiration"] == pd.Timestamp("2026-06-16")).all()
+    assert df["vix"].isna().all()
+    by_key = df.set_index(["option_type", "strike"])
+    assert by_key.loc[("call", 510.0), "iv"] == 0.185           # percent -> fraction
+    assert np.isnan(by_key.loc[("call", 520.0), "iv"])
+    assert by_key.loc[("call", 520.0), "bid"] == 0.0
+    assert by_key.loc[("put", 500.0), "abs_delta"] == 0.18
+
+    out = write_snapshot(df, pd.Timestamp("2026-06-09 15:00"), tmp_path)
+    assert len(read_snapshot(out)) == 4
+
+
+def test_main_writes_a_replayed_payload(tmp_path, monkeypatch, capsys):
+    assert _replay(tmp_path, monkeypatch, SCHWAB_PAYLOAD, "--moneyness", "0") == 0
+    files = snapshot_files(tmp_path / "chains")
+    assert len(files) == 1 and files[0].name.startswith("SPY_chain_2026-06-09_1500")
+    assert "[schwab] wrote 4 contracts" in capsys.readouterr().out
+
+
+def test_main_rejects_and_reports_duplicate_contracts(tmp_path, monkeypatch, capsys):
+    payload = json.loads(json.dumps(SCHWAB_PAYLOAD))
+    # The same contract listed under two strike keys
+    calls = payload["chain"]["callExpDateMap"]["2026-06-16:7"]
+    calls["510.00"] = _schwab_contract("2026-06-16", 7, 510.0, 0.55)
+
+    assert _replay(tmp_path, monkeypatch, payload) == 1
+    out = capsys.readouterr().out
+    assert "Malformed schwab chain, not written" in out and "duplicate" in out
+    assert snapshot_files(tmp_path / "chains") == []
+
+
+def test_main_rejects_and_reports_malformed_rows(tmp_path, monkeypatch, capsys):
+    payload = json.loads(json.dumps(YF_PAYLOAD))
+    payload["expirations"]["2026-07-17"]["puts"]["strike"] = [500.0, 0.0, 520.0]
+
+    assert _replay(tmp_path, monkeypatch, payload, "--moneyness", "0") == 1
+    out = capsys.readouterr().out
+    assert "Malformed yfinance chain, not written" in out and "non-positive strikes" in out
+    assert snapshot_files(tmp_path / "chains") == []
@@ -0,0 +1,123 @@
+"""Batched IV surface fits against per-date lstsq (src/data_fetchers/iv_surface_fitter.py)."""
+import numpy as np
+import pandas as pd
+
+from src.data_fetchers.iv_surface_fitter import (
+    COEFF_COLS, fit_day_surface, fit_surfaces, reprice_from_surfaces,
+)
+from src.utils.black_scholes import black_scholes_price, delta, theta, vega
+
+R, SPREAD, MIN_SPREAD, Q = 0.04, 0.03, 0.05, 0.015
+
+
+def _day(date, rng, expirations, n):
+    spot = 400 + 50 * rng.random()
+    strike = np.round(spot * rng.uniform(0.85, 1.15, n))
+    dte = rng.choice(expirations, n)
+    m, t = np.log(strike / spot), dte / 365.0
+    iv = 0.2 - 0.3 * m + 0.1 * t + 1.0 * m * m + rng.normal(0, 0.005, n)
+    return pd.DataFrame({"_date": date, "underlying_price": spot, "strike": strike, "dte": dte,
+                         "iv": iv, "option_type": rng.choice(["call", "put"], n)})
+
+
+def _real_data():
+    rng = np.random.default_rng(0)
+    days = pd.bdate_range("2024-01-02", periods=13)
+    frames = [_day(d, rng, [10, 24, 38, 66], 25) for d in days[:8]]
+    frames.append(_day(days[8], rng, [17], 12))                 # one expiration: rank 3
+    frames.append(_day(days[9], rng, [17, 45], 12))             # two expirations: rank 5
+    frames.append(_day(days[10], rng, [10, 24, 38], 5))         # below min_points
+    frames.append(_day(pd.NaT, rng, [10, 24, 38], 30))          # undated rows
+    day = _day(days[11], rng, [10, 24, 38, 66], 20)
+    day.loc[:4, "iv"] = np.nan                                  # partly unquoted
+    frames.append(day)
+    day = _day(days[12], rng, [10, 24, 38, 66], 25)
+    day.loc[3, "iv"] = 5.0                                      # bad print: fails the sanity check
+    frames.append(day)
+    return pd.concat(frames, ignore_index=True)
+
+
+def _lstsq_fit(day, min_points=6):
+    """The per-date fit ``fit_surfaces`` batches: one np.linalg.lstsq per date."""
+    day = day.dropna(subset=["iv", "dte", "underlying_price", "strike"])
+    if len(day) < min_points:
+        return None
+    spot = float(day["underlying_price"].iloc[0])
+    m = np.log(np.maximum(day["strike"].to_numpy(float), 0.01) / spot)
+    t = np.maximum(day["dte"].to_numpy(float), 1) / 365.0
+    iv = np.clip(day["iv"].to_numpy(float), 0.03, 3.0)
+    A = np.column_stack([np.ones_like(m), m, t, m * m, m * t, t * t])
+    coeffs = np.linalg.lstsq(A, iv, rcond=None)[0]
+    if np.any(np.abs(A @ coeffs - iv) > 0.75):
+        return None
+    return {"coeffs": coeffs, "spot": spot, "n": len(day), "m_lo": m.min(), "m_hi": m.max(),
+            "t_lo": t.min(), "t_hi": t.max()}
+
+
+def test_fit_surfaces_matches_per_date_lstsq():
+    real = _real_data()
+    surfaces = fit_surfaces(real)
+    expected = {date: _lstsq_fit(day) for date, day in real.groupby("_date")}
+    expected = {date: fit for date, fit in expected.items() if fit is not None}
+
+    assert list(surfaces.index) == sorted(expected)   # short, implausible and undated days left out
+    assert len(surfaces) == 11
+    for date, fit in expected.items():
+        row = surfaces.loc[date]
+        np.testing.assert_allclose(row[COEFF_COLS].to_numpy(float), fit["coeffs"],
+                                   rtol=1e-7, atol=1e-9)
+        for key in ("spot", "n", "m_lo", "m_hi", "t_lo", "t_hi"):
+            assert row[key] == fit[key], (date, key)
+
+        single = fit_day_surface(real[real["_date"] == date].drop(columns="_date"))
+        np.testing.assert_allclose(single["coeffs"], fit["coeffs"], rtol=1e-7, atol=1e-9)
+
+
+def test_rank_deficient_days_get_the_minimum_norm_solution():
+    real = _real_data()
+    surfaces = fit_surfaces(real)
+    for date in pd.bdate_range("2024-01-02", periods=12)[8:10]:
+        day = real[real["_date"] == date]
+        coeffs = surfaces.loc[date, COEFF_COLS].to_numpy(float)
+        assert np.linalg.matrix_rank(np.column_stack([
+            np.ones(len(day)), day["dte"], day["dte"] ** 2])) < 3
+        np.testing.assert_allclose(coeffs, _lstsq_fit(day)["coeffs"], rtol=1e-7, atol=1e-9)
+
+
+def test_reprice_from_surfaces_matches_scalar_black_scholes():
+    real = _real_data()
+    surfaces = fit_surfaces(real)
+    rng = np.random.default_rng(1)
+    unfitted = real["_date"].max() + pd.Timedelta(days=7)
+    rows = pd.concat([_day(d, rng, [3, 30, 90], 10) for d in [*surfaces.index[:3], unfitted]],
+                     ignore_index=True)
+    rows.loc[0, "dte"] = 0                                      # expiring today: intrinsic
+    rows = pd.concat([rows, _day(pd.NaT, rng, [30], 3)], ignore_index=True)
+
+    out, repriced = reprice_from_surfaces(rows, surfaces, R, SPREAD, MIN_SPREAD, Q)
+    hit = rows["_date"].isin(surfaces.index).to_numpy()
+    assert repriced == hit.sum() == 30
+    pd.testing.assert_frame_equal(out.loc[~hit, rows.columns], rows.loc[~hit])
+
+    for i in np.flatnonzero(hit):
+        row = rows.loc[i]
+        s = surfaces.loc[row["_date"]]
+        m = np.clip(np.log(row["strike"] / s["spot"]), s["m_lo"], s["m_hi"])
+        t = np.clip(row["dte"] / 365.0, s["t_lo"], s["t_hi"])
+        c = s[COEFF_COLS].to_numpy(float)
+        iv = np.clip(c[0] + c[1] * m + c[2] * t + c[3] * m * m + c[4] * m * t + c[5] * t * t,
+                     0.03, 3.0)
+        T = row["dte"] / 365.0
+        mid = black_scholes_price(row["underlying_price"], row["strike"], T, R, iv,
+                                  row["option_type"], Q)
+        half = max(SPREAD * mid, MIN_SPREAD) / 2
+        got = out.loc[i]
+        np.testing.assert_allclose([got["iv"], got["last"], got["bid"], got["ask"]],
+                                   [iv, mid, max(mid - half, 0.01), mid + half],
+                                   rtol=1e-10, atol=1e-12)
+        if T > 0:
+            args = (row["underlying_price"], row["strike"], T, R, iv)
+            np.testing.assert_allclose(
+                [got["delta"], got["theta"], got["vega"]],
+                [delta(*args, row["option_type"], Q), theta(*args, row["option_type"], Q) / 365,
+                 vega(*args, Q)], rtol=1e-9, atol=1e-12)
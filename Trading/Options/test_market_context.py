@@ -0,0 +1,121 @@
+"""Incremental refresh of the shared market context (src/data_fetchers/market_context.py)."""
+import numpy as np
+import pandas as pd
+
+from src.data_fetchers.market_context import (
+    VIX_TICKERS, MarketContext, _rank_and_percentile, fixture_source,
+)
+
+WINDOW = 20
+DATES = pd.bdate_range("2020-01-01", "2020-12-31")
+
+
+def _bars(seed, level, dates=DATES):
+    rng = np.random.default_rng(seed)
+    close = level * np.exp(np.cumsum(rng.normal(0, 0.02, len(dates))))
+    return pd.DataFrame({"Open": close, "High": close * 1.01, "Low": close * 0.99,
+                         "Close": close, "Volume": 1e6}, index=dates)
+
+
+def _frames():
+    frames = {"SPY": _bars(0, 300.0)}
+    for i, ticker in enumerate(VIX_TICKERS.values()):
+        frames[ticker] = _bars(i + 1, 20.0)
+    return frames
+
+
+class Recorder:
+    """fixture_source that logs (ticker, start, end) and can fail chosen tickers"""
+
+    def __init__(self, frames, fail=()):
+        self.source = fixture_source(frames)
+        self.fail = set(fail)
+        self.calls = []
+
+    def __call__(self, ticker, start, end):
+        self.calls.append((ticker, start, end))
+        if ticker in self.fail:
+            raise ConnectionError(f"{ticker} unavailable")
+        return self.source(ticker, start, end)
+
+    def spans(self, ticker):
+        return [(start, end) for t, start, end in self.calls if t == ticker]
+
+
+def _open(tmp_path, source):
+    return MarketContext("SPY", cache_dir=tmp_path, source=source, window=WINDOW)
+
+
+def _assert_ranks_match_full_recompute(ctx):
+    vix = ctx.series("vix")
+    rank, pct = _rank_and_percentile(vix, WINDOW)
+    np.testing.assert_allclose(ctx.series("vix_rank", dropna=False).loc[vix.index], rank)
+    np.testing.assert_allclose(ctx.series("vix_percentile", dropna=False).loc[vix.index], pct)
+
+
+def test_reopened_context_serves_the_cached_span_without_fetching(tmp_path):
+    frames = _frames()
+    first = _open(tmp_path, Recorder(frames))
+    first.ensure("2020-02-03", "2020-10-30")
+
+    source = Recorder(frames)
+    reopened = _open(tmp_path, source).ensure("2020-03-02", "2020-10-30")
+    assert source.calls == []
+    pd.testing.assert_frame_equal(reopened.frame(), first.frame(), check_freq=False)
+    np.testing.assert_allclose(reopened.series("close").to_numpy(),
+                               frames["SPY"].loc["2020-02-03":"2020-10-30", "Close"].to_numpy())
+
+
+def test_head_and_tail_extension_fetch_only_the_missing_span(tmp_path):
+    frames = _frames()
+    _open(tmp_path, Recorder(frames)).ensure("2020-04-01", "2020-06-30")
+
+    source = Recorder(frames)
+    ctx = _open(tmp_path, source).ensure("2020-04-01", "2020-09-30")
+    # Tail: from the last cached row (re-read) to the new end
+    for ticker in ["SPY", *VIX_TICKERS.values()]:
+        assert source.spans(ticker) == [("2020-06-30", "2020-09-30")]
+    _assert_ranks_match_full_recompute(ctx)
+
+    source = Recorder(frames)
+    ctx = _open(tmp_path, source).ensure("2020-01-02", "2020-09-30")
+    # Head: from the new start through the first cached row
+    for ticker in ["SPY", *VIX_TICKERS.values()]:
+        assert source.spans(ticker) == [("2020-01-02", "2020-04-01")]
+    _assert_ranks_match_full_recompute(ctx)
+    assert ctx.series("close").index[0] == pd.Timestamp("2020-01-02")
+
+
+def test_incremental_ranks_equal_a_full_recompute_across_many_tail_refreshes(tmp_path):
+    frames = _frames()
+    _open(tmp_path, Recorder(frames)).ensure("2020-01-01", "2020-01-31")
+    for end in pd.date_range("2020-02-07", "2020-12-31", freq="9D"):
+        ctx = _open(tmp_path, Recorder(frames)).ensure("2020-01-01", end)
+        _assert_ranks_match_full_recompute(ctx)
+
+
+def test_failed_tenor_is_retried_on_the_next_run(tmp_path):
+    frames = _frames()
+    ctx = _open(tmp_path, Recorder(frames, fail={"^VIX9D"})).ensure("2020-01-01", "2020-06-30")
+    assert ctx.series("vix9d").empty
+    assert ctx.manifest["coverage"]["vix9d"] == [None, None]
+
+    source = Recorder(frames)
+    ctx = _open(tmp_path, source).ensure("2020-01-01", "2020-06-30")
+    assert [ticker for ticker, _, _ in source.calls] == ["^VIX9D"]
+    np.testing.assert_allclose(ctx.series("vix9d").to_numpy(),
+                               frames["^VIX9D"].loc["2020-01-01":"2020-06-30", "Close"].to_numpy())
+
+
+def test_rebased_close_forces_a_full_underlying_refetch(tmp_path):
+    frames = _frames()
+    _open(tmp_path, Recorder(frames)).ensure("2020-01-01", "2020-06-30")
+
+    # A dividend re-bases the whole adjusted history
+    rebased = dict(frames, SPY=frames["SPY"] * [0.99, 0.99, 0.99, 0.99, 1.0])
+    source = Recorder(rebased)
+    ctx = _open(tmp_path, source).ensure("2020-01-01", "2020-09-30")
+    assert source.spans("SPY") == [("2020-06-30", "2020-09-30"), ("2020-01-01", "2020-09-30")]
+    assert source.spans("^VIX") == [("2020-06-30", "2020-09-30")]
+    np.testing.assert_allclose(ctx.series("close").to_numpy(),
+                               rebased["SPY"].loc["2020-01-01":"2020-09-30", "Close"].to_numpy())
@@ -0,0 +1,138 @@
+"""Resumable Massive download against a local fake API (src/data_fetchers/massive_loader.py)."""
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data_fetchers import massive_loader
+from src.data_fetchers.massive_loader import ContractSpool, download_massive
+from src.utils.black_scholes import black_scholes_price
+
+DAYS = pd.bdate_range("2023-11-01", "2024-04-30")
+SPY = pd.Series(450 * np.exp(np.cumsum(np.random.default_rng(0).normal(0, 0.01, len(DAYS)))),
+                index=DAYS)
+VIX = pd.Series(np.linspace(12, 25, len(DAYS)), index=DAYS).drop(DAYS[40])   # one missing day
+
+
+def _contracts():
+    contracts = []
+    for exp in pd.date_range("2024-01-05", "2024-03-29", freq="W-FRI"):
+        for strike in (440.0, 450.0, 460.0):
+            for kind in ("call", "put"):
+                ticker = f"O:SPY{exp:%y%m%d}{kind[0].upper()}{int(strike * 1000):08d}"
+                contracts.append({"ticker": ticker, "strike_price": strike, "contract_type": kind,
+                                  "expiration_date": f"{exp:%Y-%m-%d}"})
+    return contracts
+
+
+def _bars(contract, n):
+    exp = pd.Timestamp(contract["expiration_date"])
+    bars = []
+    for j, day in enumerate(DAYS[(DAYS >= exp - pd.Timedelta(days=45)) & (DAYS <= exp)]):
+        price = black_scholes_price(SPY[day], contract["strike_price"], (exp - day).days / 365,
+                                    0.04, 0.15 + 0.01 * (n % 7), contract["contract_type"], 0.015)
+        bars.append({"t": int(day.timestamp() * 1000), "c": round(price, 2), "v": 10 + j, "o": 1})
+    return bars if n % 11 else []                               # some contracts have no bars
+
+
+CONTRACTS = _contracts()
+BARS = {c["ticker"]: _bars(c, n) for n, c in enumerate(CONTRACTS)}
+
+
+@pytest.fixture
+def api():
+    """Fake Polygon/Massive server; ``api.requested`` lists the aggs tickers asked for."""
+    requested = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            path = urlsplit(self.path).path
+            if path == "/v3/reference/options/contracts":
+                body = {"results": CONTRACTS}
+            else:
+                ticker = path.split("/")[4]
+                requested.append(ticker)
+                body = {"resultsCount": len(BARS[ticker]), "results": BARS[ticker]}
+            data = json.dumps(body).encode()
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    server.url = f"http://127.0.0.1:{server.server_address[1]}"
+    server.requested = requested
+    yield server
+    server.shutdown()
+
+
+def _download(api, root, **kwargs):
+    return download_massive("key", "2024-01-01", "2024-03-31", out_dir=str(root / "out"),
+                            raw_dir=str(root / "raw"), base_url=api.url, rate_limit_delay=0,
+                            spy_close=SPY, vix_close=VIX, segment_contracts=5, **kwargs)
+
+
+def test_interrupted_download_resumes_to_the_same_csv(api, tmp_path, monkeypatch):
+    reference = open(_download(api, tmp_path / "ref")).read()
+    assert len(pd.read_csv(tmp_path / "ref" / "out" / "SPY_real_options_2024-01-01_2024-03-31.csv"))
+
+    fetch = massive_loader._fetch_aggs
+    calls = []
+
+    def interrupt(*args, **kwargs):
+        calls.append(args)
+        if len(calls) == 13:                                    # probe + 11 contracts, then Ctrl-C
+            raise KeyboardInterrupt
+        return fetch(*args, **kwargs)
+
+    monkeypatch.setattr(massive_loader, "_fetch_aggs", interrupt)
+    with pytest.raises(KeyboardInterrupt):
+        _download(api, tmp_path / "run")
+    monkeypatch.setattr(massive_loader, "_fetch_aggs", fetch)
+    done = set(ContractSpool(tmp_path / "run" / "raw").done)
+    assert len(done) == 11
+
+    # A crash between segment write and manifest append, and mid-append
+    spool_dir = tmp_path / "run" / "raw" / "spool"
+    (spool_dir / "segment_999999.csv").write_text("junk")
+    with (spool_dir / "manifest.jsonl").open("a") as f:
+        f.write('{"segment": "segment_000009.csv", "tick')
+
+    api.requested.clear()
+    resumed = _download(api, tmp_path / "run")
+    assert open(resumed).read() == reference
+    assert not done & set(api.requested)
+    assert len(api.requested) == len(CONTRACTS) - len(done) + 1   # + the preflight probe
+    assert not (spool_dir / "segment_999999.csv").exists()
+
+
+def test_spool_recovers_from_a_torn_manifest_and_orphan_segment(tmp_path):
+    rows = pd.DataFrame({col: [1.0, 2.0] for col in massive_loader.OUT_COLS})
+    spool = ContractSpool(tmp_path)
+    spool.write(["A", "B"], rows)
+    spool.write(["C"], rows.iloc[:0])                            # a batch without usable bars
+    spool.write(["D"], rows.iloc[:1])
+    manifest = spool.manifest.read_text()
+
+    with spool.manifest.open("a") as f:
+        f.write('{"segment": "segment_000003.parquet", "tickers": ["E"')
+    orphan = spool.dir / "segment_000003.csv"
+    orphan.write_text("junk")
+
+    reopened = ContractSpool(tmp_path)
+    assert reopened.done == {"A", "B", "C", "D"}
+    assert reopened.rows == 3
+    assert reopened.manifest.read_text() == manifest
+    assert not orphan.exists()
+    assert sum(len(frame) for frame in reopened.frames()) == 3
+
+    reopened.write(["E"], rows)
+    assert ContractSpool(tmp_path).done == {"A", "B", "C", "D", "E"}
@@ -0,0 +1,93 @@
+"""Batch metrics engine against PerformanceAnalyzer (src/analysis/metrics.py)."""
+import numpy as np
+import pandas as pd
+
+from src.analysis.metrics import (
+    PerformanceAnalyzer, batch_performance_metrics, calculate_batch_metrics,
+    stack_backtest_results,
+)
+
+DATES = pd.bdate_range("2022-01-03", "2023-12-29")
+
+
+def _result(rng, lo=0, hi=None, n_trades=20, flat=False, wins_only=False):
+    dates = DATES[lo:hi]
+    value = 100_000 * np.cumprod(1 + rng.normal(0.0004, 0.01, len(dates)))
+    if flat:
+        value[:] = 100_000.0
+    equity = pd.DataFrame({"date": dates, "total_value": value})
+    trades = pd.DataFrame({"net_pnl": np.round(rng.normal(20, 300, n_trades), 2),
+                           "days_in_trade": rng.integers(1, 40, n_trades)})
+    if wins_only:
+        trades["net_pnl"] = trades["net_pnl"].abs() + 1
+    elif n_trades:
+        trades.loc[0, "net_pnl"] = 0.0                          # break-even counts as a loss
+    return {"equity_curve": equity, "trades": trades, "initial_capital": 100_000.0}
+
+
+def _results():
+    rng = np.random.default_rng(0)
+    return {
+        "full": _result(rng),
+        "late_start": _result(rng, lo=37),
+        "early_end": _result(rng, hi=-52),                      # ends mid-month
+        "both": _result(rng, lo=120, hi=300),
+        "short": _result(rng, lo=200, hi=205),                  # inside one month
+        "no_trades": _result(rng, lo=10, n_trades=0),
+        "no_trades_short": _result(rng, hi=60, n_trades=0),
+        "wins_only": _result(rng, wins_only=True),
+        "one_win": _result(rng, lo=80, n_trades=1, wins_only=True),
+    }
+
+
+def _assert_same(batch, expected, label):
+    for key, want in expected.items():
+        got = batch[key]
+        if np.isinf(want):
+            assert got == want, (label, key)
+        else:
+            assert np.isclose(got, want, rtol=1e-9, atol=1e-9), (label, key, got, want)
+
+
+def test_batch_matches_performance_analyzer_per_config():
+    results = _results()
+    batch = calculate_batch_metrics(results)
+    assert list(batch.index) == list(results)
+    for label, result in results.items():
+        expected = PerformanceAnalyzer(result["equity_curve"], result["trades"]) \
+            .calculate_all_metrics(result["initial_capital"])
+        if len(result["trades"]):
+            assert list(batch.columns) == list(expected)
+        _assert_same(batch.loc[label], expected, label)
+
+    assert (batch.loc[["no_trades", "no_trades_short"], "total_trades"] == 0).all()
+    assert (batch.loc[["no_trades", "no_trades_short"], "avg_days_in_trade"] == 0).all()
+    assert np.isinf(batch.loc[["wins_only", "one_win"], "profit_factor"]).all()
+    assert (batch.loc[["wins_only", "one_win"], "largest_loss"] == 0).all()
+
+
+def test_batch_labels_trades_through_config_ids():
+    results = _results()
+    equity, dates, trades, capital = stack_backtest_results(results)
+    labels = [f"cfg{i}" for i in range(len(results))][::-1]
+    trades["config"] = np.asarray(labels)[trades["config"]]
+
+    by_label = batch_performance_metrics(equity, dates, trades, capital, config_ids=labels)
+    by_position = calculate_batch_metrics(results)
+    np.testing.assert_array_equal(by_label.to_numpy(), by_position.to_numpy())
+
+
+def test_flat_equity_curve_scores_zero_sharpe():
+    # The one intentional deviation: PerformanceAnalyzer divides the constant excess return
+    # by the roundoff left in its std, the batch engine calls that zero volatility.
+    rng = np.random.default_rng(1)
+    results = {"flat": _result(rng, flat=True), "flat_short": _result(rng, lo=300, flat=True)}
+    batch = calculate_batch_metrics(results)
+    for label, result in results.items():
+        expected = PerformanceAnalyzer(result["equity_curve"], result["trades"]) \
+            .calculate_all_metrics(result["initial_capital"])
+        assert batch.loc[label, "sharpe_ratio"] == 0.0
+        assert expected["sharpe_ratio"] == 0 or abs(expected["sharpe_ratio"]) > 1e6
+        assert batch.loc[label, "volatility_pct"] == expected["volatility_pct"] == 0.0
+        _assert_same(batch.loc[label], {k: v for k, v in expected.items() if k != "sharpe_ratio"},
+                     label)
@@ -0,0 +1,95 @@
+"""VerticalSpread.evaluate_exits against the per-position exit loop it replaces."""
+import numpy as np
+import pandas as pd
+
+from src.strategies.base_strategy import Position
+from src.strategies.vertical_spreads import (
+    BearCallSpread, BearPutSpread, BullCallSpread, BullPutSpread,
+)
+from src.utils.black_scholes import black_scholes_price_array
+from src.utils.chain_index import DayChain
+from src.utils.execution import net_open
+
+DAYS = pd.bdate_range("2024-01-02", "2024-03-29")
+SPOT = pd.Series(450 + 25 * np.sin(np.arange(len(DAYS)) / 6.0), index=DAYS)
+EXPIRATIONS = pd.to_datetime(["2024-02-16", "2024-03-01", "2024-03-15", "2024-03-28"])
+STRIKES = np.arange(380.0, 525.0, 5.0)
+FILLS = dict(limit_fraction=0.5, market_fraction=1.0, extra_slippage=0.02, stop_slippage=0.1)
+SPREADS = [  # (class, option type, short offset, long offset) from spot, in strikes
+    (BullPutSpread, "put", -2, -4), (BearCallSpread, "call", 2, 4),
+    (BullCallSpread, "call", 2, -1), (BearPutSpread, "put", -2, 1),
+]
+
+
+def _chain(day, rng):
+    """The day's quotes for live expirations, with a few contracts missing (data gaps)."""
+    exp = EXPIRATIONS[EXPIRATIONS > day]
+    grid = pd.MultiIndex.from_product([exp, ["put", "call"], STRIKES],
+                                      names=["expiration", "option_type", "strike"])
+    grid = grid.to_frame(index=False)
+    dte = (grid["expiration"] - day).dt.days.to_numpy()
+    price = black_scholes_price_array(SPOT[day], grid["strike"], dte / 365.0, 0.04, 0.2,
+                                      grid["option_type"] == "call", 0.015)
+    grid["bid"], grid["ask"] = np.round(price * 0.97, 2), np.round(price * 1.03 + 0.02, 2)
+    grid["dte"] = dte
+    return grid[rng.random(len(grid)) > 0.04].reset_index(drop=True)
+
+
+def _open(strategy, chain, day, kind, short_off, long_off, i):
+    atm = STRIKES[np.abs(STRIKES - SPOT[day]).argmin()]
+    short_k, long_k = atm + 5 * short_off, atm + 5 * long_off
+    expiration = EXPIRATIONS[i % len(EXPIRATIONS)]
+    if expiration <= day:
+        return
+    rows = strategy._leg_rows(chain, short_k, long_k, kind, expiration)
+    if rows is None:
+        return
+    short, long = rows
+    entry = net_open([(short["bid"], short["ask"], False), (long["bid"], long["ask"], True)])
+    legs = [{"strike": short_k, "option_type": kind, "position": "short", "expiration": expiration},
+            {"strike": long_k, "option_type": kind, "position": "long", "expiration": expiration}]
+    if i % 13 == 0:                         # no pinned expiration: the generate_exit_signal path
+        legs = [{k: v for k, v in leg.items() if k != "expiration"} for leg in legs]
+    strategy.open_position(Position(strategy.name, day.to_pydatetime(), entry, 1 + i % 3, legs))
+
+
+def _run(exit_config, array_path):
+    """Daily loop: exits, then entries. Returns (ledger, equity curve) over all four spreads."""
+    rng = np.random.default_rng(7)
+    strategies = [(cls({"exit": exit_config}), kind, s, l) for cls, kind, s, l in SPREADS]
+    ledger, equity, cash = [], [], 100_000.0
+    for d, day in enumerate(DAYS):
+        chain = _chain(day, rng)
+        dc = DayChain(chain)
+        for strategy, kind, short_off, long_off in strategies:
+            if array_path:
+                exits = strategy.evaluate_exits(day, strategy.book, dc, chain, SPOT[day], **FILLS)
+            else:
+                exits = []
+                for position in strategy.get_open_positions():
+                    signal = strategy.generate_exit_signal(day, position, chain, SPOT[day], **FILLS)
+                    if signal:
+                        exits.append((position, signal))
+                strategy.book.pull()
+            for position, signal in exits:
+                strategy.close_position(position, day, position.current_price, signal.exit_reason)
+                cash += position.realized_pnl
+                ledger.append((strategy.name, position.entry_date, day, position.legs[0]["strike"],
+                               position.exit_price, position.realized_pnl, signal.exit_reason))
+            if d % 3 == 0:
+                _open(strategy, chain, day, kind, short_off, long_off, d // 3)
+        equity.append(cash + sum(p.unrealized_pnl for s, *_ in strategies for p in s.positions))
+    return ledger, equity
+
+
+def test_evaluate_exits_reproduces_the_per_position_ledger_and_equity():
+    reasons = set()
+    for exit_config in ({"profit_target": 0.5, "stop_loss": 0.5, "dte_min": 7},
+                        {"profit_target": 0.9, "stop_loss": 1.5, "dte_min": 0}):
+        ledger, equity = _run(exit_config, array_path=True)
+        assert (ledger, equity) == _run(exit_config, array_path=False)
+        reasons.update(reason.split(":")[0] for *_, reason in ledger)
+
+        per_day = pd.Series([day for _, _, day, *_ in ledger]).value_counts()
+        assert per_day.max() > 1                                    # same-day exits
+    assert reasons == {"Profit target reached", "Stop loss triggered", "DTE exit", "Expired"}
@@ -24,16 +24,17 @@ PARAM_GRID = {
 }
 
 
+def strat(d, superfast, fast, slow, use_low_filter):
+    # Module-level (not a closure) so the optimizer's worker processes can pickle it.
+    return strategies.trend_reversal(d, superfast, fast, slow, use_low_filter, long_short=True)
+
+
 def main(ticker: str = "SPY") -> None:
     os.makedirs(OUT, exist_ok=True)
     df = data.get_ohlcv(ticker, start="2005-01-01")
 
-    # Keep only valid (superfast < fast < slow) combinations.
-    def strat(d, superfast, fast, slow, use_low_filter):
-        return strategies.trend_reversal(d, superfast, fast, slow, use_low_filter, long_short=True)
-
     grid = {k: v for k, v in PARAM_GRID.items()}
-    metrics_df, ret_matrix = optimize.grid_search(df, strat, grid,
+    metrics_df, ret_matrix = optimize.grid_search(df, strat, grid, n_jobs=-1,
                                                   commission_bps=1.0, slippage_bps=5.0)
     # Drop degenerate orderings (superfast must be < fast < slow).
     keep = [c for c in metrics_df.index
@@ -63,7 +64,7 @@ def main(ticker: str = "SPY") -> None:
                           title=f"{ticker} — Sharpe across (superfast, slow)")
 
     # Anchored walk-forward out-of-sample.
-    wf, choices = optimize.walk_forward(df, strat, grid, n_splits=5,
+    wf, choices = optimize.walk_forward(df, strat, grid, n_splits=5, n_jobs=-1,
                                         commission_bps=1.0, slippage_bps=5.0)
     is_sharpe = best["sharpe"]
     oos_sharpe = metrics.sharpe_ratio(wf["returns"])
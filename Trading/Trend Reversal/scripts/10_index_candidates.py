@@ -132,6 +132,7 @@ def main() -> None:
         print("  (none in band — widen --min-cap/--max-cap)\n")
 
     start = "2005-01-01"
+    data.get_many([c.ticker for c in add], start=start, errors="skip")  # warm the cache concurrently
     ov_map, bh_map = {}, {}
     for c in add:
         ov, bh = overlay_and_bh(c.ticker, start)
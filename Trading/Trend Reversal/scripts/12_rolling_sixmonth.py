@@ -49,12 +49,11 @@ def sp500_members(refresh=False) -> set[str]:
 
 
 def load_frames(tickers, start):
-    frames = {}
+    failures = {}
+    frames = data.get_many(tickers, start=start, errors="skip", failures=failures)
     for t in tickers:
-        try:
-            frames[t] = data.get_ohlcv(t, start=start)
-        except Exception as exc:
-            print(f"  ! skip {t}: {exc}")
+        if t not in frames:
+            print(f"  ! skip {t}: {failures.get(t, 'no data')}")
     return frames
 
 
@@ -136,13 +136,16 @@ def main() -> None:
     except Exception as exc:
         print(f"  SPY    ! price download failed: {exc}")
 
+    # Refresh every name concurrently up front, then chart from the returned frames.
+    failures = {}
+    fresh = data.get_many([c.ticker for c in top], start=start, refresh=True, errors="skip",
+                          failures=failures)
     # Charts (and the status list) alphabetical by ticker; the footer table keeps the scanner's rank order.
     for c in sorted(top, key=lambda c: c.ticker):
-        try:
-            df_daily = data.get_ohlcv(c.ticker, start=start, refresh=True)
-        except Exception as exc:
-            print(f"  {c.ticker:6s} ! price download failed: {exc}")
+        if c.ticker not in fresh:
+            print(f"  {c.ticker:6s} ! price download failed: {failures.get(c.ticker, 'no data')}")
             continue
+        df_daily = fresh[c.ticker]
         df = data.resample_ohlcv(df_daily, TIMEFRAME)   # -> 3-day bars
         frame = strategies.trend_reversal_frame(df, **EMA)
         state, is_buy = live_state(df, frame)
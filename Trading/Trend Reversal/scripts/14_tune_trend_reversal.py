@@ -49,27 +49,29 @@ def _label(cfg) -> str:
     return f"{cfg['superfast']}/{cfg['fast']}/{cfg['slow']}{'+lf' if cfg['use_low_filter'] else ''}"
 
 
-def portfolio_returns(frames, cfg):
-    """Equal-weight long-only full-timing (buy green / sell red) portfolio returns + total trades."""
-    rmap, n_trades = {}, 0
-    for t, df in frames.items():
-        if len(df) < 30:           # too few bars to warm the EMAs / form a signal
-            continue
-        pos = strategies.trend_reversal_long_target(
-            df, profit_target=None, exit_signal="sell_signal",
-            superfast=cfg["superfast"], fast=cfg["fast"], slow=cfg["slow"],
-            use_low_filter=cfg["use_low_filter"])
-        res = backtest.run_backtest(df, pos, 1.0, 5.0)
-        rmap[t] = res.returns
-        n_trades += len(res.trades)
-    if not rmap:
-        return pd.Series(dtype=float), 0
-    port, _ = backtest.equal_weight_returns(rmap)
-    return port, n_trades
-
-
-def evaluate(frames, cfg, ppy, years):
-    port, n_trades = portfolio_returns(frames, cfg)
+def portfolio_sweep(frames, cfg_grid):
+    """Equal-weight long-only full-timing (buy green / sell red) portfolio for every config at once.
+
+    Returns ``[(portfolio_returns, total_trades), ...]`` aligned with ``cfg_grid``. The whole
+    universe is stacked into one panel and every EMA ribbon/state machine is evaluated in a single
+    vectorized pass (``strategies.trend_reversal_batch``), which matches the per-ticker
+    ``trend_reversal_long_target`` + ``run_backtest`` loop exactly but runs in seconds.
+    """
+    frames = {t: df for t, df in frames.items() if len(df) >= 30}  # too few bars to warm the EMAs
+    if not frames:
+        return [(pd.Series(dtype=float), 0) for _ in cfg_grid]
+    panel = data.stack_ohlcv(frames)
+    batch = strategies.trend_reversal_batch(panel["close"], panel["high"], panel["low"], cfg_grid)
+    positions = strategies.trend_reversal_long_batch(batch, exit_signal="sell_signal")
+    out = []
+    for k in range(len(cfg_grid)):
+        net, n_trades = backtest.run_backtest_batch(panel["open"], positions[k], 1.0, 5.0)
+        port = pd.DataFrame(net, index=batch.index, columns=batch.tickers).mean(axis=1).fillna(0.0)
+        out.append((port, int(n_trades.sum())))
+    return out
+
+
+def evaluate(frames, cfg, port, n_trades, ppy, years):
     eq = (1 + port.fillna(0)).cumprod()
     r = port[port.notna()]
     per_obs = float(r.mean() / r.std(ddof=1)) if r.std(ddof=1) > 0 else 0.0
@@ -97,14 +99,13 @@ def holdout_oos(frames, cfg_grid, ppy, baseline_cfg):
     is_frames = {t: d[d.index <= cut] for t, d in frames.items()}
     oos_frames = {t: d[d.index > cut] for t, d in frames.items()}
     best, best_sh = None, -np.inf
-    for cfg in cfg_grid:
-        p, _ = portfolio_returns(is_frames, cfg)
+    for cfg, (p, _) in zip(cfg_grid, portfolio_sweep(is_frames, cfg_grid)):
         sh = metrics.sharpe_ratio(p, ppy)
         if sh > best_sh:
             best, best_sh = cfg, sh
     out = {}
-    for tag, cfg in [("picked", best), ("baseline", baseline_cfg)]:
-        p, _ = portfolio_returns(oos_frames, cfg)
+    picks = [("picked", best), ("baseline", baseline_cfg)]
+    for (tag, cfg), (p, _) in zip(picks, portfolio_sweep(oos_frames, [c for _, c in picks])):
         out[tag] = {"config": _label(cfg), "oos_sharpe": metrics.sharpe_ratio(p, ppy),
                     "oos_maxdd": metrics.max_drawdown((1 + p.fillna(0)).cumprod())}
     return out
@@ -125,12 +126,11 @@ def main() -> None:
           f"x {len(args.timeframes)} timeframes = {len(grid)*len(args.timeframes)} trials")
     print(f"  {', '.join(tickers)}\n  downloading daily data ...")
 
-    daily = {}
+    failures = {}
+    daily = data.get_many(tickers, start="2005-01-01", errors="skip", failures=failures)
     for t in tickers:
-        try:
-            daily[t] = data.get_ohlcv(t, start="2005-01-01")
-        except Exception as exc:
-            print(f"  ! skip {t}: {exc}")
+        if t not in daily:
+            print(f"  ! skip {t}: {failures.get(t, 'no data')}")
 
     all_rows = []
     best_overall = None
@@ -141,7 +141,8 @@ def main() -> None:
         years = (next(iter(frames.values())).index[-1]
                  - next(iter(frames.values())).index[0]).days / 365.25
 
-        evals = [evaluate(frames, cfg, ppy, years) for cfg in grid]
+        evals = [evaluate(frames, cfg, port, n_trades, ppy, years)
+                 for cfg, (port, n_trades) in zip(grid, portfolio_sweep(frames, grid))]
         ret_mat = pd.DataFrame({e["config"]: e["_returns"] for e in evals})
         sr_trials = np.array([e["per_obs_sharpe"] for e in evals])
         edf = pd.DataFrame([{k: v for k, v in e.items() if k != "_returns"} for e in evals])
@@ -0,0 +1,61 @@
+"""AFML labeling/weights: the vectorized engine must reproduce the book's per-event loops."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from trendrev import afml
+
+
+def _loop_pt_sl(close, events, pt_sl):
+    """AFML snippet 3.2 as printed — one path slice per event."""
+    out = events[["t1"]].copy()
+    pt = pt_sl[0] * events["trgt"] if pt_sl[0] > 0 else pd.Series(index=events.index, dtype=float)
+    sl = -pt_sl[1] * events["trgt"] if pt_sl[1] > 0 else pd.Series(index=events.index, dtype=float)
+    for loc, t1 in events["t1"].fillna(close.index[-1]).items():
+        path = (close[loc:t1] / close[loc] - 1.0) * events.at[loc, "side"]
+        out.at[loc, "sl"] = path[path < sl[loc]].index.min()
+        out.at[loc, "pt"] = path[path > pt[loc]].index.min()
+    return out
+
+
+def _events(ohlcv, n=300, seed=3):
+    close = ohlcv["close"]
+    rng = np.random.default_rng(seed)
+    t_events = close.index[np.sort(rng.choice(len(close) - 1, n, replace=False))]
+    side = pd.Series(rng.choice([-1.0, 1.0], n), index=t_events)
+    target = afml.get_daily_vol(close, 50).reindex(close.index).ffill()
+    return close, t_events, side, target
+
+
+@pytest.mark.parametrize("pt_sl, vertical", [([1.0, 1.0], True), ([2.0, 0.0], True),
+                                             ([0.5, 2.0], False)])
+def test_first_touch_matches_loop(ohlcv, pt_sl, vertical):
+    close, t_events, side, target = _events(ohlcv)
+    vbar = afml.add_vertical_barrier(t_events, close, num_days=15) if vertical else None
+    events = afml.get_events(close, t_events, pt_sl, target, vertical=vbar, side=side)
+    events = events.assign(t1=vbar.reindex(events.index) if vertical else pd.NaT)
+    fast = afml._apply_pt_sl(close, events, pt_sl, max_cells=500)  # force many small blocks
+    slow = _loop_pt_sl(close, events, pt_sl)
+    for col in ("sl", "pt"):
+        assert pd.DatetimeIndex(fast[col]).equals(pd.DatetimeIndex(slow[col]))
+
+
+def test_concurrency_and_weights_match_loop(ohlcv):
+    close, t_events, side, target = _events(ohlcv)
+    vbar = afml.add_vertical_barrier(t_events, close, num_days=15)
+    events = afml.get_events(close, t_events, [1.0, 1.0], target, vertical=vbar, side=side)
+    t1 = afml.get_bins(events, close)["t1"]
+
+    co = afml.num_co_events(close.index, t1)
+    expected = pd.Series(0.0, index=co.index)
+    for t_in, t_out in t1.items():
+        expected.loc[t_in:t_out] += 1.0
+    pd.testing.assert_series_equal(co, expected)
+
+    ret = np.log(close).diff()
+    uniq = pd.Series({t: (1.0 / co.loc[t:u]).mean() for t, u in t1.items()})
+    attr = pd.Series({t: (ret.loc[t:u] / co.loc[t:u]).sum() for t, u in t1.items()}).abs()
+    pd.testing.assert_series_equal(afml.avg_uniqueness(t1, co), uniq, check_names=False,
+                                   check_index_type=False, rtol=1e-12)
+    pd.testing.assert_series_equal(afml.return_attribution_weights(t1, co, close), attr,
+                                   check_names=False, check_index_type=False, rtol=1e-9, atol=1e-14)
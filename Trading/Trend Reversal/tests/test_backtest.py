@@ -2,7 +2,7 @@
 import numpy as np
 import pandas as pd
 
-from trendrev import backtest, strategies
+from trendrev import backtest, data, strategies
 
 
 def test_engine_uses_only_prior_signal(ohlcv):
@@ -56,3 +56,21 @@ def test_trade_ledger_round_trips(ohlcv):
     assert {"entry_date", "exit_date", "side", "return_pct"}.issubset(trades.columns)
     assert (trades["side"].isin([-1, 1])).all()
     assert (trades["exit_date"] > trades["entry_date"]).all()
+
+
+def test_batch_engine_matches_run_backtest(ohlcv):
+    """``run_backtest_batch`` reproduces ``run_backtest`` per ticker (returns and trade count), with
+    NaN on dates a ticker has no bar."""
+    frames = {"A": ohlcv, "B": ohlcv.iloc[300:].drop(ohlcv.index[900:904])}
+    panel = data.stack_ohlcv(frames)
+    batch = strategies.trend_reversal_batch(panel["close"], panel["high"], panel["low"],
+                                            [dict(superfast=9, fast=14, slow=21)])
+    target = strategies.trend_reversal_long_batch(batch)[0]
+    net, n_trades = backtest.run_backtest_batch(panel["open"], target, 1.0, 5.0)
+    for j, t in enumerate(batch.tickers):
+        rows = batch.index.get_indexer(frames[t].index)
+        res = backtest.run_backtest(frames[t], pd.Series(target[rows, j], index=frames[t].index),
+                                    1.0, 5.0)
+        assert np.array_equal(net[rows, j], res.returns.values)
+        assert n_trades[j] == len(res.trades)
+        assert np.isnan(np.delete(net[:, j], rows)).all()
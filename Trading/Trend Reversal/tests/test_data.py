@@ -0,0 +1,64 @@
+"""Data cache: Parquet round-trips, batched get_many reads, and legacy CSV migration (offline)."""
+import os
+
+import pandas as pd
+import pytest
+
+from trendrev import data
+
+
+@pytest.fixture
+def fake_yf(ohlcv, tmp_path, monkeypatch):
+    """Point the cache at a temp dir and serve the synthetic fixture instead of yfinance."""
+    monkeypatch.setattr(data, "DATA_DIR", str(tmp_path))
+    monkeypatch.setattr(data, "PARQUET_DIR", str(tmp_path / "ohlcv"))
+    calls = []
+
+    class FakeTicker:
+        def __init__(self, ticker):
+            self.ticker = ticker
+
+        def history(self, start, end, interval, auto_adjust):
+            calls.append(self.ticker)
+            raw = ohlcv[ohlcv.index >= pd.Timestamp(start)].rename(columns=str.title)
+            return raw.tz_localize("America/New_York")
+
+    monkeypatch.setattr(data.yf, "Ticker", FakeTicker)
+    return calls
+
+
+def test_get_many_reads_warm_cache_without_downloading(fake_yf, ohlcv):
+    cold = data.get_many(["AAA", "BBB"], start="2015-01-01")
+    assert sorted(fake_yf) == ["AAA", "BBB"]
+    warm = data.get_many(["BBB", "AAA"], start="2016-01-01", end="2018-06-30")
+    assert len(fake_yf) == 2  # served from the batched Parquet scan
+    assert list(warm) == ["BBB", "AAA"]
+    expected = cold["AAA"].loc["2016-01-01":"2018-06-30"]
+    pd.testing.assert_frame_equal(warm["AAA"], expected, check_freq=False)
+    pd.testing.assert_frame_equal(data.get_ohlcv("AAA", start="2016-01-01", end="2018-06-30"),
+                                  expected, check_freq=False)
+
+
+def test_legacy_csv_cache_is_migrated(fake_yf, ohlcv):
+    ohlcv.to_csv(os.path.join(data.DATA_DIR, "OLD_1d.csv"))
+    with open(os.path.join(data.DATA_DIR, "OLD_1d.meta"), "w") as fh:
+        fh.write("2015-01-01")
+    df = data.get_ohlcv("OLD", start="2015-01-01")
+    assert fake_yf == []
+    assert os.path.exists(data._parquet_path("OLD", "1d"))
+    assert len(df) == len(ohlcv)
+
+
+def test_get_many_skip_reports_failures(fake_yf, monkeypatch):
+    real_ticker = data.yf.Ticker
+
+    def flaky(ticker):
+        if ticker == "BAD":
+            raise RuntimeError("Too Many Requests")
+        return real_ticker(ticker)
+
+    monkeypatch.setattr(data.yf, "Ticker", flaky)
+    failures = {}
+    frames = data.get_many(["AAA", "BAD"], start="2015-01-01", errors="skip", failures=failures)
+    assert list(frames) == ["AAA"]
+    assert "Too Many Requests" in str(failures["BAD"])
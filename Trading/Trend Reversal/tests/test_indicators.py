@@ -2,6 +2,7 @@
 import numpy as np
 import pandas as pd
 
+from trendrev import data
 from trendrev import indicators as ind
 from trendrev import strategies
 
@@ -60,3 +61,36 @@ def test_long_target_is_long_only_and_causal(ohlcv):
     full = strategies.trend_reversal_long_target(ohlcv)
     trunc = strategies.trend_reversal_long_target(ohlcv.iloc[:800])
     assert np.array_equal(full.iloc[:799].values, trunc.iloc[:799].values)
+
+
+def _two_ticker_panel(ohlcv):
+    """The fixture plus a late-listing copy with a missing stretch, stacked on the union of dates."""
+    late = ohlcv.iloc[400:].drop(ohlcv.index[700:705]) * 1.1
+    frames = {"A": ohlcv, "B": late}
+    return frames, data.stack_ohlcv(frames)
+
+
+def test_ema_stack_matches_ema(ohlcv):
+    lengths = [5, 9, 14, 21, 50]
+    stack = ind.ema_stack(ohlcv[["close"]].values, lengths)
+    for k, n in enumerate(lengths):
+        assert np.array_equal(stack[k, :, 0], ind.ema(ohlcv["close"], n).values)
+
+
+def test_trend_reversal_batch_matches_single_config(ohlcv):
+    """Every (config, ticker) slice of the batch engine equals the per-ticker state machine exactly,
+    including a ticker that lists late and has gaps in the shared date index."""
+    frames, panel = _two_ticker_panel(ohlcv)
+    configs = [dict(superfast=9, fast=14, slow=21, use_low_filter=True),
+               dict(superfast=5, fast=21, slow=50, use_low_filter=False)]
+    batch = strategies.trend_reversal_batch(panel["close"], panel["high"], panel["low"], configs)
+    longs = strategies.trend_reversal_long_batch(batch, exit_signal="sell_signal")
+    for k, cfg in enumerate(configs):
+        for j, t in enumerate(batch.tickers):
+            rows = batch.index.get_indexer(frames[t].index)
+            ref = strategies.trend_reversal_frame(frames[t], **cfg)
+            assert np.array_equal(batch.buysignal[k][rows, j], ref["buysignal"].values)
+            assert np.array_equal(batch.sellsignal[k][rows, j], ref["sellsignal"].values)
+            pos = strategies.trend_reversal_long_target(frames[t], profit_target=None,
+                                                        exit_signal="sell_signal", **cfg)
+            assert np.array_equal(longs[k][rows, j], pos.values)
@@ -0,0 +1,36 @@
+"""Incremental live-scan state must agree with a full recompute, day after day."""
+import pytest
+
+from trendrev import data, live, strategies
+
+
+def _full_status(daily, rule):
+    """What the scanners computed before: the whole resampled history, walked back to the flip."""
+    df = data.resample_ohlcv(daily, rule)
+    f = strategies.trend_reversal_frame(df)
+    buy, sell = f["buysignal"].values, f["sellsignal"].values
+    state = "green" if buy[-1] == 1 else "red" if sell[-1] == 1 else "neutral"
+    series = buy if state == "green" else sell if state == "red" else None
+    if series is None:
+        return state, None, None, None, float(df["close"].iloc[-1])
+    i = len(series) - 1
+    while i > 0 and series[i - 1] == 1:
+        i -= 1
+    return (state, len(series) - 1 - i, df.index[i], float(df["close"].iloc[i]),
+            float(df["close"].iloc[-1]))
+
+
+@pytest.mark.parametrize("rule", ["1D", "3D"])
+def test_incremental_state_matches_full_recompute(ohlcv, tmp_path, rule):
+    """Advance one day at a time (reloading the persisted snapshot each run, so partial 3-day bars
+    and the shifting bar grid are exercised) and inject a back-adjustment that forces a rebuild."""
+    path = str(tmp_path / "state.json")
+    for n_rows in range(250, 330):
+        daily = ohlcv.iloc[:n_rows]
+        if n_rows == 300:
+            daily = daily * 1.02  # dividend back-adjustment revises every past close
+        scan = live.LiveScanState(rule, path=path)
+        st = scan.advance("XYZ", daily)
+        scan.save()
+        got = (st.state, st.bars_since_flip, st.flip_date, st.price_at_flip, st.last_price)
+        assert got == _full_status(daily, rule), f"diverged at {n_rows} rows"
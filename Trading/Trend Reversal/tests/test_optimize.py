@@ -0,0 +1,23 @@
+"""Optimizer: the process-parallel path must reproduce the serial grid search and walk-forward."""
+import pandas as pd
+
+from trendrev import optimize, strategies
+
+GRID = {"superfast": [5, 9], "fast": [14, 21], "slow": [34, 50], "use_low_filter": [True, False]}
+
+
+def test_parallel_grid_search_matches_serial(ohlcv):
+    serial_m, serial_r = optimize.grid_search(ohlcv, strategies.trend_reversal, GRID)
+    par_m, par_r = optimize.grid_search(ohlcv, strategies.trend_reversal, GRID, n_jobs=2)
+    pd.testing.assert_frame_equal(serial_m, par_m)
+    pd.testing.assert_frame_equal(serial_r, par_r)
+
+
+def test_parallel_walk_forward_matches_serial(ohlcv):
+    serial_wf, serial_choices = optimize.walk_forward(ohlcv, strategies.trend_reversal, GRID,
+                                                      n_splits=4)
+    par_wf, par_choices = optimize.walk_forward(ohlcv, strategies.trend_reversal, GRID,
+                                                n_splits=4, n_jobs=2)
+    pd.testing.assert_frame_equal(serial_choices, par_choices)
+    pd.testing.assert_series_equal(serial_wf["returns"], par_wf["returns"])
+    pd.testing.assert_series_equal(serial_wf["exec_pos"], par_wf["exec_pos"])
@@ -19,6 +19,8 @@ from dataclasses import dataclass, field
 import numpy as np
 import pandas as pd
 
+from . import indicators as ind
+
 PERIODS_PER_YEAR = 252
 
 
@@ -82,6 +84,38 @@ def run_backtest(
     )
 
 
+def run_backtest_batch(
+    open_: pd.DataFrame,
+    target_pos: np.ndarray,
+    commission_bps: float = 1.0,
+    slippage_bps: float = 5.0,
+) -> tuple[np.ndarray, np.ndarray]:
+    """:func:`run_backtest` for a whole ``bars x tickers`` panel (optionally ``configs x ...``) at once.
+
+    ``open_`` is the panel of opens (NaN where a ticker has no bar) and ``target_pos`` the matching
+    target array, e.g. from :func:`trendrev.strategies.trend_reversal_long_batch`. Returns
+    ``(net_returns, n_trades)``: net returns shaped like ``target_pos`` — identical to
+    ``run_backtest(...).returns`` on each ticker's own bars, NaN where it has none, so
+    :func:`equal_weight_returns` semantics carry over — and the round-trip count per column
+    (``len(run_backtest(...).trades)``).
+    """
+    px = open_.to_numpy(dtype=float)
+    valid = ~np.isnan(px)
+    prev = ind.prev_bar(valid)
+    target = np.where(valid, np.nan_to_num(np.asarray(target_pos, dtype=float)), 0.0)
+
+    exec_pos = ind.at_bar(target, prev, 0.0)
+    interval_ret = ind.at_bar(px[None], ind.next_bar(valid), np.nan)[0] / px - 1.0
+    cost_rate = (commission_bps + slippage_bps) / 1e4
+    prev_exec = ind.at_bar(exec_pos, prev, 0.0)
+    turnover = np.abs(np.where(prev >= 0, exec_pos - prev_exec, exec_pos))
+
+    net = exec_pos * interval_ret - turnover * cost_rate
+    net = np.where(valid, np.where(np.isnan(net), 0.0, net), np.nan)
+    closed = valid & (prev >= 0) & (exec_pos != prev_exec) & (prev_exec != 0)
+    return net, closed.sum(axis=-2)
+
+
 def equal_weight_returns(returns_by_ticker: dict[str, pd.Series]) -> tuple[pd.Series, pd.Series]:
     """Aggregate per-ticker interval returns into an equal-weight portfolio.
 
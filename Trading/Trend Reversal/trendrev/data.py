@@ -1,19 +1,33 @@
-"""Data layer: download OHLCV from yfinance with a local CSV cache (no parquet dependency).
+"""Data layer: download OHLCV from yfinance with a local columnar cache.
 
 All data is returned as a tidy DataFrame indexed by a tz-naive ``DatetimeIndex`` named ``date``
 with lowercase columns ``open, high, low, close, volume``. Prices are split/dividend adjusted
 (``auto_adjust=True``) so that close-to-close returns are economically meaningful for backtests.
+
+The cache is one typed Parquet dataset under ``data/ohlcv/`` partitioned by interval
+(``interval=1d/<TICKER>.parquet``, each file carrying a ``ticker`` column), so a whole universe
+can be read in one batched, date-filtered scan. Legacy ``data/<TICKER>_<interval>.csv`` files are
+migrated on first use. pyarrow is optional: without it the CSV cache is used exactly as before.
 """
 from __future__ import annotations
 
 import os
+from concurrent.futures import ThreadPoolExecutor
 from typing import Iterable
 
 import numpy as np
 import pandas as pd
 import yfinance as yf
 
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as pads
+    import pyarrow.parquet as pq
+except ModuleNotFoundError:  # pragma: no cover - lighter environments fall back to CSV
+    pa = None
+
 DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+PARQUET_DIR = os.path.join(DATA_DIR, "ohlcv")
 _COLUMNS = ["open", "high", "low", "close", "volume"]
 
 
@@ -21,6 +35,10 @@ def _cache_path(ticker: str, interval: str) -> str:
     return os.path.join(DATA_DIR, f"{ticker.upper()}_{interval}.csv")
 
 
+def _parquet_path(ticker: str, interval: str) -> str:
+    return os.path.join(PARQUET_DIR, f"interval={interval}", f"{ticker.upper()}.parquet")
+
+
 def _meta_path(ticker: str, interval: str) -> str:
     """Sidecar recording the earliest ``start`` ever requested, so we can tell a genuine IPO date
     (don't refetch) from a cache that was truncated by a short ``refresh`` (do refetch)."""
@@ -45,6 +63,121 @@ def _write_earliest_request(ticker: str, interval: str, start: str) -> None:
         fh.write(earliest.strftime("%Y-%m-%d"))
 
 
+# --------------------------------------------------------------------------- cache storage
+# The Parquet files keep the earliest-request date (the CSV ``.meta`` sidecar) and the first cached
+# date in their schema metadata, so a coverage check never has to read the price rows.
+def _read_csv_cache(ticker: str, interval: str) -> pd.DataFrame:
+    cached = pd.read_csv(_cache_path(ticker, interval), index_col=0, parse_dates=True)
+    cached.index.name = "date"
+    return cached
+
+
+def _cache_info(ticker: str, interval: str) -> tuple[pd.Timestamp, pd.Timestamp | None] | None:
+    """``(first_cached_date, earliest_request)`` for a cached ticker, ``None`` when uncached.
+
+    A legacy CSV cache is migrated to Parquet here the first time the ticker is touched.
+    """
+    if pa is None:
+        if not os.path.exists(_cache_path(ticker, interval)):
+            return None
+        return _read_csv_cache(ticker, interval).index.min(), _read_earliest_request(ticker, interval)
+    path = _parquet_path(ticker, interval)
+    if not os.path.exists(path):
+        if not os.path.exists(_cache_path(ticker, interval)):
+            return None
+        legacy = _read_csv_cache(ticker, interval)
+        _write_cache(ticker, interval, legacy, _read_earliest_request(ticker, interval))
+    meta = pq.read_schema(path).metadata or {}
+    earliest = meta.get(b"earliest_request")
+    return (pd.Timestamp(meta[b"first_date"].decode()),
+            pd.Timestamp(earliest.decode()) if earliest else None)
+
+
+def _covers(info: tuple[pd.Timestamp, pd.Timestamp | None], start: str) -> bool:
+    """Does the cache cover ``start``? It does if we ever asked for data that far back (so a later
+    first date is the listing date), or if it actually starts within a few days of ``start``."""
+    first, earliest_req = info
+    return (earliest_req is not None and earliest_req <= pd.Timestamp(start)) or (
+        first <= pd.Timestamp(start) + pd.Timedelta(days=5)
+    )
+
+
+def _date_filter(start: str | None, end: str | None):
+    """Arrow filter expression for ``start <= date <= end`` (either bound optional)."""
+    date = pads.field("date")
+    conds = []
+    if start is not None:
+        conds.append(date >= pa.scalar(pd.Timestamp(start).as_unit("ns"), type=pa.timestamp("ns")))
+    if end is not None:
+        conds.append(date <= pa.scalar(pd.Timestamp(end).as_unit("ns"), type=pa.timestamp("ns")))
+    if not conds:
+        return None
+    return conds[0] if len(conds) == 1 else conds[0] & conds[1]
+
+
+def _read_cache(
+    ticker: str, interval: str, start: str | None = None, end: str | None = None
+) -> pd.DataFrame:
+    """Cached frame for one ticker, restricted to ``[start, end]`` (pushed down into the scan)."""
+    if pa is None:
+        return _slice(_read_csv_cache(ticker, interval), start, end)
+    return read_cached_many([ticker], start, end, interval)[ticker.upper()]
+
+
+def read_cached_many(
+    tickers: Iterable[str], start: str | None = None, end: str | None = None, interval: str = "1d"
+) -> dict[str, pd.DataFrame]:
+    """Read many cached tickers in one batched, date-filtered Parquet scan -> ``{TICKER: frame}``.
+
+    Only tickers that already have a cache file are returned; nothing is downloaded.
+    """
+    paths = {t.upper(): _parquet_path(t, interval) for t in tickers}
+    paths = {t: p for t, p in paths.items() if os.path.exists(p)}
+    if not paths:
+        return {}
+    by_path = {p: t for t, p in paths.items()}
+    scanner = pads.dataset(list(paths.values()), format="parquet").scanner(
+        columns=["date", *_COLUMNS], filter=_date_filter(start, end)
+    )
+    batches: dict[str, list] = {}
+    for tagged in scanner.scan_batches():  # one multi-threaded scan; batches tagged by source file
+        batches.setdefault(by_path[tagged.fragment.path], []).append(tagged.record_batch)
+    out = {}
+    for t, parts in batches.items():
+        tbl = pa.Table.from_batches(parts)
+        idx = pd.DatetimeIndex(tbl.column("date").to_numpy(), name="date")
+        out[t] = pd.DataFrame({c: tbl.column(c).to_numpy() for c in _COLUMNS}, index=idx).sort_index()
+    for t in paths:  # a file with no rows in the window still yields an (empty) frame
+        if t not in out:
+            out[t] = pd.DataFrame(columns=_COLUMNS, dtype=float,
+                                  index=pd.DatetimeIndex([], name="date"))
+    return out
+
+
+def _write_cache(
+    ticker: str, interval: str, df: pd.DataFrame, earliest: pd.Timestamp | None
+) -> None:
+    """Persist the full merged history atomically (write-then-rename, safe under interruption)."""
+    if pa is None:
+        df.to_csv(_cache_path(ticker, interval))
+        if earliest is not None:
+            _write_earliest_request(ticker, interval, earliest.strftime("%Y-%m-%d"))
+        return
+    path = _parquet_path(ticker, interval)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    out = df[_COLUMNS].astype("float64")
+    out.index = pd.DatetimeIndex(out.index).as_unit("ns")
+    table = pa.Table.from_pandas(out.reset_index().assign(ticker=ticker.upper()),
+                                 preserve_index=False)
+    meta = {b"first_date": out.index.min().strftime("%Y-%m-%d").encode()}
+    if earliest is not None:
+        meta[b"earliest_request"] = earliest.strftime("%Y-%m-%d").encode()
+    table = table.replace_schema_metadata({**(table.schema.metadata or {}), **meta})
+    tmp = f"{path}.{os.getpid()}.tmp"
+    pq.write_table(table, tmp)
+    os.replace(tmp, path)
+
+
 def get_ohlcv(
     ticker: str,
     start: str = "2005-01-01",
@@ -52,30 +185,23 @@ def get_ohlcv(
     interval: str = "1d",
     refresh: bool = False,
 ) -> pd.DataFrame:
-    """Return an adjusted OHLCV frame for ``ticker``, caching to ``data/<TICKER>_<interval>.csv``.
+    """Return an adjusted OHLCV frame for ``ticker``, caching it under ``data/``.
 
-    On cache hit the local file is reused unless ``refresh=True``. A small network failure with a
+    On cache hit the local copy is reused unless ``refresh=True``. A small network failure with a
     warm cache degrades gracefully to the cached copy.
     """
     os.makedirs(DATA_DIR, exist_ok=True)
-    path = _cache_path(ticker, interval)
-
-    cached = None
-    if os.path.exists(path):
-        cached = pd.read_csv(path, index_col=0, parse_dates=True)
-        cached.index.name = "date"
-
-    if cached is not None and not refresh:
-        # Reuse the cache only if it actually covers the requested window. If a prior short
-        # ``refresh`` truncated it (cache starts well after ``start`` we never asked to drop),
-        # fall through and re-download the full range instead of returning a thin slice.
-        earliest_req = _read_earliest_request(ticker, interval)
-        covers_back = earliest_req is not None and earliest_req <= pd.Timestamp(start)
-        if covers_back or cached.index.min() <= pd.Timestamp(start) + pd.Timedelta(days=5):
-            return _slice(cached, start, end)
+    info = _cache_info(ticker, interval)
+
+    # Reuse the cache only if it actually covers the requested window. If a prior short
+    # ``refresh`` truncated it (cache starts well after ``start`` we never asked to drop),
+    # fall through and re-download the full range instead of returning a thin slice.
+    if info is not None and not refresh and _covers(info, start):
+        return _read_cache(ticker, interval, start, end)
+    cached = _read_cache(ticker, interval) if info is not None else None
 
     # Download from the widest start we've ever needed so a refresh never shrinks history.
-    prev_req = _read_earliest_request(ticker, interval)
+    prev_req = info[1] if info is not None else None
     fetch_start = min(pd.Timestamp(start), prev_req) if prev_req is not None else pd.Timestamp(start)
     if cached is not None:
         fetch_start = min(fetch_start, cached.index.min())
@@ -94,23 +220,78 @@ def get_ohlcv(
             return _slice(cached, start, end)
         raise RuntimeError(f"yfinance returned no data for {ticker} ({interval}).")
 
-    df = raw.rename(columns=str.lower)[_COLUMNS].copy()
-    df.index = pd.to_datetime(df.index).tz_localize(None)
+    df = raw.rename(columns=str.lower)[_COLUMNS].astype("float64")
+    df.index = pd.to_datetime(df.index).tz_localize(None).as_unit("ns")
     df.index.name = "date"
     # Merge with any existing cache so refreshing a short window never discards older history.
     if cached is not None:
         df = pd.concat([cached, df])
     df = df[~df.index.duplicated(keep="last")].sort_index()
-    df.to_csv(path)
-    _write_earliest_request(ticker, interval, start)
+    earliest = min(pd.Timestamp(start), prev_req) if prev_req is not None else pd.Timestamp(start)
+    _write_cache(ticker, interval, df, earliest)
     return _slice(df, start, end)
 
 
 def get_many(
-    tickers: Iterable[str], start: str = "2005-01-01", end: str | None = None, interval: str = "1d"
+    tickers: Iterable[str],
+    start: str = "2005-01-01",
+    end: str | None = None,
+    interval: str = "1d",
+    refresh: bool = False,
+    max_workers: int = 8,
+    errors: str = "raise",
+    failures: dict[str, Exception] | None = None,
 ) -> dict[str, pd.DataFrame]:
-    """Download several tickers, returning ``{ticker: ohlcv_frame}``."""
-    return {t: get_ohlcv(t, start=start, end=end, interval=interval) for t in tickers}
+    """Download several tickers, returning ``{ticker: ohlcv_frame}`` in the order given.
+
+    Tickers whose cache already covers the window are read together in one batched scan; only the
+    missing or stale ones go to yfinance, ``max_workers`` at a time (each writes its own file, so
+    the fetches don't contend). ``errors='skip'`` drops tickers that fail instead of raising; pass a
+    ``failures`` dict to receive each dropped ticker's exception.
+    """
+    if errors not in ("raise", "skip"):
+        raise ValueError("errors must be 'raise' or 'skip'")
+    tickers = list(dict.fromkeys(tickers))
+    os.makedirs(DATA_DIR, exist_ok=True)
+    warm = [] if refresh else [
+        t for t in tickers if (info := _cache_info(t, interval)) is not None and _covers(info, start)
+    ]
+    if pa is not None:
+        batch = read_cached_many(warm, start, end, interval)
+        frames = {t: batch[t.upper()] for t in warm}
+    else:
+        frames = {t: _read_cache(t, interval, start, end) for t in warm}
+
+    def fetch(t):
+        try:
+            return get_ohlcv(t, start=start, end=end, interval=interval, refresh=refresh)
+        except Exception as exc:
+            if errors == "raise":
+                raise
+            if failures is not None:
+                failures[t] = exc
+            return None
+
+    cold = [t for t in tickers if t not in frames]
+    if cold:
+        with ThreadPoolExecutor(max(1, min(max_workers, len(cold)))) as pool:
+            for t, df in zip(cold, pool.map(fetch, cold)):
+                if df is not None:
+                    frames[t] = df
+    return {t: frames[t] for t in tickers if t in frames}
+
+
+def stack_ohlcv(frames: dict[str, pd.DataFrame]) -> dict[str, pd.DataFrame]:
+    """Turn ``{ticker: ohlcv_frame}`` into ``{column: bars x tickers panel}`` on the union of dates.
+
+    Dates a ticker does not trade are NaN, which the batch engines
+    (:func:`trendrev.strategies.trend_reversal_batch`, :func:`trendrev.backtest.run_backtest_batch`)
+    treat as "no bar" — so each column still behaves like that ticker's own frame.
+    """
+    return {
+        col: pd.concat({t: df[col] for t, df in frames.items()}, axis=1).sort_index()
+        for col in _COLUMNS
+    }
 
 
 # Trading bars per year for each supported resample rule (used to annualise metrics).
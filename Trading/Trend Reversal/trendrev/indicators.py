@@ -17,6 +17,46 @@ def ema(series: pd.Series, length: int) -> pd.Series:
     return series.ewm(span=length, adjust=False).mean()
 
 
+def ema_update(prev: float | None, value: float, length: int) -> float:
+    """One :func:`ema` step (``adjust=False``), bit-identical to pandas — for incremental state.
+
+    ``prev`` is the EMA through the previous bar (``None`` before the first bar, which seeds it).
+    """
+    if prev is None:
+        return value
+    if prev == value:
+        return prev
+    alpha = 1.0 / (1.0 + (length - 1) / 2)
+    old_wt = 1.0 - alpha
+    return (old_wt * prev + alpha * value) / (old_wt + alpha)
+
+
+def ema_stack(values: np.ndarray, lengths) -> np.ndarray:
+    """EMAs of a ``bars x tickers`` array for several lengths in one pass -> ``lengths x bars x tickers``.
+
+    Reproduces :func:`ema` bit-for-bit (same ``com``-derived alpha and the same update pandas uses
+    for ``adjust=False``), so batch engines can stand in for per-ticker loops. A NaN cell means the
+    ticker has no bar there: it is skipped (the EMA carries over it untouched) and reported as NaN,
+    so each column matches ``ema`` run on that ticker's own bars.
+    """
+    x = np.asarray(values, dtype=float)
+    if x.ndim == 1:
+        x = x[:, None]
+    com = (np.asarray(lengths, dtype=float) - 1) / 2
+    alpha = (1.0 / (1.0 + com))[:, None]
+    old_wt = 1.0 - alpha
+    w = np.full((len(alpha), x.shape[1]), np.nan)
+    out = np.full((len(alpha),) + x.shape, np.nan)
+    for t in range(x.shape[0]):
+        cur = x[t]
+        obs = ~np.isnan(cur)
+        upd = (old_wt * w + alpha * cur) / (old_wt + alpha)
+        upd = np.where(w == cur, w, upd)
+        w = np.where(obs, np.where(np.isnan(w), cur, upd), w)
+        out[:, t] = np.where(obs, w, np.nan)
+    return out
+
+
 def sma(series: pd.Series, length: int) -> pd.Series:
     return series.rolling(length).mean()
 
@@ -177,3 +217,42 @@ def zigzag_repaint(df: pd.DataFrame, pct: float = 5.0) -> pd.Series:
         leg = 1 if close[b] >= close[a] else -1
         direction[a : b + 1] = leg  # back-fill the whole leg => look-ahead
     return pd.Series(direction, index=df.index, name="zz_repaint")
+
+
+# --------------------------------------------------------------------------- ragged bar panels
+# Batch engines work on ``bars x tickers`` arrays aligned on a shared date index, where NaN marks a
+# bar the ticker does not have (pre-listing, or a date its own history skips). These helpers step
+# along each column's *own* bars so a batch result matches the per-ticker frame computation.
+def prev_bar(valid: np.ndarray) -> np.ndarray:
+    """Row of each column's previous valid bar (strictly before ``t``), ``-1`` where there is none."""
+    last = np.where(valid, np.arange(valid.shape[0])[:, None], -1)
+    np.maximum.accumulate(last, axis=0, out=last)
+    prev = np.full_like(last, -1)
+    prev[1:] = last[:-1]
+    return prev
+
+
+def next_bar(valid: np.ndarray) -> np.ndarray:
+    """Row of each column's next valid bar (strictly after ``t``), ``-1`` where there is none."""
+    rev = prev_bar(valid[::-1])[::-1]
+    return np.where(rev >= 0, valid.shape[0] - 1 - rev, -1)
+
+
+def at_bar(values: np.ndarray, rows: np.ndarray, fill) -> np.ndarray:
+    """Gather ``values[..., rows[t, j], j]`` along the bar axis (``-2``); ``fill`` where ``rows < 0``.
+
+    ``values`` may carry leading (e.g. config) dimensions that broadcast against ``rows``.
+    """
+    idx = np.broadcast_to(np.maximum(rows, 0), values.shape)
+    return np.where(rows >= 0, np.take_along_axis(values, idx, axis=-2), fill)
+
+
+def latch(on: np.ndarray, off: np.ndarray) -> np.ndarray:
+    """Vectorized set/reset latch along the bar axis: 1 after an ``on`` bar until an ``off`` bar.
+
+    ``on`` and ``off`` must never both be true on the same bar (true of every latch in this
+    package), so the state is simply the most recent event, held forward; 0 before the first one.
+    """
+    events = np.where(on | off, np.arange(on.shape[-2])[:, None], -1)
+    np.maximum.accumulate(events, axis=-2, out=events)
+    return at_bar(on, events, False).astype(np.int8)
@@ -0,0 +1,191 @@
+"""Incremental live-scan state for the Trend Reversal signal.
+
+Live scans only ask "which names are green/red right now, and since when?", yet recomputing
+:func:`trendrev.strategies.trend_reversal_frame` over the whole resampled history for every name
+on every run pays for years of bars to learn about the last one. :class:`LiveScanState` persists,
+per ticker, everything the state machine needs to take one more bar — the three EMA values, the
+previous bar's raw buy/sell conditions, the latched ``buysignal``/``sellsignal`` and where the
+current green/red run began — and advances it with only the daily rows that arrived since.
+
+**Resampled bars.** :func:`trendrev.data.resample_ohlcv` aligns ``'ND'`` bars so the *last* bar is
+always complete, which means the bar grid shifts by one row every day. There are only ``N`` such
+grids (one per front-padding offset), so a snapshot is kept per offset; each run advances the one
+that matches today's row count over its complete bars. The trailing partial bar of the other grids
+is never folded in, so their state stays exact until their turn comes.
+
+**Revisions.** Each snapshot remembers the first daily date it counts from and the date and close
+of the last row it consumed. yfinance back-adjusts the whole history on dividends and splits, so a
+changed close (or a shifted start / shorter history) triggers a full rebuild of that ticker.
+Results match ``trend_reversal_frame`` on the fully resampled history exactly.
+"""
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import asdict, dataclass, field
+
+import numpy as np
+import pandas as pd
+
+from . import indicators as ind
+from .data import DATA_DIR
+
+
+@dataclass
+class LiveStatus:
+    """Current Trend Reversal reading for one ticker (what the live scanners print)."""
+
+    state: str                      # "green" | "red" | "neutral"
+    bars_since_flip: int | None     # bars since the current green/red run began
+    flip_date: pd.Timestamp | None  # date of the bar that started the run
+    price_at_flip: float | None
+    last_price: float
+    n_bars: int                     # resampled bars seen so far (scanners skip thin histories)
+
+
+@dataclass
+class _Snapshot:
+    anchor: str                # first daily date the bar grid is counted from
+    rows: int = 0              # daily rows folded into completed bars
+    last_date: str | None = None
+    last_close: float | None = None
+    bars: int = 0
+    ema: list = field(default_factory=lambda: [None, None, None])
+    buy: bool = False          # raw (un-latched) conditions on the last bar — for the "now" edge
+    sell: bool = False
+    buysignal: int = 0
+    sellsignal: int = 0
+    green_start: list | None = None  # [bar, date, close] where the current buysignal run began
+    red_start: list | None = None
+
+
+class LiveScanState:
+    """Persisted per-ticker Trend Reversal state, advanced incrementally on each scan.
+
+    ``rule`` is ``'1D'`` or ``'ND'`` (e.g. ``'3D'``). The snapshot file is keyed by rule and EMA
+    config, so changing either simply starts a fresh file.
+    """
+
+    def __init__(
+        self,
+        rule: str = "3D",
+        superfast: int = 9,
+        fast: int = 14,
+        slow: int = 21,
+        use_low_filter: bool = True,
+        path: str | None = None,
+    ):
+        if rule in ("1D", "D"):
+            rule = "1D"
+        elif not (rule.endswith("D") and rule[:-1].isdigit()):
+            raise ValueError("LiveScanState supports '1D' or 'ND' bars only")
+        self.rule, self.n = rule, int(rule[:-1])
+        self.lengths = (superfast, fast, slow)
+        self.use_low_filter = use_low_filter
+        tag = f"{rule}_{superfast}-{fast}-{slow}{'lf' if use_low_filter else ''}"
+        self.path = path or os.path.join(DATA_DIR, "live_state", f"trend_reversal_{tag}.json")
+        self._state: dict[str, dict[str, _Snapshot]] = {}
+        if os.path.exists(self.path):
+            with open(self.path) as fh:
+                raw = json.load(fh)
+            self._state = {t: {k: _Snapshot(**v) for k, v in snaps.items()}
+                           for t, snaps in raw.items()}
+
+    # ------------------------------------------------------------------ public API
+    def advance(self, ticker: str, daily: pd.DataFrame) -> LiveStatus | None:
+        """Fold any new daily rows into ``ticker``'s snapshot and return its current status.
+
+        ``daily`` is the full daily OHLCV frame (as from :func:`trendrev.data.get_ohlcv`). Returns
+        ``None`` for an empty frame.
+        """
+        if daily.empty:
+            return None
+        pad = (self.n - len(daily) % self.n) % self.n
+        snaps = self._state.setdefault(ticker, {})
+        snap = snaps.get(str(pad))
+        if snap is None or not self._consistent(snap, daily):
+            if snap is not None:  # data revision: every grid is stale, not just this one
+                snaps.clear()
+            snap = snaps[str(pad)] = _Snapshot(anchor=daily.index[0].strftime("%Y-%m-%d"))
+        self._fold(snap, daily, pad)
+        return self._status(snap)
+
+    def save(self) -> None:
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w") as fh:
+            json.dump({t: {k: asdict(s) for k, s in snaps.items()}
+                       for t, snaps in self._state.items()}, fh)
+        os.replace(tmp, self.path)
+
+    # ------------------------------------------------------------------ internals
+    @staticmethod
+    def _consistent(snap: _Snapshot, daily: pd.DataFrame) -> bool:
+        """Is ``daily`` an append-only extension of the rows this snapshot already consumed?"""
+        if daily.index[0].strftime("%Y-%m-%d") != snap.anchor or snap.rows > len(daily):
+            return False
+        if snap.rows == 0:
+            return True
+        last = snap.rows - 1
+        return (daily.index[last].strftime("%Y-%m-%d") == snap.last_date
+                and float(daily["close"].iat[last]) == snap.last_close)
+
+    def _fold(self, snap: _Snapshot, daily: pd.DataFrame, pad: int) -> None:
+        """Advance ``snap`` over every *complete* bar of its grid after ``snap.rows``."""
+        n, total = self.n, len(daily)
+        o = daily["open"].to_numpy()
+        h = daily["high"].to_numpy()
+        lo = daily["low"].to_numpy()
+        c = daily["close"].to_numpy()
+        i = snap.rows
+        while True:
+            end = ((i + pad) // n + 1) * n - pad  # one past the last row of the bar starting at i
+            if end > total:
+                break
+            self._step(snap, daily.index[end - 1], o[i], np.nanmax(h[i:end]),
+                       np.nanmin(lo[i:end]), c[end - 1])
+            i = end
+        if i != snap.rows:
+            snap.rows = i
+            snap.last_date = daily.index[i - 1].strftime("%Y-%m-%d")
+            snap.last_close = float(c[i - 1])
+
+    def _step(self, snap: _Snapshot, date, open_, high, low, close) -> None:
+        """One bar of the ThinkScript state machine, exactly as in ``trend_reversal_frame``."""
+        e9, e14, e21 = snap.ema = [ind.ema_update(prev, float(close), n)
+                                   for prev, n in zip(snap.ema, self.lengths)]
+        buy = e9 > e14 and e14 > e21
+        sell = e9 < e14 and e14 < e21
+        if self.use_low_filter:
+            buy = buy and low > e9
+            sell = sell and high < e9
+        if snap.bars > 0:  # the state machine starts on the second bar
+            was_green, was_red = snap.buysignal, snap.sellsignal
+            if buy and not snap.buy and not e9 <= e14:
+                snap.buysignal = 1
+            elif snap.buysignal == 1 and e9 <= e14:
+                snap.buysignal = 0
+            if sell and not snap.sell and not e9 >= e14:
+                snap.sellsignal = 1
+            elif snap.sellsignal == 1 and e9 >= e14:
+                snap.sellsignal = 0
+            start = [snap.bars, pd.Timestamp(date).strftime("%Y-%m-%d"), float(close)]
+            if snap.buysignal and not was_green:
+                snap.green_start = start
+            if snap.sellsignal and not was_red:
+                snap.red_start = start
+        snap.buy, snap.sell = bool(buy), bool(sell)
+        snap.bars += 1
+
+    @staticmethod
+    def _status(snap: _Snapshot) -> LiveStatus:
+        state = "green" if snap.buysignal == 1 else "red" if snap.sellsignal == 1 else "neutral"
+        run = snap.green_start if state == "green" else snap.red_start if state == "red" else None
+        return LiveStatus(
+            state=state,
+            bars_since_flip=snap.bars - 1 - run[0] if run else None,
+            flip_date=pd.Timestamp(run[1]) if run else None,
+            price_at_flip=run[2] if run else None,
+            last_price=float(snap.last_close) if snap.last_close is not None else float("nan"),
+            n_bars=snap.bars,
+        )
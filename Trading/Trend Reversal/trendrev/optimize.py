@@ -5,9 +5,16 @@ table and the per-config return matrix needed for :func:`trendrev.afml.prob_back
 ``walk_forward`` does anchored out-of-sample selection so the reported edge is the one that survived
 being chosen on past data only. The Deflated Sharpe Ratio ties the two together by judging the
 selected config against the luckiest of all trials.
+
+Both accept ``n_jobs``: combinations are then evaluated in a process pool whose workers receive the
+OHLCV frame once (pool initializer) and get only parameter dicts per task. ``executor.map`` keeps
+results in ``expand_grid`` order, so the output is identical to the serial run. ``strategy_fn``
+must be picklable (a module-level function) when ``n_jobs != 1``.
 """
 from __future__ import annotations
 
+import os
+from concurrent.futures import ProcessPoolExecutor
 from itertools import product
 from typing import Callable
 
@@ -30,26 +37,73 @@ def expand_grid(param_grid: dict[str, list]) -> list[dict]:
     return [dict(zip(keys, combo)) for combo in product(*param_grid.values())]
 
 
+def _label(params: dict) -> str:
+    return ",".join(f"{k}={v}" for k, v in params.items())
+
+
+# Per-process state for pool workers: the frame, strategy and engine kwargs are shipped once by the
+# initializer instead of being pickled into every task.
+_WORKER: dict = {}
+
+
+def _init_worker(df: pd.DataFrame, strategy_fn: Callable, bt_kwargs: dict) -> None:
+    _WORKER.update(df=df, strategy_fn=strategy_fn, bt_kwargs=bt_kwargs)
+
+
+def _evaluate(params: dict):
+    """Full-history position, backtest and metrics for one combination -> ``(pos, res, metrics)``."""
+    df = _WORKER["df"]
+    pos = _WORKER["strategy_fn"](df, **params)
+    res = run_backtest(df, pos, **_WORKER["bt_kwargs"])
+    return pos, res, compute_metrics(res)
+
+
+def evaluate_grid(
+    df: pd.DataFrame,
+    strategy_fn: Callable[..., pd.Series],
+    combos: list[dict],
+    n_jobs: int = 1,
+    **bt_kwargs,
+) -> list[tuple]:
+    """Run every combination on the full history, returning ``(pos, result, metrics)`` in order.
+
+    ``n_jobs=1`` evaluates in-process; ``n_jobs=-1`` uses every core. Each combination is computed
+    exactly once, so callers slice the full-history series rather than re-running the strategy.
+    """
+    workers = (os.cpu_count() or 1) if n_jobs == -1 else n_jobs
+    workers = min(max(int(workers), 1), len(combos) or 1)
+    if workers == 1:
+        _init_worker(df, strategy_fn, bt_kwargs)
+        try:
+            return [_evaluate(params) for params in combos]
+        finally:
+            _WORKER.clear()
+    chunk = max(1, len(combos) // (workers * 4))
+    with ProcessPoolExecutor(workers, initializer=_init_worker,
+                             initargs=(df, strategy_fn, bt_kwargs)) as pool:
+        return list(pool.map(_evaluate, combos, chunksize=chunk))
+
+
 def grid_search(
     df: pd.DataFrame,
     strategy_fn: Callable[..., pd.Series],
     param_grid: dict[str, list],
+    n_jobs: int = 1,
     **bt_kwargs,
 ):
     """Evaluate all combinations. Returns ``(metrics_df, returns_matrix)``.
 
     ``metrics_df`` is sorted by Sharpe and carries a ``deflated_sharpe`` column that discounts the
     best row for the number of trials run. ``returns_matrix`` (T x N) feeds the PBO estimator.
+    ``n_jobs`` parallelizes the evaluation (see :func:`evaluate_grid`) without changing the output.
     """
     combos = expand_grid(param_grid)
     rows, ret_cols = [], {}
-    for params in combos:
-        pos = strategy_fn(df, **params)
-        res = run_backtest(df, pos, **bt_kwargs)
-        m = compute_metrics(res)
+    for params, (_, res, m) in zip(combos, evaluate_grid(df, strategy_fn, combos, n_jobs,
+                                                         **bt_kwargs)):
         m.update(params)
         m["per_obs_sharpe"] = _per_obs_sharpe(res.returns)
-        label = ",".join(f"{k}={v}" for k, v in params.items())
+        label = _label(params)
         m["config"] = label
         rows.append(m)
         ret_cols[label] = res.returns
@@ -71,6 +125,7 @@ def walk_forward(
     param_grid: dict[str, list],
     n_splits: int = 5,
     select_by: str = "sharpe",
+    n_jobs: int = 1,
     **bt_kwargs,
 ):
     """Anchored walk-forward: pick params on the in-sample window, trade them out-of-sample.
@@ -78,7 +133,9 @@ def walk_forward(
     The instrument's history is cut into ``n_splits + 1`` contiguous folds. For each test fold the
     parameters are chosen using only the data strictly before it, then applied to the test fold.
     Returns ``(stitched_oos_result_like, choices_df)`` where the first is a dict of stitched OOS
-    series and the second records which config won each fold.
+    series and the second records which config won each fold. Each config is run once on the full
+    history (in parallel with ``n_jobs``) and its series are sliced per fold — valid because every
+    strategy is causal, so a fold's slice equals a run truncated at the fold end.
     """
     combos = expand_grid(param_grid)
     n = len(df)
@@ -90,11 +147,11 @@ def walk_forward(
 
     # Precompute each config's causal position & per-interval returns once on the full history.
     cfg_pos, cfg_ret = {}, {}
-    for params in combos:
-        label = ",".join(f"{k}={v}" for k, v in params.items())
-        pos = strategy_fn(df, **params)
+    for params, (pos, res, _) in zip(combos, evaluate_grid(df, strategy_fn, combos, n_jobs,
+                                                           **bt_kwargs)):
+        label = _label(params)
         cfg_pos[label] = pos
-        cfg_ret[label] = run_backtest(df, pos, **bt_kwargs).returns
+        cfg_ret[label] = res.returns
 
     for k in range(1, n_splits + 1):
         train_idx = df.index[: bounds[k]]
@@ -103,7 +160,7 @@ def walk_forward(
             continue
         best_label, best_score = None, -np.inf
         for label in cfg_ret:
-            score = _per_obs_sharpe(cfg_ret[label].loc[train_idx])
+            score = _per_obs_sharpe(cfg_ret[label].iloc[: bounds[k]])
             if score > best_score:
                 best_label, best_score = label, score
         oos_returns.loc[test_idx] = cfg_ret[best_label].loc[test_idx]
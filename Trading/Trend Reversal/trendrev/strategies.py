@@ -10,6 +10,8 @@ EMA 9/14/21 ribbon state machine). The others are benchmarks for the bake-off.
 """
 from __future__ import annotations
 
+from dataclasses import dataclass
+
 import numpy as np
 import pandas as pd
 
@@ -234,6 +236,82 @@ def trend_reversal_long_target(
     return pd.Series(pos, index=df.index, name="tr_long_target")
 
 
+# --------------------------------------------------------------------------- Trend Reversal (batch)
+@dataclass
+class RibbonBatch:
+    """Latched Trend Reversal states for many configs x many tickers (``configs x bars x tickers``)."""
+
+    configs: list[dict]
+    index: pd.DatetimeIndex
+    tickers: list[str]
+    buysignal: np.ndarray   # int8, configs x bars x tickers
+    sellsignal: np.ndarray  # int8, configs x bars x tickers
+    valid: np.ndarray       # bool, bars x tickers — False where the ticker has no bar
+
+
+def trend_reversal_batch(
+    close: pd.DataFrame, high: pd.DataFrame, low: pd.DataFrame, configs: list[dict]
+) -> RibbonBatch:
+    """Run :func:`trend_reversal_frame` for every config and every ticker at once.
+
+    ``close``/``high``/``low`` are ``bars x tickers`` panels on a shared index (see
+    :func:`trendrev.data.stack_ohlcv`); NaN closes mark bars a ticker does not have. Each distinct
+    EMA length is computed once for the whole universe (:func:`indicators.ema_stack`), and the
+    buy/sell state machine becomes two vectorized latches: ``buynow`` implies ``not stopbuy`` (and
+    likewise for sells), so the latched state is just the most recent set/reset event. Each
+    ``[k, :, j]`` slice equals ``trend_reversal_frame`` of config ``k`` on ticker ``j``'s own bars.
+    """
+    c = close.to_numpy(dtype=float)
+    h = high.reindex_like(close).to_numpy(dtype=float)
+    lo = low.reindex_like(close).to_numpy(dtype=float)
+    valid = ~np.isnan(c)
+    lengths = sorted({cfg[k] for cfg in configs for k in ("superfast", "fast", "slow")})
+    ribbon = dict(zip(lengths, ind.ema_stack(c, lengths)))
+    prev = ind.prev_bar(valid)
+    stepped = valid & (prev >= 0)  # the state machine starts on each ticker's second bar
+
+    buysignal = np.zeros((len(configs),) + c.shape, dtype=np.int8)
+    sellsignal = np.zeros_like(buysignal)
+    for k, cfg in enumerate(configs):
+        e9, e14, e21 = ribbon[cfg["superfast"]], ribbon[cfg["fast"]], ribbon[cfg["slow"]]
+        buy = (e9 > e14) & (e14 > e21)
+        sell = (e9 < e14) & (e14 < e21)
+        if cfg.get("use_low_filter", True):
+            buy &= lo > e9
+            sell &= h < e9
+        buynow = buy & ~ind.at_bar(buy, prev, False) & stepped
+        sellnow = sell & ~ind.at_bar(sell, prev, False) & stepped
+        buysignal[k] = ind.latch(buynow, (e9 <= e14) & stepped) * valid
+        sellsignal[k] = ind.latch(sellnow, (e9 >= e14) & stepped) * valid
+    return RibbonBatch(list(configs), close.index, list(close.columns), buysignal, sellsignal, valid)
+
+
+def trend_reversal_long_batch(batch: RibbonBatch, exit_signal: str = "buy_end") -> np.ndarray:
+    """Batch twin of :func:`trend_reversal_long_target` with ``profit_target=None``.
+
+    Returns 0/1 target positions (``configs x bars x tickers``, int8). Without a profit target the
+    swing rule is another latch — entry on a fresh green bar that has a next bar to fill on, exit on
+    the chosen signal — so it vectorizes exactly like the ribbon state machine.
+    """
+    if exit_signal not in ("buy_end", "sell_signal", "hold"):
+        raise ValueError("exit_signal must be 'buy_end', 'sell_signal' or 'hold'")
+    valid = batch.valid
+    prev = ind.prev_bar(valid)
+    fillable = valid & (ind.next_bar(valid) >= 0)
+    pos = np.zeros_like(batch.buysignal)
+    for k in range(len(batch.configs)):
+        green = batch.buysignal[k] == 1
+        entry = green & ~ind.at_bar(green, prev, False) & fillable
+        if exit_signal == "hold":
+            exit_ = np.zeros_like(green)
+        elif exit_signal == "sell_signal":
+            exit_ = (batch.sellsignal[k] == 1) & valid
+        else:  # "buy_end"
+            exit_ = ~green & valid
+        pos[k] = ind.latch(entry, exit_) * valid
+    return pos
+
+
 def buy_and_hold(df: pd.DataFrame, **_) -> pd.Series:
     return pd.Series(1.0, index=df.index, name="buy_hold")
 